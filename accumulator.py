@@ -8,6 +8,7 @@ import csv
 import json
 import logging
 import shutil
+from concurrent.futures import Future
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, Optional, List
@@ -16,6 +17,9 @@ import pandas as pd
 import openpyxl
 from openpyxl import load_workbook
 
+from app.excel.ledger_backup import LedgerBackupStore
+from app.excel.workbook_session import atomic_save_workbook, get_workbook_session
+
 from validators import (
     get_available_locations,
     normalize_location,
@@ -50,6 +54,7 @@ STAFF_CONFIG_PATH = BASE_DIR / "config" / "staff_config.json"
 logger = logging.getLogger(__name__)
 MAX_BACKUPS_PER_LOCATION = 3
 DATA_ENTRY_START_ROW = 41
+_backup_store = LedgerBackupStore(BACKUP_DIR, max_snapshots=MAX_BACKUPS_PER_LOCATION)
 
 
 def _record_log_entry(payload: Dict[str, Any]) -> None:
@@ -63,43 +68,18 @@ def _record_log_entry(payload: Dict[str, Any]) -> None:
         writer.writerow(payload)
 
 
-def _create_backup_snapshot(file_path: Path, location: str) -> Optional[Path]:
-    """Create a timestamped backup and prune old backups for the location."""
-    if not file_path.exists():
-        return None
+def _create_backup_snapshot(file_path: Path, location: str) -> Optional[Future]:
+    """Queue a compressed, deduplicated snapshot of the workbook for the location.
 
-    timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-    location_dir = BACKUP_DIR / location
-    location_dir.mkdir(parents=True, exist_ok=True)
-    backup_name = f"{file_path.stem}_{timestamp}{file_path.suffix}"
-    backup_path = location_dir / backup_name
-
-    try:
-        shutil.copy2(file_path, backup_path)
-    except Exception as exc:
-        logger.warning("Failed to create backup for %s: %s", location, exc)
+    The on-disk bytes are pinned before this returns, so the workbook may be
+    saved straight away; hashing and compression run on the backup store's
+    background worker and the future resolves to the snapshot object path.
+    Pruning to MAX_BACKUPS_PER_LOCATION is done by the store from its
+    per-location index.
+    """
+    if not file_path.exists():
         return None
-
-    _prune_old_backups(location_dir, file_path.stem, file_path.suffix)
-    return backup_path
-
-
-def _prune_old_backups(location_dir: Path, stem: str, suffix: str) -> None:
-    """Keep only the most recent MAX_BACKUPS_PER_LOCATION backups per location."""
-    try:
-        backups = sorted(
-            location_dir.glob(f"{stem}_*{suffix}"),
-            key=lambda path: path.stat().st_mtime,
-            reverse=True,
-        )
-    except FileNotFoundError:
-        return
-
-    for obsolete in backups[MAX_BACKUPS_PER_LOCATION:]:
-        try:
-            obsolete.unlink()
-        except OSError:
-            logger.warning("Unable to remove old backup %s", obsolete)
+    return _backup_store.snapshot_async(file_path, location)
 
 
 def get_staff_for_location(location: str) -> List[Dict[str, Any]]:
@@ -236,41 +216,8 @@ def check_duplicate(ws, invoice_value: str) -> bool:
 
 
 def persist_wb(wb, file_path: Path) -> None:
-    """Save workbook with retry logic for Windows file locking."""
-    max_retries = 3
-    for attempt in range(max_retries):
-        try:
-            wb.save(file_path)
-            return
-        except PermissionError:
-            if attempt == max_retries - 1:
-                # Final attempt: clean up any existing temp files first
-                for temp_attempt in range(max_retries):
-                    temp_path = file_path.with_suffix(f".tmp_{temp_attempt}.xlsx")
-                    try:
-                        temp_path.unlink(missing_ok=True)
-                    except:
-                        pass
-                # Now create new temp
-                temp_path = file_path.with_suffix(f".tmp_{attempt}.xlsx")
-                wb.save(temp_path)
-                
-                try:
-                    if file_path.exists():
-                        file_path.unlink()
-                    temp_path.replace(file_path)
-                    return
-                except Exception as e:
-                    # Clean up temp file on failure
-                    try:
-                        temp_path.unlink(missing_ok=True)
-                    except:
-                        pass
-                    logger.error(f"Failed to save file after {max_retries} attempts: {e}")
-                    raise
-            else:
-                import time
-                time.sleep(0.5)
+    """Save workbook atomically (temp file + rename), retrying on Windows file locks."""
+    atomic_save_workbook(wb, file_path)
 
 
 def log_operation(
@@ -333,9 +280,24 @@ def append_to_month_sheet(data: Dict[str, Any], location: str, staff_member: str
     # Ensure location workbook exists
     file_path = ensure_location_workbook(location)
     
-    # Load workbook
-    wb = load_workbook(file_path)
-    
+    # Load workbook (kept open across a batch by the workbook session)
+    session = get_workbook_session()
+    with session.lock(file_path):
+        wb = session.open(file_path, loader=load_workbook)
+        try:
+            return _append_to_open_workbook(
+                wb, file_path, data, location, staff_member, operator, force=force
+            )
+        except Exception:
+            # Drop this append's partial cells; earlier unsaved appends are replayed
+            session.rollback(file_path, loader=load_workbook)
+            raise
+
+
+def _append_to_open_workbook(wb, file_path: Path, data: Dict[str, Any], location: str,
+                             staff_member: str, operator: Dict[str, Any], *,
+                             force: bool = False) -> Dict[str, Any]:
+    """Append one receipt to a session-held workbook and mark it for saving."""
     # Determine target month from receipt_date
     receipt_date = data.get("receipt_date", "")
     if receipt_date:
@@ -369,7 +331,6 @@ def append_to_month_sheet(data: Dict[str, Any], location: str, staff_member: str
             message="Duplicate invoice rejected",
         )
         logger.warning(f"Duplicate invoice rejected: {invoice_number}")
-        wb.close()
         return {
             "success": False,
             "error": "Duplicate invoice number",
@@ -378,7 +339,7 @@ def append_to_month_sheet(data: Dict[str, Any], location: str, staff_member: str
             "sheet": sheet_name
         }
     
-    backup_path = _create_backup_snapshot(file_path, location)
+    backup = _create_backup_snapshot(file_path, location)
 
     # Find first empty row
     row_number = find_first_empty_row(ws)
@@ -408,11 +369,14 @@ def append_to_month_sheet(data: Dict[str, Any], location: str, staff_member: str
     # Append row
     append_row(ws, row_number, mapped_values)
     
-    # Save workbook
-    try:
-        persist_wb(wb, file_path)
-    finally:
-        wb.close()
+    def replay(workbook) -> None:
+        append_row(get_month_sheet(workbook, year, month), row_number, mapped_values)
+
+    # Save workbook (deferred to batch end inside a session batch); the
+    # backup already pinned the on-disk copy, so the save does not wait on it
+    get_workbook_session().mark_dirty(file_path, replay=replay)
+    # Known once the background snapshot has finished
+    backup_path = backup.result() if backup is not None and backup.done() else None
     
     # Log operation
     log_operation(
@@ -9,6 +9,9 @@ Endpoints:
 - PUT /api/drafts/{id}    - Update draft
 - DELETE /api/drafts/{id} - Delete draft
 - POST /api/drafts/send   - Send drafts to Excel (bulk)
+- POST /api/drafts/send-jobs            - Queue a bulk send as a background job
+- GET /api/drafts/send-jobs/{id}        - Poll send job progress
+- GET /api/drafts/send-jobs/{id}/events - Stream send job progress (SSE)
 
 Phase 4B Scope:
 - Backend APIs only
@@ -21,7 +24,9 @@ from __future__ import annotations
 
 from typing import List, Optional, Dict, Any
 import asyncio
+import json
 import os
+import threading
 from uuid import UUID
 from decimal import Decimal
 from datetime import datetime
@@ -29,7 +34,8 @@ import time
 
 from fastapi import APIRouter, HTTPException, status, UploadFile, File, Form, Depends, Request, Response
 from fastapi.concurrency import run_in_threadpool
-from pydantic import BaseModel, Field
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field, TypeAdapter
 
 from app.auth.dependencies import get_current_user
 from app.models.user import User
@@ -49,7 +55,19 @@ from app.services.validation_service import (
     ENFORCE_VALIDATION,
 )
 from app.services.access_control_service import AccessControlService
-from app.repositories.user_repository import UserRepository
+from app.services.send_jobs import (
+    SEND_JOB_WORKERS,
+    STATE_COMPLETED,
+    STATE_FAILED,
+    DraftsAlreadyQueued,
+    SendJob,
+    get_send_job_store,
+    process_send_job,
+)
+from app.utils.job_workers import JobWorkerPool
+from app.repositories.user_repository import get_user_repository
+from app.utils.http_cache import conditional_json_response, make_etag
+from app.utils.uploads import UploadTooLargeError, receive_upload
 import logging
 
 # Security: Maximum file upload size (10 MB)
@@ -89,6 +107,34 @@ def get_draft_service() -> DraftService:
     return _draft_service
 
 
+def _run_send_job(job: SendJob, report_stage):
+    """Job-store handler for POST /api/drafts/send-jobs."""
+    return process_send_job(get_send_job_store(), get_draft_service(), job, report_stage)
+
+
+def _on_send_job_failed(job: SendJob, error: str) -> None:
+    logger.error("send_job_failed job_id=%s attempts=%s error=%s", job.job_id, job.attempts, error)
+
+
+_send_worker_pool: Optional[JobWorkerPool] = None
+_send_worker_pool_lock = threading.Lock()
+
+
+def get_send_worker_pool(workers: Optional[int] = None) -> JobWorkerPool:
+    """Get or create this process's send job worker pool (SEND_JOB_WORKERS threads)."""
+    global _send_worker_pool
+    with _send_worker_pool_lock:
+        if _send_worker_pool is None:
+            _send_worker_pool = JobWorkerPool(
+                get_send_job_store(),
+                _run_send_job,
+                workers=SEND_JOB_WORKERS if workers is None else workers,
+                on_failure=_on_send_job_failed,
+                name="send-job",
+            )
+        return _send_worker_pool
+
+
 def _is_worker(user: User) -> bool:
     """Check if user has WORKER role.
     
@@ -294,13 +340,13 @@ class DraftResponse(BaseModel):
             # Lookup user info from repository (try UUID first, then login_id)
             try:
                 from uuid import UUID as UUID_Type
-                user_repo = UserRepository()
+                user_repo = get_user_repository()
                 user = None
                 
                 # Try UUID lookup first
                 try:
                     user_uuid = UUID_Type(draft.creator_user_id) if isinstance(draft.creator_user_id, str) else draft.creator_user_id
-                    user = user_repo.get_user_by_id(user_uuid)
+                    user = user_repo.get_cached_user_by_id(user_uuid)
                 except ValueError:
                     # Not a valid UUID, try login_id lookup instead
                     user = user_repo.get_user_by_login_id(draft.creator_user_id)
@@ -318,9 +364,8 @@ class DraftResponse(BaseModel):
         staff_id = getattr(r, 'staff_id', None)
         if staff_id:
             try:
-                from app.services.config_service import ConfigService
-                config_service = ConfigService()
-                staff_name = config_service.get_staff_name(staff_id, business_location_id)
+                from app.services.config_service import get_config_service
+                staff_name = get_config_service().get_staff_name(staff_id, business_location_id)
             except Exception as e:
                 # Graceful fallback if staff lookup fails
                 logger.warning(f"Failed to lookup staff {staff_id}: {e}")
@@ -364,9 +409,9 @@ class DraftResponse(BaseModel):
             # Lookup reviewer details
             try:
                 from uuid import UUID as UUID_Type
-                user_repo = UserRepository()
+                user_repo = get_user_repository()
                 reviewer_uuid = UUID_Type(draft.reviewed_by_user_id) if isinstance(draft.reviewed_by_user_id, str) else draft.reviewed_by_user_id
-                reviewer = user_repo.get_user_by_id(reviewer_uuid)
+                reviewer = user_repo.get_cached_user_by_id(reviewer_uuid)
                 if reviewer:
                     reviewed_by_login_id = reviewer.login_id
                     reviewed_by_name = reviewer.name
@@ -418,6 +463,83 @@ class DraftResponse(BaseModel):
         )
 
 
+class DraftSummaryResponse(BaseModel):
+    """Compact list-row model (GET /api/drafts?view=summary, /sent-records/all?view=summary).
+
+    Carries only what list screens display; use GET /api/drafts/{id} for
+    the full receipt, image and audit fields.
+    """
+    draft_id: UUID
+    status: DraftStatus
+    vendor: Optional[str] = None
+    receipt_date: Optional[str] = None
+    total_amount: Optional[Decimal] = None
+    business_location_id: Optional[str] = None
+    staff_id: Optional[str] = None
+    staff_name: Optional[str] = None
+    created_at: str
+    sent_at: Optional[str] = None
+    reviewed_at: Optional[str] = None
+    creator_user_id: Optional[str] = None
+    send_attempt_count: int = 0
+    last_send_error: Optional[str] = None
+    user_facing_status: str = "Draft"
+
+
+_DRAFT_SUMMARY_LIST = TypeAdapter(List[DraftSummaryResponse])
+_DRAFT_RESPONSE_LIST = TypeAdapter(List[DraftResponse])
+
+
+def _summary_response(rows: List[Dict[str, Any]]) -> Response:
+    return Response(content=_summary_payload(rows), media_type="application/json")
+
+
+def _summary_payload(rows: List[Dict[str, Any]]) -> bytes:
+    """Serialize summary rows in one pydantic-core pass.
+
+    Staff names are resolved once per (staff, location) pair instead of per
+    row, and no user lookups are made.
+    """
+    staff_names: Dict[Any, Optional[str]] = {}
+    config_service = None
+    items = []
+    for row in rows:
+        staff_id = row.get("staff_id")
+        location_id = row.get("business_location_id")
+        staff_name = None
+        if staff_id:
+            key = (staff_id, location_id)
+            if key not in staff_names:
+                try:
+                    if config_service is None:
+                        from app.services.config_service import get_config_service
+                        config_service = get_config_service()
+                    staff_names[key] = config_service.get_staff_name(staff_id, location_id)
+                except Exception as e:
+                    logger.warning(f"Failed to lookup staff {staff_id}: {e}")
+                    staff_names[key] = None
+            staff_name = staff_names[key]
+        draft_status = DraftStatus(row["status"])
+        items.append({
+            "draft_id": row["draft_id"],
+            "status": draft_status,
+            "vendor": row.get("vendor_name"),
+            "receipt_date": row.get("receipt_date"),
+            "total_amount": row.get("total_amount"),
+            "business_location_id": location_id,
+            "staff_id": staff_id,
+            "staff_name": staff_name,
+            "created_at": row["created_at"],
+            "sent_at": row.get("sent_at"),
+            "reviewed_at": row.get("reviewed_at"),
+            "creator_user_id": row.get("creator_user_id"),
+            "send_attempt_count": row.get("send_attempt_count") or 0,
+            "last_send_error": row.get("last_send_error"),
+            "user_facing_status": get_user_facing_status(draft_status).value,
+        })
+    return _DRAFT_SUMMARY_LIST.dump_json(_DRAFT_SUMMARY_LIST.validate_python(items))
+
+
 class SendDraftsResponse(BaseModel):
     """Response model for bulk send operation."""
     total: int = Field(..., description="Total drafts requested")
@@ -511,8 +633,10 @@ def save_draft(
 
 @router.get("", response_model=List[DraftResponse])
 def list_drafts(
+    request: Request,
     status_filter: Optional[str] = None,
     limit: Optional[int] = None,
+    view: str = "full",
     current_user: User = Depends(get_current_user)
 ) -> List[DraftResponse]:
     """List all drafts for the current user, optionally filtered by status.
@@ -522,6 +646,8 @@ def list_drafts(
                       ("DRAFT" or "SENT"). If omitted, returns all drafts.
         limit: Maximum number of drafts to return. Defaults to 200 for ADMIN/HQ, 50 for WORKER.
               Use lower values for faster response times.
+        view: "full" (default) or "summary" for compact DraftSummaryResponse
+              rows read from promoted columns (no receipt JSON, no validation)
         current_user: Authenticated user from JWT token
     
     Returns:
@@ -531,6 +657,8 @@ def list_drafts(
         - ADMIN/HQ roles get image_data included (for office view previews)
         - WORKER role gets image_data excluded (to reduce payload for workers)
         - Validation is only computed for DRAFT status (not for SENT/REVIEWED)
+        - The ETag is derived from the draft change version, config version and
+          user scope; a matching If-None-Match returns 304 without loading drafts
     
     Example:
         GET /api/drafts              # All drafts for current user
@@ -578,22 +706,45 @@ def list_drafts(
         print(f"DEBUG: list_drafts called by user_id={current_user.user_id}, role={current_user.role}, filtering by user_id={filter_by_user}, include_image_data={include_image_data}, limit={limit}")
 
     try:
-        drafts = service.list_drafts(status=status_enum, user_id=filter_by_user, include_image_data=include_image_data, limit=limit)
-        
-        # Add validation status to each draft
-        # Performance optimization: Only validate DRAFT status, skip for SENT/REVIEWED
-        responses = []
-        for draft in drafts:
-            if draft.status == DraftStatus.DRAFT:
-                # Validate DRAFT status receipts for ready-to-send
-                is_valid, errors = service._validate_ready_to_send(draft)
-            else:
-                # SENT/REVIEWED drafts are already validated, skip validation
-                is_valid = True
-                errors = []
-            responses.append(DraftResponse.from_draft(draft, is_valid=is_valid, validation_errors=errors))
-        
-        return responses
+        etag = make_etag(
+            "/api/drafts",
+            filter_by_user,
+            status_enum.value if status_enum else None,
+            limit,
+            view,
+            service.repository.get_change_version(),
+            service.config_service.get_version(),
+        )
+
+        if view == "summary":
+            def build_summaries() -> bytes:
+                rows = service.list_draft_summaries(
+                    statuses=[status_enum] if status_enum else None,
+                    user_id=filter_by_user,
+                    limit=limit,
+                )
+                return _summary_payload(rows)
+
+            return conditional_json_response(request, etag, build_summaries)
+
+        def build_drafts() -> bytes:
+            drafts = service.list_drafts(status=status_enum, user_id=filter_by_user, include_image_data=include_image_data, limit=limit)
+            
+            # Add validation status to each draft
+            # Performance optimization: Only validate DRAFT status, skip for SENT/REVIEWED
+            responses = []
+            for draft in drafts:
+                if draft.status == DraftStatus.DRAFT:
+                    # Validate DRAFT status receipts for ready-to-send
+                    is_valid, errors = service._validate_ready_to_send(draft)
+                else:
+                    # SENT/REVIEWED drafts are already validated, skip validation
+                    is_valid = True
+                    errors = []
+                responses.append(DraftResponse.from_draft(draft, is_valid=is_valid, validation_errors=errors))
+            return _DRAFT_RESPONSE_LIST.dump_json(responses)
+
+        return conditional_json_response(request, etag, build_drafts)
     except Exception as exc:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -606,6 +757,7 @@ def list_drafts(
 @router.get("/sent-records/all", response_model=List[DraftResponse])
 def list_sent_records(
     limit: int = 50,
+    view: str = "full",
     current_user: User = Depends(get_current_user)
 ) -> List[DraftResponse]:
     """Phase 5G-A/C: List all SENT and REVIEWED receipts for Admin/HQ verification view.
@@ -616,6 +768,7 @@ def list_sent_records(
     Args:
         limit: Maximum number of sent records to return (default 50).
               Use lower values for faster response times.
+        view: "full" (default) or "summary" for compact DraftSummaryResponse rows
     
     Security:
         - Only ADMIN and HQ roles can access
@@ -652,6 +805,16 @@ def list_sent_records(
     service = get_draft_service()
     
     try:
+        if view == "summary":
+            # One query over both statuses, already sorted by sent_at and limited
+            rows = service.list_draft_summaries(
+                statuses=[DraftStatus.SENT, DraftStatus.REVIEWED],
+                user_id=None,
+                limit=limit,
+                order_by_sent=True,
+            )
+            return _summary_response(rows)
+
         # Phase 5G-C: Fetch both SENT and REVIEWED drafts (no user filtering for ADMIN/HQ)
         # Apply limit to each query, then combine (total may be up to 2*limit)
         sent_drafts = service.list_drafts(
@@ -693,6 +856,7 @@ def list_sent_records(
 
 @router.get("/config/reference-data", response_model=ReferenceDataResponse)
 def get_reference_data(
+    request: Request,
     current_user: User = Depends(get_current_user)
 ) -> ReferenceDataResponse:
     """Return read-only location/staff reference data for Office Manual Entry.
@@ -700,6 +864,9 @@ def get_reference_data(
     Access:
     - ADMIN, HQ: allowed
     - WORKER: forbidden
+
+    The ETag follows the config file version, so polling clients get 304
+    until locations.json or staff_config.json change.
     """
     if not _is_admin_or_hq(current_user):
         raise HTTPException(
@@ -708,7 +875,16 @@ def get_reference_data(
         )
 
     service = get_draft_service()
-    locations = service.config_service.get_locations()
+    etag = make_etag("/api/drafts/config/reference-data", service.config_service.get_version())
+    return conditional_json_response(
+        request,
+        etag,
+        lambda: _build_reference_data(service.config_service).model_dump_json().encode("utf-8"),
+    )
+
+
+def _build_reference_data(config_service) -> ReferenceDataResponse:
+    locations = config_service.get_locations()
 
     business_locations = [
         ReferenceLocation(id=location_id, name=location_id)
@@ -717,7 +893,7 @@ def get_reference_data(
 
     staff: List[ReferenceStaff] = []
     for location_id in locations:
-        for staff_entry in service.config_service.get_staff_for_location(location_id):
+        for staff_entry in config_service.get_staff_for_location(location_id):
             staff_id = str(staff_entry.get("id") or "").strip()
             if not staff_id:
                 continue
@@ -1285,17 +1461,18 @@ async def batch_upload_receipts(
     except Exception:
         logger.debug("Failed to read request.form() for diagnostics")
 
-    # Read all files with size validation
+    # Read all files with size validation (oversized files are rejected before being read)
     images = []
     for file in files:
-        content = await file.read()
-        # Security: Validate file size (max 10 MB)
-        if len(content) > MAX_UPLOAD_SIZE_BYTES:
+        try:
+            upload = await receive_upload(file, MAX_UPLOAD_SIZE_BYTES)
+        except UploadTooLargeError:
+            # Security: Validate file size (max 10 MB)
             raise HTTPException(
                 status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
                 detail=f"File '{file.filename}' too large. Maximum size is {MAX_UPLOAD_SIZE_MB} MB."
             )
-        images.append((content, file.filename))
+        images.append((upload.data, file.filename))
 
     logger.info("Uploaded filenames: %s", [file.filename for file in files])
     
@@ -1409,14 +1586,15 @@ async def debug_batch_upload_receipts(
     service = get_draft_service()
     images = []
     for file in files:
-        content = await file.read()
-        # Security: Validate file size (max 10 MB) - even for debug
-        if len(content) > MAX_UPLOAD_SIZE_BYTES:
+        try:
+            upload = await receive_upload(file, MAX_UPLOAD_SIZE_BYTES)
+        except UploadTooLargeError:
+            # Security: Validate file size (max 10 MB) - even for debug
             raise HTTPException(
                 status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
                 detail=f"File '{file.filename}' too large. Maximum size is {MAX_UPLOAD_SIZE_MB} MB."
             )
-        images.append((content, file.filename))
+        images.append((upload.data, file.filename))
 
     logger.info("Debug: Uploaded filenames: %s", [file.filename for file in files])
 
@@ -1434,6 +1612,59 @@ async def debug_batch_upload_receipts(
         )
 
 
+def _assert_drafts_sendable(service: DraftService, draft_ids: List[UUID], current_user: User) -> None:
+    """Pre-send checks shared by /send and /send-jobs; raises HTTPException on the first blocker."""
+    for draft_id in draft_ids:
+        draft = service.get_draft(draft_id)
+        if draft is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Draft not found: {draft_id}",
+            )
+
+        if _is_worker(current_user):
+            _assert_draft_access(current_user, draft)
+
+        # Phase 9.R.3: Block re-sending SENT receipts explicitly
+        if draft.status == DraftStatus.SENT:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Receipt {draft_id} has already been sent and cannot be re-sent.",
+            )
+
+        # Phase 6A-4: SEND-only hard block for staff/location mismatch
+        try:
+            service.validate_staff_location_or_raise(
+                getattr(draft.receipt, "staff_id", None),
+                getattr(draft.receipt, "business_location_id", None),
+            )
+        except StaffLocationMismatchError as exc:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail={
+                    "message": str(exc),
+                    "error_code": getattr(exc, "error_code", "STAFF_LOCATION_MISMATCH"),
+                },
+            )
+        
+        # Phase 12A-1: Validation enforcement (gated by ENFORCE_VALIDATION flag)
+        # When ENFORCE_VALIDATION=false (default): advisory only, no blocking
+        # When ENFORCE_VALIDATION=true: block sends with validation issues
+        if ENFORCE_VALIDATION:
+            try:
+                validation_service = ValidationService()
+                validation_service.validate_for_send(
+                    draft.receipt,
+                    enforce=True,
+                    receipt_id=str(draft_id),
+                )
+            except ValidationEnforcementError as exc:
+                raise HTTPException(
+                    status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                    detail=exc.to_dict(),
+                )
+
+
 @router.post("/send", response_model=SendDraftsResponse)
 def send_drafts(
     request: SendDraftsRequest,
@@ -1498,57 +1729,8 @@ def send_drafts(
         }
     """
     service = get_draft_service()
+    _assert_drafts_sendable(service, request.draft_ids, current_user)
 
-    for draft_id in request.draft_ids:
-        draft = service.get_draft(draft_id)
-        if draft is None:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Draft not found: {draft_id}",
-            )
-
-        if _is_worker(current_user):
-            _assert_draft_access(current_user, draft)
-
-        # Phase 9.R.3: Block re-sending SENT receipts explicitly
-        if draft.status == DraftStatus.SENT:
-            raise HTTPException(
-                status_code=status.HTTP_409_CONFLICT,
-                detail=f"Receipt {draft_id} has already been sent and cannot be re-sent.",
-            )
-
-        # Phase 6A-4: SEND-only hard block for staff/location mismatch
-        try:
-            service.validate_staff_location_or_raise(
-                getattr(draft.receipt, "staff_id", None),
-                getattr(draft.receipt, "business_location_id", None),
-            )
-        except StaffLocationMismatchError as exc:
-            raise HTTPException(
-                status_code=status.HTTP_409_CONFLICT,
-                detail={
-                    "message": str(exc),
-                    "error_code": getattr(exc, "error_code", "STAFF_LOCATION_MISMATCH"),
-                },
-            )
-        
-        # Phase 12A-1: Validation enforcement (gated by ENFORCE_VALIDATION flag)
-        # When ENFORCE_VALIDATION=false (default): advisory only, no blocking
-        # When ENFORCE_VALIDATION=true: block sends with validation issues
-        if ENFORCE_VALIDATION:
-            try:
-                validation_service = ValidationService()
-                validation_service.validate_for_send(
-                    draft.receipt,
-                    enforce=True,
-                    receipt_id=str(draft_id),
-                )
-            except ValidationEnforcementError as exc:
-                raise HTTPException(
-                    status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-                    detail=exc.to_dict(),
-                )
-    
     try:
         role_value = current_user.role.value if hasattr(current_user.role, "value") else str(current_user.role)
         result = service.send_drafts(
@@ -1603,6 +1785,113 @@ def send_drafts(
         )
 
 
+@router.post("/send-jobs", status_code=status.HTTP_202_ACCEPTED)
+def submit_send_job(
+    request: SendDraftsRequest,
+    response: Response,
+    current_user: User = Depends(get_current_user)
+) -> Dict[str, Any]:
+    """Queue a bulk send as a durable background job.
+
+    Runs the same pre-send checks as POST /send, then returns immediately.
+    Follow progress with GET /send-jobs/{job_id} (polling) or
+    GET /send-jobs/{job_id}/events (server-sent events); the final
+    ``result`` has the SendDraftsResponse shape.
+    """
+    service = get_draft_service()
+    _assert_drafts_sendable(service, request.draft_ids, current_user)
+
+    role_value = current_user.role.value if hasattr(current_user.role, "value") else str(current_user.role)
+    try:
+        job = get_send_job_store().enqueue(
+            request.draft_ids,
+            {"sent_by_user_id": str(current_user.user_id), "sent_by_role": role_value},
+            created_by=str(current_user.user_id),
+        )
+    except DraftsAlreadyQueued as exc:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail={"message": str(exc), "draft_ids": exc.draft_ids},
+        )
+    get_send_worker_pool().notify()
+
+    response.headers["Location"] = f"/api/drafts/send-jobs/{job.job_id}"
+    return get_send_job_store().snapshot(job.job_id)
+
+
+def _get_send_job_snapshot(job_id: str, current_user: User) -> Dict[str, Any]:
+    snapshot = get_send_job_store().snapshot(job_id)
+    if snapshot is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Send job not found: {job_id}")
+    if snapshot["created_by"] != str(current_user.user_id) and not _is_admin_or_hq(current_user):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Permission denied. You can only view your own send jobs.",
+        )
+    return snapshot
+
+
+@router.get("/send-jobs/{job_id}")
+def get_send_job(
+    job_id: str,
+    request: Request,
+    current_user: User = Depends(get_current_user)
+) -> Response:
+    """Poll a send job: state, per-draft progress and, once finished, the result."""
+    snapshot = _get_send_job_snapshot(job_id, current_user)
+    etag = make_etag("/api/drafts/send-jobs", job_id, snapshot["state"], snapshot["updated_at"])
+    return conditional_json_response(
+        request, etag, lambda: json.dumps(snapshot, ensure_ascii=False, default=str).encode("utf-8"),
+    )
+
+
+SEND_JOB_EVENT_POLL_SECONDS = float(os.getenv("SEND_JOB_EVENT_POLL_SECONDS", "1"))
+SEND_JOB_EVENT_KEEPALIVE_SECONDS = 15.0
+
+
+@router.get("/send-jobs/{job_id}/events")
+async def stream_send_job_events(
+    job_id: str,
+    request: Request,
+    current_user: User = Depends(get_current_user)
+) -> StreamingResponse:
+    """Server-sent events for a send job.
+
+    Emits ``progress`` whenever the job changes and a final ``done`` event
+    (with the result) when it completes or fails, then closes the stream.
+    """
+    snapshot = await run_in_threadpool(_get_send_job_snapshot, job_id, current_user)
+
+    async def events():
+        current = snapshot
+        last_key = None
+        last_sent = time.monotonic()
+        while True:
+            if current is None:
+                yield "event: error\ndata: {\"detail\": \"Send job not found\"}\n\n"
+                return
+            key = (current["state"], current["updated_at"])
+            finished = current["state"] in (STATE_COMPLETED, STATE_FAILED)
+            if key != last_key:
+                last_key = key
+                last_sent = time.monotonic()
+                data = json.dumps(current, ensure_ascii=False, default=str)
+                yield f"event: {'done' if finished else 'progress'}\ndata: {data}\n\n"
+            if finished or await request.is_disconnected():
+                return
+            if time.monotonic() - last_sent >= SEND_JOB_EVENT_KEEPALIVE_SECONDS:
+                last_sent = time.monotonic()
+                yield ": keep-alive\n\n"
+            await asyncio.sleep(SEND_JOB_EVENT_POLL_SECONDS)
+            current = await run_in_threadpool(get_send_job_store().snapshot, job_id)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.post("/send/precheck", response_model=SendPrecheckResponse)
 def precheck_send_drafts(
     request: SendDraftsRequest,
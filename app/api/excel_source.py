@@ -19,11 +19,14 @@ Date: 2026-03-01
 
 from __future__ import annotations
 
+import json
 import logging
+import os
+import time
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from pydantic import BaseModel, Field
 
 from app.auth.dependencies import get_current_user
@@ -39,11 +42,17 @@ from app.services.excel_sync_service import (
     SyncStatus,
     get_excel_sync_service,
 )
+from app.repositories.draft_repository import DraftRepository
 from app.services.access_control_service import AccessControlService
+from app.utils.http_cache import CACHE_CONTROL, etag_matches, get_response_cache, make_etag
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/excel", tags=["excel-source"])
 
+# Upper bound on how stale the dashboard can be after edits made outside the app
+EXCEL_DASHBOARD_MAX_AGE_SECONDS = int(os.getenv("EXCEL_DASHBOARD_MAX_AGE_SECONDS", "60"))
+_draft_repository: Optional[DraftRepository] = None
+
 
 # =============================================================================
 # REQUEST/RESPONSE MODELS
@@ -586,21 +595,56 @@ async def check_file_sync_status(
 # DASHBOARD ENDPOINT
 # =============================================================================
 
+def _dashboard_version() -> tuple:
+    """Version for the dashboard ETag.
+
+    Ledger writes made by this app happen alongside draft updates, so the
+    draft change version covers them; edits made directly in OneDrive are
+    picked up when the time bucket rolls over.
+    """
+    global _draft_repository
+    if _draft_repository is None:
+        _draft_repository = DraftRepository()
+    bucket = int(time.time() // EXCEL_DASHBOARD_MAX_AGE_SECONDS) if EXCEL_DASHBOARD_MAX_AGE_SECONDS > 0 else time.time()
+    return (_draft_repository.get_change_version(), bucket)
+
+
 @router.get("/dashboard")
-async def excel_dashboard() -> Dict[str, Any]:
+async def excel_dashboard(request: Request):
     """
     Get Phase 10 dashboard with summary statistics.
     
     Returns overview of Excel data without authentication (for demo).
+    Connected responses are cached and carry an ETag; a matching
+    If-None-Match returns 304 without calling Graph.
     
     Note: Requires Graph API to be configured (Phase 10 PoC).
     """
     _require_graph_api_configured()
+
+    etag = make_etag("/api/excel/dashboard", _dashboard_version())
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    cache = get_response_cache()
+    body = cache.get(etag)
+    if body is None:
+        payload = _build_excel_dashboard()
+        if payload.get("status") != "connected":
+            return payload
+        body = json.dumps(payload).encode("utf-8")
+        cache.put(etag, body)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def _build_excel_dashboard() -> Dict[str, Any]:
     provider = get_excel_data_provider()
     
     try:
         location_files = provider.list_location_files()
         staff_files = provider.list_staff_files()
+        # Cached per file ETag; only new or edited workbooks are probed
+        provider.fill_row_counts(location_files + staff_files)
         
         # Calculate totals
         total_location_rows = sum(f.row_count or 0 for f in location_files)
@@ -675,6 +719,7 @@ async def excel_api_health() -> Dict[str, Any]:
             "service": "Excel Source API (Phase 10)",
             "timestamp": datetime.utcnow().isoformat(),
             "location_files_count": len(files),
+            "read_cache": provider.cache.stats(),
             "message": "Excel Source API is operational",
         }
     except Exception as e:
@@ -174,6 +174,36 @@ class MonthEndTransferResponse(BaseModel):
     message: Optional[str] = None
 
 
+class MonthEndPipelineRequest(BaseModel):
+    """Request payload for a multi-office month-end HQ transfer."""
+    year: int = Field(..., ge=2020, le=2100, description="Transfer year")
+    month: int = Field(..., ge=1, le=12, description="Transfer month (1-12)")
+    office_ids: Optional[List[str]] = Field(
+        default=None, description="Offices to transfer (default: every office with SENT receipts)"
+    )
+
+
+class MonthEndOfficeResult(MonthEndTransferResponse):
+    """Per-office result within a multi-office transfer."""
+    office_id: str
+
+
+class MonthEndPipelineResponse(BaseModel):
+    """Response for a multi-office month-end HQ transfer or recovery run."""
+    reporting_month: str
+    status: str
+    office_count: int
+    written_count: int
+    failed_count: int
+    offices: List[MonthEndOfficeResult]
+
+
+class MonthEndPeriodRequest(BaseModel):
+    """Request payload identifying a reporting month."""
+    year: int = Field(..., ge=2020, le=2100, description="Transfer year")
+    month: int = Field(..., ge=1, le=12, description="Transfer month (1-12)")
+
+
 class TransferStatusResponse(BaseModel):
     """Response for transfer status query."""
     batch_id: Optional[str] = None
@@ -261,6 +291,99 @@ def execute_month_end_transfer(
     )
 
 
+def _office_result(result: dict) -> MonthEndOfficeResult:
+    return MonthEndOfficeResult(
+        office_id=result["office_id"],
+        batch_id=result.get("batch_id"),
+        status=result["status"],
+        receipt_count=result.get("receipt_count", 0),
+        written_count=result.get("written_count"),
+        failed_count=result.get("failed_count"),
+        errors=[MonthEndTransferError(**e) for e in result["errors"]] if result.get("errors") else None,
+        reporting_month=result["reporting_month"],
+        message=result.get("message"),
+    )
+
+
+@router.post("/month-end/execute-all", response_model=MonthEndPipelineResponse)
+def execute_month_end_pipeline(
+    request: MonthEndPipelineRequest,
+    current_user: User = Depends(get_current_user),
+):
+    """Execute month-end HQ transfer for many offices in one commit.
+    
+    Offices are prepared in parallel, then committed to the HQ Master
+    Ledger under a single file lock with one contiguous range write per
+    office. Per-office batches and results match /month-end/execute.
+    
+    Requires ADMIN role.
+    """
+    _ensure_feature_enabled()
+    _ensure_admin_only(current_user)
+    
+    user_id = str(getattr(current_user, "user_id", "system"))
+    result = get_hq_transfer_writer_service().execute_month_end_pipeline(
+        year=request.year,
+        month=request.month,
+        user_id=user_id,
+        office_ids=request.office_ids,
+    )
+    
+    logger.info(
+        "hq_month_end_pipeline user_id=%s year=%d month=%d status=%s offices=%d written=%d failed=%d",
+        user_id,
+        request.year,
+        request.month,
+        result["status"],
+        result["office_count"],
+        result["written_count"],
+        result["failed_count"],
+    )
+    
+    return MonthEndPipelineResponse(
+        reporting_month=result["reporting_month"],
+        status=result["status"],
+        office_count=result["office_count"],
+        written_count=result["written_count"],
+        failed_count=result["failed_count"],
+        offices=[_office_result(office) for office in result["offices"]],
+    )
+
+
+@router.post("/month-end/recover", response_model=MonthEndPipelineResponse)
+def recover_month_end_transfers(
+    request: MonthEndPeriodRequest,
+    current_user: User = Depends(get_current_user),
+):
+    """Reconcile batches left in WRITING by an interrupted HQ commit.
+    
+    Rows already in the HQ Master Ledger (matched by Batch ID) are kept and
+    their drafts marked transferred; each batch is finalized so the
+    remaining receipts can be transferred again. Batches newer than
+    HQ_TRANSFER_RECOVERY_MIN_AGE_SECONDS are left for their own commit.
+    
+    Requires ADMIN role.
+    """
+    _ensure_feature_enabled()
+    _ensure_admin_only(current_user)
+    
+    user_id = str(getattr(current_user, "user_id", "system"))
+    offices = get_hq_transfer_writer_service().recover_interrupted_batches(
+        year=request.year,
+        month=request.month,
+        user_id=user_id,
+    )
+    
+    return MonthEndPipelineResponse(
+        reporting_month=f"{request.year:04d}-{request.month:02d}",
+        status="recovered" if offices else "nothing_to_recover",
+        office_count=len(offices),
+        written_count=sum(office.get("written_count") or 0 for office in offices),
+        failed_count=sum(office.get("failed_count") or 0 for office in offices),
+        offices=[_office_result(office) for office in offices],
+    )
+
+
 @router.get("/month-end/status", response_model=TransferStatusResponse)
 def get_month_end_status(
     office_id: str,
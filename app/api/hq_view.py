@@ -11,7 +11,7 @@ import logging
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from pydantic import BaseModel, Field
 
 from app.auth.dependencies import get_current_user
@@ -19,11 +19,21 @@ from app.models.user import User
 from app.repositories.draft_repository import DraftRepository
 from app.services.config_service import ConfigService
 from app.services.access_control_service import AccessControlService
+from app.utils.http_cache import conditional_json_response, make_etag
 
 
 logger = logging.getLogger("uvicorn.error")
 router = APIRouter(prefix="/api/hq-view", tags=["hq-view"])
 config_service = ConfigService()
+_draft_repository: Optional[DraftRepository] = None
+
+
+def _get_draft_repository() -> DraftRepository:
+    """Shared repository so polls do not re-run schema setup each time."""
+    global _draft_repository
+    if _draft_repository is None:
+        _draft_repository = DraftRepository()
+    return _draft_repository
 
 
 def _ensure_hq_or_admin(current_user: User) -> None:
@@ -104,6 +114,7 @@ def _compute_month_display(month_key: Optional[str]) -> str:
 
 @router.get("/batches", response_model=HQViewResponse)
 def get_hq_batches(
+    request: Request,
     office: Optional[str] = None,
     month: Optional[str] = None,
     current_user: User = Depends(get_current_user),
@@ -115,6 +126,9 @@ def get_hq_batches(
     Query params:
         office: Optional filter by business_location
         month: Optional filter by YYYYMM month key
+
+    The response carries an ETag derived from the draft change version and
+    config version; a matching If-None-Match returns 304 without loading drafts.
     """
     _ensure_hq_or_admin(current_user)
     
@@ -127,9 +141,28 @@ def get_hq_batches(
         canonical_office_filter or office,
         month,
     )
-    
+
+    repo = _get_draft_repository()
+    etag = make_etag(
+        "/api/hq-view/batches",
+        canonical_office_filter,
+        month,
+        repo.get_change_version(),
+        config_service.get_version(),
+    )
+    return conditional_json_response(
+        request,
+        etag,
+        lambda: _build_hq_batches(repo, canonical_office_filter, month).model_dump_json().encode("utf-8"),
+    )
+
+
+def _build_hq_batches(
+    repo: DraftRepository,
+    canonical_office_filter: Optional[str],
+    month: Optional[str],
+) -> HQViewResponse:
     # Fetch all SENT drafts
-    repo = DraftRepository()
     from app.models.draft import DraftStatus
     drafts_list = repo.list_all(status=DraftStatus.SENT, include_image_data=False, limit=None)
     
@@ -3,32 +3,28 @@ import threading
 import logging
 import json
 from fastapi import APIRouter, UploadFile, File, HTTPException, Form, Request, BackgroundTasks, Body, Query
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import JSONResponse, FileResponse
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Callable
 import os
 import uuid
 from pathlib import Path
 import base64
-from PIL import Image
-import io
 
 # Security: Maximum file upload size (10 MB)
 MAX_UPLOAD_SIZE_BYTES = 10 * 1024 * 1024  # 10 MB
 MAX_UPLOAD_SIZE_MB = 10
 
-from app.utils.image_processing import optimize_image_for_ocr
+from app.utils.image_processing import image_extension, prepare_image_for_ocr, read_image_header
+from app.utils.uploads import UploadTooLargeError, receive_upload, save_spooled_upload
 from app.utils.logging_utils import log_ocr_event, log_batch_event
-from app.pipeline.multi_receipt_pipeline import MultiReceiptPipeline
-
-from app.extractors.enhanced_field_extractor import EnhancedFieldExtractor
-from app.ocr.multi_engine_ocr import MultiEngineOCR
-from app.exporters.excel_exporter import ExcelExporter
-from app.history.submission_history import SubmissionHistory
+from app.mobile.analysis_jobs import (
+    ANALYSIS_JOB_WORKERS,
+    AnalysisJob,
+    AnalysisJobWorkerPool,
+    get_analysis_job_store,
+)
 from app.models.schema import ExtractionConfig
-from app.services.receipt_builder import ReceiptBuilder
-from app.services.validation_service import ValidationService
-from accumulator import ACCUM_DIR, test_template_system, get_staff_for_location, validate_staff_member, append_to_month_sheet
-from template_formatter import append_to_formatted_template
 from validators import (
     get_available_locations,
     normalize_location,
@@ -37,18 +33,19 @@ from validators import (
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
-_locations_cache: Dict[str, Any] = get_available_locations()
+_locations_cache: Optional[Dict[str, Any]] = None
 _ocr_max_concurrent = max(1, int(os.getenv("OCR_MAX_CONCURRENT", "2")))
 _ocr_concurrency_guard = threading.Semaphore(_ocr_max_concurrent)
 DEMO_AUTOSAVE_SAMPLE = os.getenv("DEMO_AUTOSAVE_SAMPLE", "true").lower() == "true"
 DEMO_SAMPLE_PATH = Path(__file__).resolve().parents[2] / "artifacts" / "sample_receipt.json"
 ARTIFACTS_DIR = Path(__file__).resolve().parents[2] / "artifacts"
+_JOB_STATE_TO_STATUS = {"queued": "queued", "running": "processing", "completed": "completed", "failed": "failed"}
 
 
 def _build_demo_sample_payload(data: Dict[str, Any]) -> Dict[str, Any]:
     """Project analysis data to the ExtractionResult-compatible keys used by the Excel demo.
 
-    We intentionally drop large blobs (source_image, thumbnail) and keep only the fields
+    We intentionally drop the image fields (source_image_url, thumbnail) and keep only the fields
     required by scripts/demo_hq_export.py to instantiate ExtractionResult.
     """
 
@@ -156,86 +153,179 @@ async def test_upload(file: UploadFile = File(...)):
     except Exception as e:
         return {"error": str(e)}
 
-# Initialize components with error handling
-try:
-    # Initialize multi-engine OCR
-    multi_engine_ocr = MultiEngineOCR()
-    print("Multi-engine OCR initialized")
-except Exception as e:
-    print(f"Multi-engine OCR initialization failed: {e}")
-    logger.exception("Multi-engine OCR initialization failed")
-    multi_engine_ocr = None
-
-try:
-    # Initialize enhanced field extractor
-    enhanced_extractor = EnhancedFieldExtractor()
-    print("Enhanced field extractor initialized")
-except Exception as e:
-    print(f"Enhanced extractor initialization failed: {e}")
-    logger.exception("Enhanced extractor initialization failed")
-    enhanced_extractor = None
-
-try:
-    excel_exporter = ExcelExporter()
-    print("ExcelExporter initialized")
-except Exception as e:
-    print(f"ExcelExporter initialization failed: {e}")
-    logger.exception("ExcelExporter initialization failed")
-    excel_exporter = None
-
-try:
-    submission_history = SubmissionHistory()
-    print("SubmissionHistory initialized")
-except Exception as e:
-    print(f"SubmissionHistory initialization failed: {e}")
-    logger.exception("SubmissionHistory initialization failed")
-    submission_history = None
-
-try:
-    receipt_builder = ReceiptBuilder()
-    print("ReceiptBuilder initialized")
-except Exception as e:
-    print(f"ReceiptBuilder initialization failed: {e}")
-    logger.exception("ReceiptBuilder initialization failed")
-    receipt_builder = None
-
-try:
-    validation_service = ValidationService()
-    print("ValidationService initialized")
-except Exception as e:
-    print(f"ValidationService initialization failed: {e}")
-    logger.exception("ValidationService initialization failed")
-    validation_service = None
-
-def _process_analysis_job(queue_id: str, image_bytes: bytes, metadata: Optional[str], payload_hash: Optional[str],
-                          source_image_b64: str, thumbnail_b64: Optional[str], preprocess_stats: Dict[str, Any],
-                          engine_preference: str, source_filename: str, image_format: str = 'jpg'):
+# Heavy components (OCR SDKs, openpyxl/pandas exporters, extractors) are built
+# on first use, or by warm_up_components() after the server is accepting traffic.
+_components: Dict[str, Any] = {}
+_component_locks: Dict[str, threading.Lock] = {}
+_component_locks_guard = threading.Lock()
+
+
+def _lazy_component(name: str, factory: Callable[[], Any]) -> Any:
+    """Build a shared component once; a failed build is remembered as None."""
     try:
-        submission_history.mark_analysis_processing(queue_id)
-        analysis_data, timings = _run_analysis_pipeline(
-            queue_id,
-            image_bytes,
-            metadata,
-            payload_hash,
-            source_image_b64,
-            thumbnail_b64,
-            preprocess_stats,
-            engine_preference,
-            source_filename,
-            image_format  # Pass format through
-        )
-        submission_history.store_analysis(queue_id, analysis_data, metadata, payload_hash, timings)
-    except Exception as exc:
-        logger.exception("Background analysis job failed", extra={"queue_id": queue_id})
-        submission_history.mark_analysis_failed(queue_id, str(exc))
+        return _components[name]
+    except KeyError:
+        pass
+    with _component_locks_guard:
+        lock = _component_locks.setdefault(name, threading.Lock())
+    with lock:
+        if name not in _components:
+            started = time.perf_counter()
+            try:
+                _components[name] = factory()
+                logger.info("%s initialized in %.0fms", name, (time.perf_counter() - started) * 1000)
+            except Exception:
+                logger.exception("%s initialization failed", name)
+                _components[name] = None
+        return _components[name]
+
+
+def _build_enhanced_extractor():
+    from app.extractors.enhanced_field_extractor import EnhancedFieldExtractor
+    return EnhancedFieldExtractor()
+
+
+def _build_excel_exporter():
+    from app.exporters.excel_exporter import ExcelExporter
+    return ExcelExporter()
+
+
+def _build_submission_history():
+    from app.history.submission_history import SubmissionHistory
+    return SubmissionHistory()
+
+
+def _build_receipt_builder():
+    from app.services.receipt_builder import ReceiptBuilder
+    return ReceiptBuilder()
+
+
+def _build_validation_service():
+    from app.services.validation_service import ValidationService
+    return ValidationService()
+
+
+def get_multi_engine_ocr():
+    """Shared multi-engine OCR (one per process)."""
+    def build():
+        from app.ocr.multi_engine_ocr import get_ocr_engine
+        return get_ocr_engine()
+    return _lazy_component("multi_engine_ocr", build)
+
+
+def get_enhanced_extractor():
+    return _lazy_component("enhanced_extractor", _build_enhanced_extractor)
+
+
+def get_excel_exporter():
+    return _lazy_component("excel_exporter", _build_excel_exporter)
+
+
+def get_submission_history():
+    return _lazy_component("submission_history", _build_submission_history)
+
+
+def get_receipt_builder():
+    return _lazy_component("receipt_builder", _build_receipt_builder)
+
+
+def get_validation_service():
+    return _lazy_component("validation_service", _build_validation_service)
+
+
+def _components_ready(*getters: Callable[[], Any]) -> bool:
+    """Build (if needed) the given components; False if any is unavailable.
+
+    The first call can take seconds (OCR SDKs), so async routes run this
+    via run_in_threadpool instead of on the event loop.
+    """
+    return all(getter() is not None for getter in getters)
+
+
+_ANALYSIS_COMPONENTS = (
+    get_multi_engine_ocr,
+    get_enhanced_extractor,
+    get_submission_history,
+    get_receipt_builder,
+    get_validation_service,
+)
+
+
+def warm_up_components() -> Dict[str, bool]:
+    """Build every lazy component now; returns which ones are available."""
+    getters = {
+        "submission_history": get_submission_history,
+        "receipt_builder": get_receipt_builder,
+        "validation_service": get_validation_service,
+        "multi_engine_ocr": get_multi_engine_ocr,
+        "enhanced_extractor": get_enhanced_extractor,
+        "excel_exporter": get_excel_exporter,
+    }
+    status = {name: getter() is not None for name, getter in getters.items()}
+    _refresh_locations_cache()
+    return status
+
+
+def _run_analysis_job(job: AnalysisJob, report_stage: Callable[[str], None]):
+    """Job-store handler for async /mobile/analyze uploads."""
+    payload = job.payload
+    queue_id = job.job_id
+    blobs = payload.get('blobs', {})
+    image_bytes = Path(blobs['optimized']).read_bytes()
+
+    get_submission_history().mark_analysis_processing(queue_id)
+    analysis_data, timings = _run_analysis_pipeline(
+        queue_id,
+        image_bytes,
+        payload.get('metadata'),
+        payload.get('payload_hash'),
+        payload.get('source_image_url'),
+        payload.get('thumbnail'),
+        payload.get('preprocess') or {},
+        payload.get('engine_preference', 'auto'),
+        payload.get('source_filename', 'uploaded_receipt'),
+        payload.get('image_format', 'jpg'),
+        on_stage=report_stage,
+    )
+    timings['attempts'] = job.attempts
+    get_submission_history().store_analysis(queue_id, analysis_data, payload.get('metadata'), payload.get('payload_hash'), timings)
+    return analysis_data, timings
+
+
+def _on_analysis_job_failed(job: AnalysisJob, error: str) -> None:
+    logger.error("Background analysis job failed", extra={"queue_id": job.job_id, "attempts": job.attempts})
+    get_submission_history().mark_analysis_failed(job.job_id, error)
+
+
+_analysis_worker_pool: Optional[AnalysisJobWorkerPool] = None
+_analysis_worker_pool_lock = threading.Lock()
+
+
+def get_analysis_worker_pool(workers: Optional[int] = None) -> AnalysisJobWorkerPool:
+    """Get or create this process's analysis job worker pool."""
+    global _analysis_worker_pool
+    with _analysis_worker_pool_lock:
+        if _analysis_worker_pool is None:
+            _analysis_worker_pool = AnalysisJobWorkerPool(
+                get_analysis_job_store(),
+                _run_analysis_job,
+                workers=ANALYSIS_JOB_WORKERS if workers is None else workers,
+                on_failure=_on_analysis_job_failed,
+            )
+        return _analysis_worker_pool
 
 
 def _run_analysis_pipeline(queue_id: str, image_bytes: bytes, metadata: Optional[str], payload_hash: Optional[str],
-                           source_image_b64: str, thumbnail_b64: Optional[str], preprocess_stats: Dict[str, Any],
-                           engine_preference: str, source_filename: str, image_format: str = 'jpg'):
-    if receipt_builder is None or validation_service is None:
+                           source_image_url: Optional[str], thumbnail_b64: Optional[str], preprocess_stats: Dict[str, Any],
+                           engine_preference: str, source_filename: str, image_format: str = 'jpg',
+                           on_stage: Optional[Callable[[str], None]] = None):
+    if get_receipt_builder() is None or get_validation_service() is None:
         raise RuntimeError("Receipt builder not available")
 
+    def report_stage(stage: str) -> None:
+        if on_stage is not None:
+            on_stage(stage)
+
     timings: Dict[str, Any] = {'preprocess': preprocess_stats}
 
     wait_start = time.perf_counter()
@@ -243,9 +333,10 @@ def _run_analysis_pipeline(queue_id: str, image_bytes: bytes, metadata: Optional
     timings['queue_wait'] = round(time.perf_counter() - wait_start, 3)
 
     try:
+        report_stage('ocr')
         stage_start = time.perf_counter()
         try:
-            ocr_result = multi_engine_ocr.extract_structured(image_bytes, engine=engine_preference)
+            ocr_result = get_multi_engine_ocr().extract_structured(image_bytes, engine=engine_preference)
         except Exception as exc:
             log_ocr_event({
                 "file": source_filename,
@@ -288,8 +379,9 @@ def _run_analysis_pipeline(queue_id: str, image_bytes: bytes, metadata: Optional
         engine_used = ocr_result.get('engine_used', 'unknown')
         structured_data = ocr_result.get('structured_data', {})
 
+        report_stage('extraction')
         stage_start = time.perf_counter()
-        extracted_data = enhanced_extractor.extract_fields_with_document_ai(
+        extracted_data = get_enhanced_extractor().extract_fields_with_document_ai(
             structured_data=structured_data,
             raw_text=raw_text
         )
@@ -311,7 +403,7 @@ def _run_analysis_pipeline(queue_id: str, image_bytes: bytes, metadata: Optional
             "fields_confidence": extracted_data.get('field_confidence') or extracted_data.get('fields_confidence') or structured_data.get('fields_confidence'),
         }
 
-        standard_result = receipt_builder.build_from_standard_ocr(
+        standard_result = get_receipt_builder().build_from_standard_ocr(
             builder_payload,
             raw_text=raw_text,
             processing_time_ms=None,
@@ -323,7 +415,7 @@ def _run_analysis_pipeline(queue_id: str, image_bytes: bytes, metadata: Optional
             or structured_data.get('docai_raw_fields')
             or ocr_result.get('confidence_docai') is not None
         )
-        docai_result = receipt_builder.build_from_document_ai(
+        docai_result = get_receipt_builder().build_from_document_ai(
             builder_payload,
             raw_text=raw_text,
             processing_time_ms=None,
@@ -335,11 +427,12 @@ def _run_analysis_pipeline(queue_id: str, image_bytes: bytes, metadata: Optional
         elif engine_preference == 'standard':
             canonical_result = standard_result
         elif docai_result:
-            canonical_result = receipt_builder.build_auto(standard_result, docai_result, metadata=None)
+            canonical_result = get_receipt_builder().build_auto(standard_result, docai_result, metadata=None)
         else:
             canonical_result = standard_result
 
-        validated_result = validation_service.validate(
+        report_stage('validation')
+        validated_result = get_validation_service().validate(
             canonical_result,
             ExtractionConfig()
         )
@@ -362,7 +455,7 @@ def _run_analysis_pipeline(queue_id: str, image_bytes: bytes, metadata: Optional
             if passthrough_key in extracted_data and passthrough_key not in analysis_result:
                 analysis_result[passthrough_key] = extracted_data[passthrough_key]
 
-        analysis_result['source_image'] = source_image_b64
+        analysis_result['source_image_url'] = source_image_url
         analysis_result['thumbnail'] = thumbnail_b64
         analysis_result.setdefault('diagnostics', {})
         analysis_result['diagnostics'].update({
@@ -389,106 +482,80 @@ async def analyze_receipt(
 ):
     """Analyze a receipt image and extract structured data using Document AI + enhanced extraction."""
     try:
-        if multi_engine_ocr is None or enhanced_extractor is None or submission_history is None or receipt_builder is None or validation_service is None:
+        if not await run_in_threadpool(_components_ready, *_ANALYSIS_COMPONENTS):
             raise HTTPException(status_code=500, detail="OCR service not available")
+        history = get_submission_history()
 
         # Generate unique queue ID
         queue_id = str(uuid.uuid4())
 
-        # Read file content - use file.file to access the underlying file
-        file_content = await file.read()
-        
-        # If the content is too small, try accessing the underlying file object
-        if len(file_content) < 100:
-            try:
-                # Reset and read from the underlying file object
-                file.file.seek(0)
-                file_content = file.file.read()
-                print(f"  - Used file.file.read(), size: {len(file_content)} bytes")
-            except Exception as e:
-                print(f"  - file.file.read() failed: {e}")
-        
-        # Debug file information
-        print(f"File upload debug:")
-        print(f"  - Filename: {file.filename}")
-        print(f"  - Content type: {file.content_type}")
-        print(f"  - File size: {len(file_content)} bytes")
-        source_filename = file.filename or 'uploaded_receipt'
-        
-        # Security: Validate file size (max 10 MB)
-        if len(file_content) > MAX_UPLOAD_SIZE_BYTES:
+        # Read the spooled upload once; every later stage shares this buffer
+        try:
+            upload = await receive_upload(file, MAX_UPLOAD_SIZE_BYTES)
+        except UploadTooLargeError as e:
             raise HTTPException(
                 status_code=413,
-                detail=f"File too large. Maximum size is {MAX_UPLOAD_SIZE_MB} MB. Your file: {len(file_content) / (1024*1024):.1f} MB"
+                detail=f"File too large. Maximum size is {MAX_UPLOAD_SIZE_MB} MB. Your file: {e.size / (1024*1024):.1f} MB"
             )
-        
+        file_content = upload.data
+
+        logger.debug("Upload received: filename=%s content_type=%s size=%d sha256=%s",
+                     file.filename, file.content_type, upload.size, upload.sha256)
+        source_filename = file.filename or 'uploaded_receipt'
+
         # Validate file size
         if len(file_content) < 100:  # Less than 100 bytes is likely corrupted
             raise HTTPException(status_code=400, detail=f"File too small ({len(file_content)} bytes). Please upload a valid image file.")
-        
-        # Validate file is a valid image and get info
+
+        # Validate file is a valid image (header only; pixels are decoded once below)
         try:
-            # Open image from file_content
-            image = Image.open(io.BytesIO(file_content))
-            image_format = image.format
-            image_size = image.size
-            print(f"  - Image format: {image_format}")
-            print(f"  - Image size: {image_size}")
-            # Don't call verify() as it corrupts the image data
+            image_format, image_size = read_image_header(file_content)
+            logger.debug("Upload image: format=%s size=%s", image_format, image_size)
         except Exception as e:
             raise HTTPException(status_code=400, detail=f"Invalid image file: {str(e)}")
+        ext = image_extension(image_format)
 
-        # Save image to artifacts/ocr_results for draft display
+        # Save image to artifacts/ocr_results for draft display; responses
+        # link to it instead of embedding the full image as base64
+        source_image_url = None
         try:
             results_dir = ARTIFACTS_DIR / 'ocr_results'
             results_dir.mkdir(parents=True, exist_ok=True)
-            
-            # Determine image extension from format
-            image = Image.open(io.BytesIO(file_content))
-            ext = 'jpg' if image.format in ('JPEG', 'JPG') else (image.format.lower() if image.format else 'png')
-            
-            # Save with queue_id as filename
             image_path = results_dir / f"{queue_id}.{ext}"
-            with open(image_path, 'wb') as f:
-                f.write(file_content)
-            print(f"  - Saved image to: {image_path}")
-            print(f"  - Image format: {ext}")
+            await run_in_threadpool(save_spooled_upload, file, image_path)
+            source_image_url = f"/artifacts/ocr_results/{image_path.name}"
         except Exception as e:
-            print(f"  - Failed to save image file: {e}")
+            logger.warning("Failed to save uploaded image for %s: %s", queue_id, e)
             ext = 'jpg'  # Default fallback
             # Continue anyway - image save is optional for core functionality
 
-        # Encode image as base64 for frontend display
-        source_image_b64 = base64.b64encode(file_content).decode('utf-8')
-
-        # Generate thumbnail for history
-        thumbnail_b64 = None
+        # Single decode (JPEG at reduced DCT scale): OCR payload + history thumbnail
         try:
-            image = Image.open(io.BytesIO(file_content))
-            if image.mode not in ('RGB', 'L'):
-                image = image.convert('RGB')
-            image.thumbnail((200, 200), Image.Resampling.LANCZOS)
-            thumb_buffer = io.BytesIO()
-            image.save(thumb_buffer, format='JPEG', quality=70)
-            thumbnail_b64 = base64.b64encode(thumb_buffer.getvalue()).decode('utf-8')
-        except Exception:
-            pass
-
-        optimized_bytes, preprocess_stats = optimize_image_for_ocr(file_content)
+            prepared = await run_in_threadpool(prepare_image_for_ocr, file_content)
+        except Exception as e:
+            raise HTTPException(status_code=400, detail=f"Invalid image file: {str(e)}")
+        optimized_bytes = prepared.optimized_bytes
+        preprocess_stats = {**prepared.stats, 'upload_sha256': upload.sha256}
         payload_hash = preprocess_stats.get('optimized_hash')
-
-        cached_analysis = submission_history.get_cached_analysis(payload_hash) if payload_hash else None
-        if cached_analysis:
-            cached_analysis['source_image'] = source_image_b64
+        thumbnail_b64 = base64.b64encode(prepared.thumbnail_bytes).decode('utf-8') if prepared.thumbnail_bytes else None
+
+        cached = await run_in_threadpool(history.get_cached_analysis, payload_hash) if payload_hash else None
+        if cached:
+            # Cached entries are read-only views; build a fresh record for this upload
+            cached_analysis = dict(cached)
+            cached_analysis.pop('source_image', None)
+            cached_analysis['source_image_url'] = source_image_url
             cached_analysis['thumbnail'] = thumbnail_b64
-            cached_analysis.setdefault('diagnostics', {})
-            cached_analysis['diagnostics'].update({
+            cached_analysis['diagnostics'] = {
+                **(cached.get('diagnostics') or {}),
                 'queue_id': queue_id,
                 'payload_hash': payload_hash,
                 'cache_hit': True,
                 'image_format': ext  # Store format to avoid 404s
-            })
-            submission_history.store_analysis(queue_id, cached_analysis, metadata, payload_hash, {'cache_hit': True})
+            }
+            await run_in_threadpool(
+                history.store_analysis, queue_id, cached_analysis, metadata, payload_hash, {'cache_hit': True}
+            )
             _write_demo_sample(cached_analysis)
             return {
                 "queue_id": queue_id,
@@ -506,40 +573,48 @@ async def analyze_receipt(
             engine_preference = 'auto'
 
         if processing_mode == 'async':
-            submission_history.create_pending_analysis(queue_id, metadata, payload_hash, preprocess_stats)
-            background_tasks.add_task(
-                _process_analysis_job,
-                queue_id,
-                optimized_bytes,
-                metadata,
-                payload_hash,
-                source_image_b64,
-                thumbnail_b64,
-                preprocess_stats,
-                engine_preference,
-                source_filename,
-                ext  # Pass image format to background task
+            # Durable job: survives worker restarts and runs on any process with job workers
+            await run_in_threadpool(history.create_pending_analysis, queue_id, metadata, payload_hash, preprocess_stats)
+            await run_in_threadpool(
+                lambda: get_analysis_job_store().enqueue(
+                    queue_id,
+                    {
+                        'metadata': metadata,
+                        'payload_hash': payload_hash,
+                        'thumbnail': thumbnail_b64,
+                        'preprocess': preprocess_stats,
+                        'engine_preference': engine_preference,
+                        'source_filename': source_filename,
+                        'source_image_url': source_image_url,
+                        'image_format': ext,
+                    },
+                    blobs={'optimized': optimized_bytes},
+                )
             )
+            pool = get_analysis_worker_pool()
+            pool.start()
+            pool.notify()
             return {
                 "queue_id": queue_id,
                 "status": "queued",
                 "preprocess": preprocess_stats
             }
 
-        submission_history.mark_analysis_processing(queue_id)
-        analysis_data, timings = _run_analysis_pipeline(
+        await run_in_threadpool(history.mark_analysis_processing, queue_id)
+        analysis_data, timings = await run_in_threadpool(
+            _run_analysis_pipeline,
             queue_id,
             optimized_bytes,
             metadata,
             payload_hash,
-            source_image_b64,
+            source_image_url,
             thumbnail_b64,
             preprocess_stats,
             engine_preference,
             source_filename,
             ext  # Pass image format
         )
-        submission_history.store_analysis(queue_id, analysis_data, metadata, payload_hash, timings)
+        await run_in_threadpool(history.store_analysis, queue_id, analysis_data, metadata, payload_hash, timings)
         _write_demo_sample(analysis_data)
 
         return {
@@ -552,6 +627,8 @@ async def analyze_receipt(
             }
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"Analysis error: {str(e)}")
         logger.exception("Analysis failed")
@@ -567,7 +644,7 @@ async def analyze_receipt_batch(
 ):
     """Register a batch of receipts for sequential placeholder processing."""
 
-    if submission_history is None:
+    if not await run_in_threadpool(_components_ready, get_submission_history):
         raise HTTPException(status_code=500, detail="Submission history not available")
 
     if not files:
@@ -594,7 +671,7 @@ async def analyze_receipt_batch(
         filenames.append(safe_name)
         await upload.close()
 
-    submission_history.create_batch(batch_id, filenames, engine_preference)
+    await run_in_threadpool(get_submission_history().create_batch, batch_id, filenames, engine_preference)
     log_batch_event({
         "batch_id": batch_id,
         "engine": engine_preference,
@@ -602,7 +679,9 @@ async def analyze_receipt_batch(
         "status": "created"
     })
 
-    pipeline = MultiReceiptPipeline(engine_preference, submission_history)
+    from app.pipeline.multi_receipt_pipeline import MultiReceiptPipeline
+
+    pipeline = MultiReceiptPipeline(engine_preference, get_submission_history())
     background_tasks.add_task(pipeline.process_batch, batch_id, stored_paths)
 
     return {
@@ -618,7 +697,7 @@ async def submit_receipt(
 ):
     """Submit verified receipt data and generate Excel export."""
     try:
-        if excel_exporter is None or submission_history is None:
+        if not await run_in_threadpool(_components_ready, get_excel_exporter, get_submission_history):
             raise HTTPException(status_code=500, detail="Export service not available")
 
         data = await request.json()
@@ -627,7 +706,7 @@ async def submit_receipt(
         user_data = data.get("user", {})
 
         # Get original analysis
-        analysis = submission_history.get_analysis(queue_id)
+        analysis = await run_in_threadpool(get_submission_history().get_analysis, queue_id)
         if not analysis:
             raise HTTPException(status_code=404, detail="Analysis not found")
 
@@ -635,10 +714,10 @@ async def submit_receipt(
         verified_data = {**analysis, **fields_data}
 
         # Generate Excel export
-        excel_path = excel_exporter.export_to_excel(verified_data, user_data)
+        excel_path = await run_in_threadpool(get_excel_exporter().export_to_excel, verified_data, user_data)
 
         # Store submission
-        submission_history.store_submission(queue_id, verified_data, user_data, excel_path)
+        await run_in_threadpool(get_submission_history().store_submission, queue_id, verified_data, user_data, excel_path)
 
         return {
             "status": "success",
@@ -652,7 +731,26 @@ async def submit_receipt(
 
 @router.get("/mobile/analyze/status/{queue_id}")
 async def get_analysis_status_route(queue_id: str):
-    status_payload = submission_history.get_analysis_status(queue_id)
+    # History/job-store lookups hit SQLite and may build the history store
+    return await run_in_threadpool(_analysis_status_response, queue_id)
+
+
+def _analysis_status_response(queue_id: str) -> Dict[str, Any]:
+    status_payload = get_submission_history().get_analysis_status(queue_id)
+    job = None
+    if not status_payload or status_payload.get('status') not in ('completed', 'failed'):
+        # Async jobs may run in another process; the job table is authoritative for them
+        job = get_analysis_job_store().get(queue_id)
+    if job is not None:
+        status_payload = {
+            **(status_payload or {}),
+            'status': _JOB_STATE_TO_STATUS.get(job.state, job.state),
+            'error': job.error,
+            'timings': job.timings or (status_payload or {}).get('timings'),
+            'metadata': job.payload.get('metadata'),
+            'preprocess': job.payload.get('preprocess'),
+            'analysis_data': job.result,
+        }
     if not status_payload:
         raise HTTPException(status_code=404, detail="Analysis not found")
 
@@ -664,6 +762,9 @@ async def get_analysis_status_route(queue_id: str):
         "metadata": status_payload.get('metadata'),
         "preprocess": status_payload.get('preprocess')
     }
+    if job is not None:
+        response['stage'] = job.stage
+        response['attempts'] = job.attempts
 
     if status_payload.get('status') == 'completed' and status_payload.get('analysis_data'):
         response['fields'] = status_payload['analysis_data']
@@ -675,11 +776,16 @@ async def get_analysis_status_route(queue_id: str):
 
     return response
 
+@router.get("/mobile/analyze/stats")
+async def get_analysis_history_stats():
+    """Memory usage and eviction counters of the submission history store."""
+    return await run_in_threadpool(lambda: get_submission_history().get_stats())
+
 @router.get("/history")
 async def get_history(limit: int = 50):
     """Get submission history."""
     try:
-        history = submission_history.get_recent_submissions(limit)
+        history = await run_in_threadpool(lambda: get_submission_history().get_recent_submissions(limit))
         return history
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch history: {str(e)}")
@@ -698,6 +804,8 @@ async def list_staff(location: str):
     if not canonical:
         raise HTTPException(status_code=400, detail="Unknown business location")
 
+    from accumulator import get_staff_for_location
+
     staff = get_staff_for_location(canonical) or []
     return {
         "success": True,
@@ -712,6 +820,8 @@ async def download_accumulation(location: str):
     canonical = normalize_location(location, cfg)
     if not canonical:
         raise HTTPException(status_code=400, detail="Unknown business location")
+    from accumulator import ACCUM_DIR
+
     filepath = ACCUM_DIR / f"{canonical}_Accumulated.xlsx"
     if not filepath.exists():
         raise HTTPException(status_code=404, detail="Accumulation file not found")
@@ -23,7 +23,8 @@ Date: 2026-02-28
 """
 
 import logging
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi.responses import PlainTextResponse
 from typing import Dict, Any, Optional
 from datetime import datetime
 
@@ -85,7 +86,11 @@ async def get_graph_config() -> Dict[str, Any]:
 
 
 @router.get("/graph-health")
-async def get_graph_health() -> Dict[str, Any]:
+async def get_graph_health(
+    format: Optional[str] = Query(
+        None, description="Set to 'prometheus' for Prometheus text exposition"
+    )
+):
     """
     Get Microsoft Graph API health status.
     
@@ -98,6 +103,8 @@ async def get_graph_health() -> Dict[str, Any]:
         - Lifetime statistics
         
     This endpoint is useful for monitoring dashboards and alerting.
+    With ``?format=prometheus`` the latency histograms, outcome counters and
+    circuit state are returned in Prometheus text format for scraping.
     
     Note (Phase 9 Step 1): Returns "not_configured" status if Graph API
     credentials are missing or placeholder values.
@@ -118,6 +125,13 @@ async def get_graph_health() -> Dict[str, Any]:
             }
         }
     """
+    if format == "prometheus":
+        from app.services.graph_health_monitor import export_prometheus
+        
+        return PlainTextResponse(
+            export_prometheus(), media_type="text/plain; version=0.0.4"
+        )
+    
     # Phase 9 Step 1: Check if Graph API is configured before attempting health check
     try:
         from app.services.graph_auth import is_graph_api_configured
@@ -213,9 +227,11 @@ async def get_graph_status() -> Dict[str, Any]:
     try:
         from app.services.graph_health_monitor import get_health_report, is_circuit_open
         from app.services.request_queue import get_queue_stats, is_queue_healthy
+        from app.services.graph_auth import get_token_metrics
         
         health = get_health_report()
         queue = get_queue_stats()
+        token = get_token_metrics()
         
         # Determine overall status
         overall = "healthy"
@@ -241,6 +257,12 @@ async def get_graph_status() -> Dict[str, Any]:
             # Response times
             "avgResponseMs": health.get("avgResponseMs", 0),
             
+            # Token acquisition
+            "tokenAcquisitions": token["acquisitions"],
+            "tokenAcquireAvgMs": token["avgLatencyMs"],
+            "tokenAcquireMaxMs": token["maxLatencyMs"],
+            "token": token,
+            
             # Lifetime
             "totalRequests": health.get("lifetime", {}).get("totalRequests", 0),
             "totalThrottles": health.get("lifetime", {}).get("totalThrottle", 0)
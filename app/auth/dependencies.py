@@ -15,7 +15,7 @@ from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 
 from app.auth.jwt import verify_access_token
 from app.models.user import User
-from app.repositories.user_repository import UserRepository
+from app.repositories.user_repository import get_user_repository
 
 # HTTP Bearer token security
 security = HTTPBearer()
@@ -53,9 +53,8 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"}
         )
     
-    # Load user from database
-    repo = UserRepository()
-    user = repo.get_user_by_id(token_data.user_id)
+    # Load user (shared repository + TTL cache; invalidated on user writes)
+    user = get_user_repository().get_cached_user_by_id(token_data.user_id)
     
     if not user:
         raise HTTPException(
@@ -102,9 +101,8 @@ async def get_optional_user(
     if not token_data:
         return None
     
-    # Load user from database
-    repo = UserRepository()
-    user = repo.get_user_by_id(token_data.user_id)
+    # Load user (shared repository + TTL cache; invalidated on user writes)
+    user = get_user_repository().get_cached_user_by_id(token_data.user_id)
     
     if not user or not user.is_active:
         return None
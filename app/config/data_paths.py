@@ -0,0 +1,22 @@
+"""Location of the local SQLite databases.
+
+Repositories default to ``app/data`` (users historically live in
+``app/Data``). Setting APP_DATA_DIR moves every default database into that
+directory, e.g. so test runs never touch the working tree.
+"""
+
+import os
+from pathlib import Path
+
+APP_DIR = Path(__file__).resolve().parents[1]
+
+
+def get_data_dir(default_subdir: str = "data") -> Path:
+    """Return (and create) the directory for local databases.
+
+    APP_DATA_DIR is read on every call so it can be set after import.
+    """
+    override = os.environ.get("APP_DATA_DIR")
+    data_dir = Path(override) if override else APP_DIR / default_subdir
+    data_dir.mkdir(parents=True, exist_ok=True)
+    return data_dir
@@ -33,7 +33,7 @@ Date: 2026-02-28
 """
 
 import re
-from typing import Optional
+from typing import Dict, Iterable, List, Optional
 
 
 # =============================================================================
@@ -315,3 +315,33 @@ def get_hq_month_sheet_name(year: int, month: int) -> str:
         Sheet name, e.g., "2026年3月"
     """
     return f"{year}年{month}月"
+
+
+# =============================================================================
+# ALL CONFIGURED LEDGERS
+# =============================================================================
+
+def get_configured_ledger_paths(
+    locations: Iterable[str],
+    staff_by_location: Dict[str, List[Dict[str, str]]],
+) -> List[str]:
+    """
+    Get every ledger path the writers can touch for the configured locations and staff.
+    
+    Args:
+        locations: Canonical location ids
+        staff_by_location: {location: [{"id", "name"}, ...]} as in staff_config.json
+        
+    Returns:
+        Relative paths: HQ ledger, one location ledger per location, one
+        staff ledger per staff member
+    """
+    paths = [get_hq_master_ledger_path()]
+    paths.extend(get_location_file_path(location) for location in locations)
+    for location, staff in staff_by_location.items():
+        paths.extend(
+            get_staff_file_path(entry["name"], location)
+            for entry in staff
+            if entry.get("name")
+        )
+    return paths
@@ -3,7 +3,9 @@
 from __future__ import annotations
 
 import logging
+from contextlib import contextmanager
 from datetime import datetime
+from pathlib import Path
 from typing import Dict, Optional
 
 from app.excel.excel_template_loader import ExcelTemplateLoader
@@ -49,58 +51,28 @@ class BranchLedgerWriter:
             target_path = self.template_loader.ensure_location_workbook(receipt.business_location_id)
             self.logger.info(f"Target workbook path: {target_path}")
             
-            # Try to open workbook; if corrupted, delete and recreate
-            try:
-                wb = self.repository.open(target_path)
-                self.logger.info(f"Successfully opened workbook: {target_path}")
-            except (KeyError, Exception) as open_err:
-                # File is corrupted, delete and recreate from template
-                self.logger.warning(f"Corrupted workbook detected: {open_err}, recreating from template")
+            with self._checkout_location_workbook(receipt.business_location_id, target_path) as (target_path, wb):
+                write_row = self._apply_receipt(wb, receipt)
+                if write_row is None:
+                    self.logger.warning(f"Skipping duplicate invoice: {receipt.invoice_number}")
+                    return {"status": "skipped_duplicate", "location": receipt.business_location_id}
+
+                # Save workbook (deferred to batch end when inside a session batch)
+                self.logger.info(f"Committing workbook {target_path}")
                 try:
-                    target_path.unlink(missing_ok=True)
-                    self.logger.info(f"Deleted corrupted workbook: {target_path}")
-                except Exception as del_err:
-                    self.logger.error(f"Failed to delete corrupted workbook: {del_err}")
-                target_path = self.template_loader.ensure_location_workbook(receipt.business_location_id)
-                self.logger.info(f"Recreated workbook at: {target_path}")
-                wb = self.repository.open(target_path)
-
-            sheet_name = self._month_sheet_name(receipt.receipt_date)
-            alternate_sheet_names = self._month_sheet_aliases(receipt.receipt_date)
-            
-            self.logger.info(f"Receipt date: {receipt.receipt_date}, target sheet: {repr(sheet_name)}")
-            
-            # Use accumulator-style sheet resolution: duplicate from existing sheet if needed
-            ws = self._get_or_create_month_sheet(wb, sheet_name, alternate_sheet_names)
-            
-            self.logger.info(f"Using sheet '{ws.title}' for {sheet_name}")
-
-            if self._is_duplicate(ws, receipt.invoice_number):
-                self.logger.warning(f"Skipping duplicate invoice: {receipt.invoice_number}")
-                wb.close()
-                return {"status": "skipped_duplicate", "location": receipt.business_location_id}
-
-            # Find the next empty row to write to (NO ROW INSERTION)
-            write_row = self._find_next_empty_row(ws)
+                    self.repository.commit(
+                        target_path, is_staff=False, replay=lambda wb: self._apply_receipt(wb, receipt)
+                    )
+                except PermissionError as pe:
+                    self.logger.error(f"Permission denied saving {target_path} - file may be open in Excel")
+                    raise ValueError(f"Cannot save {target_path.name} - please close it in Excel") from pe
             
-            self.logger.info(f"Writing to row {write_row} (no row insertion)")
-            
-            # Write data directly to the empty row - DO NOT INSERT ROWS
-            # The template already has empty rows with formulas in place
-            self._write_row(ws, write_row, receipt)
-            
-            self.logger.info(f"Wrote receipt to row {write_row} in sheet '{ws.title}'")
-
-            # Save workbook
-            self.logger.info(f"Saving workbook to {target_path}")
-            try:
-                self.repository.save(wb, target_path, is_staff=False)
-                self.logger.info(f"Successfully saved workbook")
-            except PermissionError as pe:
-                self.logger.error(f"Permission denied saving {target_path} - file may be open in Excel")
-                raise ValueError(f"Cannot save {target_path.name} - please close it in Excel") from pe
-            
-            return {"status": "written", "location": receipt.business_location_id, "row": write_row}
+            return {
+                "status": "written",
+                "location": receipt.business_location_id,
+                "row": write_row,
+                "workbook": str(target_path),
+            }
         except ValueError as ve:
             # Re-raise validation errors
             error_msg = f"Validation error in location writer: {ve}"
@@ -110,15 +82,62 @@ class BranchLedgerWriter:
             error_msg = f"Failed to write receipt to location: {str(exc)}"
             self.logger.exception(error_msg, extra={"location": receipt.business_location_id})
             return {"status": "error", "error": error_msg, "location": receipt.business_location_id}
-        finally:
-            try:
-                wb.close()  # type: ignore
-            except Exception:
-                pass
 
     # -----------------
     # Internals
     # -----------------
+    @contextmanager
+    def _checkout_location_workbook(self, location_id: str, target_path: Path):
+        """Check out the location workbook; if corrupted, delete and recreate it."""
+        opened = False
+        try:
+            with self.repository.checkout(target_path) as wb:
+                opened = True
+                self.logger.info(f"Successfully opened workbook: {target_path}")
+                yield target_path, wb
+        except Exception as open_err:
+            if opened:
+                raise
+            # File is corrupted, delete and recreate from template
+            self.logger.warning(f"Corrupted workbook detected: {open_err}, recreating from template")
+            try:
+                target_path.unlink(missing_ok=True)
+                self.repository.discard(target_path)
+                self.logger.info(f"Deleted corrupted workbook: {target_path}")
+            except Exception as del_err:
+                self.logger.error(f"Failed to delete corrupted workbook: {del_err}")
+            target_path = self.template_loader.ensure_location_workbook(location_id)
+            self.logger.info(f"Recreated workbook at: {target_path}")
+            with self.repository.checkout(target_path) as wb:
+                yield target_path, wb
+
+    def _apply_receipt(self, wb, receipt: Receipt) -> Optional[int]:
+        """Write the receipt's row into ``wb``; returns the row, or None for a duplicate."""
+        sheet_name = self._month_sheet_name(receipt.receipt_date)
+        alternate_sheet_names = self._month_sheet_aliases(receipt.receipt_date)
+
+        self.logger.info(f"Receipt date: {receipt.receipt_date}, target sheet: {repr(sheet_name)}")
+
+        # Use accumulator-style sheet resolution: duplicate from existing sheet if needed
+        ws = self._get_or_create_month_sheet(wb, sheet_name, alternate_sheet_names)
+
+        self.logger.info(f"Using sheet '{ws.title}' for {sheet_name}")
+
+        if self._is_duplicate(ws, receipt.invoice_number):
+            return None
+
+        # Find the next empty row to write to (NO ROW INSERTION)
+        write_row = self._find_next_empty_row(ws)
+
+        self.logger.info(f"Writing to row {write_row} (no row insertion)")
+
+        # Write data directly to the empty row - DO NOT INSERT ROWS
+        # The template already has empty rows with formulas in place
+        self._write_row(ws, write_row, receipt)
+
+        self.logger.info(f"Wrote receipt to row {write_row} in sheet '{ws.title}'")
+        return write_row
+
     def _month_sheet_name(self, receipt_date: Optional[str]) -> str:
         if not receipt_date:
             raise ValueError("receipt_date is required for month resolution")
@@ -1,20 +1,29 @@
-"""Excel repository for safe open/save with artifact mirroring (Phase 3A)."""
+"""Excel repository for safe open/save with artifact mirroring (Phase 3A).
+
+Ledger writers go through the workbook session cache (checkout/commit) so a
+batch touching one workbook parses and saves it once.
+"""
 
 from __future__ import annotations
 
 import logging
+import os
 import shutil
 import warnings
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional
 
 from openpyxl import load_workbook
 
+from app.excel.workbook_session import WorkbookSession, atomic_save_workbook, get_workbook_session
+
 
 class ExcelRepository:
     """Thin persistence layer: open/save and optional artifact copy."""
 
-    def __init__(self) -> None:
+    def __init__(self, *, session: Optional[WorkbookSession] = None) -> None:
+        self.session = session or get_workbook_session()
         base_dir = Path(__file__).resolve().parents[2]
         self.artifacts_locations = base_dir / "artifacts" / "accumulation" / "locations"
         self.artifacts_staff = base_dir / "artifacts" / "accumulation" / "staff"
@@ -31,17 +40,64 @@ class ExcelRepository:
             return load_workbook(path, read_only=read_only)
 
     def save(self, workbook, dest_path: Path, *, is_staff: bool = False) -> None:
-        dest_path.parent.mkdir(parents=True, exist_ok=True)
-        workbook.save(dest_path)
+        atomic_save_workbook(workbook, dest_path)
         self._copy_artifact(dest_path, is_staff=is_staff)
 
+    @contextmanager
+    def checkout(self, path: Path) -> Iterator[object]:
+        """Yield the session-cached workbook for ``path`` under its write lock.
+
+        If the body raises, its partial edits are rolled back: the cached
+        workbook is reloaded from disk and the batch's earlier unsaved
+        edits are replayed onto it (see ``commit``).
+        """
+        with self.session.lock(path):
+            wb = self.session.open(path, loader=self.open)
+            try:
+                yield wb
+            except BaseException:
+                self.session.rollback(path, loader=self.open)
+                raise
+
+    def commit(self, path: Path, *, is_staff: bool = False, replay=None) -> None:
+        """Mark a checked-out workbook dirty; it is saved (and mirrored to
+        artifacts) immediately, at batch end, or after the debounce delay.
+
+        ``replay(wb)`` must redo this edit on a reloaded workbook; it is used
+        when a later write to the same workbook fails before the flush.
+        """
+        self.session.mark_dirty(
+            path,
+            after_save=lambda p: self._copy_artifact(p, is_staff=is_staff),
+            replay=replay,
+        )
+
+    def discard(self, path: Path) -> None:
+        """Forget any cached copy of ``path`` (e.g. after deleting it)."""
+        self.session.invalidate(path, force=True)
+
     # -----------------
     # Helpers
     # -----------------
     def _copy_artifact(self, src: Path, *, is_staff: bool) -> None:
+        """Mirror ``src`` into artifacts.
+
+        Saves replace the ledger with a new file (temp + rename), so the
+        artifact can be a hard link to the just-saved file instead of a full
+        copy; later saves never modify it in place. Falls back to copying
+        where links are unsupported (e.g. across devices).
+        """
         try:
             target_dir = self.artifacts_staff if is_staff else self.artifacts_locations
             target_dir.mkdir(parents=True, exist_ok=True)
-            shutil.copy2(src, target_dir / src.name)
+            dest = target_dir / src.name
+            tmp = target_dir / f".{src.name}.link"
+            try:
+                tmp.unlink(missing_ok=True)
+                os.link(src, tmp)
+                os.replace(tmp, dest)
+            except OSError:
+                tmp.unlink(missing_ok=True)
+                shutil.copy2(src, dest)
         except Exception as exc:  # best-effort only
             self.logger.warning("Artifact copy failed", extra={"src": str(src), "error": str(exc)})
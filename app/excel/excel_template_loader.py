@@ -1,17 +1,63 @@
-"""Excel template loader for Phase 3A (infrastructure only)."""
+"""Excel template loader for Phase 3A (infrastructure only).
+
+Month sheets are created from a precompiled image of the template sheet
+(values, shared style IDs, merges, dimensions, page and print setup) that
+is built once per template file and stamped into target worksheets in bulk.
+"""
 
 from __future__ import annotations
 
 import shutil
+import threading
 import warnings
+from copy import copy
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional
+from typing import Any, Callable, Dict, Optional, Tuple
 
 from openpyxl import load_workbook
-from openpyxl.cell.cell import MergedCell
+from openpyxl.cell.cell import Cell, MergedCell
+from openpyxl.styles.cell_style import StyleArray
+from openpyxl.styles.numbers import BUILTIN_FORMATS_MAX_SIZE, BUILTIN_FORMATS_REVERSE
 from openpyxl.worksheet.worksheet import Worksheet
 
 
+@dataclass(frozen=True)
+class TemplateSheetImage:
+    """Workbook-independent snapshot of a template sheet.
+
+    ``styles`` holds each distinct cell style once as
+    (font, fill, border, alignment, protection, number_format, quote_prefix,
+    pivot_button); ``cells`` reference them by index (-1 = default style).
+    ``merged_styles`` keeps the borders etc. of covered cells in merges.
+    ``page_setup`` through ``sheet_properties`` are private copies of the
+    template's sheet-level objects (what copy_worksheet carries over); print
+    titles and area are kept as ranges without the template's sheet name.
+    """
+
+    title: str
+    cells: Tuple[Tuple[int, int, object, int], ...]
+    merged_styles: Tuple[Tuple[int, int, int], ...]
+    styles: Tuple[tuple, ...]
+    merges: Tuple[str, ...]
+    column_widths: Tuple[Tuple[str, float], ...]
+    row_heights: Tuple[Tuple[int, float], ...]
+    page_setup: Any
+    print_options: Any
+    page_margins: Any
+    sheet_format: Any
+    sheet_properties: Any
+    print_title_rows: Optional[str]
+    print_title_cols: Optional[str]
+    print_area: Tuple[str, ...]
+
+
+# Compiled template images keyed by (template path, sheet loader); each entry
+# remembers the template mtime it was built from.
+_sheet_image_cache: Dict[Tuple[str, str], Tuple[int, TemplateSheetImage]] = {}
+_sheet_image_lock = threading.Lock()
+
+
 class ExcelTemplateLoader:
     """Load base templates and materialize destination workbooks safely.
 
@@ -52,9 +98,7 @@ class ExcelTemplateLoader:
         (<staff_id>.xlsx) exists, copy it to the canonical name to preserve data.
         """
 
-        safe_staff = self._safe_filename(staff_name or staff_id or "staff")
-        safe_loc = self._safe_filename(location_id or "loc")
-        dest = self.staff_dir / f"{safe_staff}_{safe_loc}.xlsx"
+        dest = self.staff_workbook_path(staff_name, location_id, staff_id=staff_id)
 
         legacy = None
         if staff_id:
@@ -68,6 +112,12 @@ class ExcelTemplateLoader:
                 self._copy_base(self.format01_template, dest)
         return dest
 
+    def staff_workbook_path(self, staff_name: str, location_id: str, *, staff_id: Optional[str] = None) -> Path:
+        """Canonical per-staff workbook path, without creating it."""
+        safe_staff = self._safe_filename(staff_name or staff_id or "staff")
+        safe_loc = self._safe_filename(location_id or "loc")
+        return self.staff_dir / f"{safe_staff}_{safe_loc}.xlsx"
+
     def ensure_format02_month_sheet(self, workbook, target_sheet: str) -> Worksheet:
         """Create a new month sheet ONLY from the canonical clean template.
 
@@ -79,12 +129,25 @@ class ExcelTemplateLoader:
         if target_sheet in workbook.sheetnames:
             raise ValueError(f"Sheet '{target_sheet}' already exists; will not duplicate.")
 
-        template_wb, template_sheet = self._load_format02_template_sheet()
+        image = self._sheet_image(self.format02_template, self._load_format02_template_sheet)
         new_ws = workbook.create_sheet(title=target_sheet)
-        self._copy_sheet(template_sheet, new_ws)
-        template_wb.close()
+        self._stamp_sheet(image, new_ws)
         return new_ws
     
+    def ensure_format01_month_sheet(self, workbook, target_sheet: str) -> Worksheet:
+        """Create a staff month sheet from the Format① template's 原本 sheet.
+
+        Stamps the compiled template image, like Format②, instead of copying
+        the workbook's own 原本 sheet cell by cell.
+        """
+        if target_sheet in workbook.sheetnames:
+            raise ValueError(f"Sheet '{target_sheet}' already exists; will not duplicate.")
+
+        image = self._sheet_image(self.format01_template, self._load_format01_template_sheet)
+        new_ws = workbook.create_sheet(title=target_sheet)
+        self._stamp_sheet(image, new_ws)
+        return new_ws
+
     def create_month_sheet_from_template(self, workbook, target_sheet: str) -> Worksheet:
         """Create a clean month sheet from external template file.
         
@@ -94,17 +157,14 @@ class ExcelTemplateLoader:
         if target_sheet in workbook.sheetnames:
             raise ValueError(f"Sheet '{target_sheet}' already exists")
         
-        # Load external template
-        template_wb, template_sheet = self._load_format02_template_sheet()
+        # Compiled external template (parsed once per template file)
+        image = self._sheet_image(self.format02_template, self._load_format02_template_sheet)
         
         # Create new sheet in target workbook
         new_ws = workbook.create_sheet(title=target_sheet)
         
-        # Copy structure from template
-        self._copy_sheet(template_sheet, new_ws)
-        
-        # Close template workbook
-        template_wb.close()
+        # Stamp structure from template
+        self._stamp_sheet(image, new_ws)
         
         return new_ws
 
@@ -135,7 +195,147 @@ class ExcelTemplateLoader:
         # Last resort: active sheet
         return wb, wb.active
 
+    def _load_format01_template_sheet(self):
+        with warnings.catch_warnings():
+            warnings.filterwarnings("ignore", message=".*invalid dependency definitions.*")
+            wb = load_workbook(self.format01_template)
+        
+        # Staff ledgers clone the "原本" (master) sheet for each month
+        if "原本" in wb.sheetnames:
+            return wb, wb["原本"]
+        return wb, wb[wb.sheetnames[0]]
+
+    def _sheet_image(self, template_path: Path, sheet_loader: Callable) -> TemplateSheetImage:
+        """Return the compiled image of a template sheet, rebuilding if the file changed."""
+        key = (str(template_path), sheet_loader.__name__)
+        mtime = template_path.stat().st_mtime_ns
+        with _sheet_image_lock:
+            cached = _sheet_image_cache.get(key)
+            if cached and cached[0] == mtime:
+                return cached[1]
+            template_wb, template_sheet = sheet_loader()
+            try:
+                image = self._compile_sheet(template_sheet)
+            finally:
+                template_wb.close()
+            _sheet_image_cache[key] = (mtime, image)
+            return image
+
+    @staticmethod
+    def _compile_sheet(source: Worksheet) -> TemplateSheetImage:
+        """Flatten a worksheet into values + deduplicated style tuples."""
+        wb = source.parent
+        style_ids: Dict[tuple, int] = {}
+        styles = []
+        cells = []
+        merged_styles = []
+        for row in source.iter_rows():
+            for cell in row:
+                style_id = -1
+                if cell.has_style:
+                    sa = cell._style
+                    spec = (
+                        wb._fonts[sa.fontId],
+                        wb._fills[sa.fillId],
+                        wb._borders[sa.borderId],
+                        wb._alignments[sa.alignmentId],
+                        wb._protections[sa.protectionId],
+                        cell.number_format,
+                        sa.quotePrefix,
+                        sa.pivotButton,
+                    )
+                    style_id = style_ids.get(spec, -1)
+                    if style_id < 0:
+                        style_id = style_ids[spec] = len(styles)
+                        styles.append(spec)
+                if isinstance(cell, MergedCell):
+                    # Placeholders inside merged ranges are recreated by the
+                    # merge itself; only their style needs restoring.
+                    if style_id >= 0:
+                        merged_styles.append((cell.row, cell.column, style_id))
+                    continue
+                if cell.value is None and style_id < 0:
+                    continue
+                cells.append((cell.row, cell.column, cell.value, style_id))
+
+        return TemplateSheetImage(
+            title=source.title,
+            cells=tuple(cells),
+            merged_styles=tuple(merged_styles),
+            styles=tuple(styles),
+            merges=tuple(str(m) for m in source.merged_cells.ranges),
+            column_widths=tuple(
+                (key, dim.width) for key, dim in source.column_dimensions.items()
+            ),
+            row_heights=tuple(
+                (idx, dim.height) for idx, dim in source.row_dimensions.items() if dim.height
+            ),
+            page_setup=copy(source.page_setup),
+            print_options=copy(source.print_options),
+            page_margins=copy(source.page_margins),
+            sheet_format=copy(source.sheet_format),
+            sheet_properties=copy(source.sheet_properties),
+            print_title_rows=source.print_title_rows,
+            print_title_cols=source.print_title_cols,
+            print_area=tuple(str(r) for r in source._print_area.ranges) if source._print_area else (),
+        )
+
+    @staticmethod
+    def _stamp_sheet(image: TemplateSheetImage, target: Worksheet) -> None:
+        """Write a compiled template image into ``target`` in bulk.
+
+        Each distinct template style is registered once in the target
+        workbook's shared style tables; cells then just reference the
+        resulting style IDs.
+        """
+        wb = target.parent
+        arrays = []
+        for font, fill, border, alignment, protection, number_format, quote, pivot in image.styles:
+            sa = StyleArray()
+            sa.fontId = wb._fonts.add(font)
+            sa.fillId = wb._fills.add(fill)
+            sa.borderId = wb._borders.add(border)
+            sa.alignmentId = wb._alignments.add(alignment)
+            sa.protectionId = wb._protections.add(protection)
+            if number_format in BUILTIN_FORMATS_REVERSE:
+                sa.numFmtId = BUILTIN_FORMATS_REVERSE[number_format]
+            else:
+                sa.numFmtId = wb._number_formats.add(number_format) + BUILTIN_FORMATS_MAX_SIZE
+            sa.quotePrefix = quote
+            sa.pivotButton = pivot
+            arrays.append(sa)
+
+        add_cell = target._add_cell
+        for row, col, value, style_id in image.cells:
+            add_cell(Cell(
+                target, row=row, column=col, value=value,
+                style_array=arrays[style_id] if style_id >= 0 else None,
+            ))
+
+        for merged in image.merges:
+            target.merge_cells(merged)
+        for row, col, style_id in image.merged_styles:
+            placeholder = target._cells.get((row, col))
+            if placeholder is not None:
+                placeholder._style = StyleArray(arrays[style_id])
+        for key, width in image.column_widths:
+            target.column_dimensions[key].width = width
+        for idx, height in image.row_heights:
+            target.row_dimensions[idx].height = height
+
+        # Each sheet gets its own copies; the image is shared across workbooks
+        target.page_setup = copy(image.page_setup)
+        target.print_options = copy(image.print_options)
+        target.page_margins = copy(image.page_margins)
+        target.sheet_format = copy(image.sheet_format)
+        target.sheet_properties = copy(image.sheet_properties)
+        target.print_title_rows = image.print_title_rows
+        target.print_title_cols = image.print_title_cols
+        if image.print_area:
+            target.print_area = list(image.print_area)
+
     def _copy_sheet(self, source: Worksheet, target: Worksheet) -> None:
+        """Per-cell copy of a live worksheet (reference for the clone benchmark)."""
         # Copy cell values and styles safely
         for row in source.iter_rows():
             for cell in row:
@@ -0,0 +1,245 @@
+"""Content-addressed, compressed ledger backups.
+
+Each location gets a directory under the backup root holding gzip-compressed
+snapshot objects named by the SHA-256 of the original workbook bytes, plus an
+``index.json`` listing snapshots newest-last:
+
+    backups/<location>/index.json
+    backups/<location>/objects/<sha256>.xlsx.gz
+
+Taking a snapshot streams the workbook once (hash + compress in one pass).
+If the content matches the latest snapshot for that workbook, nothing is
+stored. If the file's mtime/size are unchanged since the last snapshot, the
+file is not even read. Pruning trims the index and removes objects no longer
+referenced, so it never globs or stats the directory.
+
+snapshot_async() pins the workbook's current bytes with a hard link (a copy
+where links are unsupported) before returning, then hashes and compresses
+the pinned file on a single background worker. Saves replace the workbook
+by rename, so the pinned inode keeps the pre-save content and the append
+path never waits on the snapshot.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILE = "index.json"
+OBJECTS_DIR = "objects"
+OBJECT_SUFFIX = ".xlsx.gz"
+CHUNK_SIZE = 1024 * 1024
+
+
+class LedgerBackupStore:
+    """Deduplicated snapshot store for ledger workbooks."""
+
+    def __init__(self, root: Path, *, max_snapshots: int = 3, compress_level: int = 6) -> None:
+        self.root = Path(root)
+        self.max_snapshots = max(1, max_snapshots)
+        self.compress_level = compress_level
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    # -----------------
+    # Public API
+    # -----------------
+    def snapshot(self, file_path: Path, location: str) -> Optional[Path]:
+        """Snapshot ``file_path`` now; returns the object path (None if missing)."""
+        file_path = Path(file_path)
+        try:
+            st = file_path.stat()
+        except FileNotFoundError:
+            return None
+
+        return self._unchanged(file_path, st, location) or self._store(file_path, file_path, st, location)
+
+    def snapshot_async(self, file_path: Path, location: str) -> Future:
+        """Pin ``file_path``'s current bytes and snapshot them in the background.
+
+        The pin is taken before returning, so the caller may replace the
+        file right away; the future resolves to the object path.
+        """
+        file_path = Path(file_path)
+        done: Future = Future()
+        try:
+            st = file_path.stat()
+        except FileNotFoundError:
+            done.set_result(None)
+            return done
+        unchanged = self._unchanged(file_path, st, location)
+        if unchanged is not None:
+            done.set_result(unchanged)
+            return done
+
+        try:
+            pinned = self._pin(file_path, self.root / location)
+        except OSError as exc:
+            logger.warning("Failed to create backup for %s: %s", location, exc)
+            done.set_result(None)
+            return done
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ledger-backup")
+            executor = self._executor
+        # A hard link shares the inode, so its stat is the pinned content's stamp
+        return executor.submit(self._store_logged, file_path, pinned, pinned.stat(), location)
+
+    def list_snapshots(self, location: str, stem: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Snapshots for a location (optionally one workbook), newest first."""
+        with self._lock:
+            index = self._load_index(self.root / location)
+        entries = [e for e in index if stem is None or e["stem"] == stem]
+        return list(reversed(entries))
+
+    def restore(self, location: str, sha256: str, dest_path: Path) -> Path:
+        """Decompress a snapshot to ``dest_path`` (atomically)."""
+        object_path = self.root / location / OBJECTS_DIR / f"{sha256}{OBJECT_SUFFIX}"
+        if not object_path.exists():
+            raise FileNotFoundError(f"Snapshot not found: {location}/{sha256}")
+        dest_path = Path(dest_path)
+        tmp_path = dest_path.with_name(f".{dest_path.name}.{uuid.uuid4().hex[:8]}.tmp")
+        try:
+            with gzip.open(object_path, "rb") as src, open(tmp_path, "wb") as dst:
+                shutil.copyfileobj(src, dst, CHUNK_SIZE)
+            os.replace(tmp_path, dest_path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+        return dest_path
+
+    # -----------------
+    # Helpers
+    # -----------------
+    def _unchanged(self, file_path: Path, st: os.stat_result, location: str) -> Optional[Path]:
+        """Latest object for ``file_path`` if its mtime/size match the last snapshot."""
+        location_dir = self.root / location
+        with self._lock:
+            index = self._load_index(location_dir)
+            latest = self._latest_for(index, file_path.stem)
+            if latest and latest["mtimeNs"] == st.st_mtime_ns and latest["size"] == st.st_size:
+                return location_dir / OBJECTS_DIR / f"{latest['sha256']}{OBJECT_SUFFIX}"
+        return None
+
+    def _pin(self, file_path: Path, location_dir: Path) -> Path:
+        objects_dir = location_dir / OBJECTS_DIR
+        objects_dir.mkdir(parents=True, exist_ok=True)
+        pinned = objects_dir / f".{uuid.uuid4().hex}.pin"
+        try:
+            os.link(file_path, pinned)
+        except OSError:
+            shutil.copy2(file_path, pinned)
+        return pinned
+
+    def _store_logged(self, file_path: Path, source: Path, st: os.stat_result, location: str) -> Optional[Path]:
+        try:
+            return self._store(file_path, source, st, location)
+        except Exception as exc:
+            logger.warning("Failed to create backup for %s: %s", location, exc)
+            return None
+        finally:
+            source.unlink(missing_ok=True)
+
+    def _store(self, file_path: Path, source: Path, st: os.stat_result, location: str) -> Path:
+        """Hash and compress ``source`` and record it as a snapshot of ``file_path``."""
+        location_dir = self.root / location
+        sha, tmp_path = self._hash_and_compress(source, location_dir)
+        object_path = location_dir / OBJECTS_DIR / f"{sha}{OBJECT_SUFFIX}"
+        try:
+            with self._lock:
+                index = self._load_index(location_dir)
+                latest = self._latest_for(index, file_path.stem)
+                if latest and latest["sha256"] == sha:
+                    # Identical content (e.g. touched but unchanged) - refresh stamp only
+                    latest["mtimeNs"] = st.st_mtime_ns
+                    latest["size"] = st.st_size
+                    self._write_index(location_dir, index)
+                    return object_path
+
+                if not object_path.exists():
+                    os.replace(tmp_path, object_path)
+                index.append({
+                    "stem": file_path.stem,
+                    "suffix": file_path.suffix,
+                    "sha256": sha,
+                    "createdAt": datetime.utcnow().isoformat() + "Z",
+                    "mtimeNs": st.st_mtime_ns,
+                    "size": st.st_size,
+                })
+                self._prune(location_dir, index, file_path.stem)
+                self._write_index(location_dir, index)
+                return object_path
+        finally:
+            tmp_path.unlink(missing_ok=True)
+
+    def _hash_and_compress(self, file_path: Path, location_dir: Path):
+        objects_dir = location_dir / OBJECTS_DIR
+        objects_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = objects_dir / f".{uuid.uuid4().hex}.tmp"
+        digest = hashlib.sha256()
+        try:
+            with open(file_path, "rb") as src, gzip.open(
+                tmp_path, "wb", compresslevel=self.compress_level
+            ) as dst:
+                for chunk in iter(lambda: src.read(CHUNK_SIZE), b""):
+                    digest.update(chunk)
+                    dst.write(chunk)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+        return digest.hexdigest(), tmp_path
+
+    @staticmethod
+    def _latest_for(index: List[Dict[str, Any]], stem: str) -> Optional[Dict[str, Any]]:
+        for entry in reversed(index):
+            if entry["stem"] == stem:
+                return entry
+        return None
+
+    def _prune(self, location_dir: Path, index: List[Dict[str, Any]], stem: str) -> None:
+        """Keep the newest max_snapshots entries for ``stem``; drop orphaned objects."""
+        for_stem = [e for e in index if e["stem"] == stem]
+        obsolete = for_stem[:-self.max_snapshots]
+        if not obsolete:
+            return
+        for entry in obsolete:
+            index.remove(entry)
+        still_used = {e["sha256"] for e in index}
+        for entry in obsolete:
+            if entry["sha256"] in still_used:
+                continue
+            obj = location_dir / OBJECTS_DIR / f"{entry['sha256']}{OBJECT_SUFFIX}"
+            try:
+                obj.unlink(missing_ok=True)
+            except OSError:
+                logger.warning("Unable to remove old backup %s", obj)
+
+    @staticmethod
+    def _load_index(location_dir: Path) -> List[Dict[str, Any]]:
+        try:
+            with open(location_dir / INDEX_FILE, "r", encoding="utf-8") as handle:
+                return json.load(handle)
+        except FileNotFoundError:
+            return []
+        except (OSError, ValueError) as exc:
+            logger.warning("Backup index unreadable for %s, starting fresh: %s", location_dir, exc)
+            return []
+
+    @staticmethod
+    def _write_index(location_dir: Path, index: List[Dict[str, Any]]) -> None:
+        location_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = location_dir / f".{INDEX_FILE}.{uuid.uuid4().hex[:8]}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            json.dump(index, handle, ensure_ascii=False, indent=1)
+        os.replace(tmp_path, location_dir / INDEX_FILE)
@@ -4,7 +4,7 @@ from __future__ import annotations
 
 import logging
 from datetime import datetime
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
 
 from app.excel.excel_template_loader import ExcelTemplateLoader
 from app.excel.excel_repository import ExcelRepository
@@ -34,7 +34,6 @@ class StaffLedgerWriter:
         if not receipt.staff_id:
             return {"status": "skipped_missing_staff_id", "reason": "staff_id required", "receipt_id": str(receipt.receipt_id)}
 
-        wb = None
         try:
             staff_display = self._resolve_staff_name(receipt)
             target_path = self.template_loader.ensure_staff_workbook(
@@ -42,41 +41,51 @@ class StaffLedgerWriter:
                 location_id=receipt.business_location_id or "unknown",
                 staff_id=receipt.staff_id,
             )
-            wb = self.repository.open(target_path)
-
-            sheet_name = self._target_sheet_name(receipt.receipt_date)
-            resolved_sheet = self._ensure_month_sheet(wb, sheet_name)
-            ws = wb[resolved_sheet]
-
-            # Find next empty row to fill (NO ROW INSERTION)
-            # Same logic as location sheet - just fill existing empty rows
-            write_row = self._find_next_empty_row(ws)
-            self.logger.info(f"Staff sheet '{resolved_sheet}' write_row: {write_row}, max_row: {ws.max_row} (no insertion)")
-            
-            # Write data directly to the empty row - DO NOT INSERT ROWS
-            # The template already has empty rows with formulas in place
-            self._write_row(ws, write_row, receipt)
-
-            self.repository.save(wb, target_path, is_staff=True)
+            with self.repository.checkout(target_path) as wb:
+                resolved_sheet, write_row = self._apply_receipt(wb, receipt)
+                self.repository.commit(
+                    target_path, is_staff=True, replay=lambda wb: self._apply_receipt(wb, receipt)
+                )
             return {
                 "status": "written",
                 "staff": receipt.staff_id,
                 "sheet": resolved_sheet,
                 "row": write_row,
+                "workbook": str(target_path),
             }
         except Exception as exc:
             self.logger.exception("Failed to write staff ledger", extra={"staff": receipt.staff_id})
             return {"status": "error", "error": str(exc), "staff": receipt.staff_id}
-        finally:
-            try:
-                if wb:
-                    wb.close()
-            except Exception:
-                pass
+
+    def workbook_key(self, receipt: Receipt) -> Optional[str]:
+        """Path of the workbook write_receipt would touch (None if it would skip)."""
+        if not receipt.staff_id:
+            return None
+        return str(self.template_loader.staff_workbook_path(
+            self._resolve_staff_name(receipt) or receipt.staff_id,
+            receipt.business_location_id or "unknown",
+            staff_id=receipt.staff_id,
+        ))
 
     # -----------------
     # Internals
     # -----------------
+    def _apply_receipt(self, wb, receipt: Receipt) -> Tuple[str, int]:
+        """Write the receipt's row into ``wb``; returns (sheet, row)."""
+        sheet_name = self._target_sheet_name(receipt.receipt_date)
+        resolved_sheet = self._ensure_month_sheet(wb, sheet_name)
+        ws = wb[resolved_sheet]
+
+        # Find next empty row to fill (NO ROW INSERTION)
+        # Same logic as location sheet - just fill existing empty rows
+        write_row = self._find_next_empty_row(ws)
+        self.logger.info(f"Staff sheet '{resolved_sheet}' write_row: {write_row}, max_row: {ws.max_row} (no insertion)")
+
+        # Write data directly to the empty row - DO NOT INSERT ROWS
+        # The template already has empty rows with formulas in place
+        self._write_row(ws, write_row, receipt)
+        return resolved_sheet, write_row
+
     def _target_sheet_name(self, receipt_date: Optional[str]) -> str:
         try:
             dt = datetime.fromisoformat(receipt_date) if receipt_date else datetime.now()
@@ -89,10 +98,7 @@ class StaffLedgerWriter:
         if existing:
             return existing
 
-        source_name = "原本" if "原本" in workbook.sheetnames else workbook.sheetnames[0]
-        source_sheet = workbook[source_name]
-        duplicated = workbook.copy_worksheet(source_sheet)
-        duplicated.title = target_sheet
+        self.template_loader.ensure_format01_month_sheet(workbook, target_sheet)
         return target_sheet
 
     def _match_existing_sheet(self, workbook, target_sheet: str) -> Optional[str]:
@@ -0,0 +1,431 @@
+"""Workbook session cache with write-behind flushing for local ledger writers.
+
+Parsing and serializing an .xlsx with openpyxl dominates the cost of a local
+ledger write. The session cache keeps parsed workbooks open per path so a
+batch of receipts for the same location or staff file loads it once, mutates
+it in memory, and saves it once:
+
+    session = get_workbook_session()
+    with session.batch():                      # flush once on exit
+        with session.lock(path):
+            wb = session.open(path, loader=load_workbook)
+            ...mutate wb...
+            session.mark_dirty(path, after_save=copy_artifact)
+
+If a write fails half-way, ``rollback(path)`` drops the cached workbook and
+reloads it, re-applying the ``replay`` callables of earlier, still unsaved
+edits, so the failed write's partial cells are never flushed but the rows
+written before it are.
+
+Outside a batch, dirty workbooks are saved immediately (the historical
+behaviour) unless WORKBOOK_FLUSH_DEBOUNCE_SECONDS is set, in which case a
+timer flushes them once writes go quiet.
+
+Cached entries are validated against the file's mtime/size on every open, so
+edits made outside this process (e.g. in Excel) are picked up. Saves go to a
+temp file in the same directory, are fsynced and then renamed over the
+target, so a crash never leaves a half-written ledger behind.
+"""
+
+from __future__ import annotations
+
+import atexit
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Seconds of write inactivity before dirty workbooks outside a batch are
+# flushed. 0 saves immediately after each write.
+WORKBOOK_FLUSH_DEBOUNCE_SECONDS = float(os.environ.get("WORKBOOK_FLUSH_DEBOUNCE_SECONDS", "0"))
+
+# Maximum number of parsed workbooks kept open
+WORKBOOK_SESSION_MAX_OPEN = int(os.environ.get("WORKBOOK_SESSION_MAX_OPEN", "16"))
+
+SAVE_RETRIES = 3
+SAVE_RETRY_DELAY_SECONDS = 0.5
+
+
+def atomic_save_workbook(workbook, dest_path: Path) -> None:
+    """Save a workbook via temp file + fsync + rename.
+
+    Retries on PermissionError, which Windows raises while the target is
+    open in Excel.
+    """
+    dest_path = Path(dest_path)
+    dest_path.parent.mkdir(parents=True, exist_ok=True)
+
+    for attempt in range(SAVE_RETRIES):
+        tmp_path = dest_path.with_name(f".{dest_path.name}.{uuid.uuid4().hex[:8]}.tmp")
+        try:
+            workbook.save(tmp_path)
+            with open(tmp_path, "rb") as handle:
+                os.fsync(handle.fileno())
+            os.replace(tmp_path, dest_path)
+            return
+        except PermissionError:
+            if attempt == SAVE_RETRIES - 1:
+                raise
+            time.sleep(SAVE_RETRY_DELAY_SECONDS)
+        finally:
+            try:
+                tmp_path.unlink(missing_ok=True)
+            except OSError:
+                pass
+
+
+def _file_stamp(path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+class _Entry:
+    __slots__ = ("path", "workbook", "stamp", "dirty", "after_save", "before_save", "replays", "replayable")
+
+    def __init__(self, path: Path, workbook, stamp):
+        self.path = path
+        self.workbook = workbook
+        self.stamp = stamp
+        self.dirty = False
+        self.after_save: Optional[Callable[[Path], None]] = None
+        self.before_save: List[Callable[[], object]] = []
+        # Unsaved edits as callables re-applicable to a freshly loaded copy;
+        # replayable turns False once an edit is marked without one
+        self.replays: List[Callable[[object], object]] = []
+        self.replayable = True
+
+
+class WorkbookBatch:
+    """Collects workbooks dirtied while active; flushes them on exit."""
+
+    def __init__(self, session: "WorkbookSession") -> None:
+        self._session = session
+        self.paths: set = set()
+        self.errors: Dict[str, str] = {}
+
+    def flush(self) -> Dict[str, str]:
+        """Flush this batch's workbooks; returns {path: error} for failures."""
+        for path in sorted(self.paths):
+            try:
+                self._session.flush(Path(path))
+            except Exception as exc:
+                # Drop the unsaved edits so they are reported as failed and
+                # not silently saved by a later flush
+                logger.error(f"Workbook flush failed for {path}: {exc}")
+                self.errors[path] = str(exc)
+                self._session.invalidate(Path(path), force=True)
+        self.paths.clear()
+        return self.errors
+
+
+class WorkbookSession:
+    """Process-wide cache of parsed workbooks keyed by resolved path."""
+
+    def __init__(
+        self,
+        *,
+        max_open: int = WORKBOOK_SESSION_MAX_OPEN,
+        debounce_seconds: float = WORKBOOK_FLUSH_DEBOUNCE_SECONDS,
+    ) -> None:
+        self.max_open = max(1, max_open)
+        self.debounce_seconds = debounce_seconds
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._path_locks: Dict[str, threading.RLock] = {}
+        self._lock = threading.Lock()
+        self._batches: List[WorkbookBatch] = []
+        self._timer: Optional[threading.Timer] = None
+        self._stats = {"loads": 0, "hits": 0, "invalidations": 0, "flushes": 0, "evictions": 0}
+
+    # -----------------
+    # Public API
+    # -----------------
+    @contextmanager
+    def lock(self, path: Path) -> Iterator[None]:
+        """Serialize access to one workbook (reentrant)."""
+        key = self._key(path)
+        with self._lock:
+            path_lock = self._path_locks.setdefault(key, threading.RLock())
+        with path_lock:
+            yield
+
+    def open(self, path: Path, loader: Callable[[Path], object]):
+        """Return the cached workbook for ``path``, loading it if stale or absent.
+
+        Callers must hold ``lock(path)`` while using the returned workbook.
+        """
+        key = self._key(path)
+        stamp = _file_stamp(Path(path))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry.stamp == stamp:
+                    self._entries.move_to_end(key)
+                    self._stats["hits"] += 1
+                    return entry.workbook
+                if entry.dirty:
+                    # Changed on disk while we hold unsaved rows: our flush
+                    # will overwrite it, same as the old load/save window.
+                    logger.warning(f"Workbook changed on disk with unsaved session edits: {path}")
+                    self._entries.move_to_end(key)
+                    return entry.workbook
+                self._stats["invalidations"] += 1
+                del self._entries[key]
+                self._close(entry)
+
+        workbook = loader(Path(path))
+        with self._lock:
+            self._stats["loads"] += 1
+            self._entries[key] = _Entry(Path(path), workbook, stamp)
+            self._entries.move_to_end(key)
+        self._evict_overflow(keep=key)
+        return workbook
+
+    def mark_dirty(
+        self,
+        path: Path,
+        *,
+        after_save: Optional[Callable[[Path], None]] = None,
+        before_save: Optional[Callable[[], object]] = None,
+        replay: Optional[Callable[[object], object]] = None,
+    ) -> None:
+        """Record that ``path`` has unsaved edits and schedule its flush.
+
+        ``before_save`` runs once right before the next save of this path
+        (e.g. to wait for a pending backup of the on-disk copy). ``replay``
+        re-applies this edit to a reloaded workbook (see ``rollback``).
+        """
+        key = self._key(path)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                raise KeyError(f"Workbook not open in session: {path}")
+            entry.dirty = True
+            if after_save is not None:
+                entry.after_save = after_save
+            if before_save is not None:
+                entry.before_save.append(before_save)
+            if replay is not None:
+                entry.replays.append(replay)
+            else:
+                entry.replayable = False
+            batches = list(self._batches)
+            for batch in batches:
+                batch.paths.add(key)
+
+        if batches:
+            return
+        if self.debounce_seconds > 0:
+            self._schedule_flush()
+            return
+        try:
+            self.flush(path)
+        except Exception:
+            self.invalidate(path, force=True)
+            raise
+
+    def invalidate(self, path: Path, *, force: bool = False) -> bool:
+        """Drop a cached workbook (kept if dirty unless ``force``)."""
+        key = self._key(path)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or (entry.dirty and not force):
+                return False
+            del self._entries[key]
+            self._stats["invalidations"] += 1
+        self._close(entry)
+        return True
+
+    def rollback(self, path: Path, loader: Callable[[Path], object]) -> bool:
+        """Discard edits made to ``path`` since its last ``mark_dirty``.
+
+        The cached workbook is dropped. If it still holds earlier unsaved
+        edits, it is reloaded and their replays re-applied, so those edits
+        are flushed as usual. Callers must hold ``lock(path)``. Returns False
+        if earlier edits could not be restored.
+        """
+        key = self._key(path)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return True
+            if entry.dirty and not entry.replayable:
+                # No way to rebuild the earlier edits; keep them (and the
+                # partial write) rather than silently dropping saved rows
+                logger.warning(f"Cannot roll back workbook without replays: {path}")
+                return False
+            del self._entries[key]
+            self._stats["invalidations"] += 1
+        self._close(entry)
+        if not entry.dirty:
+            return True
+
+        try:
+            workbook = loader(Path(path))
+            for replay in entry.replays:
+                replay(workbook)
+        except Exception as exc:
+            logger.error(f"Replaying unsaved edits failed for {path}: {exc}")
+            with self._lock:
+                for batch in self._batches:
+                    if key in batch.paths:
+                        batch.errors[key] = f"unsaved edits lost on rollback: {exc}"
+            return False
+
+        restored = _Entry(Path(path), workbook, _file_stamp(Path(path)))
+        restored.dirty = True
+        restored.after_save = entry.after_save
+        restored.before_save = entry.before_save
+        restored.replays = entry.replays
+        with self._lock:
+            self._stats["loads"] += 1
+            self._entries[key] = restored
+        return True
+
+    def flush(self, path: Optional[Path] = None) -> int:
+        """Save dirty workbooks (one path, or all). Returns number saved."""
+        with self._lock:
+            if path is None:
+                entries = [e for e in self._entries.values() if e.dirty]
+            else:
+                entry = self._entries.get(self._key(path))
+                entries = [entry] if entry is not None and entry.dirty else []
+
+        saved = 0
+        for entry in entries:
+            with self.lock(entry.path):
+                if not entry.dirty:
+                    continue
+                barriers, entry.before_save = entry.before_save, []
+                for barrier in barriers:
+                    barrier()
+                atomic_save_workbook(entry.workbook, entry.path)
+                entry.dirty = False
+                entry.replays = []
+                entry.replayable = True
+                entry.stamp = _file_stamp(entry.path)
+                saved += 1
+                with self._lock:
+                    self._stats["flushes"] += 1
+                if entry.after_save is not None:
+                    entry.after_save(entry.path)
+        return saved
+
+    @contextmanager
+    def batch(self) -> Iterator[WorkbookBatch]:
+        """Defer saves for workbooks dirtied inside the block until it exits."""
+        batch = WorkbookBatch(self)
+        with self._lock:
+            self._batches.append(batch)
+        try:
+            yield batch
+        finally:
+            with self._lock:
+                self._batches.remove(batch)
+            batch.flush()
+
+    def clear(self) -> None:
+        """Flush and drop every cached workbook."""
+        try:
+            self.flush()
+        finally:
+            with self._lock:
+                entries = list(self._entries.values())
+                self._entries.clear()
+            for entry in entries:
+                self._close(entry)
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["open"] = len(self._entries)
+            stats["dirty"] = sum(1 for e in self._entries.values() if e.dirty)
+        return stats
+
+    # -----------------
+    # Helpers
+    # -----------------
+    @staticmethod
+    def _key(path: Path) -> str:
+        return str(Path(path).resolve())
+
+    @staticmethod
+    def _close(entry: _Entry) -> None:
+        try:
+            entry.workbook.close()
+        except Exception:
+            pass
+
+    def _schedule_flush(self) -> None:
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(self.debounce_seconds, self._timer_flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _timer_flush(self) -> None:
+        with self._lock:
+            self._timer = None
+        try:
+            self.flush()
+        except Exception as exc:
+            logger.error(f"Debounced workbook flush failed: {exc}")
+
+    def _evict_overflow(self, keep: Optional[str] = None) -> None:
+        """Close least-recently-used workbooks beyond max_open (flushing first).
+
+        Workbooks currently locked by another writer are skipped rather than
+        waited on, so evicting never blocks or deadlocks a concurrent lane.
+        """
+        with self._lock:
+            overflow = len(self._entries) - self.max_open
+            candidates = list(self._entries.items())
+            path_locks = dict(self._path_locks)
+        for key, entry in candidates:
+            if overflow <= 0:
+                return
+            if key == keep:
+                continue
+            path_lock = path_locks.get(key)
+            if path_lock is not None and not path_lock.acquire(blocking=False):
+                continue
+            try:
+                try:
+                    self.flush(entry.path)
+                except Exception as exc:
+                    logger.error(f"Flush before eviction failed for {entry.path}: {exc}")
+                    continue
+                with self._lock:
+                    if self._entries.get(key) is not entry or entry.dirty:
+                        continue
+                    del self._entries[key]
+                    self._stats["evictions"] += 1
+                self._close(entry)
+                overflow -= 1
+            finally:
+                if path_lock is not None:
+                    path_lock.release()
+
+
+_session: Optional[WorkbookSession] = None
+_session_lock = threading.Lock()
+
+
+def get_workbook_session() -> WorkbookSession:
+    """Get or create the global workbook session."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = WorkbookSession()
+            atexit.register(_session.flush)
+        return _session
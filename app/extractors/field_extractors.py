@@ -38,7 +38,7 @@ except ImportError:
 
 # Import multi-engine OCR system
 try:
-    from ..ocr.multi_engine_ocr import MultiEngineOCR
+    from ..ocr.multi_engine_ocr import get_ocr_engine
     MULTI_ENGINE_AVAILABLE = True
 except ImportError:
     MULTI_ENGINE_AVAILABLE = False
@@ -70,7 +70,7 @@ class FieldExtractor:
         # Initialize multi-engine OCR system
         if MULTI_ENGINE_AVAILABLE:
             try:
-                self.multi_engine_ocr = MultiEngineOCR()  # Remove preferred_engine parameter
+                self.multi_engine_ocr = get_ocr_engine()
                 print("Multi-engine OCR initialized")
             except Exception as e:
                 print(f"Failed to initialize multi-engine OCR: {e}")
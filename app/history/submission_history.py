@@ -1,23 +1,251 @@
-import copy
+import json
+import os
+import sqlite3
+import time
+from collections import OrderedDict, deque
 from datetime import datetime
 from pathlib import Path
 from threading import Lock
-from typing import Any, Dict, List, Optional
+from types import MappingProxyType
+from typing import Any, Dict, Hashable, List, Mapping, Optional, Tuple
+
+# Entries older than this (since their last write) are evicted
+HISTORY_TTL_SECONDS = float(os.environ.get("SUBMISSION_HISTORY_TTL_SECONDS", str(24 * 3600)))
+HISTORY_MAX_ANALYSES = int(os.environ.get("SUBMISSION_HISTORY_MAX_ANALYSES", "500"))
+HISTORY_MAX_CACHED = int(os.environ.get("SUBMISSION_HISTORY_MAX_CACHED", "200"))
+HISTORY_MAX_SUBMISSIONS = int(os.environ.get("SUBMISSION_HISTORY_MAX_SUBMISSIONS", "1000"))
+HISTORY_MAX_BATCHES = int(os.environ.get("SUBMISSION_HISTORY_MAX_BATCHES", "200"))
+# Approximate byte budget for analysis records (they carry base64 images)
+HISTORY_MAX_BYTES = int(os.environ.get("SUBMISSION_HISTORY_MAX_BYTES", str(256 * 1024 * 1024)))
+
+# Share analysis status/cache across worker processes through SQLite
+HISTORY_PERSIST = os.environ.get("SUBMISSION_HISTORY_PERSIST", "false").lower() in ("1", "true", "yes")
+HISTORY_DB_PATH = os.environ.get("SUBMISSION_HISTORY_DB_PATH", "")
+
+
+def _approx_size(obj: Any) -> int:
+    """Cheap recursive size estimate dominated by string/bytes payloads."""
+    if isinstance(obj, (str, bytes)):
+        return len(obj)
+    if isinstance(obj, Mapping):
+        return 64 + sum(_approx_size(k) + _approx_size(v) for k, v in obj.items())
+    if isinstance(obj, (list, tuple)):
+        return 56 + sum(_approx_size(v) for v in obj)
+    return 16
+
+
+class _BoundedTTLMap:
+    """Insertion-ordered map bounded by TTL, entry count and approximate bytes.
+    
+    Entries are re-appended on every write, so the oldest write is always at
+    the front: TTL and size eviction only ever pop from the head.
+    """
+    
+    def __init__(self, max_entries: int, ttl_seconds: float, max_bytes: Optional[int] = None) -> None:
+        self.max_entries = max(1, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self._data: "OrderedDict[Hashable, Tuple[float, int, Any]]" = OrderedDict()
+        self.bytes = 0
+        self.evicted_ttl = 0
+        self.evicted_size = 0
+    
+    def get(self, key: Hashable) -> Any:
+        item = self._data.get(key)
+        if item is None:
+            return None
+        if item[0] <= time.monotonic():
+            self._discard(key)
+            self.evicted_ttl += 1
+            return None
+        return item[2]
+    
+    def set(self, key: Hashable, value: Any) -> None:
+        self._discard(key)
+        size = _approx_size(value)
+        self._data[key] = (time.monotonic() + self.ttl_seconds, size, value)
+        self.bytes += size
+        self.purge_expired()
+        while len(self._data) > self.max_entries or (
+            self.max_bytes is not None and self.bytes > self.max_bytes and len(self._data) > 1
+        ):
+            oldest = next(iter(self._data))
+            self._discard(oldest)
+            self.evicted_size += 1
+    
+    def pop(self, key: Hashable) -> None:
+        self._discard(key)
+    
+    def purge_expired(self, older_than: Optional[float] = None) -> int:
+        """Evict entries past their TTL (or written more than ``older_than`` seconds ago)."""
+        now = time.monotonic()
+        cutoff_offset = 0.0 if older_than is None else self.ttl_seconds - older_than
+        purged = 0
+        while self._data:
+            key, (expires_at, _, _) = next(iter(self._data.items()))
+            if expires_at - cutoff_offset > now:
+                break
+            self._discard(key)
+            purged += 1
+        self.evicted_ttl += purged
+        return purged
+    
+    def values(self) -> List[Any]:
+        return [item[2] for item in self._data.values()]
+    
+    def __len__(self) -> int:
+        return len(self._data)
+    
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._data),
+            "approxBytes": self.bytes,
+            "evictedTtl": self.evicted_ttl,
+            "evictedSize": self.evicted_size,
+        }
+    
+    def _discard(self, key: Hashable) -> None:
+        item = self._data.pop(key, None)
+        if item is not None:
+            self.bytes -= item[1]
+
+
+class _HistoryDatabase:
+    """SQLite mirror of analysis status and cache, shared by all workers."""
+    
+    PRUNE_EVERY_WRITES = 200
+    
+    def __init__(self, db_path: str, ttl_seconds: float) -> None:
+        self.db_path = db_path
+        self.ttl_seconds = ttl_seconds
+        self._writes = 0
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        conn = self._connect()
+        try:
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS analysis_status (
+                    queue_id TEXT PRIMARY KEY,
+                    record TEXT NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS analysis_cache (
+                    payload_hash TEXT PRIMARY KEY,
+                    data TEXT NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_analysis_status_updated ON analysis_status (updated_at)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_analysis_cache_updated ON analysis_cache (updated_at)")
+            conn.commit()
+        finally:
+            conn.close()
+    
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=15.0)
+        conn.execute("PRAGMA busy_timeout = 15000")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        return conn
+    
+    def put(self, table: str, key_col: str, value_col: str, key: str, value: Dict[str, Any]) -> None:
+        conn = self._connect()
+        try:
+            conn.execute(
+                f"INSERT OR REPLACE INTO {table} ({key_col}, {value_col}, updated_at) VALUES (?, ?, ?)",
+                (key, json.dumps(value, ensure_ascii=False, separators=(",", ":")), time.time()),
+            )
+            self._writes += 1
+            if self._writes % self.PRUNE_EVERY_WRITES == 0:
+                self._prune(conn, time.time() - self.ttl_seconds)
+            conn.commit()
+        finally:
+            conn.close()
+    
+    def get(self, table: str, key_col: str, value_col: str, key: str) -> Optional[Dict[str, Any]]:
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                f"SELECT {value_col} FROM {table} WHERE {key_col} = ? AND updated_at >= ?",
+                (key, time.time() - self.ttl_seconds),
+            ).fetchone()
+        finally:
+            conn.close()
+        return json.loads(row[0]) if row else None
+    
+    def delete(self, table: str, key_col: str, key: str) -> None:
+        conn = self._connect()
+        try:
+            conn.execute(f"DELETE FROM {table} WHERE {key_col} = ?", (key,))
+            conn.commit()
+        finally:
+            conn.close()
+    
+    def prune(self, older_than_seconds: float) -> None:
+        conn = self._connect()
+        try:
+            self._prune(conn, time.time() - older_than_seconds)
+            conn.commit()
+        finally:
+            conn.close()
+    
+    @staticmethod
+    def _prune(conn: sqlite3.Connection, cutoff: float) -> None:
+        conn.execute("DELETE FROM analysis_status WHERE updated_at < ?", (cutoff,))
+        conn.execute("DELETE FROM analysis_cache WHERE updated_at < ?", (cutoff,))
+
 
 class SubmissionHistory:
-    """Manage receipt submission history and analysis queue."""
+    """Manage receipt submission history and analysis queue.
 
-    def __init__(self):
-        self.analysis_queue: Dict[str, Dict[str, Any]] = {}
-        self.submissions: List[Dict[str, Any]] = []
-        self.analysis_cache: Dict[str, Dict[str, Any]] = {}
-        self.batches: Dict[str, Dict[str, Any]] = {}
+    All collections are bounded by TTL and size. Records are never mutated
+    after being stored (updates replace them), so reads return read-only
+    views instead of deep copies. With persistence enabled, analysis status
+    and the analysis cache are mirrored to SQLite so any worker can answer
+    /mobile/analyze/status/{queue_id}.
+    """
+    
+    def __init__(self, *, persist: Optional[bool] = None, db_path: Optional[str] = None,
+                 ttl_seconds: float = HISTORY_TTL_SECONDS):
+        self.analysis_queue = _BoundedTTLMap(HISTORY_MAX_ANALYSES, ttl_seconds, HISTORY_MAX_BYTES)
+        self.analysis_cache = _BoundedTTLMap(HISTORY_MAX_CACHED, ttl_seconds, HISTORY_MAX_BYTES // 4)
+        self.batches = _BoundedTTLMap(HISTORY_MAX_BATCHES, ttl_seconds)
+        self.submissions: deque = deque(maxlen=HISTORY_MAX_SUBMISSIONS)
+        self._submission_total = 0
         self.lock = Lock()
+        
+        if persist is None:
+            persist = HISTORY_PERSIST
+        self._db: Optional[_HistoryDatabase] = None
+        if persist:
+            if not db_path:
+                db_path = HISTORY_DB_PATH or str(Path(__file__).parent.parent / "data" / "submission_history.db")
+            self._db = _HistoryDatabase(db_path, ttl_seconds)
+    
+    # ---------------------------
+    # Analysis status
+    # ---------------------------
+    def _put_status(self, queue_id: str, record: Dict[str, Any]) -> None:
+        """Store a status record (caller holds the lock)."""
+        self.analysis_queue.set(queue_id, record)
+        if self._db is not None:
+            self._db.put("analysis_status", "queue_id", "record", queue_id, record)
+    
+    def _current_status(self, queue_id: str) -> Optional[Dict[str, Any]]:
+        """Look up a status record; the shared database is authoritative when enabled.
+
+        Status changes on other workers, so it is never served from this
+        process's memory while persistence is on.
+        """
+        if self._db is not None:
+            return self._db.get("analysis_status", "queue_id", "record", queue_id)
+        return self.analysis_queue.get(queue_id)
 
     def create_pending_analysis(self, queue_id: str, metadata: Optional[str], payload_hash: Optional[str], preprocess_stats: Optional[Dict[str, Any]] = None):
         """Add a placeholder entry so clients can poll for status."""
         with self.lock:
-            self.analysis_queue[queue_id] = {
+            self._put_status(queue_id, {
                 'analysis_data': None,
                 'metadata': metadata,
                 'payload_hash': payload_hash,
@@ -25,20 +253,28 @@ class SubmissionHistory:
                 'status': 'queued',
                 'preprocess': preprocess_stats or {},
                 'error': None
-            }
+            })
 
     def mark_analysis_processing(self, queue_id: str):
         with self.lock:
-            if queue_id in self.analysis_queue:
-                self.analysis_queue[queue_id]['status'] = 'processing'
-                self.analysis_queue[queue_id]['started_at'] = datetime.now().isoformat()
+            entry = self._current_status(queue_id)
+            if entry is not None:
+                self._put_status(queue_id, {
+                    **entry,
+                    'status': 'processing',
+                    'started_at': datetime.now().isoformat(),
+                })
 
     def mark_analysis_failed(self, queue_id: str, error_message: str):
         with self.lock:
-            if queue_id in self.analysis_queue:
-                self.analysis_queue[queue_id]['status'] = 'failed'
-                self.analysis_queue[queue_id]['error'] = error_message
-                self.analysis_queue[queue_id]['completed_at'] = datetime.now().isoformat()
+            entry = self._current_status(queue_id)
+            if entry is not None:
+                self._put_status(queue_id, {
+                    **entry,
+                    'status': 'failed',
+                    'error': error_message,
+                    'completed_at': datetime.now().isoformat(),
+                })
 
     def store_analysis(self, queue_id: str, analysis_data: Dict[str, Any], metadata: Optional[str] = None,
                        payload_hash: Optional[str] = None, timings: Optional[Dict[str, Any]] = None):
@@ -53,32 +289,39 @@ class SubmissionHistory:
         }
 
         with self.lock:
-            self.analysis_queue[queue_id] = record
+            self._put_status(queue_id, record)
             if payload_hash:
-                self.analysis_cache[payload_hash] = copy.deepcopy(analysis_data)
+                self.analysis_cache.set(payload_hash, analysis_data)
+                if self._db is not None:
+                    self._db.put("analysis_cache", "payload_hash", "data", payload_hash, analysis_data)
 
-    def get_analysis(self, queue_id: str) -> Optional[Dict[str, Any]]:
-        """Retrieve stored analysis by queue ID."""
+    def get_analysis(self, queue_id: str) -> Optional[Mapping[str, Any]]:
+        """Retrieve stored analysis by queue ID (read-only view)."""
         with self.lock:
-            entry = self.analysis_queue.get(queue_id)
-            if not entry:
+            entry = self._current_status(queue_id)
+            if not entry or entry.get('analysis_data') is None:
                 return None
-            return entry.get('analysis_data')
+            return MappingProxyType(entry['analysis_data'])
 
-    def get_analysis_status(self, queue_id: str) -> Optional[Dict[str, Any]]:
+    def get_analysis_status(self, queue_id: str) -> Optional[Mapping[str, Any]]:
+        """Current status record for a queue ID (read-only view)."""
         with self.lock:
-            entry = self.analysis_queue.get(queue_id)
-            if not entry:
-                return None
-            # Return a copy to avoid accidental mutation
-            status_copy = copy.deepcopy(entry)
-            return status_copy
+            entry = self._current_status(queue_id)
+            return MappingProxyType(entry) if entry else None
 
-    def get_cached_analysis(self, payload_hash: str) -> Optional[Dict[str, Any]]:
+    def get_cached_analysis(self, payload_hash: str) -> Optional[Mapping[str, Any]]:
+        """Previous analysis for identical image bytes (read-only view)."""
         with self.lock:
             cached = self.analysis_cache.get(payload_hash)
-            return copy.deepcopy(cached) if cached else None
+            if cached is None and self._db is not None:
+                cached = self._db.get("analysis_cache", "payload_hash", "data", payload_hash)
+                if cached is not None:
+                    self.analysis_cache.set(payload_hash, cached)
+            return MappingProxyType(cached) if cached else None
 
+    # ---------------------------
+    # Submissions
+    # ---------------------------
     def store_submission(self, queue_id: str, verified_data: Dict[str, Any],
                         user_data: Dict[str, Any], excel_path: str):
         """Store completed submission."""
@@ -95,8 +338,10 @@ class SubmissionHistory:
 
         with self.lock:
             self.submissions.append(submission)
-            if queue_id in self.analysis_queue:
-                del self.analysis_queue[queue_id]
+            self._submission_total += 1
+            self.analysis_queue.pop(queue_id)
+            if self._db is not None:
+                self._db.delete("analysis_status", "queue_id", queue_id)
 
     def get_recent_submissions(self, limit: int = 50) -> List[Dict[str, Any]]:
         """Get recent submissions for history display."""
@@ -132,14 +377,36 @@ class SubmissionHistory:
         return history_items
 
     def get_submission_count(self) -> int:
-        """Get total number of submissions."""
+        """Get total number of submissions (including ones rotated out of history)."""
         with self.lock:
-            return len(self.submissions)
+            return self._submission_total
 
     def clear_old_analyses(self, hours: int = 24):
-        """Clear old unprocessed analyses (optional cleanup)."""
-        # Implementation for cleanup if needed
-        pass
+        """Evict analyses and cache entries last written more than ``hours`` ago."""
+        older_than = hours * 3600
+        with self.lock:
+            self.analysis_queue.purge_expired(older_than)
+            self.analysis_cache.purge_expired(older_than)
+            self.batches.purge_expired(older_than)
+        if self._db is not None:
+            self._db.prune(older_than)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Memory usage and eviction counters for monitoring."""
+        with self.lock:
+            return {
+                'analyses': self.analysis_queue.stats(),
+                'analysisCache': self.analysis_cache.stats(),
+                'batches': self.batches.stats(),
+                'submissions': {
+                    'entries': len(self.submissions),
+                    'capacity': self.submissions.maxlen,
+                    'total': self._submission_total,
+                },
+                'approxBytes': self.analysis_queue.bytes + self.analysis_cache.bytes + self.batches.bytes,
+                'ttlSeconds': self.analysis_queue.ttl_seconds,
+                'persistent': self._db is not None,
+            }
 
     # ---------------------------
     # Batch helpers (scaffolding)
@@ -164,18 +431,19 @@ class SubmissionHistory:
         }
 
         with self.lock:
-            self.batches[batch_id] = batch_record
+            self.batches.set(batch_id, batch_record)
 
     def update_file_status(self, batch_id: str, filename: str, status: str) -> None:
         with self.lock:
             batch = self.batches.get(batch_id)
             if not batch:
                 return
-            for file_entry in batch.get('files', []):
+            now = datetime.now().isoformat()
+            files = list(batch.get('files', []))
+            for i, file_entry in enumerate(files):
                 if file_entry.get('filename') == filename:
-                    file_entry['status'] = status
-                    file_entry['updated_at'] = datetime.now().isoformat()
-                    batch['updated_at'] = datetime.now().isoformat()
+                    files[i] = {**file_entry, 'status': status, 'updated_at': now}
+                    self.batches.set(batch_id, {**batch, 'files': files, 'updated_at': now})
                     break
 
     def update_batch_status(self, batch_id: str, status: str) -> None:
@@ -183,10 +451,9 @@ class SubmissionHistory:
             batch = self.batches.get(batch_id)
             if not batch:
                 return
-            batch['status'] = status
-            batch['updated_at'] = datetime.now().isoformat()
+            self.batches.set(batch_id, {**batch, 'status': status, 'updated_at': datetime.now().isoformat()})
 
-    def get_batch(self, batch_id: str) -> Optional[Dict[str, Any]]:
+    def get_batch(self, batch_id: str) -> Optional[Mapping[str, Any]]:
         with self.lock:
             batch = self.batches.get(batch_id)
-            return copy.deepcopy(batch) if batch else None
\ No newline at end of file
+            return MappingProxyType(batch) if batch else None
@@ -387,8 +387,9 @@ async def seed_dev_users():
     force_seed = os.getenv("SEED_DEV_USERS", "0") == "1"
 
     # If not explicitly in dev mode, allow seeding when DB is empty or when SEED_DEV_USERS=1
-    from app.repositories.user_repository import UserRepository
-    repo_check = UserRepository()
+    # Shared repository: schema setup happens here, once, at startup
+    from app.repositories.user_repository import get_user_repository
+    repo_check = get_user_repository()
     existing_users = repo_check.count_users()
 
     if env != "dev" and not force_seed and existing_users > 0:
@@ -403,12 +404,10 @@ async def seed_dev_users():
         return
     
     try:
-        from app.repositories.user_repository import UserRepository
-        
         with open(seed_file, 'r') as f:
             users = json.load(f)
         
-        repo = UserRepository()
+        repo = repo_check
         worker_count = 0
         admin_count = 0
         hq_count = 0
@@ -460,3 +459,108 @@ async def cleanup_old_drafts():
     except Exception as e:
         # Must never block startup
         print(f"DRAFT CLEANUP WARNING: {e}")
+
+
+# Resume durable /mobile/analyze jobs left queued by a previous process
+@app.on_event("startup")
+async def start_analysis_job_workers():
+    """Start this process's analysis job workers (ANALYSIS_JOB_WORKERS=0 disables)."""
+    try:
+        from app.api.routes import get_analysis_worker_pool
+
+        get_analysis_worker_pool().start()
+    except Exception as e:
+        # Must never block startup
+        print(f"ANALYSIS JOB WORKERS WARNING: {e}")
+
+
+# Resume durable bulk send jobs left queued or mid-write by a previous process
+@app.on_event("startup")
+async def start_send_job_workers():
+    """Start this process's send job workers (SEND_JOB_WORKERS=0 disables)."""
+    try:
+        from app.api.drafts import get_send_worker_pool
+
+        get_send_worker_pool().start()
+    except Exception as e:
+        # Must never block startup
+        print(f"SEND JOB WORKERS WARNING: {e}")
+
+
+@app.on_event("startup")
+async def prewarm_drive_item_cache():
+    """Resolve ledger paths for all configured locations and staff in the background.
+
+    Skipped when Graph is not configured or DRIVE_ITEM_PREWARM=0.
+    """
+    if os.getenv("DRIVE_ITEM_PREWARM", "1").lower() in ("0", "false", "no"):
+        return
+    try:
+        from app.services.graph_auth import is_graph_fully_configured
+
+        if not is_graph_fully_configured():
+            return
+
+        import threading
+
+        def _prewarm():
+            try:
+                from app.config.onedrive_structure import get_configured_ledger_paths
+                from app.services.config_service import get_config_service
+                from app.services.onedrive_file_manager import prewarm_item_ids
+
+                index = get_config_service().get_index()
+                paths = get_configured_ledger_paths(index.locations, index.staff_by_location)
+                print(f"DRIVE ITEM PREWARM: {prewarm_item_ids(paths)}")
+            except Exception as e:
+                print(f"DRIVE ITEM PREWARM WARNING: {e}")
+
+        threading.Thread(target=_prewarm, name="drive-item-prewarm", daemon=True).start()
+    except Exception as e:
+        # Must never block startup
+        print(f"DRIVE ITEM PREWARM WARNING: {e}")
+
+
+@app.on_event("startup")
+async def warm_up_heavy_components():
+    """Build OCR engines, extractors and exporters off the startup path.
+
+    STARTUP_WARMUP=background (default) warms up in a daemon thread so the
+    server starts accepting requests immediately; "eager" blocks startup
+    until everything is built; "off" leaves each component to first use.
+    """
+    mode = os.getenv("STARTUP_WARMUP", "background").lower()
+    if mode == "off":
+        return
+    try:
+        from app.api.routes import warm_up_components
+
+        if mode == "eager":
+            print(f"STARTUP WARMUP: {warm_up_components()}")
+            return
+
+        import threading
+
+        def _warm_up():
+            started = time.perf_counter()
+            try:
+                status = warm_up_components()
+                print(f"STARTUP WARMUP: {status} in {time.perf_counter() - started:.1f}s")
+            except Exception as e:
+                print(f"STARTUP WARMUP WARNING: {e}")
+
+        threading.Thread(target=_warm_up, name="startup-warmup", daemon=True).start()
+    except Exception as e:
+        # Must never block startup
+        print(f"STARTUP WARMUP WARNING: {e}")
+
+
+@app.on_event("shutdown")
+async def shutdown_ocr_engine_registry():
+    """Release the shared OCR engine's executor and availability refresher."""
+    try:
+        from app.ocr.multi_engine_ocr import shutdown_ocr_engine
+
+        shutdown_ocr_engine()
+    except Exception as e:
+        print(f"OCR ENGINE SHUTDOWN WARNING: {e}")
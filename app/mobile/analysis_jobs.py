@@ -0,0 +1,333 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import shutil
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Optional
+from uuid import uuid4
+
+from app.utils.job_workers import JobClaimLost, JobHandler, JobWorkerPool
+
+logger = logging.getLogger(__name__)
+
+# Worker threads per process claiming analysis jobs (0 = enqueue only; run
+# ``python -m app.mobile.analysis_jobs`` as a separate worker process)
+ANALYSIS_JOB_WORKERS = int(os.environ.get("ANALYSIS_JOB_WORKERS", "2"))
+ANALYSIS_JOB_MAX_ATTEMPTS = int(os.environ.get("ANALYSIS_JOB_MAX_ATTEMPTS", "3"))
+ANALYSIS_JOB_RETRY_BASE_SECONDS = float(os.environ.get("ANALYSIS_JOB_RETRY_BASE_SECONDS", "2"))
+# A running job whose claim is not renewed within this window (worker died)
+# becomes claimable again
+ANALYSIS_JOB_CLAIM_TIMEOUT_SECONDS = float(os.environ.get("ANALYSIS_JOB_CLAIM_TIMEOUT_SECONDS", "600"))
+ANALYSIS_JOB_RETENTION_SECONDS = float(os.environ.get("ANALYSIS_JOB_RETENTION_SECONDS", str(24 * 3600)))
+ANALYSIS_JOB_DIR = os.environ.get("ANALYSIS_JOB_DIR", "")
+
+STATE_QUEUED = "queued"
+STATE_RUNNING = "running"
+STATE_COMPLETED = "completed"
+STATE_FAILED = "failed"
+
+# Stages reported while a job runs, in order. Preprocessing finishes in the
+# request before the job is enqueued, so a queued job has no stage yet.
+STAGES = ("ocr", "extraction", "validation")
+
+
+@dataclass
+class AnalysisJob:
+    job_id: str
+    state: str
+    stage: Optional[str]
+    payload: Dict[str, Any]
+    attempts: int
+    max_attempts: int
+    created_at: float
+    updated_at: float
+    error: Optional[str] = None
+    result: Optional[Dict[str, Any]] = None
+    timings: Dict[str, Any] = field(default_factory=dict)
+    claim_token: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.job_id,
+            "state": self.state,
+            "stage": self.stage,
+            "attempts": self.attempts,
+            "max_attempts": self.max_attempts,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
+            "error": self.error,
+        }
+
+
+class AnalysisJobStore:
+    """Durable analysis jobs: blobs on disk, job state in SQLite.
+
+    ``claim`` atomically hands the oldest due job to one worker. A job whose
+    worker stops renewing its claim (crash, restart) is picked up again once
+    the claim expires, so queued work survives process restarts.
+    """
+
+    def __init__(
+        self,
+        base_dir: str | Path | None = None,
+        *,
+        claim_timeout: float = ANALYSIS_JOB_CLAIM_TIMEOUT_SECONDS,
+    ) -> None:
+        self.base_dir = Path(base_dir or ANALYSIS_JOB_DIR or Path("artifacts") / "analysis_jobs")
+        self.blobs_dir = self.base_dir / "blobs"
+        self.blobs_dir.mkdir(parents=True, exist_ok=True)
+        self.db_path = self.base_dir / "jobs.db"
+        self.claim_timeout = claim_timeout
+        self._init_schema()
+
+    def enqueue(
+        self,
+        job_id: str,
+        payload: Dict[str, Any],
+        blobs: Optional[Dict[str, bytes]] = None,
+        *,
+        max_attempts: int = ANALYSIS_JOB_MAX_ATTEMPTS,
+    ) -> AnalysisJob:
+        """Persist blobs and payload, then make the job claimable."""
+        blob_paths: Dict[str, str] = {}
+        if blobs:
+            job_dir = self.blobs_dir / job_id
+            job_dir.mkdir(parents=True, exist_ok=True)
+            for name, data in blobs.items():
+                path = job_dir / name
+                path.write_bytes(data)
+                blob_paths[name] = str(path)
+        payload = {**payload, "blobs": blob_paths}
+        now = time.time()
+        with self._connect(immediate=True) as conn:
+            conn.execute(
+                """
+                INSERT INTO analysis_jobs
+                    (job_id, state, stage, payload, attempts, max_attempts, next_attempt_at, created_at, updated_at)
+                VALUES (?, ?, ?, ?, 0, ?, ?, ?, ?)
+                """,
+                (job_id, STATE_QUEUED, None, _dumps(payload), max(1, max_attempts), now, now, now),
+            )
+        return self.get(job_id)
+
+    def get(self, job_id: str) -> Optional[AnalysisJob]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM analysis_jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return self._build_job(row) if row else None
+
+    def claim(self, *, worker_id: Optional[str] = None) -> Optional[AnalysisJob]:
+        """Claim the oldest queued job that is due, or a running job whose claim expired."""
+        now = time.time()
+        token = f"{worker_id or 'worker'}:{uuid4().hex}"
+        with self._connect(immediate=True) as conn:
+            row = conn.execute(
+                """
+                UPDATE analysis_jobs
+                SET state = 'running', claim_token = ?, claim_expires_at = ?,
+                    attempts = attempts + 1, updated_at = ?
+                WHERE job_id = (
+                    SELECT job_id FROM analysis_jobs
+                    WHERE (state = 'queued' AND next_attempt_at <= ?)
+                       OR (state = 'running' AND claim_expires_at <= ?)
+                    ORDER BY next_attempt_at
+                    LIMIT 1
+                )
+                RETURNING *
+                """,
+                (token, now + self.claim_timeout, now, now, now),
+            ).fetchone()
+        return self._build_job(row) if row else None
+
+    def set_stage(self, job: AnalysisJob, stage: str) -> None:
+        """Record progress and renew the claim; raises JobClaimLost if it expired."""
+        now = time.time()
+        with self._connect(immediate=True) as conn:
+            cur = conn.execute(
+                """
+                UPDATE analysis_jobs SET stage = ?, claim_expires_at = ?, updated_at = ?
+                WHERE job_id = ? AND claim_token = ? AND state = 'running'
+                """,
+                (stage, now + self.claim_timeout, now, job.job_id, job.claim_token),
+            )
+            if cur.rowcount != 1:
+                raise JobClaimLost(job.job_id)
+        job.stage = stage
+
+    def complete(self, job: AnalysisJob, result: Dict[str, Any], timings: Optional[Dict[str, Any]] = None) -> bool:
+        with self._connect(immediate=True) as conn:
+            cur = conn.execute(
+                """
+                UPDATE analysis_jobs
+                SET state = 'completed', result = ?, timings = ?, error = NULL,
+                    claim_token = NULL, claim_expires_at = NULL, updated_at = ?
+                WHERE job_id = ? AND claim_token = ?
+                """,
+                (_dumps(result), _dumps(timings or {}), time.time(), job.job_id, job.claim_token),
+            )
+            done = cur.rowcount == 1
+        if done:
+            self._remove_blobs(job.job_id)
+        return done
+
+    def fail(self, job: AnalysisJob, error: str) -> bool:
+        """Schedule a retry with exponential backoff; returns True if the job is now terminally failed."""
+        now = time.time()
+        terminal = job.attempts >= job.max_attempts
+        delay = ANALYSIS_JOB_RETRY_BASE_SECONDS * (2 ** max(0, job.attempts - 1))
+        with self._connect(immediate=True) as conn:
+            cur = conn.execute(
+                """
+                UPDATE analysis_jobs
+                SET state = ?, error = ?, next_attempt_at = ?,
+                    claim_token = NULL, claim_expires_at = NULL, updated_at = ?
+                WHERE job_id = ? AND claim_token = ?
+                """,
+                (STATE_FAILED if terminal else STATE_QUEUED, error, now + delay, now, job.job_id, job.claim_token),
+            )
+            if cur.rowcount != 1:
+                return False
+        if terminal:
+            self._remove_blobs(job.job_id)
+        return terminal
+
+    def counts(self) -> Dict[str, int]:
+        with self._connect() as conn:
+            rows = conn.execute("SELECT state, COUNT(*) FROM analysis_jobs GROUP BY state").fetchall()
+        return {row[0]: row[1] for row in rows}
+
+    def purge_finished(self, older_than_seconds: float = ANALYSIS_JOB_RETENTION_SECONDS) -> int:
+        cutoff = time.time() - older_than_seconds
+        with self._connect(immediate=True) as conn:
+            rows = conn.execute(
+                """
+                DELETE FROM analysis_jobs
+                WHERE state IN ('completed', 'failed') AND updated_at < ?
+                RETURNING job_id
+                """,
+                (cutoff,),
+            ).fetchall()
+        for row in rows:
+            self._remove_blobs(row[0])
+        return len(rows)
+
+    # -----------------
+    # Internals
+    # -----------------
+    @contextmanager
+    def _connect(self, *, immediate: bool = False) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(str(self.db_path), timeout=15.0, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            conn.execute("PRAGMA busy_timeout = 15000")
+            conn.execute("BEGIN IMMEDIATE" if immediate else "BEGIN")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+        finally:
+            conn.close()
+
+    def _init_schema(self) -> None:
+        conn = sqlite3.connect(str(self.db_path), timeout=15.0)
+        try:
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS analysis_jobs (
+                    job_id TEXT PRIMARY KEY,
+                    state TEXT NOT NULL,
+                    stage TEXT,
+                    payload TEXT NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    max_attempts INTEGER NOT NULL,
+                    next_attempt_at REAL NOT NULL,
+                    claim_token TEXT,
+                    claim_expires_at REAL,
+                    error TEXT,
+                    result TEXT,
+                    timings TEXT,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+            """)
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_analysis_jobs_state_due
+                ON analysis_jobs (state, next_attempt_at)
+            """)
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _remove_blobs(self, job_id: str) -> None:
+        shutil.rmtree(self.blobs_dir / job_id, ignore_errors=True)
+
+    @staticmethod
+    def _build_job(row: sqlite3.Row) -> AnalysisJob:
+        return AnalysisJob(
+            job_id=row["job_id"],
+            state=row["state"],
+            stage=row["stage"],
+            payload=json.loads(row["payload"]),
+            attempts=row["attempts"],
+            max_attempts=row["max_attempts"],
+            created_at=row["created_at"],
+            updated_at=row["updated_at"],
+            error=row["error"],
+            result=json.loads(row["result"]) if row["result"] else None,
+            timings=json.loads(row["timings"]) if row["timings"] else {},
+            claim_token=row["claim_token"],
+        )
+
+
+class AnalysisJobWorkerPool(JobWorkerPool):
+    """Worker pool for analysis jobs (ANALYSIS_JOB_WORKERS threads by default)."""
+
+    def __init__(
+        self,
+        store: AnalysisJobStore,
+        handler: JobHandler,
+        *,
+        workers: int = ANALYSIS_JOB_WORKERS,
+        on_failure: Optional[Callable[[AnalysisJob, str], None]] = None,
+        name: str = "analysis-job",
+    ) -> None:
+        super().__init__(store, handler, workers=workers, on_failure=on_failure, name=name)
+
+
+_store: Optional[AnalysisJobStore] = None
+_store_lock = threading.Lock()
+
+
+def get_analysis_job_store() -> AnalysisJobStore:
+    """Get or create the global analysis job store."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = AnalysisJobStore()
+        return _store
+
+
+def _dumps(payload: Dict[str, Any]) -> str:
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":"), default=str)
+
+
+if __name__ == "__main__":
+    # Standalone worker process: scales OCR independently of HTTP workers
+    logging.basicConfig(level=logging.INFO)
+    from app.api.routes import get_analysis_worker_pool
+
+    pool = get_analysis_worker_pool(workers=max(1, ANALYSIS_JOB_WORKERS))
+    pool.start()
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pool.stop()
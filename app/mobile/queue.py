@@ -1,12 +1,28 @@
 from __future__ import annotations
 
 import json
+import logging
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional
+from typing import Any, Dict, Iterator, List, Optional
 from uuid import uuid4
 
+logger = logging.getLogger(__name__)
+
+# Seconds a popped item stays invisible to other workers before it can be
+# claimed again (a worker that crashes mid-item loses its claim after this).
+VISIBILITY_TIMEOUT_SECONDS = float(os.environ.get("MOBILE_QUEUE_VISIBILITY_TIMEOUT_SECONDS", "300"))
+
+STATE_PENDING = "pending"
+STATE_PROCESSED = "processed"
+# Dead-lettered items (e.g. upload file gone); never handed out again
+STATE_FAILED = "failed"
+
 
 @dataclass
 class MobileQueueItem:
@@ -16,6 +32,8 @@ class MobileQueueItem:
     metadata: Dict[str, Any]
     status: str
     queued_at: float
+    claim_token: Optional[str] = None
+    attempts: int = 0
 
     @property
     def thumbnail_candidate(self) -> Path:
@@ -33,28 +51,52 @@ class MobileQueueItem:
 
 
 class MobileUploadQueueManager:
-    def __init__(self, base_dir: str | Path | None = None) -> None:
+    """Mobile upload queue: image bytes on disk, queue state in SQLite.
+
+    Each item is a row in ``mobile_upload_queue`` (indexed by state and
+    queued_at) whose ``payload`` column holds what used to live in the
+    item's metadata.json. ``pop_next`` atomically claims the oldest visible
+    pending item for ``visibility_timeout`` seconds, so several workers can
+    drain the queue without handing out the same upload twice.
+    """
+
+    def __init__(
+        self,
+        base_dir: str | Path | None = None,
+        *,
+        visibility_timeout: float = VISIBILITY_TIMEOUT_SECONDS,
+    ) -> None:
         root = Path(base_dir or Path("artifacts") / "mobile_queue")
         self.base_dir = root
+        self.items_dir = self.base_dir / "items"
+        # Legacy directory-per-item layout, imported once on first use
         self.pending_dir = self.base_dir / "pending"
         self.processed_dir = self.base_dir / "processed"
-        self.pending_dir.mkdir(parents=True, exist_ok=True)
-        self.processed_dir.mkdir(parents=True, exist_ok=True)
+        self.items_dir.mkdir(parents=True, exist_ok=True)
+        self.db_path = self.base_dir / "queue.db"
+        self.visibility_timeout = visibility_timeout
+        self._init_schema()
 
     def enqueue(self, filename: str, data: bytes, metadata: Dict[str, Any], queued_at: float) -> MobileQueueItem:
         queue_id = uuid4().hex
-        item_dir = self.pending_dir / queue_id
+        item_dir = self.items_dir / queue_id
         item_dir.mkdir(parents=True, exist_ok=True)
         extension = Path(filename).suffix or ".jpg"
         stored_path = item_dir / f"upload{extension}"
         stored_path.write_bytes(data)
-        metadata_path = item_dir / "metadata.json"
         metadata_payload = {
             "metadata": metadata,
             "original_filename": filename,
             "queued_at": queued_at,
         }
-        metadata_path.write_text(json.dumps(metadata_payload, ensure_ascii=False, indent=2), encoding="utf-8")
+        with self._connect() as conn:
+            conn.execute(
+                """
+                INSERT INTO mobile_upload_queue (queue_id, filename, stored_path, state, queued_at, payload)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                (queue_id, filename, str(stored_path), STATE_PENDING, queued_at, _dumps(metadata_payload)),
+            )
         return MobileQueueItem(
             queue_id=queue_id,
             filename=filename,
@@ -65,35 +107,59 @@ class MobileUploadQueueManager:
         )
 
     def snapshot(self, *, include_processed: bool = False) -> List[Dict[str, Any]]:
+        states = (STATE_PENDING, STATE_PROCESSED) if include_processed else (STATE_PENDING,)
+        placeholders = ",".join("?" for _ in states)
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"""
+                SELECT * FROM mobile_upload_queue
+                WHERE state IN ({placeholders})
+                ORDER BY state = 'processed', queued_at
+                """,
+                states,
+            ).fetchall()
         items: List[Dict[str, Any]] = []
-        items.extend(self._load_items(self.pending_dir, status="pending"))
-        if include_processed:
-            items.extend(self._load_items(self.processed_dir, status="processed"))
+        for row in rows:
+            payload = json.loads(row["payload"])
+            items.append({
+                "id": row["queue_id"],
+                "filename": payload.get("original_filename", row["filename"]),
+                "metadata": payload.get("metadata", {}),
+                "status": payload.get("status", row["state"]),
+                "queued_at": payload.get("queued_at", row["queued_at"]),
+                "stored_path": row["stored_path"],
+                "processed_at": payload.get("processed_at"),
+                "result_summary": payload.get("result_summary"),
+                "analysis": payload.get("analysis"),
+            })
         return items
 
     def get_item(self, queue_id: str, *, include_processed: bool = False) -> Optional[MobileQueueItem]:
-        pending_path = self.pending_dir / queue_id
-        if pending_path.exists():
-            return self._build_item_from_dir(pending_path)
-        if include_processed:
-            processed_path = self.processed_dir / queue_id
-            if processed_path.exists():
-                return self._build_item_from_dir(processed_path)
-        return None
+        row = self._get_row(queue_id)
+        if row is None:
+            return None
+        if row["state"] == STATE_PROCESSED and not include_processed:
+            return None
+        item = self._build_item(row)
+        if item is None or not item.stored_path.exists():
+            return None
+        return item
 
     def update_metadata(self, queue_id: str, updates: Dict[str, Any], *, processed: bool = False) -> None:
-        base_dir = self.processed_dir if processed else self.pending_dir
-        item_dir = base_dir / queue_id
-        if not item_dir.exists():
-            raise FileNotFoundError(f"Queue item {queue_id} not found")
-        metadata_path = item_dir / "metadata.json"
-        payload: Dict[str, Any]
-        if metadata_path.exists():
-            payload = json.loads(metadata_path.read_text(encoding="utf-8"))
-        else:
-            payload = {}
-        payload.update(updates)
-        metadata_path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+        state = STATE_PROCESSED if processed else STATE_PENDING
+        with self._connect(immediate=True) as conn:
+            row = conn.execute(
+                "SELECT payload FROM mobile_upload_queue WHERE queue_id = ? AND state = ?",
+                (queue_id, state),
+            ).fetchone()
+            if row is None:
+                raise FileNotFoundError(f"Queue item {queue_id} not found")
+            payload = json.loads(row["payload"])
+            payload.update(updates)
+            conn.execute(
+                "UPDATE mobile_upload_queue SET payload = ? WHERE queue_id = ?",
+                (_dumps(payload), queue_id),
+            )
 
     def store_analysis(self, queue_id: str, analysis_payload: Dict[str, Any]) -> None:
         self.update_metadata(
@@ -106,77 +172,63 @@ class MobileUploadQueueManager:
         )
 
     def get_metadata(self, queue_id: str, *, processed: bool = False) -> Dict[str, Any]:
-        base_dir = self.processed_dir if processed else self.pending_dir
-        item_dir = base_dir / queue_id
-        if not item_dir.exists():
+        state = STATE_PROCESSED if processed else STATE_PENDING
+        row = self._get_row(queue_id)
+        if row is None or row["state"] != state:
             raise FileNotFoundError(f"Queue item {queue_id} not found")
-        metadata_path = item_dir / "metadata.json"
-        if not metadata_path.exists():
-            return {}
-        return json.loads(metadata_path.read_text(encoding="utf-8"))
-
-    def pop_next(self) -> Optional[MobileQueueItem]:
-        pending_items = sorted(self.pending_dir.iterdir(), key=lambda path: path.stat().st_ctime)
-        if not pending_items:
-            return None
-        item_dir = pending_items[0]
-        metadata_path = item_dir / "metadata.json"
-        metadata_payload = metadata_path.read_text(encoding="utf-8") if metadata_path.exists() else "{}"
-        payload = json.loads(metadata_payload)
-        stored_files = [p for p in item_dir.iterdir() if p.name != "metadata.json"]
-        file_path = stored_files[0] if stored_files else item_dir / "upload.bin"
-        if not file_path.exists():
-            return None
-        return MobileQueueItem(
-            queue_id=item_dir.name,
-            filename=payload.get("original_filename", file_path.name),
-            stored_path=file_path,
-            metadata=payload.get("metadata", {}),
-            status="pending",
-            queued_at=payload.get("queued_at", file_path.stat().st_ctime),
-        )
+        return json.loads(row["payload"])
 
-    def _load_items(self, directory: Path, *, status: str) -> Iterable[Dict[str, Any]]:
-        for item_dir in directory.iterdir():
-            if not item_dir.is_dir():
-                continue
-            metadata_path = item_dir / "metadata.json"
-            payload: Dict[str, Any]
-            if metadata_path.exists():
-                payload = json.loads(metadata_path.read_text(encoding="utf-8"))
-            else:
-                payload = {}
-            stored_files = [p for p in item_dir.iterdir() if p.name != "metadata.json"]
-            file_path = stored_files[0] if stored_files else item_dir / "upload.bin"
-            yield {
-                "id": item_dir.name,
-                "filename": payload.get("original_filename", file_path.name),
-                "metadata": payload.get("metadata", {}),
-                "status": payload.get("status", status),
-                "queued_at": payload.get("queued_at", file_path.stat().st_ctime),
-                "stored_path": str(file_path),
-                "processed_at": payload.get("processed_at"),
-                "result_summary": payload.get("result_summary"),
-                "analysis": payload.get("analysis"),
-            }
+    def pop_next(
+        self,
+        *,
+        worker_id: Optional[str] = None,
+        visibility_timeout: Optional[float] = None,
+    ) -> Optional[MobileQueueItem]:
+        """Claim the oldest visible pending item.
 
-    def _build_item_from_dir(self, item_dir: Path) -> Optional[MobileQueueItem]:
-        metadata_path = item_dir / "metadata.json"
-        if not metadata_path.exists():
-            return None
-        payload = json.loads(metadata_path.read_text(encoding="utf-8"))
-        stored_files = [p for p in item_dir.iterdir() if p.name != "metadata.json"]
-        file_path = stored_files[0] if stored_files else item_dir / "upload.bin"
-        if not file_path.exists():
-            return None
-        return MobileQueueItem(
-            queue_id=item_dir.name,
-            filename=payload.get("original_filename", file_path.name),
-            stored_path=file_path,
-            metadata=payload.get("metadata", {}),
-            status=payload.get("status", "pending"),
-            queued_at=payload.get("queued_at", file_path.stat().st_ctime),
-        )
+        The item stays pending but is hidden from other ``pop_next`` callers
+        until ``mark_processed``/``release`` or until the visibility timeout
+        elapses. Items whose upload file is missing are moved to the failed
+        state in the same transaction and skipped.
+        """
+        now = time.time()
+        timeout = self.visibility_timeout if visibility_timeout is None else visibility_timeout
+        token = f"{worker_id or 'worker'}:{uuid4().hex}"
+        with self._connect(immediate=True) as conn:
+            while True:
+                item = self._claim_oldest(conn, token, now + timeout, now)
+                if item is None:
+                    return None
+                if item.stored_path.exists():
+                    break
+                self._dead_letter(conn, item, "Stored upload file is missing")
+        item.status = "pending"
+        return item
+
+    def extend_claim(self, item: MobileQueueItem, *, visibility_timeout: Optional[float] = None) -> bool:
+        """Push back the visibility deadline of a claim this worker still holds."""
+        timeout = self.visibility_timeout if visibility_timeout is None else visibility_timeout
+        with self._connect(immediate=True) as conn:
+            cur = conn.execute(
+                """
+                UPDATE mobile_upload_queue SET claim_expires_at = ?
+                WHERE queue_id = ? AND claim_token = ? AND state = 'pending'
+                """,
+                (time.time() + timeout, item.queue_id, item.claim_token),
+            )
+            return cur.rowcount == 1
+
+    def release(self, item: MobileQueueItem) -> bool:
+        """Give up a claim so the item is immediately visible again."""
+        with self._connect(immediate=True) as conn:
+            cur = conn.execute(
+                """
+                UPDATE mobile_upload_queue SET claim_token = NULL, claim_expires_at = NULL
+                WHERE queue_id = ? AND claim_token = ? AND state = 'pending'
+                """,
+                (item.queue_id, item.claim_token),
+            )
+            return cur.rowcount == 1
 
     def mark_processed(
         self,
@@ -185,30 +237,178 @@ class MobileUploadQueueManager:
         status: str = "processed",
         result_summary: Optional[Dict[str, Any]] = None,
     ) -> None:
-        source_dir = item.stored_path.parent
-        target_dir = self.processed_dir / item.queue_id
-        target_dir.mkdir(parents=True, exist_ok=True)
-        metadata_path = source_dir / "metadata.json"
-        metadata_payload: Dict[str, Any]
-        if metadata_path.exists():
-            metadata_payload = json.loads(metadata_path.read_text(encoding="utf-8"))
-        else:
-            metadata_payload = {}
-        metadata_payload["status"] = status
-        metadata_payload["processed_at"] = datetime.now().timestamp()
-        if result_summary is not None:
-            metadata_payload["result_summary"] = result_summary
-        (target_dir / "metadata.json").write_text(
-            json.dumps(metadata_payload, ensure_ascii=False, indent=2),
-            encoding="utf-8",
+        with self._connect(immediate=True) as conn:
+            row = conn.execute(
+                "SELECT payload FROM mobile_upload_queue WHERE queue_id = ?",
+                (item.queue_id,),
+            ).fetchone()
+            if row is None:
+                raise FileNotFoundError(f"Queue item {item.queue_id} not found")
+            metadata_payload = json.loads(row["payload"])
+            metadata_payload["status"] = status
+            metadata_payload["processed_at"] = datetime.now().timestamp()
+            if result_summary is not None:
+                metadata_payload["result_summary"] = result_summary
+            conn.execute(
+                """
+                UPDATE mobile_upload_queue
+                SET state = 'processed', payload = ?, processed_at = ?,
+                    claim_token = NULL, claim_expires_at = NULL
+                WHERE queue_id = ?
+                """,
+                (_dumps(metadata_payload), metadata_payload["processed_at"], item.queue_id),
+            )
+
+    def pending_count(self) -> int:
+        with self._connect() as conn:
+            return conn.execute(
+                "SELECT COUNT(*) FROM mobile_upload_queue WHERE state = 'pending'"
+            ).fetchone()[0]
+
+    # -----------------
+    # Internals
+    # -----------------
+    def _claim_oldest(
+        self, conn: sqlite3.Connection, token: str, expires_at: float, now: float
+    ) -> Optional[MobileQueueItem]:
+        row = conn.execute(
+            """
+            UPDATE mobile_upload_queue
+            SET claim_token = ?, claim_expires_at = ?, attempts = attempts + 1
+            WHERE queue_id = (
+                SELECT queue_id FROM mobile_upload_queue
+                WHERE state = 'pending'
+                  AND (claim_expires_at IS NULL OR claim_expires_at <= ?)
+                ORDER BY queued_at
+                LIMIT 1
+            )
+            RETURNING *
+            """,
+            (token, expires_at, now),
+        ).fetchone()
+        return self._build_item(row) if row is not None else None
+
+    def _dead_letter(self, conn: sqlite3.Connection, item: MobileQueueItem, error: str) -> None:
+        logger.warning("Mobile queue item %s dead-lettered: %s (%s)", item.queue_id, error, item.stored_path)
+        payload = json.loads(conn.execute(
+            "SELECT payload FROM mobile_upload_queue WHERE queue_id = ?", (item.queue_id,)
+        ).fetchone()["payload"])
+        payload["status"] = STATE_FAILED
+        payload["error"] = error
+        payload["failed_at"] = time.time()
+        conn.execute(
+            """
+            UPDATE mobile_upload_queue
+            SET state = 'failed', payload = ?, claim_token = NULL, claim_expires_at = NULL
+            WHERE queue_id = ?
+            """,
+            (_dumps(payload), item.queue_id),
         )
-        # move upload file
-        stored_files = [p for p in source_dir.iterdir() if p.name != "metadata.json"]
-        for path in stored_files:
-            target_path = target_dir / path.name
-            target_path.write_bytes(path.read_bytes())
-        # cleanup source directory
-        for path in source_dir.iterdir():
-            if path.is_file():
-                path.unlink()
-        source_dir.rmdir()
\ No newline at end of file
+
+    @contextmanager
+    def _connect(self, *, immediate: bool = False) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(str(self.db_path), timeout=15.0, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            conn.execute("PRAGMA busy_timeout = 15000")
+            conn.execute("BEGIN IMMEDIATE" if immediate else "BEGIN")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+        finally:
+            conn.close()
+
+    def _init_schema(self) -> None:
+        conn = sqlite3.connect(str(self.db_path), timeout=15.0)
+        try:
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS mobile_upload_queue (
+                    queue_id TEXT PRIMARY KEY,
+                    filename TEXT NOT NULL,
+                    stored_path TEXT NOT NULL,
+                    state TEXT NOT NULL,
+                    queued_at REAL NOT NULL,
+                    payload TEXT NOT NULL,
+                    claim_token TEXT,
+                    claim_expires_at REAL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    processed_at REAL
+                )
+            """)
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_mobile_upload_queue_state_queued
+                ON mobile_upload_queue (state, queued_at)
+            """)
+            conn.commit()
+            empty = conn.execute("SELECT 1 FROM mobile_upload_queue LIMIT 1").fetchone() is None
+        finally:
+            conn.close()
+        if empty:
+            self._import_legacy_dirs()
+
+    def _import_legacy_dirs(self) -> None:
+        """One-time import of items stored in the old metadata.json layout."""
+        rows = []
+        for state, directory in ((STATE_PENDING, self.pending_dir), (STATE_PROCESSED, self.processed_dir)):
+            if not directory.exists():
+                continue
+            for item_dir in directory.iterdir():
+                metadata_path = item_dir / "metadata.json"
+                if not item_dir.is_dir() or not metadata_path.exists():
+                    continue
+                try:
+                    payload = json.loads(metadata_path.read_text(encoding="utf-8"))
+                except (OSError, ValueError):
+                    continue
+                stored_files = [p for p in item_dir.iterdir() if p.name != "metadata.json"]
+                file_path = stored_files[0] if stored_files else item_dir / "upload.bin"
+                queued_at = payload.get("queued_at") or item_dir.stat().st_ctime
+                rows.append((
+                    item_dir.name,
+                    payload.get("original_filename", file_path.name),
+                    str(file_path),
+                    state,
+                    queued_at,
+                    _dumps(payload),
+                    payload.get("processed_at"),
+                ))
+        if not rows:
+            return
+        with self._connect(immediate=True) as conn:
+            conn.executemany(
+                """
+                INSERT OR IGNORE INTO mobile_upload_queue
+                    (queue_id, filename, stored_path, state, queued_at, payload, processed_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                rows,
+            )
+
+    def _get_row(self, queue_id: str) -> Optional[sqlite3.Row]:
+        with self._connect() as conn:
+            return conn.execute(
+                "SELECT * FROM mobile_upload_queue WHERE queue_id = ?", (queue_id,)
+            ).fetchone()
+
+    @staticmethod
+    def _build_item(row: sqlite3.Row) -> Optional[MobileQueueItem]:
+        payload = json.loads(row["payload"])
+        stored_path = Path(row["stored_path"])
+        return MobileQueueItem(
+            queue_id=row["queue_id"],
+            filename=payload.get("original_filename", row["filename"]),
+            stored_path=stored_path,
+            metadata=payload.get("metadata", {}),
+            status=payload.get("status", row["state"]),
+            queued_at=payload.get("queued_at", row["queued_at"]),
+            claim_token=row["claim_token"],
+            attempts=row["attempts"],
+        )
+
+
+def _dumps(payload: Dict[str, Any]) -> str:
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
@@ -9,6 +9,7 @@ Combines multiple OCR engines for optimal text extraction
 import logging
 import io
 import os
+import threading
 from concurrent.futures import ThreadPoolExecutor, wait, ALL_COMPLETED
 import time
 from typing import Dict, Optional, Any, Tuple, List
@@ -58,15 +59,25 @@ except Exception as e:
     DocumentAIOCREngine = None
     DOCUMENT_AI_AVAILABLE = False
 
+OCR_PARALLELISM = max(1, int(os.getenv('OCR_PARALLELISM', '4')))
+# How often the shared engine re-probes engine availability (0 disables)
+OCR_AVAILABILITY_REFRESH_SECONDS = float(os.getenv('OCR_AVAILABILITY_REFRESH_SECONDS', '300'))
+
+
 class MultiEngineOCR:
-    """Multi-engine OCR system with fallback capabilities"""
+    """Multi-engine OCR system with fallback capabilities
+
+    Construction probes credentials and builds SDK clients, so callers should
+    use the shared instance from get_ocr_engine() rather than creating their own.
+    """
     
-    def __init__(self):
+    def __init__(self, executor: Optional[ThreadPoolExecutor] = None):
         """Initialize available OCR engines with graceful fallback"""
         logger.info("Initializing Multi-Engine OCR system...")
         
         # Engine toggles / configuration
         docai_env_flag = os.getenv('DOCUMENT_AI_ENABLED')
+        self._docai_env_flag = docai_env_flag
         self.document_ai_enabled = (
             docai_env_flag.lower() == 'true'
             if docai_env_flag is not None
@@ -74,8 +85,11 @@ class MultiEngineOCR:
         )
 
         # Shared executor for parallel OCR calls
-        max_workers = int(os.getenv('OCR_PARALLELISM', '4'))
-        self.parallel_executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._owns_executor = executor is None
+        self.parallel_executor = executor or ThreadPoolExecutor(
+            max_workers=OCR_PARALLELISM,
+            thread_name_prefix='ocr-engine',
+        )
 
         # Initialize engines
         self.document_ai = None
@@ -91,19 +105,6 @@ class MultiEngineOCR:
             except Exception as e:
                 logger.warning(f"Document AI initialization failed: {e}")
 
-        # If env flag is unset but credentials exist, enable Document AI automatically
-        if (
-            docai_env_flag is None
-            and self.document_ai is not None
-            and hasattr(self.document_ai, 'is_available')
-        ):
-            try:
-                if self.document_ai.is_available():
-                    self.document_ai_enabled = True
-                    logger.info("Document AI enabled automatically (credentials detected)")
-            except Exception:
-                pass
-        
         if GOOGLE_VISION_AVAILABLE:
             try:
                 # Priority 1: Check for JSON credentials in environment (Railway/cloud)
@@ -162,9 +163,22 @@ class MultiEngineOCR:
             except Exception as e:
                 logger.warning(f"OCR.space initialization failed: {e}")
         
-        # Check engine availability safely
-        self.engines_available = {}
+        self.engines_available: Dict[str, bool] = {}
+        self.availability_checked_at = 0.0
+        self.refresh_availability()
         
+        available_count = sum(self.engines_available.values())
+        logger.info(f"OCR engines initialized: {available_count}/4 available")
+        logger.info(f"Available: {[k for k, v in self.engines_available.items() if v]}")
+
+    def refresh_availability(self) -> Dict[str, bool]:
+        """Re-probe each engine's is_available() and swap in the result.
+
+        Runs at construction and then on the registry's refresh timer, never
+        per request. The new map replaces the old one in a single assignment so
+        concurrent extractions always see a consistent snapshot.
+        """
+        available: Dict[str, bool] = {}
         for engine_name, engine_obj in [
             ('document_ai', self.document_ai),
             ('google_vision', self.google_vision),
@@ -172,17 +186,29 @@ class MultiEngineOCR:
             ('ocr_space', self.ocr_space)
         ]:
             try:
-                self.engines_available[engine_name] = (
+                available[engine_name] = bool(
                     engine_obj is not None and 
                     hasattr(engine_obj, 'is_available') and 
                     engine_obj.is_available()
                 )
             except Exception:
-                self.engines_available[engine_name] = False
-        
-        available_count = sum(self.engines_available.values())
-        logger.info(f"OCR engines initialized: {available_count}/4 available")
-        logger.info(f"Available: {[k for k, v in self.engines_available.items() if v]}")
+                available[engine_name] = False
+
+        # If env flag is unset but credentials exist, enable Document AI automatically
+        if self._docai_env_flag is None and available['document_ai'] and not self.document_ai_enabled:
+            self.document_ai_enabled = True
+            logger.info("Document AI enabled automatically (credentials detected)")
+
+        if self.engines_available and available != self.engines_available:
+            logger.info(f"OCR engine availability changed: {available}")
+        self.engines_available = available
+        self.availability_checked_at = time.time()
+        return available
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the parallel executor if this instance created it."""
+        if self._owns_executor:
+            self.parallel_executor.shutdown(wait=wait, cancel_futures=True)
     
     def extract_structured(self, image_data: bytes, engine: Optional[str] = None) -> Dict[str, Any]:
         """Extract structured data with optional engine preference overrides."""
@@ -526,4 +552,72 @@ class MultiEngineOCR:
 
 def create_enhanced_ocr() -> MultiEngineOCR:
     """Factory function to create OCR instance"""
-    return MultiEngineOCR()
\ No newline at end of file
+    return MultiEngineOCR()
+
+
+class OCREngineRegistry:
+    """Lazily builds one MultiEngineOCR per process and keeps it fresh.
+
+    The registry owns the engine's bounded executor (and therefore the
+    long-lived SDK clients) and a daemon thread that re-probes engine
+    availability every ``refresh_interval`` seconds.
+    """
+
+    def __init__(self, factory=MultiEngineOCR, refresh_interval: float = OCR_AVAILABILITY_REFRESH_SECONDS):
+        self._factory = factory
+        self.refresh_interval = refresh_interval
+        self._engine: Optional[MultiEngineOCR] = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._refresher: Optional[threading.Thread] = None
+
+    def get(self) -> MultiEngineOCR:
+        engine = self._engine
+        if engine is not None:
+            return engine
+        with self._lock:
+            if self._engine is None:
+                self._engine = self._factory()
+                self._start_refresher()
+            return self._engine
+
+    def _start_refresher(self) -> None:
+        if self.refresh_interval <= 0:
+            return
+        self._stop.clear()
+        self._refresher = threading.Thread(target=self._refresh_loop, name='ocr-availability', daemon=True)
+        self._refresher.start()
+
+    def _refresh_loop(self) -> None:
+        while not self._stop.wait(self.refresh_interval):
+            engine = self._engine
+            if engine is None:
+                return
+            try:
+                engine.refresh_availability()
+            except Exception as exc:
+                logger.warning(f"OCR availability refresh failed: {exc}")
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the refresher and the engine executor; the next get() rebuilds."""
+        with self._lock:
+            engine, self._engine = self._engine, None
+            self._stop.set()
+            refresher, self._refresher = self._refresher, None
+        if refresher is not None and refresher is not threading.current_thread():
+            refresher.join(timeout=5)
+        if engine is not None:
+            engine.shutdown(wait=wait)
+
+
+_ocr_registry = OCREngineRegistry()
+
+
+def get_ocr_engine() -> MultiEngineOCR:
+    """Get the process-wide MultiEngineOCR, building it on first use."""
+    return _ocr_registry.get()
+
+
+def shutdown_ocr_engine() -> None:
+    """Release the shared engine's threads (called on application shutdown)."""
+    _ocr_registry.shutdown()
\ No newline at end of file
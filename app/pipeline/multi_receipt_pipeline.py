@@ -7,7 +7,7 @@ from pathlib import Path
 from typing import List, Sequence
 
 from app.history.submission_history import SubmissionHistory
-from app.ocr.multi_engine_ocr import MultiEngineOCR
+from app.ocr.multi_engine_ocr import get_ocr_engine
 from app.services.mapping_service import MappingService
 from app.services.receipt_builder import ReceiptBuilder
 
@@ -19,7 +19,7 @@ class MultiReceiptPipeline:
         self.engine = engine
         self.submission_history = submission_history
         self.logger = logging.getLogger(__name__)
-        self.ocr = MultiEngineOCR()
+        self.ocr = get_ocr_engine()
         self.mapping_service = MappingService()
         self.receipt_builder = ReceiptBuilder()
 
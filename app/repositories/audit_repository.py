@@ -21,10 +21,10 @@ import json
 import sqlite3
 import time
 from datetime import datetime
-from pathlib import Path
 from typing import List, Optional
 from uuid import UUID
 
+from app.config.data_paths import get_data_dir
 from app.models.audit import AuditEvent, AuditEventType
 
 
@@ -64,10 +64,7 @@ class AuditRepository:
         """
         if db_path is None:
             # Default: app/data/audit.db relative to project root
-            app_dir = Path(__file__).parent.parent
-            data_dir = app_dir / "data"
-            data_dir.mkdir(exist_ok=True)
-            db_path = str(data_dir / "audit.db")
+            db_path = str(get_data_dir() / "audit.db")
         
         self.db_path = db_path
         self._init_schema()
@@ -20,13 +20,45 @@ import json
 import sqlite3
 import time
 from datetime import datetime, timedelta
-from pathlib import Path
 from typing import List, Optional
 from uuid import UUID
 
+from pydantic import TypeAdapter, ValidationError
+
+from app.config.data_paths import get_data_dir
 from app.models.draft import DraftReceipt, DraftStatus
 from app.models.schema import Receipt
 
+try:  # Optional fast JSON decoder
+    import orjson
+    
+    _json_loads = orjson.loads
+except ImportError:  # pragma: no cover - orjson is optional
+    _json_loads = json.loads
+
+# Validates a whole page of drafts in one pydantic-core call
+_DRAFT_LIST_ADAPTER = TypeAdapter(List[DraftReceipt])
+
+# Columns copied verbatim into DraftReceipt during bulk hydration. Timestamps
+# stay ISO strings and are parsed by pydantic-core; the JSON snapshot columns
+# (excel_last_known_values, pre_edit_snapshot) stay raw text and are only
+# decoded by reconciliation when it actually needs them.
+_PASSTHROUGH_COLUMNS = (
+    "status", "created_at", "updated_at", "sent_at", "sent_by_user_id", "sent_by_role",
+    "hq_status", "hq_batch_id", "hq_transferred_at", "image_ref", "image_data", "creator_user_id",
+    "last_send_attempt_at", "last_send_error", "reviewed_at", "reviewed_by_user_id",
+    "format1_file_id", "format1_etag", "format1_row_index", "format1_worksheet_name",
+    "format2_file_id", "format2_etag", "format2_row_index", "format2_worksheet_name",
+    "write_completed_at", "excel_row_synced_at", "excel_row_hash",
+    "excel_last_known_values", "pre_edit_snapshot",
+)
+
+# Receipt fields mirrored into their own columns on save (list screens)
+_PROMOTED_COLUMNS = ("vendor_name", "receipt_date", "total_amount", "business_location_id", "staff_id")
+
+# Receipt fields a list view can request through list_projected()
+_PROJECTABLE_RECEIPT_FIELDS = frozenset(Receipt.model_fields)
+
 
 class DraftRepository:
     """SQLite-based persistence for DraftReceipt objects.
@@ -64,10 +96,7 @@ class DraftRepository:
         """
         if db_path is None:
             # Default: app/data/drafts.db relative to project root
-            app_dir = Path(__file__).parent.parent
-            data_dir = app_dir / "data"
-            data_dir.mkdir(exist_ok=True)
-            db_path = str(data_dir / "drafts.db")
+            db_path = str(get_data_dir() / "drafts.db")
         
         self.db_path = db_path
         
@@ -349,6 +378,40 @@ class DraftRepository:
             except sqlite3.OperationalError:
                 pass  # Column already exists
             
+            # Promoted list-view fields: copies of receipt_json values so draft
+            # list screens can be served without reading the JSON blob
+            added_promoted = False
+            for column in _PROMOTED_COLUMNS:
+                try:
+                    conn.execute(f"ALTER TABLE draft_receipts ADD COLUMN {column} TEXT")
+                    added_promoted = True
+                except sqlite3.OperationalError:
+                    pass  # Column already exists
+            if added_promoted:
+                conn.execute(
+                    "UPDATE draft_receipts SET "
+                    + ", ".join(f"{column} = json_extract(receipt_json, '$.{column}')" for column in _PROMOTED_COLUMNS)
+                    + " WHERE json_valid(receipt_json)"
+                )
+            
+            # Change version: bumped by triggers on every write so it is shared by
+            # all connections/processes, including writers outside this class
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS draft_change_version (
+                    id INTEGER PRIMARY KEY CHECK (id = 1),
+                    version INTEGER NOT NULL
+                )
+            """)
+            conn.execute("INSERT OR IGNORE INTO draft_change_version (id, version) VALUES (1, 0)")
+            for event in ("INSERT", "UPDATE", "DELETE"):
+                conn.execute(f"""
+                    CREATE TRIGGER IF NOT EXISTS trg_draft_change_version_{event.lower()}
+                    AFTER {event} ON draft_receipts
+                    BEGIN
+                        UPDATE draft_change_version SET version = version + 1 WHERE id = 1;
+                    END
+                """)
+            
             # Performance optimization: Create indexes for common query patterns
             # These indexes dramatically improve query performance when the table has many rows
             try:
@@ -419,7 +482,9 @@ class DraftRepository:
             be done by DraftService before calling this method.
         """
         # Serialize receipt to JSON
-        receipt_json = json.dumps(draft.receipt.model_dump(mode="json"))
+        receipt_payload = draft.receipt.model_dump(mode="json")
+        receipt_json = json.dumps(receipt_payload)
+        promoted = [receipt_payload.get(column) for column in _PROMOTED_COLUMNS]
         
         # Phase 5D-1.1: Defensive coercion - ensure creator_user_id is string before SQL insert
         creator_user_id_str = str(draft.creator_user_id) if draft.creator_user_id is not None else None
@@ -450,8 +515,9 @@ class DraftRepository:
                      format2_file_id, format2_etag, format2_row_index, format2_worksheet_name,
                      graph_api_write_confirmed, write_completed_at,
                      excel_row_synced_at, excel_row_hash, excel_conflict_detected,
-                     excel_last_known_values, pre_edit_snapshot, post_send_edit_count)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                     excel_last_known_values, pre_edit_snapshot, post_send_edit_count,
+                     vendor_name, receipt_date, total_amount, business_location_id, staff_id)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                 """, (
                     str(draft.draft_id),
                     receipt_json,
@@ -488,6 +554,7 @@ class DraftRepository:
                     draft.excel_last_known_values,
                     draft.pre_edit_snapshot,
                     draft.post_send_edit_count,
+                    *promoted,
                 ))
                 conn.commit()
                 return draft
@@ -621,7 +688,120 @@ class DraftRepository:
             cursor = conn.execute(query, params)
             
             rows = cursor.fetchall()
-            return [self._row_to_draft(row) for row in rows]
+            return self._rows_to_drafts(rows)
+        finally:
+            if should_close:
+                conn.close()
+    
+    def list_projected(
+        self,
+        receipt_fields: List[str],
+        status: Optional[DraftStatus] = None,
+        user_id: Optional[str] = None,
+        limit: Optional[int] = 1000,
+    ) -> List[dict]:
+        """Lightweight list for views: plain dicts, no model construction.
+        
+        Receipt fields are extracted inside SQLite with json_extract, so
+        neither receipt_json nor the large snapshot/image columns are
+        transferred or decoded in Python.
+        
+        Args:
+            receipt_fields: Receipt attribute names to include (e.g. vendor_name)
+            status: Optional status filter
+            user_id: Optional creator_user_id filter
+            limit: Maximum number of rows (None for no limit)
+        
+        Returns:
+            Dicts with draft_id, status, created_at, updated_at, sent_at,
+            creator_user_id plus the requested receipt fields, ordered by
+            created_at descending
+        """
+        unknown = set(receipt_fields) - _PROJECTABLE_RECEIPT_FIELDS
+        if unknown:
+            raise ValueError(f"Unknown receipt fields: {sorted(unknown)}")
+        
+        select = ["draft_id", "status", "created_at", "updated_at", "sent_at", "creator_user_id"]
+        select += [f"json_extract(receipt_json, '$.{name}') AS {name}" for name in receipt_fields]
+        query_parts = [f"SELECT {', '.join(select)} FROM draft_receipts"]
+        params: list = []
+        where_conditions = []
+        if status is not None:
+            where_conditions.append("status = ?")
+            params.append(status.value)
+        if user_id is not None:
+            where_conditions.append("creator_user_id = ?")
+            params.append(user_id)
+        if where_conditions:
+            query_parts.append("WHERE " + " AND ".join(where_conditions))
+        query_parts.append("ORDER BY created_at DESC")
+        if limit is not None:
+            query_parts.append("LIMIT ?")
+            params.append(limit)
+        
+        conn = self._get_connection()
+        should_close = (self._memory_conn is None)
+        conn.row_factory = sqlite3.Row
+        try:
+            rows = conn.execute("\n".join(query_parts), params).fetchall()
+            return [dict(row) for row in rows]
+        finally:
+            if should_close:
+                conn.close()
+    
+    def list_summaries(
+        self,
+        statuses: Optional[List[DraftStatus]] = None,
+        user_id: Optional[str] = None,
+        limit: Optional[int] = 1000,
+        order_by_sent: bool = False,
+    ) -> List[dict]:
+        """Summary rows for draft list screens, read from promoted columns.
+        
+        Only the displayed columns are selected; receipt_json and the image
+        and snapshot blobs are never read for rows saved since the promoted
+        columns were added (older rows fall back to json_extract).
+        
+        Args:
+            statuses: Optional list of statuses to include
+            user_id: Optional creator_user_id filter
+            limit: Maximum number of rows (None for no limit)
+            order_by_sent: Order by sent_at (falling back to created_at)
+                          instead of created_at, newest first
+        
+        Returns:
+            Plain dicts, one per draft
+        """
+        promoted = ", ".join(
+            f"COALESCE({column}, json_extract(receipt_json, '$.{column}')) AS {column}"
+            for column in _PROMOTED_COLUMNS
+        )
+        query_parts = [f"""
+            SELECT draft_id, status, created_at, updated_at, sent_at, reviewed_at,
+                   creator_user_id, send_attempt_count, last_send_error, {promoted}
+            FROM draft_receipts
+        """]
+        params: list = []
+        where_conditions = []
+        if statuses:
+            where_conditions.append(f"status IN ({','.join('?' * len(statuses))})")
+            params.extend(s.value for s in statuses)
+        if user_id is not None:
+            where_conditions.append("creator_user_id = ?")
+            params.append(user_id)
+        if where_conditions:
+            query_parts.append("WHERE " + " AND ".join(where_conditions))
+        query_parts.append("ORDER BY COALESCE(sent_at, created_at) DESC" if order_by_sent else "ORDER BY created_at DESC")
+        if limit is not None:
+            query_parts.append("LIMIT ?")
+            params.append(limit)
+        
+        conn = self._get_connection()
+        should_close = (self._memory_conn is None)
+        conn.row_factory = sqlite3.Row
+        try:
+            rows = conn.execute("\n".join(query_parts), params).fetchall()
+            return [dict(row) for row in rows]
         finally:
             if should_close:
                 conn.close()
@@ -753,10 +933,58 @@ class DraftRepository:
             """, [str(draft_id) for draft_id in draft_ids])
             
             rows = cursor.fetchall()
-            return [self._row_to_draft(row) for row in rows]
+            return self._rows_to_drafts(rows)
         finally:
             if should_close:
                 conn.close()
+    
+    def _rows_to_drafts(self, rows: List[sqlite3.Row]) -> List[DraftReceipt]:
+        """Convert many rows to DraftReceipt objects in one validation pass.
+        
+        Rows are decoded with the fast JSON decoder and validated together
+        through a TypeAdapter, which parses timestamps, UUIDs and the nested
+        Receipt in pydantic-core instead of per-row Python code. If the batch
+        fails validation (e.g. a legacy row with an odd timestamp format),
+        falls back to _row_to_draft row by row so behaviour is unchanged.
+        
+        Args:
+            rows: SQLite rows selected with the standard draft column list
+        
+        Returns:
+            DraftReceipt objects in row order
+        """
+        if not rows:
+            return []
+        
+        columns = set(rows[0].keys())
+        passthrough = [name for name in _PASSTHROUGH_COLUMNS if name in columns]
+        has_attempts = "send_attempt_count" in columns
+        has_post_send_edits = "post_send_edit_count" in columns
+        has_confirmed = "graph_api_write_confirmed" in columns
+        has_conflict = "excel_conflict_detected" in columns
+        
+        records = []
+        for row in rows:
+            record = {name: row[name] for name in passthrough}
+            record["draft_id"] = row["draft_id"]
+            record["receipt"] = _json_loads(row["receipt_json"])
+            # Empty strings mean "unset" in the per-row path; mirror that
+            for name in ("sent_at", "hq_transferred_at", "last_send_attempt_at", "reviewed_at",
+                         "write_completed_at", "excel_row_synced_at"):
+                if name in record and not record[name]:
+                    record[name] = None
+            if has_attempts:
+                record["send_attempt_count"] = row["send_attempt_count"]
+            if has_post_send_edits:
+                record["post_send_edit_count"] = row["post_send_edit_count"]
+            record["graph_api_write_confirmed"] = bool(row["graph_api_write_confirmed"]) if has_confirmed and row["graph_api_write_confirmed"] is not None else False
+            record["excel_conflict_detected"] = bool(row["excel_conflict_detected"]) if has_conflict and row["excel_conflict_detected"] is not None else False
+            records.append(record)
+        
+        try:
+            return _DRAFT_LIST_ADAPTER.validate_python(records)
+        except ValidationError:
+            return [self._row_to_draft(row) for row in rows]
 
     def _row_to_draft(self, row: sqlite3.Row) -> DraftReceipt:
         """Convert a database row to a DraftReceipt object.
@@ -890,6 +1118,23 @@ class DraftRepository:
             post_send_edit_count=post_send_edit_count,
         )
 
+    def get_change_version(self) -> int:
+        """Return the draft change version.
+        
+        The counter is incremented by triggers on every insert, update and
+        delete of draft_receipts, so it moves with writes made by any
+        process sharing the database. Read endpoints use it to build ETags
+        without loading any drafts.
+        """
+        conn = self._get_connection()
+        should_close = (self._memory_conn is None)
+        try:
+            row = conn.execute("SELECT version FROM draft_change_version WHERE id = 1").fetchone()
+            return row[0] if row else 0
+        finally:
+            if should_close:
+                conn.close()
+
     def count_by_status(self, status: DraftStatus) -> int:
         """Count drafts by status (useful for metrics/testing).
         
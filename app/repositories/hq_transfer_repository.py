@@ -8,22 +8,23 @@ from __future__ import annotations
 
 import sqlite3
 from datetime import datetime
-from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from app.config.data_paths import get_data_dir
 
 
 class HQTransferRepository:
     """SQLite repository for HQ transfer batches.
 
-    Table: hq_transfer_batches
+    Tables:
+        hq_transfer_batches: one row per office-month transfer attempt
+        hq_transfer_batch_rows: HQ ledger rows allocated to a batch before
+            they are written, so an interrupted commit can be reconciled
     """
 
     def __init__(self, db_path: Optional[str] = None):
         if db_path is None:
-            app_dir = Path(__file__).parent.parent
-            data_dir = app_dir / "data"
-            data_dir.mkdir(exist_ok=True)
-            db_path = str(data_dir / "drafts.db")
+            db_path = str(get_data_dir() / "drafts.db")
 
         self.db_path = db_path
         self._memory_conn: Optional[sqlite3.Connection] = None
@@ -66,6 +67,18 @@ class HQTransferRepository:
                 """
             )
 
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS hq_transfer_batch_rows (
+                    batch_id TEXT NOT NULL,
+                    draft_id TEXT NOT NULL,
+                    sheet TEXT NOT NULL,
+                    row_index INTEGER NOT NULL,
+                    PRIMARY KEY (batch_id, draft_id)
+                )
+                """
+            )
+
             conn.commit()
         finally:
             if should_close:
@@ -206,6 +219,70 @@ class HQTransferRepository:
             if should_close:
                 conn.close()
 
+    def list_batches(
+        self,
+        reporting_month: str,
+        statuses: Optional[Sequence[str]] = None,
+        created_before: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        conn = self._get_connection()
+        should_close = self._memory_conn is None
+        try:
+            query = """
+                SELECT batch_id, office_id, reporting_month, status, created_at,
+                       created_by_user_id, receipt_count, error_message
+                FROM hq_transfer_batches
+                WHERE reporting_month = ?
+            """
+            params: List[Any] = [reporting_month]
+            if statuses:
+                query += f" AND status IN ({','.join('?' * len(statuses))})"
+                params.extend(statuses)
+            if created_before:
+                query += " AND created_at < ?"
+                params.append(created_before)
+            rows = conn.execute(query + " ORDER BY created_at", params).fetchall()
+            return [dict(row) for row in rows]
+        finally:
+            if should_close:
+                conn.close()
+
+    def record_allocated_rows(self, batch_id: str, sheet: str, rows: Sequence[Tuple[str, int]]) -> None:
+        """Persist the HQ rows reserved for each draft of a batch (before they are written)."""
+        conn = self._get_connection()
+        should_close = self._memory_conn is None
+        try:
+            conn.execute("DELETE FROM hq_transfer_batch_rows WHERE batch_id = ?", (batch_id,))
+            conn.executemany(
+                """
+                INSERT INTO hq_transfer_batch_rows (batch_id, draft_id, sheet, row_index)
+                VALUES (?, ?, ?, ?)
+                """,
+                [(batch_id, draft_id, sheet, row_index) for draft_id, row_index in rows],
+            )
+            conn.commit()
+        finally:
+            if should_close:
+                conn.close()
+
+    def get_allocated_rows(self, batch_id: str) -> List[Dict[str, Any]]:
+        conn = self._get_connection()
+        should_close = self._memory_conn is None
+        try:
+            rows = conn.execute(
+                """
+                SELECT batch_id, draft_id, sheet, row_index
+                FROM hq_transfer_batch_rows
+                WHERE batch_id = ?
+                ORDER BY row_index
+                """,
+                (batch_id,),
+            ).fetchall()
+            return [dict(row) for row in rows]
+        finally:
+            if should_close:
+                conn.close()
+
     def count_batches(self, office_id: str, reporting_month: str) -> int:
         conn = self._get_connection()
         should_close = self._memory_conn is None
@@ -6,18 +6,83 @@ Design Decisions:
 - Uses same database as drafts (app/Data/drafts.db)
 - Email is unique constraint
 - Thread-safe with connection-per-operation pattern
+- Authenticated lookups go through a short TTL cache shared by all
+  repositories on the same database file
 """
 
 from __future__ import annotations
 
+import os
 import sqlite3
+import threading
+import time
 from datetime import datetime
-from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional, Tuple
 from uuid import UUID, uuid4
 
+from app.config.data_paths import get_data_dir
 from app.models.user import User, UserRole
 
+USER_CACHE_TTL_SECONDS = float(os.getenv("USER_CACHE_TTL_SECONDS", "60"))
+USER_CACHE_MAX_ENTRIES = int(os.getenv("USER_CACHE_MAX_ENTRIES", "1024"))
+
+
+class _UserCache:
+    """TTL cache of User rows keyed by user_id.
+
+    Writes through any repository on the same database invalidate the entry
+    immediately; writes from other processes are picked up within the TTL.
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: Dict[str, Tuple[float, User]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, user_id: str) -> Optional[User]:
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._entries[user_id]
+                return None
+            return entry[1].model_copy()
+
+    def put(self, user: User) -> None:
+        if self.ttl_seconds <= 0 or self.max_entries <= 0:
+            return
+        with self._lock:
+            if len(self._entries) >= self.max_entries:
+                now = time.monotonic()
+                for key in [key for key, (expires, _) in self._entries.items() if expires <= now]:
+                    del self._entries[key]
+                while len(self._entries) >= self.max_entries:
+                    del self._entries[next(iter(self._entries))]
+            self._entries[str(user.user_id)] = (time.monotonic() + self.ttl_seconds, user.model_copy())
+
+    def invalidate(self, user_id) -> None:
+        with self._lock:
+            self._entries.pop(str(user_id), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_user_caches: Dict[str, _UserCache] = {}
+_user_caches_lock = threading.Lock()
+
+
+def _cache_for(db_path: str) -> _UserCache:
+    with _user_caches_lock:
+        cache = _user_caches.get(db_path)
+        if cache is None:
+            cache = _UserCache(USER_CACHE_TTL_SECONDS, USER_CACHE_MAX_ENTRIES)
+            _user_caches[db_path] = cache
+        return cache
+
 
 class UserRepository:
     """SQLite-based persistence for User objects.
@@ -42,12 +107,10 @@ class UserRepository:
         """
         if db_path is None:
             # Default: app/Data/drafts.db (same as drafts)
-            app_dir = Path(__file__).parent.parent
-            data_dir = app_dir / "Data"
-            data_dir.mkdir(exist_ok=True)
-            db_path = str(data_dir / "drafts.db")
+            db_path = str(get_data_dir("Data") / "drafts.db")
         
         self.db_path = db_path
+        self._cache = _cache_for(db_path)
         self._init_schema()
 
     def _init_schema(self) -> None:
@@ -118,6 +181,7 @@ class UserRepository:
                 user.created_at.isoformat()
             ))
             conn.commit()
+            self._cache.invalidate(user.user_id)
             return user
         finally:
             conn.close()
@@ -188,6 +252,26 @@ class UserRepository:
         finally:
             conn.close()
 
+    def get_cached_user_by_id(self, user_id: UUID) -> Optional[User]:
+        """Get user by user_id through the authenticated-user cache.
+        
+        Used on every authenticated request. Entries live for
+        USER_CACHE_TTL_SECONDS and are dropped by upsert_user/set_user_active.
+        
+        Args:
+            user_id: User UUID
+        
+        Returns:
+            User if found, None otherwise
+        """
+        user = self._cache.get(str(user_id))
+        if user is not None:
+            return user
+        user = self.get_user_by_id(user_id)
+        if user is not None:
+            self._cache.put(user)
+        return user
+
     def get_user_by_login_id(self, login_id: str) -> Optional[User]:
         """Get user by login_id (human-friendly identifier).
         
@@ -269,6 +353,7 @@ class UserRepository:
                     WHERE login_id = ?
                 """, (display_name, email, role, login_id))
                 conn.commit()
+                self._cache.invalidate(existing.user_id)
                 
                 # Return updated user
                 return User(
@@ -315,3 +400,42 @@ class UserRepository:
                 )
         finally:
             conn.close()
+
+    def set_user_active(self, user_id: UUID, is_active: bool) -> bool:
+        """Activate or deactivate a user.
+        
+        Deactivation takes effect on the next request in this process; other
+        processes see it once their cached entry expires.
+        
+        Args:
+            user_id: User UUID
+            is_active: New active flag
+        
+        Returns:
+            True if the user exists, False otherwise
+        """
+        conn = sqlite3.connect(self.db_path)
+        try:
+            cursor = conn.execute(
+                "UPDATE users SET is_active = ? WHERE user_id = ?",
+                (1 if is_active else 0, str(user_id)),
+            )
+            conn.commit()
+            return cursor.rowcount > 0
+        finally:
+            conn.close()
+            self._cache.invalidate(user_id)
+
+
+_user_repository: Optional[UserRepository] = None
+_user_repository_lock = threading.Lock()
+
+
+def get_user_repository() -> UserRepository:
+    """Get or create the shared UserRepository (schema is set up once)."""
+    global _user_repository
+    if _user_repository is None:
+        with _user_repository_lock:
+            if _user_repository is None:
+                _user_repository = UserRepository()
+    return _user_repository
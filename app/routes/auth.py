@@ -12,10 +12,10 @@ from pydantic import BaseModel
 from app.auth.jwt import create_access_token
 from app.auth.password import verify_password
 from app.models.user import UserResponse
-from app.repositories.user_repository import UserRepository
+from app.repositories.user_repository import get_user_repository
 
 router = APIRouter(prefix="/api/auth", tags=["Authentication"])
-user_repo = UserRepository()
+user_repo = get_user_repository()
 
 
 class LoginRequest(BaseModel):
@@ -4,14 +4,178 @@ from __future__ import annotations
 
 import json
 import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
-from validators import normalize_location
+from validators import _canonical_token
+
+# Accessors re-stat the config files at most this often; get_version() always does
+CONFIG_RELOAD_CHECK_SECONDS = float(os.getenv("CONFIG_RELOAD_CHECK_SECONDS", "2"))
+_NORMALIZE_MEMO_MAX = 4096
+
+_logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ReferenceDataIndex:
+    """Immutable snapshot of locations, staff and vendor overrides with lookup maps."""
+    version: str
+    generation: int
+    locations: Tuple[str, ...] = ()
+    # canonical token -> canonical location (canonical names win over synonyms)
+    location_tokens: Dict[str, str] = field(default_factory=dict)
+    canonical_tokens: Tuple[Tuple[str, str], ...] = ()
+    staff_by_location: Dict[str, List[Dict[str, str]]] = field(default_factory=dict)
+    staff_names: Dict[Tuple[str, str], Optional[str]] = field(default_factory=dict)
+    staff_names_any: Dict[str, Optional[str]] = field(default_factory=dict)
+    vendor_overrides: List[Dict[str, object]] = field(default_factory=list)
+    # normalized alias -> matching rules in file order
+    vendor_aliases: Dict[str, List[Dict[str, object]]] = field(default_factory=dict)
+    _normalized: Dict[str, Optional[str]] = field(default_factory=dict, repr=False)
+
+    def normalize_location(self, raw: Optional[str]) -> Optional[str]:
+        """Same rules as validators.normalize_location, served from precomputed tokens."""
+        if not raw:
+            return None
+        try:
+            return self._normalized[raw]
+        except KeyError:
+            pass
+        token = _canonical_token(raw)
+        result = None
+        if token:
+            result = self.location_tokens.get(token)
+            if result is None:
+                for canonical_token, name in self.canonical_tokens:
+                    if token in canonical_token:
+                        result = name
+                        break
+        if len(self._normalized) < _NORMALIZE_MEMO_MAX:
+            self._normalized[raw] = result
+        return result
+
+
+def _file_stamp(path: Path) -> Tuple[int, int]:
+    try:
+        stat = path.stat()
+    except OSError:
+        return (0, 0)
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def _read_json(path: Path, default):
+    if not path.exists():
+        return default
+    with path.open("r", encoding="utf-8") as handle:
+        return json.load(handle) or default
+
+
+def _build_index(
+    locations_path: Path,
+    staff_config_path: Path,
+    vendor_overrides_path: Path,
+    version: str,
+    generation: int,
+) -> ReferenceDataIndex:
+    locations_data = _read_json(locations_path, {})
+    locations = tuple(locations_data.get("locations", []) or [])
+    synonyms = locations_data.get("synonyms", {}) or {}
+
+    location_tokens: Dict[str, str] = {}
+    for name in locations:
+        location_tokens.setdefault(_canonical_token(name), name)
+    for key, mapped in synonyms.items():
+        location_tokens.setdefault(_canonical_token(key), mapped)
+
+    resolved_staff = staff_config_path.resolve()
+    if not resolved_staff.exists():
+        _logger.warning("Staff config not found", extra={"path": str(resolved_staff)})
+    staff = _read_json(resolved_staff, {})
+    staff_names: Dict[Tuple[str, str], Optional[str]] = {}
+    staff_names_any: Dict[str, Optional[str]] = {}
+    for location, entries in staff.items():
+        for entry in entries:
+            staff_id = entry.get("id")
+            staff_names.setdefault((location, staff_id), entry.get("name"))
+            staff_names_any.setdefault(staff_id, entry.get("name"))
+
+    overrides = _read_json(vendor_overrides_path, [])
+    vendor_aliases: Dict[str, List[Dict[str, object]]] = {}
+    for rule in overrides:
+        for alias in rule.get("aliases", []) or []:
+            matches = vendor_aliases.setdefault(str(alias).strip().lower(), [])
+            if not matches or matches[-1] is not rule:
+                matches.append(rule)
+
+    _logger.info(
+        "Reference data loaded",
+        extra={"version": version, "locations": len(locations), "staff_locations": list(staff.keys())},
+    )
+    return ReferenceDataIndex(
+        version=version,
+        generation=generation,
+        locations=locations,
+        location_tokens=location_tokens,
+        canonical_tokens=tuple((_canonical_token(name), name) for name in locations),
+        staff_by_location=staff,
+        staff_names=staff_names,
+        staff_names_any=staff_names_any,
+        vendor_overrides=overrides,
+        vendor_aliases=vendor_aliases,
+    )
+
+
+class _ReferenceDataHolder:
+    """Process-wide owner of the index for one set of config files."""
+
+    def __init__(self, paths: Tuple[Path, Path, Path]) -> None:
+        self.paths = paths
+        self._lock = threading.Lock()
+        self._index: Optional[ReferenceDataIndex] = None
+        self._stamps: Optional[tuple] = None
+        self._checked_at = 0.0
+
+    def get(self, force_check: bool = False) -> ReferenceDataIndex:
+        index = self._index
+        if index is not None and not force_check and time.monotonic() - self._checked_at < CONFIG_RELOAD_CHECK_SECONDS:
+            return index
+        stamps = tuple(_file_stamp(path) for path in self.paths)
+        self._checked_at = time.monotonic()
+        if index is not None and stamps == self._stamps:
+            return index
+        with self._lock:
+            if self._index is None or stamps != self._stamps:
+                if self._index is not None:
+                    _logger.info("Config files changed; reloading reference data")
+                version = "-".join(f"{mtime}.{size}" for mtime, size in stamps)
+                generation = self._index.generation + 1 if self._index is not None else 1
+                self._index = _build_index(*self.paths, version=version, generation=generation)
+                self._stamps = stamps
+            return self._index
+
+
+_holders: Dict[Tuple[Path, Path, Path], _ReferenceDataHolder] = {}
+_holders_lock = threading.Lock()
+
+
+def _holder_for(paths: Tuple[Path, Path, Path]) -> _ReferenceDataHolder:
+    holder = _holders.get(paths)
+    if holder is None:
+        with _holders_lock:
+            holder = _holders.setdefault(paths, _ReferenceDataHolder(paths))
+    return holder
 
 
 class ConfigService:
-    """Load canonical config snapshots from the filesystem only."""
+    """Load canonical config snapshots from the filesystem only.
+
+    All instances pointing at the same files share one ReferenceDataIndex,
+    which is rebuilt when a file's mtime or size changes.
+    """
 
     def __init__(self) -> None:
         base_dir = Path(__file__).resolve().parents[2]
@@ -21,75 +185,64 @@ class ConfigService:
         self.staff_config_path = config_dir / "staff_config.json"
         self.vendor_overrides_path = config_dir / "vendor_overrides.json"
 
-        self._locations = None
-        self._staff = None
-        self._vendor_overrides = None
-
         self._logger = logging.getLogger(__name__)
 
+    def get_index(self, force_check: bool = False) -> ReferenceDataIndex:
+        """Return the shared reference-data index, reloading it if files changed."""
+        paths = (self.locations_path, self.staff_config_path, self.vendor_overrides_path)
+        return _holder_for(paths).get(force_check=force_check)
+
     # -----------------
     # Public accessors
     # -----------------
     def get_locations(self) -> List[str]:
         """Return canonical location list from config/locations.json."""
-        if self._locations is None:
-            self._locations = self._load_locations()
-        return list(self._locations)
+        return list(self.get_index().locations)
+
+    def get_version(self) -> str:
+        """Return a token that changes whenever a config file is edited.
+
+        Derived from file mtimes/sizes, so every worker process reports the
+        same value for the same files; downstream caches and ETags key on it.
+        Always re-stats the files and reloads the index if they moved.
+        """
+        return self.get_index(force_check=True).version
 
     def normalize_location(self, raw: Optional[str]) -> Optional[str]:
-        """Normalize location using validators.normalize_location with loaded config."""
-        cfg = {"locations": self.get_locations(), "synonyms": self._load_locations_synonyms()}
-        return normalize_location(raw, cfg)
+        """Normalize location using validators.normalize_location rules with loaded config."""
+        return self.get_index().normalize_location(raw)
 
     def get_staff_for_location(self, canonical_location: str) -> List[Dict[str, str]]:
         """Return staff list for a canonical location from staff_config.json."""
-        if self._staff is None:
-            self._staff = self._load_staff()
-        return self._staff.get(canonical_location, [])
+        return self.get_index().staff_by_location.get(canonical_location, [])
 
     def get_staff_name(self, staff_id: Optional[str], location: Optional[str] = None) -> Optional[str]:
         """Resolve staff name from staff_id.
-        
+
         Args:
             staff_id: Staff ID to resolve (e.g., "tok_001")
             location: Optional canonical location to narrow search
-        
+
         Returns:
             Staff name if found, None otherwise
         """
         if not staff_id:
             return None
-        
-        if self._staff is None:
-            self._staff = self._load_staff()
-        
+
+        index = self.get_index()
+
         # If location provided, search that location first
-        if location:
-            staff_list = self._staff.get(location, [])
-            for staff in staff_list:
-                if staff.get("id") == staff_id:
-                    return staff.get("name")
-        
+        if location and (location, staff_id) in index.staff_names:
+            return index.staff_names[(location, staff_id)]
+
         # Search all locations
-        for loc_staff_list in self._staff.values():
-            for staff in loc_staff_list:
-                if staff.get("id") == staff_id:
-                    return staff.get("name")
-        
-        return None
+        return index.staff_names_any.get(staff_id)
 
     def get_vendor_canonical(self, vendor_name: Optional[str]) -> Optional[str]:
         """Apply vendor overrides (case-insensitive, first match wins)."""
         if not vendor_name:
             return None
-        overrides = self._load_vendor_overrides()
-        target = vendor_name.strip().lower()
-        matches = []
-        for rule in overrides:
-            aliases = rule.get("aliases", []) or []
-            for alias in aliases:
-                if target == str(alias).strip().lower():
-                    matches.append(rule)
+        matches = self.get_index().vendor_aliases.get(vendor_name.strip().lower())
 
         if not matches:
             return vendor_name
@@ -99,43 +252,13 @@ class ConfigService:
 
         return matches[0].get("canonical_name") or vendor_name
 
-    # -----------------
-    # Internal loaders
-    # -----------------
-    def _load_locations(self) -> List[str]:
-        if not self.locations_path.exists():
-            return []
-        with self.locations_path.open("r", encoding="utf-8") as handle:
-            data = json.load(handle)
-        return data.get("locations", []) or []
-
-    def _load_locations_synonyms(self) -> Dict[str, str]:
-        if not self.locations_path.exists():
-            return {}
-        with self.locations_path.open("r", encoding="utf-8") as handle:
-            data = json.load(handle)
-        return data.get("synonyms", {}) or {}
-
-    def _load_staff(self) -> Dict[str, List[Dict[str, str]]]:
-        resolved = self.staff_config_path.resolve()
-        self._logger.info("Staff config path resolved", extra={"path": str(resolved)})
-        if not resolved.exists():
-            self._logger.warning("Staff config not found", extra={"path": str(resolved)})
-            return {}
-        with resolved.open("r", encoding="utf-8") as handle:
-            data = json.load(handle) or {}
-        self._logger.info(
-            "Staff config loaded",
-            extra={"path": str(resolved), "keys": list(data.keys())},
-        )
-        return data
-
-    def _load_vendor_overrides(self) -> List[Dict[str, object]]:
-        if self._vendor_overrides is not None:
-            return self._vendor_overrides
-        if not self.vendor_overrides_path.exists():
-            self._vendor_overrides = []
-            return self._vendor_overrides
-        with self.vendor_overrides_path.open("r", encoding="utf-8") as handle:
-            self._vendor_overrides = json.load(handle) or []
-        return self._vendor_overrides
+
+_config_service: Optional[ConfigService] = None
+
+
+def get_config_service() -> ConfigService:
+    """Get or create the shared ConfigService."""
+    global _config_service
+    if _config_service is None:
+        _config_service = ConfigService()
+    return _config_service
@@ -2,32 +2,29 @@
 Conflict Resolution Handler (Phase 9A.3, refined Phase 11A-2)
 
 This module provides automatic retry logic for ETag conflicts and
-in-memory write serialization for concurrent access control.
+per-file write serialization for concurrent access control.
 
 Concurrency Model:
     1. ETag-based optimistic locking (handled by Graph API)
        - Each write includes If-Match header with current ETag
        - 412 Precondition Failed indicates another process modified the file
-       
-    2. In-memory write lock per file (handled by this module)
-       - Prevents two threads/coroutines from writing to same file simultaneously
-       - Uses threading Lock (does NOT work across processes or server instances)
+    
+    2. Write lock per file (handled by this module)
+       - Prevents two threads/workers from writing to same file simultaneously
+       - Pluggable backend (see write_lock_backend):
+           memory: threading Lock, this process only
+           sqlite: SQLite lease table shared by all workers on this host,
+                   with lease expiry and fencing tokens
        - Does NOT replace ETag checking - both are used together
-       
+    
     The combination ensures:
-    - No two writes from this server instance overlap on the same file
+    - No two writes from this host overlap on the same file (sqlite backend)
     - If another server/user modifies the file, we detect and retry
 
 SCOPE LIMITATIONS (Step 4 refinement):
-    - In-memory locks are local to THIS process only
-    - Multiple workers/processes: ETag is your only protection
+    - Locks are local to THIS host (sqlite) or THIS process (memory)
     - Multiple server instances: ETag is your only protection
     - External users (SharePoint UI): ETag is your only protection
-    
-    For production multi-instance deployments, consider:
-    - Redis-based distributed locking
-    - Database-backed lease mechanism
-    - Graph API's own locking features (if available)
 
 FAILURE CLASSIFICATION (Phase 11A-2):
     - ETAG_CONFLICT: File modified by another process (412) - retryable
@@ -47,7 +44,7 @@ Usage:
     )
     
     # Manual lock management
-    with acquire_write_lock(file_id):
+    with acquire_write_lock(file_id) as lease:
         etag = get_file_metadata(file_id)['eTag']
         new_etag = append_row(file_id, "Sheet1", data, etag)
 
@@ -65,6 +62,7 @@ from functools import wraps
 from contextlib import contextmanager
 
 from app.services.excel_writer import ETagConflictError
+from app.services.write_lock_backend import WriteLease, get_lock_backend
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -72,8 +70,14 @@ logger = logging.getLogger(__name__)
 # Type variable for generic return types
 T = TypeVar('T')
 
-# Global lock registry - maps file_id to Lock
-_file_locks: dict = {}
+# Leases held by this process - maps file_id to WriteLease
+_active_leases: dict = {}
+
+# Per-file lock wait metrics - maps file_id to counters
+_lock_metrics: dict = {}
+
+# Waits longer than this count as contended acquisitions
+CONTENDED_WAIT_MS = 10.0
 _lock_registry_lock = threading.Lock()
 
 
@@ -109,7 +113,7 @@ def classify_write_error(error: Exception) -> WriteFailureType:
     
     Args:
         error: The exception to classify
-        
+    
     Returns:
         WriteFailureType indicating the nature of the failure
     """
@@ -156,7 +160,7 @@ def is_retryable_error(failure_type: WriteFailureType) -> bool:
     
     Args:
         failure_type: The WriteFailureType to check
-        
+    
     Returns:
         bool: True if the error might succeed on retry
     """
@@ -238,22 +242,43 @@ class LockTimeoutError(Exception):
         super().__init__(self.message)
 
 
-def _get_file_lock(file_id: str) -> threading.Lock:
+class LeaseLostError(LockTimeoutError):
     """
-    Get or create a lock for a specific file.
-    
-    Thread-safe access to per-file locks.
+    Raised when a write lease expired and was taken over by another worker.
     
-    Args:
-        file_id: OneDrive item ID
-        
-    Returns:
-        Lock object for the file
+    The fencing token held by this writer is stale, so the write is
+    refused before it reaches Graph.
     """
+    
+    def __init__(self, file_id: str, fencing_token: int):
+        self.fencing_token = fencing_token
+        super().__init__(file_id, 0)
+        self.message = (
+            f"Write lease for file {file_id[:20]}... (fencing token {fencing_token}) "
+            f"expired and was taken by another worker."
+        )
+        self.args = (self.message,)
+
+
+def _record_lock_wait(file_id: str, wait_ms: float, acquired: bool):
+    """Update per-file lock wait metrics."""
     with _lock_registry_lock:
-        if file_id not in _file_locks:
-            _file_locks[file_id] = threading.Lock()
-        return _file_locks[file_id]
+        metrics = _lock_metrics.setdefault(file_id, {
+            'acquisitions': 0,
+            'contended': 0,
+            'timeouts': 0,
+            'totalWaitMs': 0.0,
+            'maxWaitMs': 0.0,
+            'lastFencingToken': None,
+        })
+        if acquired:
+            metrics['acquisitions'] += 1
+        else:
+            metrics['timeouts'] += 1
+        if wait_ms >= CONTENDED_WAIT_MS:
+            metrics['contended'] += 1
+        metrics['totalWaitMs'] += wait_ms
+        metrics['maxWaitMs'] = max(metrics['maxWaitMs'], wait_ms)
 
 
 @contextmanager
@@ -262,46 +287,73 @@ def acquire_write_lock(file_id: str, timeout: float = 30.0):
     Acquire an exclusive write lock for a file.
     
     This prevents two simultaneous writes to the same file from this server
-    instance. Use this with a context manager:
+    instance (memory backend) or from any worker on this host (sqlite
+    backend). Use this with a context manager:
     
     Args:
         file_id: OneDrive item ID
         timeout: Maximum time to wait for lock (seconds)
-        
+    
     Yields:
-        None - use within context manager
-        
+        WriteLease with the fencing token for this hold
+    
     Raises:
         LockTimeoutError: If lock cannot be acquired within timeout (Phase 11A-2)
-        
+    
     Example:
-        with acquire_write_lock(file_id):
+        with acquire_write_lock(file_id) as lease:
             etag = get_file_metadata(file_id)['eTag']
             result = append_row(file_id, "Sheet1", data, etag)
     
     Note:
-        This is an in-memory lock only. It does NOT prevent writes from
-        other server instances or users. ETag checking handles cross-process
-        conflicts.
+        This does NOT prevent writes from other server instances or users.
+        ETag checking handles those conflicts.
     """
-    lock = _get_file_lock(file_id)
+    backend = get_lock_backend()
     
     logger.debug(f"Acquiring write lock for file {file_id[:20]}...")
     
-    acquired = lock.acquire(timeout=timeout)
-    if not acquired:
+    start = time.time()
+    lease = backend.acquire(file_id, timeout=timeout)
+    if lease is None:
+        _record_lock_wait(file_id, (time.time() - start) * 1000, acquired=False)
         # Phase 11A-2: Raise specialized exception for structured error handling
         raise LockTimeoutError(file_id, timeout)
     
-    logger.debug(f"Write lock acquired for file {file_id[:20]}...")
+    _record_lock_wait(file_id, lease.wait_ms, acquired=True)
+    with _lock_registry_lock:
+        _active_leases[file_id] = lease
+        _lock_metrics[file_id]['lastFencingToken'] = lease.fencing_token
+    
+    logger.debug(
+        f"Write lock acquired for file {file_id[:20]}... "
+        f"(token {lease.fencing_token}, waited {lease.wait_ms:.0f}ms)"
+    )
     
     try:
-        yield
+        yield lease
     finally:
-        lock.release()
+        with _lock_registry_lock:
+            if _active_leases.get(file_id) is lease:
+                del _active_leases[file_id]
+        backend.release(lease)
         logger.debug(f"Write lock released for file {file_id[:20]}...")
 
 
+def ensure_lease(lease: WriteLease) -> None:
+    """
+    Renew a write lease and verify its fencing token is still current.
+    
+    Call before each write issued under a lease so a writer that stalled
+    past its lease does not overwrite another worker's work.
+    
+    Raises:
+        LeaseLostError: If the lease was taken over
+    """
+    if not get_lock_backend().renew(lease):
+        raise LeaseLostError(lease.file_id, lease.fencing_token)
+
+
 def release_write_lock(file_id: str) -> bool:
     """
     Explicitly release a write lock for a file.
@@ -310,19 +362,19 @@ def release_write_lock(file_id: str) -> bool:
     
     Args:
         file_id: OneDrive item ID
-        
+    
     Returns:
         bool: True if lock was released, False if no lock was held
     """
-    lock = _get_file_lock(file_id)
+    with _lock_registry_lock:
+        lease = _active_leases.pop(file_id, None)
     
-    try:
-        lock.release()
-        logger.debug(f"Write lock explicitly released for file {file_id[:20]}...")
-        return True
-    except RuntimeError:
+    if lease is None or not get_lock_backend().release(lease):
         # Lock was not held
         return False
+    
+    logger.debug(f"Write lock explicitly released for file {file_id[:20]}...")
+    return True
 
 
 def with_etag_retry(
@@ -353,14 +405,14 @@ def with_etag_retry(
         retry_delay: Delay between retries in seconds (default: 0.5)
         worksheet_name: Worksheet name for error reporting
         operation_name: Operation name for error reporting
-        
+    
     Returns:
         Return value of the operation function
-        
+    
     Raises:
         WriteConflictError: If all retries exhausted
         Other exceptions: If non-ETag errors occur
-        
+    
     Example:
         def write_op(etag):
             return append_row(file_id, "Sheet1", ["data"], etag)
@@ -393,7 +445,7 @@ def with_etag_retry(
                 )
             
             return result
-            
+        
         except ETagConflictError as e:
             last_error = e
             
@@ -437,7 +489,7 @@ def with_etag_retry_decorator(
         etag_param: Name of the etag parameter in decorated function
         worksheet_param: Name of the worksheet parameter (optional)
         max_retries: Maximum retry attempts
-        
+    
     Example:
         @with_etag_retry_decorator(max_retries=3)
         def my_write_function(file_id, worksheet_name, data, etag):
@@ -504,11 +556,13 @@ def safe_write(
     - Format① and Format② writers should use this exclusively
     
     Flow:
-    1. Acquires exclusive in-memory lock for the file (same-process protection)
+    1. Acquires exclusive write lock for the file (same-host protection
+       with the sqlite backend, same-process with the memory backend)
     2. Fetches current ETag
-    3. Executes operation with If-Match header
-    4. Retries on ETag conflict up to max_retries times (cross-process protection)
-    5. Releases lock
+    3. Renews the lease and checks its fencing token
+    4. Executes operation with If-Match header
+    5. Retries on ETag conflict up to max_retries times (cross-instance protection)
+    6. Releases lock
     
     Args:
         file_id: OneDrive item ID (must be valid - no preflight validation)
@@ -517,16 +571,17 @@ def safe_write(
         max_retries: Maximum retry attempts (default: 3, with 0.5s delay between)
         worksheet_name: Worksheet name for logging
         operation_name: Operation name for logging
-        
+    
     Returns:
         Return value of the operation
-        
+    
     Raises:
         WriteConflictError: If all retries exhausted (persistent concurrent modification)
                            - failure_type=ETAG_CONFLICT when ETag mismatches persist
         LockTimeoutError: If write lock cannot be acquired within 30s
                          - failure_type=LOCK_TIMEOUT, includes file_id and timeout_seconds
-        
+        LeaseLostError: If the lease expired and another worker took it
+    
     Example:
         from app.services.onedrive_file_manager import get_file_metadata
         from app.services.excel_writer import append_row
@@ -539,9 +594,13 @@ def safe_write(
             operation_name="append_row"
         )
     """
-    with acquire_write_lock(file_id):
+    with acquire_write_lock(file_id) as lease:
+        def fenced_operation(etag: str) -> T:
+            ensure_lease(lease)
+            return operation(etag)
+        
         return with_etag_retry(
-            operation=operation,
+            operation=fenced_operation,
             file_id=file_id,
             get_etag_fn=get_etag_fn,
             max_retries=max_retries,
@@ -559,24 +618,47 @@ def clear_all_locks() -> int:
     Returns:
         int: Number of locks cleared
     """
-    global _file_locks
-    
     with _lock_registry_lock:
-        count = len(_file_locks)
-        _file_locks = {}
-        logger.info(f"Cleared {count} file locks")
-        return count
+        _active_leases.clear()
+        _lock_metrics.clear()
+    
+    count = get_lock_backend().clear()
+    logger.info(f"Cleared {count} file locks")
+    return count
 
 
 def get_lock_status() -> dict:
     """
-    Get status of all file locks.
+    Get status and wait metrics of all file locks.
     
     Returns:
-        dict: Map of file_id to lock status (locked/unlocked)
+        dict: Map of file_id to lock status:
+            available: True if no worker currently holds the lock
+            holder: Owner/fencing token of the current holder (if any)
+            acquisitions, contended, timeouts: Counters for this process
+            avgWaitMs, maxWaitMs: Lock wait times for this process
+            lastFencingToken: Token of the most recent hold in this process
     """
+    backend = get_lock_backend()
+    holders = backend.holders()
+    
     with _lock_registry_lock:
-        return {
-            file_id: not lock.locked()  # True = available, False = locked
-            for file_id, lock in _file_locks.items()
+        metrics = {file_id: dict(m) for file_id, m in _lock_metrics.items()}
+    
+    status = {}
+    for file_id in set(metrics) | set(holders):
+        m = metrics.get(file_id, {})
+        holder = holders.get(file_id)
+        acquisitions = m.get('acquisitions', 0)
+        status[file_id] = {
+            'available': holder is None or holder.get('expired', False),
+            'holder': holder,
+            'backend': backend.name,
+            'acquisitions': acquisitions,
+            'contended': m.get('contended', 0),
+            'timeouts': m.get('timeouts', 0),
+            'avgWaitMs': round(m.get('totalWaitMs', 0.0) / acquisitions, 2) if acquisitions else 0.0,
+            'maxWaitMs': round(m.get('maxWaitMs', 0.0), 2),
+            'lastFencingToken': m.get('lastFencingToken'),
         }
+    return status
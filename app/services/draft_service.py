@@ -21,7 +21,7 @@ from datetime import datetime
 from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
 from difflib import SequenceMatcher
 import re
-from typing import Any, Dict, List, Optional, Tuple
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 from uuid import UUID
 
 from app.models.audit import AuditEventType
@@ -31,12 +31,15 @@ from app.repositories.audit_repository import AuditRepository
 from app.repositories.draft_repository import DraftRepository
 from app.services.audit_logger import AuditLogger
 from app.services.config_service import ConfigService
-from app.services.summary_service import SummaryService
 import logging
 import os
 
 logger = logging.getLogger(__name__) 
 
+if TYPE_CHECKING:
+    # Imported lazily at runtime: the ledger writers pull in openpyxl
+    from app.services.summary_service import SummaryService
+
 
 class StaffLocationMismatchError(Exception):
     """Raised when selected staff does not belong to selected location."""
@@ -89,7 +92,10 @@ class DraftService:
             audit_logger: AuditLogger for audit trail. If None, creates default.
         """
         self.repository = repository or DraftRepository()
-        self.summary_service = summary_service or SummaryService()
+        if summary_service is None:
+            from app.services.summary_service import SummaryService
+            summary_service = SummaryService()
+        self.summary_service = summary_service
         self.config_service = config_service or ConfigService()
         self.audit_logger = audit_logger or AuditLogger(AuditRepository())
 
@@ -327,8 +333,8 @@ class DraftService:
         
         # Lazy import OCR dependencies (allows tests to inject mocks)
         try:
-            from app.ocr.multi_engine_ocr import MultiEngineOCR
-            ocr_engine = MultiEngineOCR()
+            from app.ocr.multi_engine_ocr import get_ocr_engine
+            ocr_engine = get_ocr_engine()
         except Exception as e:
             return {
                 "total": len(images),
@@ -657,6 +663,29 @@ class DraftService:
         
         return self.repository.list_all(status=status, user_id=user_id, include_image_data=include_image_data, limit=limit)
 
+    def list_draft_summaries(
+        self,
+        statuses: List[DraftStatus] | None = None,
+        user_id: str | None = None,
+        limit: int | None = 1000,
+        order_by_sent: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """List compact draft summaries for list screens (no full model hydration).
+        
+        Args:
+            statuses: Optional statuses to include (None for all)
+            user_id: If provided, only return drafts for this user
+            limit: Maximum number of rows to return
+            order_by_sent: Sort by sent_at (newest first) instead of created_at
+        
+        Returns:
+            Plain dicts with the promoted display columns
+        """
+        if isinstance(user_id, UUID):
+            user_id = str(user_id)
+        
+        return self.repository.list_summaries(statuses=statuses, user_id=user_id, limit=limit, order_by_sent=order_by_sent)
+
     def get_draft(self, draft_id: UUID) -> DraftReceipt | None:
         """Retrieve a single draft by ID.
         
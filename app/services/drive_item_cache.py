@@ -0,0 +1,241 @@
+"""Persistent OneDrive path -> item id cache.
+
+Every ledger read and write starts by turning a path such as
+``staff/Ethan Cole_Aichi.xlsx`` into a drive item id. Those ids survive
+edits and only change when an item is deleted, moved or renamed, so
+onedrive_file_manager resolves paths through this cache:
+
+    * hits are answered from memory (rows are also kept in SQLite, so a
+      restarted process starts warm);
+    * a 404 is cached as "missing" for a short time, so repeated existence
+      checks for a file that was never created stay cheap;
+    * a 404 on an item id, a rename, or a create drops the affected paths.
+
+Paths are keyed case-insensitively per drive (user id), as OneDrive is.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from app.config.data_paths import get_data_dir
+
+logger = logging.getLogger(__name__)
+
+
+DRIVE_ITEM_CACHE_ENABLED = os.environ.get("DRIVE_ITEM_CACHE_ENABLED", "1").lower() not in ("0", "false", "no")
+# Positive entries are re-resolved after this long even without a 404
+DRIVE_ITEM_CACHE_TTL_SECONDS = float(os.environ.get("DRIVE_ITEM_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+# "Does not exist" answers are trusted for this long
+DRIVE_ITEM_NEGATIVE_TTL_SECONDS = float(os.environ.get("DRIVE_ITEM_NEGATIVE_TTL_SECONDS", "60"))
+DRIVE_ITEM_CACHE_DB_PATH = os.environ.get("DRIVE_ITEM_CACHE_DB_PATH", "")
+
+
+@dataclass(frozen=True)
+class DriveItemRef:
+    """What a drive path resolved to; ``item_id`` is None for a missing item."""
+    path: str
+    item_id: Optional[str]
+    parent_id: Optional[str] = None
+    is_folder: bool = False
+    checked_at: float = 0.0
+
+    @property
+    def missing(self) -> bool:
+        return self.item_id is None
+
+
+def _key(drive: str, path: str) -> Tuple[str, str]:
+    return drive, path.strip("/").casefold()
+
+
+class DriveItemCache:
+    """Path -> item id map held in memory and written through to SQLite."""
+
+    def __init__(
+        self,
+        db_path: str | Path | None = None,
+        *,
+        ttl: float = DRIVE_ITEM_CACHE_TTL_SECONDS,
+        negative_ttl: float = DRIVE_ITEM_NEGATIVE_TTL_SECONDS,
+    ) -> None:
+        if db_path is None:
+            db_path = DRIVE_ITEM_CACHE_DB_PATH or get_data_dir() / "drive_items.db"
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._lock = threading.Lock()
+        self._entries: Dict[Tuple[str, str], Tuple[str, DriveItemRef]] = {}
+        self.hits = 0
+        self.misses = 0
+        self._init_schema()
+        self._load()
+
+    # -----------------
+    # Lookups
+    # -----------------
+    def get(self, drive: str, path: str) -> Optional[DriveItemRef]:
+        """Cached resolution of ``path``, or None if unknown or expired."""
+        key = _key(drive, path)
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None:
+                ref = cached[1]
+                max_age = self.negative_ttl if ref.missing else self.ttl
+                if time.time() - ref.checked_at < max_age:
+                    self.hits += 1
+                    return ref
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    # -----------------
+    # Updates
+    # -----------------
+    def remember(self, drive: str, path: str, item: Dict[str, Any]) -> DriveItemRef:
+        """Record a Graph driveItem found at ``path``."""
+        return self._store(drive, DriveItemRef(
+            path=path,
+            item_id=item.get("id"),
+            parent_id=(item.get("parentReference") or {}).get("id"),
+            is_folder="folder" in item or bool(item.get("isFolder")),
+            checked_at=time.time(),
+        ))
+
+    def remember_missing(self, drive: str, path: str) -> DriveItemRef:
+        """Record that nothing exists at ``path`` (yet)."""
+        return self._store(drive, DriveItemRef(path=path, item_id=None, checked_at=time.time()))
+
+    def invalidate_path(self, drive: str, path: str, recursive: bool = False) -> int:
+        """Forget ``path`` (and everything below it when ``recursive``)."""
+        drive_key, path_key = _key(drive, path)
+        prefix = path_key + "/"
+        with self._lock:
+            keys = [
+                key for key in self._entries
+                if key[0] == drive_key and (key[1] == path_key or (recursive and key[1].startswith(prefix)))
+            ]
+            for key in keys:
+                del self._entries[key]
+        with self._connect() as conn:
+            conn.execute("DELETE FROM drive_items WHERE drive = ? AND path_key = ?", (drive_key, path_key))
+            if recursive:
+                conn.execute(
+                    "DELETE FROM drive_items WHERE drive = ? AND substr(path_key, 1, ?) = ?",
+                    (drive_key, len(prefix), prefix),
+                )
+        return len(keys)
+
+    def invalidate_item(self, item_id: str) -> int:
+        """Forget every path that resolved to ``item_id``, and their descendants."""
+        with self._lock:
+            refs = [(key[0], ref.path) for key, (_, ref) in self._entries.items() if ref.item_id == item_id]
+        dropped = 0
+        for drive, path in refs:
+            dropped += self.invalidate_path(drive, path, recursive=True)
+        if dropped:
+            logger.info(f"Drive item cache: dropped {dropped} path(s) for item {item_id[:12]}...")
+        return dropped
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+        with self._connect() as conn:
+            conn.execute("DELETE FROM drive_items")
+
+    def stats(self) -> dict:
+        with self._lock:
+            missing = sum(1 for _, ref in self._entries.values() if ref.missing)
+            return {
+                "entries": len(self._entries),
+                "missing": missing,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+    # -----------------
+    # Storage
+    # -----------------
+    def _store(self, drive: str, ref: DriveItemRef) -> DriveItemRef:
+        drive_key, path_key = _key(drive, ref.path)
+        with self._lock:
+            self._entries[(drive_key, path_key)] = (drive, ref)
+        with self._connect() as conn:
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO drive_items
+                    (drive, path_key, path, item_id, parent_id, is_folder, checked_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                (drive_key, path_key, ref.path, ref.item_id, ref.parent_id, int(ref.is_folder), ref.checked_at),
+            )
+        return ref
+
+    def _load(self) -> None:
+        with self._connect() as conn:
+            rows = conn.execute("SELECT * FROM drive_items").fetchall()
+        with self._lock:
+            for row in rows:
+                ref = DriveItemRef(
+                    path=row["path"],
+                    item_id=row["item_id"],
+                    parent_id=row["parent_id"],
+                    is_folder=bool(row["is_folder"]),
+                    checked_at=row["checked_at"],
+                )
+                self._entries[(row["drive"], row["path_key"])] = (row["drive"], ref)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(str(self.db_path), timeout=15.0, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            conn.execute("PRAGMA busy_timeout = 15000")
+            yield conn
+        finally:
+            conn.close()
+
+    def _init_schema(self) -> None:
+        conn = sqlite3.connect(str(self.db_path), timeout=15.0)
+        try:
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS drive_items (
+                    drive TEXT NOT NULL,
+                    path_key TEXT NOT NULL,
+                    path TEXT NOT NULL,
+                    item_id TEXT,
+                    parent_id TEXT,
+                    is_folder INTEGER NOT NULL DEFAULT 0,
+                    checked_at REAL NOT NULL,
+                    PRIMARY KEY (drive, path_key)
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_drive_items_item ON drive_items(item_id)")
+            conn.commit()
+        finally:
+            conn.close()
+
+
+_cache: Optional[DriveItemCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_drive_item_cache() -> Optional[DriveItemCache]:
+    """Get or create the process-wide cache; None when DRIVE_ITEM_CACHE_ENABLED is off."""
+    global _cache
+    if not DRIVE_ITEM_CACHE_ENABLED:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = DriveItemCache()
+        return _cache
@@ -14,6 +14,11 @@ Architecture (Phase 10):
                                            ←→ Sync Service
                                            ←→ Local DB
 
+Parsed worksheet rows are cached per (file_id, worksheet, ETag). Each read
+re-checks the file's ETag with one metadata request; while it matches, no
+worksheet list or usedRange is downloaded again. Per-file row counts for the
+dashboard are cached by ETag as well and filled by a cheap used-range probe.
+
 Author: Phase 10 - Excel as Single Source of Truth
 Date: 2026-03-01
 """
@@ -21,26 +26,33 @@ Date: 2026-03-01
 from __future__ import annotations
 
 import logging
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime
 from decimal import Decimal
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 from uuid import uuid4
 
 from app.config.onedrive_structure import (
     get_location_file_path,
     get_staff_file_path,
+    get_template_sheet_name,
     LOCATION_FOLDER,
     STAFF_FOLDER,
 )
 from app.services.excel_reader import (
+    get_used_row_count,
     get_worksheet_names,
+    read_range,
     read_worksheet,
     ExcelReadError,
     WorksheetNotFoundError,
 )
 from app.services.onedrive_file_manager import (
-    list_files_in_folder,
+    iter_folder_children,
     get_file_id,
     get_file_metadata,
     file_exists,
@@ -50,6 +62,16 @@ from app.services.graph_client import GraphAPIError
 
 logger = logging.getLogger(__name__)
 
+# Parsed worksheets kept in memory (one entry per file/worksheet/ETag)
+EXCEL_READ_CACHE_MAX_ENTRIES = int(os.getenv("EXCEL_READ_CACHE_MAX_ENTRIES", "512"))
+# Concurrent location reads in get_all_location_receipts
+EXCEL_READ_WORKERS = int(os.getenv("EXCEL_READ_WORKERS", "4"))
+# Concurrent files probed when filling dashboard row counts
+EXCEL_ROW_COUNT_WORKERS = int(os.getenv("EXCEL_ROW_COUNT_WORKERS", "8"))
+
+# Only what ExcelFileInfo needs from a folder listing
+LEDGER_LISTING_FIELDS = ("id", "name", "eTag", "lastModifiedDateTime")
+
 
 # =============================================================================
 # COLUMN MAPPINGS (mirror of writer mappings for reading)
@@ -71,6 +93,7 @@ FORMAT1_COLUMNS = {
 }
 
 FORMAT1_DATA_START_ROW = 2  # 0-indexed (Excel row 3)
+FORMAT1_KEY_COLUMNS = [0, 1, 3, 5]
 
 # Format② (Location Ledger) column mapping
 FORMAT2_COLUMNS = {
@@ -88,6 +111,11 @@ FORMAT2_COLUMNS = {
 }
 
 FORMAT2_DATA_START_ROW = 5  # 0-indexed (Excel row 6)
+FORMAT2_KEY_COLUMNS = [0, 2, 3, 5]
+
+# Row-count probes read only A:L (every mapped column; the templates keep
+# per-row formulas to the right of it)
+ROW_COUNT_PROBE_LAST_COLUMN = "L"
 
 # Footer keywords to detect end of data
 FOOTER_KEYWORDS = ["合計", "残高", "計"]
@@ -167,6 +195,118 @@ class ExcelFileInfo:
     worksheets: List[str] = field(default_factory=list)
 
 
+@dataclass(frozen=True)
+class CachedWorksheet:
+    """Parsed receipt rows of one worksheet at one file ETag."""
+    rows: Tuple[ExcelReceiptRow, ...]
+    row_count: int
+
+
+class WorksheetRowCache:
+    """Thread-safe LRU of parsed worksheets keyed by (file_id, worksheet, ETag).
+
+    Any edit to a workbook changes its ETag, so stale entries can never be
+    served; when a newer ETag is stored for a file, its older entries are
+    dropped instead of waiting to age out.
+    """
+
+    def __init__(self, max_entries: int = EXCEL_READ_CACHE_MAX_ENTRIES) -> None:
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, str, str], CachedWorksheet]" = OrderedDict()
+        self._worksheet_names: Dict[str, Tuple[str, List[str]]] = {}
+        self._row_counts: Dict[str, Tuple[str, int]] = {}
+        self._file_etags: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, file_id: str, worksheet_name: str, etag: str) -> Optional[CachedWorksheet]:
+        key = (file_id, worksheet_name, etag)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, file_id: str, worksheet_name: str, etag: str, rows: List[ExcelReceiptRow]) -> CachedWorksheet:
+        entry = CachedWorksheet(rows=tuple(rows), row_count=len(rows))
+        if self.max_entries <= 0:
+            return entry
+        with self._lock:
+            self._observe_etag(file_id, etag)
+            self._entries[(file_id, worksheet_name, etag)] = entry
+            self._entries.move_to_end((file_id, worksheet_name, etag))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def get_worksheet_names(self, file_id: str, etag: str) -> Optional[List[str]]:
+        with self._lock:
+            cached = self._worksheet_names.get(file_id)
+            if cached is None or cached[0] != etag:
+                return None
+            return list(cached[1])
+
+    def put_worksheet_names(self, file_id: str, etag: str, names: List[str]) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._observe_etag(file_id, etag)
+            self._worksheet_names[file_id] = (etag, list(names))
+
+    def get_row_count(self, file_id: str, etag: str) -> Optional[int]:
+        """Receipt rows in the whole workbook at ``etag``, if known."""
+        with self._lock:
+            cached = self._row_counts.get(file_id)
+            if cached is None or cached[0] != etag:
+                return None
+            return cached[1]
+
+    def put_row_count(self, file_id: str, etag: str, row_count: int) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._observe_etag(file_id, etag)
+            self._row_counts[file_id] = (etag, row_count)
+
+    def invalidate(self, file_id: str) -> None:
+        """Forget everything cached for ``file_id``."""
+        with self._lock:
+            self._drop_file(file_id)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._worksheet_names.clear()
+            self._row_counts.clear()
+            self._file_etags.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "files": len(self._file_etags),
+                "row_counts": len(self._row_counts),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+    def _observe_etag(self, file_id: str, etag: str) -> None:
+        if self._file_etags.get(file_id, etag) != etag:
+            self._drop_file(file_id)
+        self._file_etags[file_id] = etag
+
+    def _drop_file(self, file_id: str) -> None:
+        for key in [key for key in self._entries if key[0] == file_id]:
+            del self._entries[key]
+        self._worksheet_names.pop(file_id, None)
+        self._row_counts.pop(file_id, None)
+        self._file_etags.pop(file_id, None)
+
+
 # =============================================================================
 # HELPER FUNCTIONS
 # =============================================================================
@@ -195,6 +335,29 @@ def _is_empty_row(row: List[Any], key_columns: List[int] = None) -> bool:
     )
 
 
+def _iter_receipt_rows(
+    rows: List[List[Any]],
+    data_start_row: int,
+    key_columns: List[int],
+) -> Iterator[Tuple[int, List[Any]]]:
+    """Yield (row_idx, row) for receipt rows: below the header, above the
+    footer, with at least one key column filled."""
+    for row_idx, row in enumerate(rows):
+        # Skip header rows
+        if row_idx < data_start_row:
+            continue
+        
+        # Stop at footer
+        if _is_footer_row(row):
+            break
+        
+        # Skip empty rows
+        if _is_empty_row(row, key_columns):
+            continue
+        
+        yield row_idx, row
+
+
 def _parse_excel_row(
     row: List[Any],
     column_mapping: Dict[int, str],
@@ -260,9 +423,10 @@ class ExcelDataProvider:
         files = provider.list_excel_files()
     """
     
-    def __init__(self):
+    def __init__(self, cache: Optional[WorksheetRowCache] = None):
         """Initialize the Excel data provider."""
         self.logger = logging.getLogger(__name__)
+        self.cache = cache if cache is not None else WorksheetRowCache()
     
     # =========================================================================
     # FILE LISTING
@@ -275,29 +439,10 @@ class ExcelDataProvider:
         Returns:
             List of ExcelFileInfo for each location ledger file
         """
-        files = []
-        
         try:
-            items = list_files_in_folder(LOCATION_FOLDER)
-            
-            for item in items:
-                if not item.get("name", "").endswith(".xlsx"):
-                    continue
-                
-                file_info = ExcelFileInfo(
-                    file_id=item.get("id", ""),
-                    file_path=f"{LOCATION_FOLDER}/{item.get('name', '')}",
-                    file_name=item.get("name", ""),
-                    etag=item.get("eTag", ""),
-                    last_modified=self._parse_datetime(
-                        item.get("lastModifiedDateTime")
-                    ),
-                )
-                files.append(file_info)
-            
+            files = list(self._iter_ledger_files(LOCATION_FOLDER))
             self.logger.info(f"Found {len(files)} location ledger files")
             return files
-            
         except Exception as e:
             self.logger.error(f"Failed to list location files: {e}")
             return []
@@ -309,33 +454,105 @@ class ExcelDataProvider:
         Returns:
             List of ExcelFileInfo for each staff ledger file
         """
-        files = []
-        
         try:
-            items = list_files_in_folder(STAFF_FOLDER)
-            
-            for item in items:
-                if not item.get("name", "").endswith(".xlsx"):
-                    continue
-                
-                file_info = ExcelFileInfo(
-                    file_id=item.get("id", ""),
-                    file_path=f"{STAFF_FOLDER}/{item.get('name', '')}",
-                    file_name=item.get("name", ""),
-                    etag=item.get("eTag", ""),
-                    last_modified=self._parse_datetime(
-                        item.get("lastModifiedDateTime")
-                    ),
-                )
-                files.append(file_info)
-            
+            files = list(self._iter_ledger_files(STAFF_FOLDER))
             self.logger.info(f"Found {len(files)} staff ledger files")
             return files
-            
         except Exception as e:
             self.logger.error(f"Failed to list staff files: {e}")
             return []
     
+    def _iter_ledger_files(self, folder: str) -> Iterator[ExcelFileInfo]:
+        """Yield ExcelFileInfo for each .xlsx in ``folder`` as listing pages arrive."""
+        for item in iter_folder_children(folder, select=LEDGER_LISTING_FIELDS):
+            name = item.get("name", "")
+            if not name.endswith(".xlsx"):
+                continue
+            yield ExcelFileInfo(
+                file_id=item.get("id", ""),
+                file_path=f"{folder}/{name}",
+                file_name=name,
+                etag=item.get("eTag", ""),
+                last_modified=self._parse_datetime(item.get("lastModifiedDateTime")),
+            )
+    
+    # =========================================================================
+    # ROW COUNTS
+    # =========================================================================
+    
+    def fill_row_counts(self, files: List[ExcelFileInfo]) -> List[ExcelFileInfo]:
+        """
+        Set ``row_count`` on each file from the ETag-keyed cache, probing the rest.
+        
+        Files whose ETag has a cached count cost nothing; the others are
+        probed concurrently (EXCEL_ROW_COUNT_WORKERS at a time). A file that
+        cannot be probed keeps row_count 0 and is retried next time.
+        
+        Returns:
+            The same list, updated in place
+        """
+        pending = []
+        for file_info in files:
+            cached = self.cache.get_row_count(file_info.file_id, file_info.etag) if file_info.etag else None
+            if cached is None:
+                pending.append(file_info)
+            else:
+                file_info.row_count = cached
+        
+        if pending:
+            workers = min(max(1, EXCEL_ROW_COUNT_WORKERS), len(pending))
+            if workers == 1:
+                counts = [self._probe_row_count(file_info) for file_info in pending]
+            else:
+                with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="excel-rowcount") as pool:
+                    counts = list(pool.map(self._probe_row_count, pending))
+            for file_info, count in zip(pending, counts):
+                file_info.row_count = count or 0
+                if count is not None and file_info.etag:
+                    self.cache.put_row_count(file_info.file_id, file_info.etag, count)
+            self.logger.info(f"Probed row counts for {len(pending)} of {len(files)} files")
+        
+        return files
+    
+    def _probe_row_count(self, file_info: ExcelFileInfo) -> Optional[int]:
+        """
+        Receipt rows in a ledger workbook, or None if it could not be read.
+        
+        Worksheets already parsed at this ETag contribute their exact count.
+        Others are counted with the readers' rule (non-empty key columns
+        between header and footer) over columns A:L only: the used range
+        alone would count the template's pre-filled formula and footer rows.
+        """
+        is_staff = file_info.file_path.startswith(f"{STAFF_FOLDER}/")
+        if is_staff:
+            data_start_row, key_columns = FORMAT1_DATA_START_ROW, FORMAT1_KEY_COLUMNS
+        else:
+            data_start_row, key_columns = FORMAT2_DATA_START_ROW, FORMAT2_KEY_COLUMNS
+        etag = file_info.etag or None
+        try:
+            total = 0
+            for ws_name in self._get_worksheet_names(file_info.file_id, etag):
+                if ws_name == get_template_sheet_name():
+                    continue
+                cached = self.cache.get(file_info.file_id, ws_name, etag) if etag else None
+                if cached is not None:
+                    total += cached.row_count
+                    continue
+                try:
+                    last_row = get_used_row_count(file_info.file_id, ws_name)
+                except WorksheetNotFoundError:
+                    continue
+                if last_row <= data_start_row:
+                    continue
+                rows = read_range(
+                    file_info.file_id, ws_name, f"A1:{ROW_COUNT_PROBE_LAST_COLUMN}{last_row}"
+                )
+                total += sum(1 for _ in _iter_receipt_rows(rows, data_start_row, key_columns))
+            return total
+        except (ExcelReadError, GraphAPIError) as e:
+            self.logger.warning(f"Row count probe failed for {file_info.file_path}: {e}")
+            return None
+    
     # =========================================================================
     # READING RECEIPTS FROM FORMAT② (LOCATION LEDGER)
     # =========================================================================
@@ -367,12 +584,7 @@ class ExcelDataProvider:
             self.logger.warning(f"Location file not found: {file_path}")
             return []
         
-        # Get file metadata for ETag
-        try:
-            metadata = get_file_metadata(file_id)
-            etag = metadata.get("eTag")
-        except Exception:
-            etag = None
+        etag = self._get_etag(file_id)
         
         # Determine which worksheets to read
         if worksheet_name:
@@ -383,7 +595,7 @@ class ExcelDataProvider:
         else:
             # Read all worksheets
             try:
-                worksheets_to_read = get_worksheet_names(file_id)
+                worksheets_to_read = self._get_worksheet_names(file_id, etag)
             except ExcelReadError:
                 self.logger.error(f"Failed to get worksheets for {file_path}")
                 return []
@@ -398,7 +610,7 @@ class ExcelDataProvider:
                 location_id=location_id,
                 etag=etag,
             )
-            receipts.extend(ws_receipts)
+            receipts.extend(ws_receipts.rows)
         
         self.logger.info(
             f"Read {len(receipts)} receipts from {location_id} "
@@ -413,46 +625,29 @@ class ExcelDataProvider:
         worksheet_name: str,
         location_id: str,
         etag: Optional[str] = None,
-    ) -> List[ExcelReceiptRow]:
+    ) -> CachedWorksheet:
         """Read all receipt rows from a Format② worksheet."""
-        try:
-            rows = read_worksheet(file_id, worksheet_name)
-        except WorksheetNotFoundError:
-            self.logger.debug(f"Worksheet {worksheet_name} not found in {file_path}")
-            return []
-        except ExcelReadError as e:
-            self.logger.error(f"Failed to read {worksheet_name}: {e}")
-            return []
-        
-        receipts = []
         
-        for row_idx, row in enumerate(rows):
-            # Skip header rows
-            if row_idx < FORMAT2_DATA_START_ROW:
-                continue
-            
-            # Stop at footer
-            if _is_footer_row(row):
-                break
+        def parse(rows: List[List[Any]]) -> List[ExcelReceiptRow]:
+            receipts = []
             
-            # Skip empty rows
-            if _is_empty_row(row, [0, 2, 3, 5]):  # Key columns for Format②
-                continue
+            for row_idx, row in _iter_receipt_rows(rows, FORMAT2_DATA_START_ROW, FORMAT2_KEY_COLUMNS):
+                receipt = _parse_excel_row(
+                    row=row,
+                    column_mapping=FORMAT2_COLUMNS,
+                    row_index=row_idx,
+                    file_id=file_id,
+                    file_path=file_path,
+                    worksheet_name=worksheet_name,
+                    format_type="format2",
+                    location_id=location_id,
+                    etag=etag,
+                )
+                receipts.append(receipt)
             
-            receipt = _parse_excel_row(
-                row=row,
-                column_mapping=FORMAT2_COLUMNS,
-                row_index=row_idx,
-                file_id=file_id,
-                file_path=file_path,
-                worksheet_name=worksheet_name,
-                format_type="format2",
-                location_id=location_id,
-                etag=etag,
-            )
-            receipts.append(receipt)
+            return receipts
         
-        return receipts
+        return self._read_worksheet_cached(file_id, file_path, worksheet_name, etag, parse)
     
     # =========================================================================
     # READING RECEIPTS FROM FORMAT① (STAFF LEDGER)
@@ -487,12 +682,7 @@ class ExcelDataProvider:
             self.logger.warning(f"Staff file not found: {file_path}")
             return []
         
-        # Get file metadata for ETag
-        try:
-            metadata = get_file_metadata(file_id)
-            etag = metadata.get("eTag")
-        except Exception:
-            etag = None
+        etag = self._get_etag(file_id)
         
         # Determine which worksheets to read
         if worksheet_name:
@@ -502,7 +692,7 @@ class ExcelDataProvider:
             worksheets_to_read = [f"{year}{month:02d}"]
         else:
             try:
-                worksheets_to_read = get_worksheet_names(file_id)
+                worksheets_to_read = self._get_worksheet_names(file_id, etag)
             except ExcelReadError:
                 return []
         
@@ -517,7 +707,7 @@ class ExcelDataProvider:
                 staff_name=staff_name,
                 etag=etag,
             )
-            receipts.extend(ws_receipts)
+            receipts.extend(ws_receipts.rows)
         
         return receipts
     
@@ -529,45 +719,83 @@ class ExcelDataProvider:
         location_id: str,
         staff_name: str,
         etag: Optional[str] = None,
-    ) -> List[ExcelReceiptRow]:
+    ) -> CachedWorksheet:
         """Read all receipt rows from a Format① worksheet."""
+        
+        def parse(rows: List[List[Any]]) -> List[ExcelReceiptRow]:
+            receipts = []
+            
+            for row_idx, row in _iter_receipt_rows(rows, FORMAT1_DATA_START_ROW, FORMAT1_KEY_COLUMNS):
+                receipt = _parse_excel_row(
+                    row=row,
+                    column_mapping=FORMAT1_COLUMNS,
+                    row_index=row_idx,
+                    file_id=file_id,
+                    file_path=file_path,
+                    worksheet_name=worksheet_name,
+                    format_type="format1",
+                    location_id=location_id,
+                    etag=etag,
+                )
+                receipts.append(receipt)
+            
+            return receipts
+        
+        return self._read_worksheet_cached(file_id, file_path, worksheet_name, etag, parse)
+    
+    # =========================================================================
+    # CACHED READS
+    # =========================================================================
+    
+    def _get_etag(self, file_id: str) -> Optional[str]:
+        """Current file ETag via one small metadata request; None if unavailable."""
         try:
-            rows = read_worksheet(file_id, worksheet_name)
+            return get_file_metadata(file_id).get("eTag")
+        except Exception:
+            return None
+    
+    def _get_worksheet_names(self, file_id: str, etag: Optional[str]) -> List[str]:
+        """Worksheet names, reused while the file ETag is unchanged."""
+        if etag:
+            names = self.cache.get_worksheet_names(file_id, etag)
+            if names is not None:
+                return names
+        names = get_worksheet_names(file_id)
+        if etag:
+            self.cache.put_worksheet_names(file_id, etag, names)
+        return names
+    
+    def _read_worksheet_cached(
+        self,
+        file_id: str,
+        file_path: str,
+        worksheet_name: str,
+        etag: Optional[str],
+        parse: Callable[[List[List[Any]]], List[ExcelReceiptRow]],
+    ) -> CachedWorksheet:
+        """
+        Return parsed rows for a worksheet, downloading usedRange only on a miss.
+        
+        A missing worksheet is cached as empty (adding one changes the ETag);
+        read errors are not cached. Without an ETag nothing is cached.
+        """
+        if etag:
+            cached = self.cache.get(file_id, worksheet_name, etag)
+            if cached is not None:
+                return cached
+        
+        try:
+            rows = parse(read_worksheet(file_id, worksheet_name))
         except WorksheetNotFoundError:
-            return []
+            self.logger.debug(f"Worksheet {worksheet_name} not found in {file_path}")
+            rows = []
         except ExcelReadError as e:
             self.logger.error(f"Failed to read {worksheet_name}: {e}")
-            return []
-        
-        receipts = []
+            return CachedWorksheet(rows=(), row_count=0)
         
-        for row_idx, row in enumerate(rows):
-            # Skip header rows
-            if row_idx < FORMAT1_DATA_START_ROW:
-                continue
-            
-            # Stop at footer
-            if _is_footer_row(row):
-                break
-            
-            # Skip empty rows
-            if _is_empty_row(row, [0, 1, 3, 5]):  # Key columns for Format①
-                continue
-            
-            receipt = _parse_excel_row(
-                row=row,
-                column_mapping=FORMAT1_COLUMNS,
-                row_index=row_idx,
-                file_id=file_id,
-                file_path=file_path,
-                worksheet_name=worksheet_name,
-                format_type="format1",
-                location_id=location_id,
-                etag=etag,
-            )
-            receipts.append(receipt)
-        
-        return receipts
+        if etag:
+            return self.cache.put(file_id, worksheet_name, etag, rows)
+        return CachedWorksheet(rows=tuple(rows), row_count=len(rows))
     
     # =========================================================================
     # SPECIFIC ROW ACCESS
@@ -643,27 +871,33 @@ class ExcelDataProvider:
         Returns:
             Dict mapping location_id to list of receipts
         """
-        result = {}
-        
         files = self.list_location_files()
         
+        location_ids = []
         for file_info in files:
             # Extract location ID from filename
             # Filename format: {LOCATION}_Accumulated.xlsx
             filename = file_info.file_name
             if filename.endswith("_Accumulated.xlsx"):
-                location_id = filename.replace("_Accumulated.xlsx", "")
+                location_ids.append(filename.replace("_Accumulated.xlsx", ""))
             else:
-                location_id = filename.replace(".xlsx", "")
-            
-            receipts = self.get_location_receipts(
-                location_id=location_id,
-                year=year,
-                month=month,
-            )
-            
-            if receipts:
-                result[location_id] = receipts
+                location_ids.append(filename.replace(".xlsx", ""))
+        
+        def read(location_id: str) -> List[ExcelReceiptRow]:
+            return self.get_location_receipts(location_id=location_id, year=year, month=month)
+        
+        workers = min(max(1, EXCEL_READ_WORKERS), max(1, len(location_ids)))
+        if workers == 1:
+            all_receipts = [read(location_id) for location_id in location_ids]
+        else:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="excel-read") as pool:
+                all_receipts = list(pool.map(read, location_ids))
+        
+        result = {
+            location_id: receipts
+            for location_id, receipts in zip(location_ids, all_receipts)
+            if receipts
+        }
         
         total_count = sum(len(r) for r in result.values())
         self.logger.info(
@@ -677,9 +911,34 @@ class ExcelDataProvider:
         year: Optional[int] = None,
         month: Optional[int] = None,
     ) -> int:
-        """Count receipts in a location's ledger without loading all data."""
-        receipts = self.get_location_receipts(location_id, year, month)
-        return len(receipts)
+        """Count receipts in a location's ledger from the cached per-worksheet counts."""
+        file_path = get_location_file_path(location_id)
+        
+        try:
+            file_id = get_file_id(file_path)
+        except OneDriveFileNotFoundError:
+            return 0
+        
+        etag = self._get_etag(file_id)
+        
+        if year and month:
+            worksheets = [f"{year}年{month}月"]
+        else:
+            try:
+                worksheets = self._get_worksheet_names(file_id, etag)
+            except ExcelReadError:
+                return 0
+        
+        return sum(
+            self._read_format2_worksheet(
+                file_id=file_id,
+                file_path=file_path,
+                worksheet_name=ws_name,
+                location_id=location_id,
+                etag=etag,
+            ).row_count
+            for ws_name in worksheets
+        )
     
     # =========================================================================
     # UTILITIES
@@ -457,6 +457,49 @@ def get_used_range_address(
         raise
 
 
+def get_used_row_count(
+    file_id: str,
+    worksheet_name: str
+) -> int:
+    """
+    Get the 1-indexed last row that holds a value, without downloading cells.
+    
+    Asks only for the used range's position (valuesOnly, $select), so the
+    response stays tiny however large the worksheet is.
+    
+    Args:
+        file_id: OneDrive item ID of the Excel file
+        worksheet_name: Name of the worksheet
+        
+    Returns:
+        int: Last used row number (1 for an empty worksheet)
+        
+    Raises:
+        WorksheetNotFoundError: If worksheet doesn't exist
+        ExcelReadError: If operation fails
+    """
+    encoded_name = _encode_worksheet_name(worksheet_name)
+    endpoint = (
+        f"{_build_workbook_endpoint(file_id)}/worksheets('{encoded_name}')"
+        f"/usedRange(valuesOnly=true)?$select=address,rowIndex,rowCount"
+    )
+    
+    try:
+        result = graph_get(endpoint)
+    except GraphAPIError as e:
+        if e.status_code == 404 or e.error_code == "ItemNotFound":
+            raise WorksheetNotFoundError(worksheet_name, file_id)
+        raise ExcelReadError(
+            "get_used_row_count",
+            f"Failed to get used range of '{worksheet_name}': {e.message}"
+        )
+    
+    if not result.get("address"):
+        return 0
+    # An empty sheet reports A1 (one row); callers subtract header rows anyway
+    return int(result.get("rowIndex") or 0) + int(result.get("rowCount") or 0)
+
+
 def read_range(
     file_id: str,
     worksheet_name: str,
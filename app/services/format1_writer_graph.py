@@ -244,8 +244,8 @@ def ensure_staff_file_exists(staff_name: str, location_id: str) -> str:
     """
     file_path = get_staff_file_path(staff_name, location_id)
     
-    # Check if file already exists
-    if file_exists(file_path):
+    # Check if file already exists (ask Graph: a cached "missing" may be stale)
+    if file_exists(file_path, fresh=True):
         return get_file_id(file_path)
     
     # Ensure folder exists
@@ -539,7 +539,8 @@ def write_format1_row(
     staff: str,
     year: int,
     month: int,
-    user_id: str
+    user_id: str,
+    file_id: Optional[str] = None,
 ) -> Dict[str, Any]:
     """
     Write a receipt row to the Format① staff ledger on OneDrive.
@@ -562,6 +563,8 @@ def write_format1_row(
         year: Target year
         month: Target month (1-12)
         user_id: User ID performing the operation
+        file_id: OneDrive item ID resolved ahead of time (see
+            SummaryService pipelining); resolved here when omitted
         
     Returns:
         dict: Result dictionary with keys:
@@ -606,8 +609,8 @@ def write_format1_row(
         }
     
     try:
-        # Ensure staff file exists
-        file_id = ensure_staff_file_exists(staff, office)
+        # Ensure staff file exists (unless resolved ahead of time)
+        file_id = file_id or ensure_staff_file_exists(staff, office)
         
         # Define write operation with ETag
         def do_write(etag: str) -> Dict[str, Any]:
@@ -246,8 +246,8 @@ def ensure_location_file_exists(location_id: str) -> str:
     """
     file_path = get_location_file_path(location_id)
     
-    # Check if file already exists
-    if file_exists(file_path):
+    # Check if file already exists (ask Graph: a cached "missing" may be stale)
+    if file_exists(file_path, fresh=True):
         return get_file_id(file_path)
     
     # Ensure folder exists
@@ -571,7 +571,8 @@ def write_format2_row(
     year: int,
     month: int,
     user_id: str,
-    staff_display: Optional[str] = None
+    staff_display: Optional[str] = None,
+    file_id: Optional[str] = None,
 ) -> Dict[str, Any]:
     """
     Write a receipt row to the Format② location ledger on OneDrive.
@@ -595,6 +596,8 @@ def write_format2_row(
         month: Target month (1-12)
         user_id: User ID performing the operation
         staff_display: Optional override for staff display name
+        file_id: OneDrive item ID resolved ahead of time (see
+            SummaryService pipelining); resolved here when omitted
         
     Returns:
         dict: Result dictionary with keys:
@@ -648,8 +651,8 @@ def write_format2_row(
         }
     
     try:
-        # Ensure location file exists
-        file_id = ensure_location_file_exists(location_id)
+        # Ensure location file exists (unless resolved ahead of time)
+        file_id = file_id or ensure_location_file_exists(location_id)
         
         # Define write operation with ETag
         def do_write(etag: str) -> Dict[str, Any]:
@@ -2,8 +2,9 @@
 Graph API Authentication Service (Phase 9A.1)
 
 This module handles OAuth2 client credentials flow authentication with Microsoft Graph API
-using MSAL (Microsoft Authentication Library). It caches access tokens and automatically
-refreshes them before expiry.
+using MSAL (Microsoft Authentication Library). It caches access tokens per tenant and
+scope, refreshes them in the background before expiry, and coalesces concurrent
+acquisitions into a single MSAL call.
 
 Usage:
     from app.services.graph_auth import get_access_token
@@ -22,8 +23,10 @@ Date: 2026-02-27
 
 import os
 import logging
+import random
+import threading
 import time
-from typing import Optional
+from typing import Dict, Optional, Sequence, Tuple
 from msal import ConfidentialClientApplication
 
 # Configure logging
@@ -32,118 +35,138 @@ logger = logging.getLogger(__name__)
 # Microsoft Graph API scope for client credentials flow
 GRAPH_SCOPE = ["https://graph.microsoft.com/.default"]
 
-# Token cache - stores the access token and expiry time
-_token_cache = {
-    "access_token": None,
-    "expires_at": 0  # Unix timestamp when token expires
-}
-
 # Buffer time in seconds - refresh token this many seconds before actual expiry
 TOKEN_EXPIRY_BUFFER = 300  # 5 minutes
 
-# MSAL app instance (lazy initialized)
-_msal_app: Optional[ConfidentialClientApplication] = None
+# Below this many seconds of remaining lifetime a cached token is no longer
+# handed out; callers wait for the (single) in-flight acquisition instead
+TOKEN_MIN_REMAINING = 30
+
+# When a pre-refresh hands back the token already cached, wait this long
+# before trying again instead of re-arming the timer straight away
+TOKEN_REFRESH_RETRY_SECONDS = 30
 
+# MSAL app instances per tenant (lazy initialized)
+_msal_apps: Dict[str, ConfidentialClientApplication] = {}
+_msal_lock = threading.Lock()
 
-def _get_msal_app() -> ConfidentialClientApplication:
+
+def _get_msal_app(tenant_id: Optional[str] = None) -> ConfidentialClientApplication:
     """
-    Get or create the MSAL ConfidentialClientApplication instance.
+    Get or create the MSAL ConfidentialClientApplication instance for a tenant.
     Lazy initialization to allow environment variables to be loaded first.
     
+    Args:
+        tenant_id: Azure AD tenant (defaults to MICROSOFT_TENANT_ID)
+    
     Returns:
         ConfidentialClientApplication: Configured MSAL app instance
         
     Raises:
         ValueError: If required environment variables are not set
     """
-    global _msal_app
-    
-    if _msal_app is not None:
-        return _msal_app
-    
     # Read credentials from environment variables
-    tenant_id = os.environ.get("MICROSOFT_TENANT_ID")
+    tenant_id = tenant_id or os.environ.get("MICROSOFT_TENANT_ID")
     client_id = os.environ.get("MICROSOFT_CLIENT_ID")
     client_secret = os.environ.get("MICROSOFT_CLIENT_SECRET")
     
-    # Validate required variables
-    missing_vars = []
-    if not tenant_id or tenant_id == "your-tenant-id-here":
-        missing_vars.append("MICROSOFT_TENANT_ID")
-    if not client_id or client_id == "your-client-id-here":
-        missing_vars.append("MICROSOFT_CLIENT_ID")
-    if not client_secret or client_secret == "your-client-secret-here":
-        missing_vars.append("MICROSOFT_CLIENT_SECRET")
-    
-    if missing_vars:
-        error_msg = f"Missing or invalid Microsoft Graph API credentials: {', '.join(missing_vars)}"
-        logger.error(error_msg)
-        raise ValueError(error_msg)
-    
-    # Build authority URL
-    authority = f"https://login.microsoftonline.com/{tenant_id}"
-    
-    # Create MSAL confidential client application
-    _msal_app = ConfidentialClientApplication(
-        client_id=client_id,
-        client_credential=client_secret,
-        authority=authority
-    )
+    with _msal_lock:
+        if tenant_id in _msal_apps:
+            return _msal_apps[tenant_id]
+        
+        # Validate required variables
+        missing_vars = []
+        if not tenant_id or tenant_id == "your-tenant-id-here":
+            missing_vars.append("MICROSOFT_TENANT_ID")
+        if not client_id or client_id == "your-client-id-here":
+            missing_vars.append("MICROSOFT_CLIENT_ID")
+        if not client_secret or client_secret == "your-client-secret-here":
+            missing_vars.append("MICROSOFT_CLIENT_SECRET")
+        
+        if missing_vars:
+            error_msg = f"Missing or invalid Microsoft Graph API credentials: {', '.join(missing_vars)}"
+            logger.error(error_msg)
+            raise ValueError(error_msg)
+        
+        # Build authority URL
+        authority = f"https://login.microsoftonline.com/{tenant_id}"
+        
+        # Create MSAL confidential client application
+        app = ConfidentialClientApplication(
+            client_id=client_id,
+            client_credential=client_secret,
+            authority=authority
+        )
+        _msal_apps[tenant_id] = app
     
     logger.info(f"MSAL app initialized for tenant: {tenant_id[:8]}...")
-    return _msal_app
+    return app
 
 
-def _is_token_valid() -> bool:
-    """
-    Check if the cached token is still valid (not expired).
-    
-    Returns:
-        bool: True if token exists and hasn't expired (with buffer), False otherwise
-    """
-    if _token_cache["access_token"] is None:
-        return False
-    
-    current_time = time.time()
-    # Check if token will expire within buffer time
-    return current_time < (_token_cache["expires_at"] - TOKEN_EXPIRY_BUFFER)
-
-
-def _acquire_new_token() -> str:
+def _acquire_new_token(scopes: Sequence[str] = GRAPH_SCOPE, tenant_id: Optional[str] = None) -> Tuple[str, int]:
     """
     Acquire a new access token using client credentials flow.
     
+    Args:
+        scopes: Scopes to request
+        tenant_id: Azure AD tenant (defaults to MICROSOFT_TENANT_ID)
+    
     Returns:
-        str: The access token
+        Tuple of (access token, expires_in seconds)
         
     Raises:
         Exception: If token acquisition fails
     """
-    msal_app = _get_msal_app()
+    msal_app = _get_msal_app(tenant_id)
     
     logger.info("Acquiring new Microsoft Graph API access token...")
     
     # Try to get token from MSAL's internal cache first
     result = msal_app.acquire_token_silent(
-        scopes=GRAPH_SCOPE,
+        scopes=list(scopes),
         account=None
     )
     
     if not result:
         # No cached token, acquire new one
-        result = msal_app.acquire_token_for_client(scopes=GRAPH_SCOPE)
+        result = msal_app.acquire_token_for_client(scopes=list(scopes))
+    
+    return _token_from_result(result)
+
+
+def _refresh_token(scopes: Sequence[str] = GRAPH_SCOPE, tenant_id: Optional[str] = None) -> Tuple[str, int]:
+    """
+    Acquire a fresh access token, bypassing MSAL's token cache.
+    
+    MSAL keeps serving a cached token until it is within 5 minutes of
+    expiry, which is exactly when the background pre-refresh runs; the
+    cached access token is dropped first so the request reaches Azure AD.
+    
+    Args:
+        scopes: Scopes to request
+        tenant_id: Azure AD tenant (defaults to MICROSOFT_TENANT_ID)
+    
+    Returns:
+        Tuple of (access token, expires_in seconds)
+    """
+    msal_app = _get_msal_app(tenant_id)
     
+    logger.info("Refreshing Microsoft Graph API access token...")
+    
+    cache = msal_app.token_cache
+    for entry in cache.find(cache.CredentialType.ACCESS_TOKEN, target=list(scopes)):
+        cache.remove_at(entry)
+    
+    return _token_from_result(msal_app.acquire_token_for_client(scopes=list(scopes)))
+
+
+def _token_from_result(result: dict) -> Tuple[str, int]:
+    """Unpack an MSAL result into (access token, expires_in), raising on errors."""
     if "access_token" in result:
-        # Calculate expiry time (tokens typically last 1 hour = 3600 seconds)
+        # Tokens typically last 1 hour = 3600 seconds
         expires_in = result.get("expires_in", 3600)
-        expires_at = time.time() + expires_in
-        
-        # Update cache
-        _token_cache["access_token"] = result["access_token"]
-        _token_cache["expires_at"] = expires_at
-        
         logger.info(f"Access token acquired successfully (expires in {expires_in}s)")
-        return result["access_token"]
+        return result["access_token"], expires_in
     
     # Token acquisition failed
     error = result.get("error", "unknown_error")
@@ -154,13 +177,203 @@ def _acquire_new_token() -> str:
     raise Exception(error_msg)
 
 
-def get_access_token() -> str:
+class _InFlight:
+    """One pending token acquisition shared by every waiting caller."""
+    
+    def __init__(self):
+        self.done = threading.Event()
+        self.token: Optional[str] = None
+        self.error: Optional[BaseException] = None
+
+
+class TokenManager:
+    """
+    Token cache with background pre-refresh and single-flight acquisition.
+    
+    Tokens are cached per (tenant, scopes). Once a token enters the
+    TOKEN_EXPIRY_BUFFER window it is refreshed by a background timer while
+    callers keep using the still-valid cached token. When no usable token
+    exists, concurrent callers coalesce onto one MSAL call.
+    
+    ``refresh_fn`` is used for the background pre-refresh and must not
+    answer from a cache; it defaults to ``_refresh_token``, or to
+    ``acquire_fn`` when only that is injected.
+    """
+    
+    def __init__(self, acquire_fn=None, refresh_fn=None):
+        self._acquire_fn = acquire_fn or _acquire_new_token
+        self._refresh_fn = refresh_fn or acquire_fn or _refresh_token
+        self._lock = threading.Lock()
+        self._cache: Dict[Tuple, Dict] = {}
+        self._inflight: Dict[Tuple, _InFlight] = {}
+        self._timers: Dict[Tuple, threading.Timer] = {}
+        self._metrics = {
+            "acquisitions": 0,
+            "failures": 0,
+            "background_refreshes": 0,
+            "coalesced_waits": 0,
+            "cache_hits": 0,
+            "total_latency_ms": 0.0,
+            "max_latency_ms": 0.0,
+            "last_latency_ms": None,
+        }
+    
+    @staticmethod
+    def _key(scopes: Sequence[str], tenant_id: Optional[str]) -> Tuple:
+        return (tenant_id or os.environ.get("MICROSOFT_TENANT_ID") or "", tuple(scopes))
+    
+    def get_token(self, scopes: Sequence[str] = GRAPH_SCOPE, tenant_id: Optional[str] = None) -> str:
+        """Return a valid token, acquiring one (single-flight) if needed."""
+        key = self._key(scopes, tenant_id)
+        now = time.time()
+        
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry and now < entry["expires_at"] - TOKEN_MIN_REMAINING:
+                self._metrics["cache_hits"] += 1
+                if now >= entry["refresh_at"]:
+                    # Inside the refresh window - refresh without blocking
+                    self._start_background_refresh(key, scopes, tenant_id)
+                return entry["access_token"]
+            
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = _InFlight()
+                self._inflight[key] = flight
+            else:
+                self._metrics["coalesced_waits"] += 1
+        
+        if leader:
+            self._run_acquisition(key, scopes, tenant_id, flight)
+        else:
+            flight.done.wait()
+        
+        if flight.error is not None:
+            raise flight.error
+        return flight.token
+    
+    def _start_background_refresh(self, key: Tuple, scopes, tenant_id) -> None:
+        """Kick off a refresh thread unless one is already running (caller holds _lock)."""
+        if key in self._inflight:
+            return
+        flight = _InFlight()
+        self._inflight[key] = flight
+        self._metrics["background_refreshes"] += 1
+        threading.Thread(
+            target=self._run_acquisition,
+            args=(key, scopes, tenant_id, flight, True),
+            daemon=True,
+            name="graph-token-refresh"
+        ).start()
+    
+    def _run_acquisition(self, key: Tuple, scopes, tenant_id, flight: _InFlight, refresh: bool = False) -> None:
+        start = time.time()
+        try:
+            acquire = self._refresh_fn if refresh else self._acquire_fn
+            token, expires_in = acquire(scopes, tenant_id)
+            latency_ms = (time.time() - start) * 1000
+            with self._lock:
+                previous = self._cache.get(key)
+                if previous is not None and previous["access_token"] == token:
+                    # Not a new token: keep the known expiry and back off
+                    # rather than re-arming the timer at its 1s floor
+                    logger.warning("Token refresh returned the cached token; retrying in %ss", TOKEN_REFRESH_RETRY_SECONDS)
+                    entry = dict(previous, refresh_at=start + TOKEN_REFRESH_RETRY_SECONDS)
+                else:
+                    entry = {
+                        "access_token": token,
+                        "expires_at": start + expires_in,
+                        "acquired_at": start,
+                        # Jitter spreads refreshes when several workers started together
+                        "refresh_at": start + expires_in - TOKEN_EXPIRY_BUFFER - random.uniform(0, 30),
+                    }
+                self._cache[key] = entry
+                self._metrics["acquisitions"] += 1
+                self._metrics["total_latency_ms"] += latency_ms
+                self._metrics["max_latency_ms"] = max(self._metrics["max_latency_ms"], latency_ms)
+                self._metrics["last_latency_ms"] = latency_ms
+                self._schedule_refresh(key, scopes, tenant_id, entry["refresh_at"] - time.time())
+            flight.token = token
+        except BaseException as exc:
+            with self._lock:
+                self._metrics["failures"] += 1
+            flight.error = exc
+        finally:
+            with self._lock:
+                if self._inflight.get(key) is flight:
+                    del self._inflight[key]
+            flight.done.set()
+    
+    def _schedule_refresh(self, key: Tuple, scopes, tenant_id, delay: float) -> None:
+        """Arm a timer to refresh after ``delay`` seconds (caller holds _lock)."""
+        old = self._timers.pop(key, None)
+        if old is not None:
+            old.cancel()
+        delay = max(1.0, delay)
+        timer = threading.Timer(delay, self._timer_refresh, args=(key, scopes, tenant_id))
+        timer.daemon = True
+        timer.name = "graph-token-timer"
+        self._timers[key] = timer
+        timer.start()
+    
+    def _timer_refresh(self, key: Tuple, scopes, tenant_id) -> None:
+        with self._lock:
+            if self._timers.get(key) is threading.current_thread():
+                del self._timers[key]
+            self._start_background_refresh(key, scopes, tenant_id)
+    
+    def clear(self) -> None:
+        """Drop all cached tokens and cancel pending refresh timers."""
+        with self._lock:
+            for timer in self._timers.values():
+                timer.cancel()
+            self._timers.clear()
+            self._cache.clear()
+    
+    def get_entry(self, scopes: Sequence[str] = GRAPH_SCOPE, tenant_id: Optional[str] = None) -> Optional[Dict]:
+        with self._lock:
+            entry = self._cache.get(self._key(scopes, tenant_id))
+            return dict(entry) if entry else None
+    
+    def get_metrics(self) -> dict:
+        """Acquisition counts and latency (no token values)."""
+        with self._lock:
+            m = dict(self._metrics)
+            cached = len(self._cache)
+            inflight = len(self._inflight)
+        acquisitions = m["acquisitions"]
+        return {
+            "acquisitions": acquisitions,
+            "failures": m["failures"],
+            "backgroundRefreshes": m["background_refreshes"],
+            "coalescedWaits": m["coalesced_waits"],
+            "cacheHits": m["cache_hits"],
+            "avgLatencyMs": round(m["total_latency_ms"] / acquisitions, 2) if acquisitions else 0.0,
+            "maxLatencyMs": round(m["max_latency_ms"], 2),
+            "lastLatencyMs": round(m["last_latency_ms"], 2) if m["last_latency_ms"] is not None else None,
+            "cachedTokens": cached,
+            "inFlight": inflight,
+        }
+
+
+# Global token manager
+_token_manager = TokenManager()
+
+
+def get_access_token(scopes: Sequence[str] = GRAPH_SCOPE, tenant_id: Optional[str] = None) -> str:
     """
     Get a valid Microsoft Graph API access token.
     
-    Returns a cached token if valid, otherwise acquires a new one.
+    Returns a cached token if valid, otherwise acquires a new one. Tokens
+    close to expiry are refreshed in the background; concurrent callers
+    without a usable token share one acquisition.
     This is the main entry point for authentication.
     
+    Args:
+        scopes: Scopes to request (defaults to Graph .default)
+        tenant_id: Azure AD tenant (defaults to MICROSOFT_TENANT_ID)
+    
     Returns:
         str: Valid access token for Microsoft Graph API
         
@@ -172,11 +385,7 @@ def get_access_token() -> str:
         token = get_access_token()
         headers = {"Authorization": f"Bearer {token}"}
     """
-    if _is_token_valid():
-        logger.debug("Using cached access token")
-        return _token_cache["access_token"]
-    
-    return _acquire_new_token()
+    return _token_manager.get_token(scopes, tenant_id)
 
 
 def clear_token_cache() -> None:
@@ -185,11 +394,9 @@ def clear_token_cache() -> None:
     
     Useful for testing or when credentials change.
     """
-    global _msal_app
-    
-    _token_cache["access_token"] = None
-    _token_cache["expires_at"] = 0
-    _msal_app = None
+    _token_manager.clear()
+    with _msal_lock:
+        _msal_apps.clear()
     
     logger.info("Token cache cleared")
 
@@ -204,7 +411,8 @@ def get_token_info() -> dict:
     Note:
         Does NOT return the actual token value for security reasons.
     """
-    if _token_cache["access_token"] is None:
+    entry = _token_manager.get_entry()
+    if entry is None:
         return {
             "has_token": False,
             "expires_at": None,
@@ -213,16 +421,21 @@ def get_token_info() -> dict:
         }
     
     current_time = time.time()
-    seconds_until_expiry = _token_cache["expires_at"] - current_time
+    seconds_until_expiry = entry["expires_at"] - current_time
     
     return {
         "has_token": True,
-        "expires_at": _token_cache["expires_at"],
-        "is_valid": _is_token_valid(),
+        "expires_at": entry["expires_at"],
+        "is_valid": current_time < (entry["expires_at"] - TOKEN_EXPIRY_BUFFER),
         "seconds_until_expiry": int(seconds_until_expiry) if seconds_until_expiry > 0 else 0
     }
 
 
+def get_token_metrics() -> dict:
+    """Token acquisition count and latency for monitoring endpoints."""
+    return _token_manager.get_metrics()
+
+
 # =============================================================================
 # PHASE 9 STEP 2: SAFE TEST OPERATIONS
 # =============================================================================
@@ -96,11 +96,14 @@ def _build_url(endpoint: str) -> str:
     Build full Graph API URL from endpoint.
     
     Args:
-        endpoint: API endpoint (e.g., "me/drive" or "/me/drive")
+        endpoint: API endpoint (e.g., "me/drive" or "/me/drive"), or an
+                  absolute URL such as an @odata.nextLink
         
     Returns:
         Full URL including base URL
     """
+    if endpoint.startswith(("https://", "http://")):
+        return endpoint
     # Remove leading slash if present
     endpoint = endpoint.lstrip("/")
     return f"{GRAPH_API_BASE_URL}/{endpoint}"
@@ -608,13 +611,16 @@ def graph_request_queued(
         # Low priority batch item
         result = graph_request_queued("GET", "users/list", priority='low')
     """
-    from app.services.request_queue import enqueue
+    from app.services.request_queue import enqueue, lane_for_request
     
+    kind, lane = lane_for_request(method, endpoint)
     return enqueue(
         request_fn=lambda: graph_request(method, endpoint, body, timeout),
         priority=priority,
         wait=wait,
-        timeout=queue_timeout
+        timeout=queue_timeout,
+        kind=kind,
+        lane=lane
     )
 
 
@@ -635,7 +641,8 @@ def graph_request_resilient(
     
     Pipeline:
         1. Request goes through queue (rate limiting, concurrency control)
-        2. Retry wrapper handles transient failures
+        2. Transient failures are re-queued with backoff (the execution
+           slot is released while waiting)
         3. Health monitor tracks success/failure/throttle
     
     Args:
@@ -668,8 +675,7 @@ def graph_request_resilient(
             priority='high'
         )
     """
-    from app.services.request_queue import enqueue
-    from app.services.retry_engine import with_retry
+    from app.services.request_queue import enqueue_with_retry, lane_for_request
     from app.services.graph_health_monitor import (
         record_success, record_failure, record_throttle, is_circuit_open
     )
@@ -689,18 +695,19 @@ def graph_request_resilient(
         if isinstance(error, GraphAPIError) and error.status_code == 429:
             record_throttle()
     
-    def make_request():
-        """The actual request with retry logic."""
-        return with_retry(
-            fn=lambda: graph_request(method, endpoint, body, timeout),
-            max_retries=max_retries,
-            operation_name=op_name,
-            on_retry=on_retry
-        )
+    kind, lane = lane_for_request(method, endpoint)
     
     try:
-        # Go through queue
-        result = enqueue(make_request, priority=priority, wait=True)
+        # Go through queue; retries are re-queued rather than slept in place
+        result = enqueue_with_retry(
+            lambda: graph_request(method, endpoint, body, timeout),
+            priority=priority,
+            kind=kind,
+            lane=lane,
+            max_retries=max_retries,
+            on_retry=on_retry,
+            operation_name=op_name
+        )
         
         # Record success
         response_time = (time.time() - start_time) * 1000
@@ -758,8 +765,7 @@ def graph_request_with_etag_resilient(
         )
         new_etag = result['etag']
     """
-    from app.services.request_queue import enqueue
-    from app.services.retry_engine import with_retry
+    from app.services.request_queue import enqueue_with_retry, lane_for_request
     from app.services.graph_health_monitor import record_success, record_failure, record_throttle
     
     op_name = operation_name or f"{method} {endpoint}"
@@ -769,18 +775,20 @@ def graph_request_with_etag_resilient(
         if isinstance(error, GraphAPIError) and error.status_code == 429:
             record_throttle()
     
-    def make_request():
-        return with_retry(
-            fn=lambda: graph_request_with_etag(method, endpoint, body, etag, timeout),
+    kind, lane = lane_for_request(method, endpoint)
+    
+    try:
+        result = enqueue_with_retry(
+            lambda: graph_request_with_etag(method, endpoint, body, etag, timeout),
+            priority=priority,
+            kind=kind,
+            lane=lane,
             max_retries=max_retries,
-            operation_name=op_name,
             on_retry=on_retry,
+            operation_name=op_name,
             # Don't retry 412 ETag conflicts - let caller handle
             retry_on_status_codes=[429, 502, 503, 504]
         )
-    
-    try:
-        result = enqueue(make_request, priority=priority, wait=True)
         
         response_time = (time.time() - start_time) * 1000
         record_success(response_time, op_name)
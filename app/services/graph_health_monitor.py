@@ -5,6 +5,7 @@ This module provides health monitoring for Graph API calls:
     - Track success/failure rates
     - Monitor throttle events
     - Calculate response time averages
+    - Streaming p50/p90/p99 per operation and window (fixed memory)
     - Circuit breaker pattern support
 
 Usage:
@@ -19,6 +20,9 @@ Usage:
     # Get health report
     report = get_health_report()
     
+    # Percentiles for an arbitrary window / operation
+    p = get_percentiles(window_seconds=900, operation="GET me/drive")
+    
     # Check health
     if is_healthy():
         # proceed
@@ -28,13 +32,13 @@ Date: 2026-02-28
 """
 
 import logging
+import math
+import re
 import threading
 import time
-from collections import deque
-from dataclasses import dataclass, field
-from datetime import datetime, timedelta
+from datetime import datetime
 from enum import Enum
-from typing import Optional, Dict, List, Any
+from typing import Optional, Dict, List, Iterable, Tuple
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -47,15 +51,188 @@ class HealthStatus(Enum):
     UNHEALTHY = "unhealthy"
 
 
-@dataclass
-class OperationRecord:
-    """Record of a single operation."""
-    timestamp: float
-    success: bool
-    response_time_ms: float
-    operation: str = ""
-    error_code: str = ""
-    is_throttle: bool = False
+class LatencyHistogram:
+    """
+    Fixed-memory, log-bucketed latency sketch (HDR-style).
+    
+    Values are mapped to geometrically growing buckets so every recorded
+    latency is represented within ``RELATIVE_ERROR`` of its true value.
+    Recording is O(1) and the bucket array never grows beyond
+    ``BUCKET_COUNT`` entries, so percentiles cost the same no matter how
+    much traffic has been recorded.
+    """
+    
+    RELATIVE_ERROR = 0.02
+    MIN_VALUE_MS = 1.0
+    MAX_VALUE_MS = 600_000.0  # 10 minutes - anything slower is clamped
+    
+    _GROWTH = 1.0 + 2 * RELATIVE_ERROR
+    _LOG_GROWTH = math.log(_GROWTH)
+    BUCKET_COUNT = int(math.ceil(math.log(MAX_VALUE_MS / MIN_VALUE_MS) / _LOG_GROWTH)) + 2
+    
+    __slots__ = ("counts", "count", "total", "min", "max")
+    
+    def __init__(self):
+        self.counts: List[int] = [0] * self.BUCKET_COUNT
+        self.count = 0
+        self.total = 0.0
+        self.min = 0.0
+        self.max = 0.0
+    
+    @classmethod
+    def bucket_index(cls, value_ms: float) -> int:
+        """Bucket holding ``value_ms``; bucket 0 collects sub-millisecond values."""
+        if value_ms < cls.MIN_VALUE_MS:
+            return 0
+        index = int(math.log(value_ms / cls.MIN_VALUE_MS) / cls._LOG_GROWTH) + 1
+        return min(index, cls.BUCKET_COUNT - 1)
+    
+    @classmethod
+    def bucket_upper_bound(cls, index: int) -> float:
+        """Upper edge (ms) of a bucket."""
+        return cls.MIN_VALUE_MS * (cls._GROWTH ** index)
+    
+    @classmethod
+    def bucket_value(cls, index: int) -> float:
+        """Representative value for a bucket (geometric midpoint)."""
+        if index == 0:
+            return cls.MIN_VALUE_MS / 2
+        return cls.MIN_VALUE_MS * (cls._GROWTH ** (index - 0.5))
+    
+    def record(self, value_ms: float):
+        """Record one latency sample."""
+        self.counts[self.bucket_index(value_ms)] += 1
+        if self.count == 0 or value_ms < self.min:
+            self.min = value_ms
+        if value_ms > self.max:
+            self.max = value_ms
+        self.count += 1
+        self.total += value_ms
+    
+    def merge(self, other: "LatencyHistogram"):
+        """Add another histogram's samples into this one."""
+        if other.count == 0:
+            return
+        counts = self.counts
+        for i, c in enumerate(other.counts):
+            if c:
+                counts[i] += c
+        if self.count == 0 or other.min < self.min:
+            self.min = other.min
+        if other.max > self.max:
+            self.max = other.max
+        self.count += other.count
+        self.total += other.total
+    
+    def clear(self):
+        """Drop all samples."""
+        self.counts = [0] * self.BUCKET_COUNT
+        self.count = 0
+        self.total = 0.0
+        self.min = 0.0
+        self.max = 0.0
+    
+    def quantiles(self, qs: Iterable[float]) -> List[float]:
+        """
+        Estimate several quantiles in a single pass over the buckets.
+        
+        Args:
+            qs: Quantiles in ascending order, each in [0, 1]
+        
+        Returns:
+            Estimated values (ms), clamped to the observed min/max
+        """
+        qs = list(qs)
+        if self.count == 0:
+            return [0.0] * len(qs)
+        
+        results: List[float] = []
+        targets = [max(1, int(math.ceil(q * self.count))) for q in qs]
+        seen = 0
+        t = 0
+        for index, c in enumerate(self.counts):
+            if not c:
+                continue
+            seen += c
+            while t < len(targets) and seen >= targets[t]:
+                value = self.bucket_value(index)
+                results.append(min(max(value, self.min), self.max))
+                t += 1
+            if t == len(targets):
+                break
+        while len(results) < len(qs):
+            results.append(self.max)
+        return results
+    
+    def count_le(self, bound_ms: float) -> int:
+        """Number of samples in buckets entirely at or below ``bound_ms``."""
+        total = 0
+        for index, c in enumerate(self.counts):
+            if self.bucket_upper_bound(index) > bound_ms:
+                break
+            total += c
+        return total
+    
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+
+_HTTP_METHODS = frozenset({"GET", "POST", "PUT", "PATCH", "DELETE", "HEAD"})
+
+# Endpoint pieces that identify a user, item, path or cell range rather than
+# a kind of call, replaced in order by route placeholders
+_ROUTE_RULES = (
+    (re.compile(r"^https?://[^/]+/(?:v1\.0|beta)/"), ""),
+    (re.compile(r"^users/[^/]+"), "users/{user}"),
+    (re.compile(r"/items/[^/:]+"), "/items/{id}"),
+    (re.compile(r"root:/[^:]*"), "root:/{path}"),
+    (re.compile(r"worksheets\('[^']*'\)|worksheets/[^/]+"), "worksheets/{ws}"),
+    (re.compile(r"\([^)]*\)"), ""),
+    # Any other id-like segment (GUIDs, drive item ids)
+    (re.compile(r"(?<=/)(?=[^/]*\d)[0-9A-Za-z!_-]{16,}(?=/|$)"), "{id}"),
+)
+
+
+def normalize_operation(operation: str) -> str:
+    """Reduce a raw "METHOD endpoint" name to its route template.
+
+    graph_client names operations after the request URL, which embeds user
+    ids, item ids, drive paths and range addresses. Those must not become
+    operation keys (or Prometheus labels), so e.g.
+    ``GET users/u1/drive/items/01AB.../workbook/worksheets('2026年3月')/range(address='A1:L40')``
+    becomes ``GET users/{user}/drive/items/{id}/workbook/worksheets/{ws}/range``.
+    Names that do not start with an HTTP method are returned unchanged.
+    """
+    method, _, endpoint = operation.partition(" ")
+    if method not in _HTTP_METHODS or not endpoint:
+        return operation
+    endpoint = endpoint.split("?", 1)[0].lstrip("/")
+    for pattern, placeholder in _ROUTE_RULES:
+        endpoint = pattern.sub(placeholder, endpoint)
+    return f"{method} {endpoint}"
+
+
+class _WindowSlot:
+    """Counters and per-operation histograms for one time slice."""
+    
+    __slots__ = ("epoch", "success", "failure", "throttle", "latency", "operations")
+    
+    def __init__(self):
+        self.epoch = -1
+        self.success = 0
+        self.failure = 0
+        self.throttle = 0
+        self.latency = LatencyHistogram()
+        self.operations: Dict[str, LatencyHistogram] = {}
+    
+    def reset(self, epoch: int):
+        self.epoch = epoch
+        self.success = 0
+        self.failure = 0
+        self.throttle = 0
+        self.latency.clear()
+        self.operations.clear()
 
 
 class GraphHealthMonitor:
@@ -64,9 +241,15 @@ class GraphHealthMonitor:
     
     Tracks:
         - Success/failure rates over sliding windows
-        - Response time percentiles
+        - Response time percentiles (streaming, per operation)
         - Throttle events
         - Circuit breaker state
+    
+    Metrics are bucketed into SLOT_SECONDS time slices held in a fixed ring
+    covering RETENTION_SECONDS. Each slice keeps counters plus a
+    LatencyHistogram per operation, so recording is O(1) and any window up
+    to the retention period can be queried without touching individual
+    requests.
         
     Thresholds:
         - DEGRADED: < 95% success rate or > 5 throttles in 5 min
@@ -75,7 +258,14 @@ class GraphHealthMonitor:
     
     # Configuration
     WINDOW_SIZE_SECONDS = 300  # 5 minute sliding window
-    MAX_RECORDS = 1000
+    SLOT_SECONDS = 10
+    RETENTION_SECONDS = 3600  # Longest queryable window
+    REPORT_WINDOWS = (60, 300, 900)
+    MAX_OPERATIONS = 50  # Distinct operation names before folding into "other"
+    OTHER_OPERATION = "other"
+    
+    # Prometheus histogram bucket bounds (ms)
+    PROMETHEUS_BUCKETS_MS = (50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000)
     
     # Thresholds
     DEGRADED_SUCCESS_RATE = 0.95
@@ -85,17 +275,22 @@ class GraphHealthMonitor:
     DEGRADED_AVG_RESPONSE_MS = 3000
     UNHEALTHY_AVG_RESPONSE_MS = 10000
     
-    def __init__(self):
-        self._records: deque = deque(maxlen=self.MAX_RECORDS)
+    def __init__(self, clock=time.time):
+        self._clock = clock
         self._lock = threading.Lock()
         
+        # Time-sliced window ring
+        self._slot_count = self.RETENTION_SECONDS // self.SLOT_SECONDS
+        self._slots: List[_WindowSlot] = [_WindowSlot() for _ in range(self._slot_count)]
+        
         # Aggregated stats
         self._total_success = 0
         self._total_failure = 0
         self._total_throttle = 0
         
-        # Response time tracking
-        self._response_times: deque = deque(maxlen=100)
+        # Lifetime histograms per operation (monotonic, for Prometheus)
+        self._lifetime_latency: Dict[str, LatencyHistogram] = {}
+        self._operation_names: set = set()
         
         # Circuit breaker state
         self._circuit_open = False
@@ -108,12 +303,47 @@ class GraphHealthMonitor:
         
         logger.info("Graph health monitor initialized")
     
-    def _prune_old_records(self):
-        """Remove records outside the sliding window."""
-        cutoff = time.time() - self.WINDOW_SIZE_SECONDS
+    def _current_slot(self) -> _WindowSlot:
+        """Slot for the current time, recycling it if it belongs to an old epoch."""
+        epoch = int(self._clock() // self.SLOT_SECONDS)
+        slot = self._slots[epoch % self._slot_count]
+        if slot.epoch != epoch:
+            slot.reset(epoch)
+        return slot
+        
+    def _window_slots(self, window_seconds: int) -> List[_WindowSlot]:
+        """Live slots covering the last ``window_seconds``."""
+        window_seconds = max(self.SLOT_SECONDS, min(window_seconds, self.RETENTION_SECONDS))
+        current = int(self._clock() // self.SLOT_SECONDS)
+        oldest = current - int(math.ceil(window_seconds / self.SLOT_SECONDS)) + 1
+        return [s for s in self._slots if oldest <= s.epoch <= current]
+    
+    def _operation_key(self, operation: str) -> str:
+        """Bound label cardinality: route templates, and unseen names beyond the cap share one bucket."""
+        operation = normalize_operation(operation or "unknown")
+        if operation in self._operation_names:
+            return operation
+        if len(self._operation_names) >= self.MAX_OPERATIONS:
+            return self.OTHER_OPERATION
+        self._operation_names.add(operation)
+        return operation
+    
+    def _record_latency(self, slot: _WindowSlot, operation: str, response_time_ms: float):
+        """Add one latency sample to the window slot and lifetime histograms."""
+        if response_time_ms <= 0:
+            return
+        key = self._operation_key(operation)
+        slot.latency.record(response_time_ms)
+        
+        op_hist = slot.operations.get(key)
+        if op_hist is None:
+            op_hist = slot.operations[key] = LatencyHistogram()
+        op_hist.record(response_time_ms)
         
-        while self._records and self._records[0].timestamp < cutoff:
-            self._records.popleft()
+        lifetime = self._lifetime_latency.get(key)
+        if lifetime is None:
+            lifetime = self._lifetime_latency[key] = LatencyHistogram()
+        lifetime.record(response_time_ms)
     
     def record_success(
         self,
@@ -127,21 +357,13 @@ class GraphHealthMonitor:
             response_time_ms: Response time in milliseconds
             operation: Optional operation name for breakdown
         """
-        record = OperationRecord(
-            timestamp=time.time(),
-            success=True,
-            response_time_ms=response_time_ms,
-            operation=operation
-        )
-        
         with self._lock:
-            self._records.append(record)
+            slot = self._current_slot()
+            slot.success += 1
+            self._record_latency(slot, operation, response_time_ms)
             self._total_success += 1
             self._consecutive_failures = 0
             
-            if response_time_ms > 0:
-                self._response_times.append(response_time_ms)
-            
             self._cached_health = None  # Invalidate cache
     
     def record_failure(
@@ -158,22 +380,13 @@ class GraphHealthMonitor:
             operation: Optional operation name
             error_code: Error code from response
         """
-        record = OperationRecord(
-            timestamp=time.time(),
-            success=False,
-            response_time_ms=response_time_ms,
-            operation=operation,
-            error_code=error_code
-        )
-        
         with self._lock:
-            self._records.append(record)
+            slot = self._current_slot()
+            slot.failure += 1
+            self._record_latency(slot, operation, response_time_ms)
             self._total_failure += 1
             self._consecutive_failures += 1
             
-            if response_time_ms > 0:
-                self._response_times.append(response_time_ms)
-            
             # Check circuit breaker
             if self._consecutive_failures >= 5:
                 self._open_circuit(30)  # 30 second cooldown
@@ -187,16 +400,9 @@ class GraphHealthMonitor:
         Args:
             retry_after_seconds: Retry-After value from response
         """
-        record = OperationRecord(
-            timestamp=time.time(),
-            success=False,
-            response_time_ms=0,
-            error_code="429_throttle",
-            is_throttle=True
-        )
-        
         with self._lock:
-            self._records.append(record)
+            slot = self._current_slot()
+            slot.throttle += 1
             self._total_throttle += 1
             self._cached_health = None
         
@@ -230,29 +436,21 @@ class GraphHealthMonitor:
         with self._lock:
             return self._check_circuit()
     
-    def _get_window_stats(self) -> dict:
-        """Calculate stats for the current sliding window."""
-        self._prune_old_records()
-        
-        if not self._records:
-            return {
-                'success_count': 0,
-                'failure_count': 0,
-                'throttle_count': 0,
-                'total_count': 0,
-                'success_rate': 1.0,
-                'avg_response_ms': 0
-            }
+    def _get_window_stats(self, window_seconds: Optional[int] = None) -> dict:
+        """Calculate stats for a sliding window (default WINDOW_SIZE_SECONDS)."""
+        slots = self._window_slots(window_seconds or self.WINDOW_SIZE_SECONDS)
         
-        success_count = sum(1 for r in self._records if r.success)
-        failure_count = sum(1 for r in self._records if not r.success)
-        throttle_count = sum(1 for r in self._records if r.is_throttle)
-        total_count = len(self._records)
+        success_count = sum(s.success for s in slots)
+        # Throttles count against the success rate, as 429s are failed calls
+        throttle_count = sum(s.throttle for s in slots)
+        failure_count = sum(s.failure for s in slots) + throttle_count
+        total_count = success_count + failure_count
         
-        success_rate = success_count / total_count if total_count > 0 else 1.0
+        latency_count = sum(s.latency.count for s in slots)
+        latency_total = sum(s.latency.total for s in slots)
         
-        response_times = [r.response_time_ms for r in self._records if r.response_time_ms > 0]
-        avg_response = sum(response_times) / len(response_times) if response_times else 0
+        success_rate = success_count / total_count if total_count > 0 else 1.0
+        avg_response = latency_total / latency_count if latency_count else 0
         
         return {
             'success_count': success_count,
@@ -263,24 +461,58 @@ class GraphHealthMonitor:
             'avg_response_ms': round(avg_response, 2)
         }
     
-    def _calculate_percentiles(self) -> dict:
-        """Calculate response time percentiles."""
-        if not self._response_times:
-            return {'p50': 0, 'p90': 0, 'p99': 0}
-        
-        sorted_times = sorted(self._response_times)
-        n = len(sorted_times)
-        
-        p50 = sorted_times[int(n * 0.5)] if n > 0 else 0
-        p90 = sorted_times[int(n * 0.9)] if n > 1 else p50
-        p99 = sorted_times[int(n * 0.99)] if n > 1 else p90
-        
+    @staticmethod
+    def _format_percentiles(hist: LatencyHistogram) -> dict:
+        p50, p90, p99 = hist.quantiles((0.5, 0.9, 0.99))
         return {
             'p50': round(p50, 2),
             'p90': round(p90, 2),
             'p99': round(p99, 2)
         }
     
+    def _merged_window(self, window_seconds: int) -> Tuple[LatencyHistogram, Dict[str, LatencyHistogram]]:
+        """Merge the window's slot histograms into overall and per-operation sketches."""
+        overall = LatencyHistogram()
+        by_operation: Dict[str, LatencyHistogram] = {}
+        for slot in self._window_slots(window_seconds):
+            overall.merge(slot.latency)
+            for name, hist in slot.operations.items():
+                merged = by_operation.get(name)
+                if merged is None:
+                    merged = by_operation[name] = LatencyHistogram()
+                merged.merge(hist)
+        return overall, by_operation
+    
+    def _calculate_percentiles(self, window_seconds: Optional[int] = None) -> dict:
+        """Calculate response time percentiles for a window."""
+        overall, _ = self._merged_window(window_seconds or self.WINDOW_SIZE_SECONDS)
+        return self._format_percentiles(overall)
+    
+    def get_percentiles(
+        self,
+        window_seconds: Optional[int] = None,
+        operation: Optional[str] = None
+    ) -> dict:
+        """
+        Get p50/p90/p99 response times for any window up to RETENTION_SECONDS.
+        
+        Args:
+            window_seconds: Window length (default WINDOW_SIZE_SECONDS)
+            operation: Restrict to one operation (name or raw request,
+                normalized like recorded ones; default: all)
+        
+        Returns:
+            dict with p50, p90, p99 and sample count
+        """
+        with self._lock:
+            overall, by_operation = self._merged_window(
+                window_seconds or self.WINDOW_SIZE_SECONDS
+            )
+        hist = overall if operation is None else by_operation.get(normalize_operation(operation), LatencyHistogram())
+        result = self._format_percentiles(hist)
+        result['count'] = hist.count
+        return result
+    
     def _determine_status(self, window_stats: dict) -> HealthStatus:
         """Determine health status based on metrics."""
         success_rate = window_stats['success_rate']
@@ -322,10 +554,23 @@ class GraphHealthMonitor:
                     return self._cached_health
             
             window_stats = self._get_window_stats()
-            percentiles = self._calculate_percentiles()
+            overall, by_operation = self._merged_window(self.WINDOW_SIZE_SECONDS)
+            percentiles = self._format_percentiles(overall)
             status = self._determine_status(window_stats)
             circuit_open = self._check_circuit()
             
+            percentiles_by_window = {
+                f"{w}s": self._calculate_percentiles(w) for w in self.REPORT_WINDOWS
+            }
+            operations = {
+                name: {
+                    'count': hist.count,
+                    'avgMs': round(hist.mean, 2),
+                    **self._format_percentiles(hist)
+                }
+                for name, hist in sorted(by_operation.items())
+            }
+            
             report = {
                 'status': status.value,
                 'timestamp': datetime.utcnow().isoformat() + 'Z',
@@ -341,6 +586,8 @@ class GraphHealthMonitor:
                 # Response times
                 'avgResponseMs': window_stats['avg_response_ms'],
                 'responseTimePercentiles': percentiles,
+                'responseTimePercentilesByWindow': percentiles_by_window,
+                'operations': operations,
                 
                 # Circuit breaker
                 'circuitBreaker': {
@@ -374,6 +621,68 @@ class GraphHealthMonitor:
             
             return report
     
+    def export_prometheus(self) -> str:
+        """
+        Render metrics in the Prometheus text exposition format.
+        
+        Lifetime per-operation histograms are exported as cumulative
+        ``graph_request_duration_ms`` histograms; windowed quantiles are
+        exported as a ``graph_request_duration_window_ms`` summary.
+        
+        Returns:
+            Text body suitable for a ``text/plain; version=0.0.4`` response
+        """
+        def esc(value: str) -> str:
+            return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        
+        with self._lock:
+            lifetime = {name: hist for name, hist in self._lifetime_latency.items()}
+            _, window_ops = self._merged_window(self.WINDOW_SIZE_SECONDS)
+            totals = (self._total_success, self._total_failure, self._total_throttle)
+            circuit_open = self._check_circuit()
+            
+            lines = [
+                '# HELP graph_requests_total Graph API calls by outcome.',
+                '# TYPE graph_requests_total counter',
+                f'graph_requests_total{{outcome="success"}} {totals[0]}',
+                f'graph_requests_total{{outcome="failure"}} {totals[1]}',
+                f'graph_requests_total{{outcome="throttle"}} {totals[2]}',
+                '# HELP graph_circuit_open Whether the Graph circuit breaker is open.',
+                '# TYPE graph_circuit_open gauge',
+                f'graph_circuit_open {1 if circuit_open else 0}',
+                '# HELP graph_request_duration_ms Graph API call latency.',
+                '# TYPE graph_request_duration_ms histogram',
+            ]
+            for name in sorted(lifetime):
+                hist = lifetime[name]
+                op = esc(name)
+                for bound in self.PROMETHEUS_BUCKETS_MS:
+                    lines.append(
+                        f'graph_request_duration_ms_bucket{{operation="{op}",le="{bound}"}} '
+                        f'{hist.count_le(bound)}'
+                    )
+                lines.append(f'graph_request_duration_ms_bucket{{operation="{op}",le="+Inf"}} {hist.count}')
+                lines.append(f'graph_request_duration_ms_sum{{operation="{op}"}} {round(hist.total, 3)}')
+                lines.append(f'graph_request_duration_ms_count{{operation="{op}"}} {hist.count}')
+            
+            lines.append(
+                f'# HELP graph_request_duration_window_ms Graph API latency quantiles '
+                f'over the last {self.WINDOW_SIZE_SECONDS}s.'
+            )
+            lines.append('# TYPE graph_request_duration_window_ms summary')
+            for name in sorted(window_ops):
+                hist = window_ops[name]
+                op = esc(name)
+                for q, value in zip(("0.5", "0.9", "0.99"), hist.quantiles((0.5, 0.9, 0.99))):
+                    lines.append(
+                        f'graph_request_duration_window_ms{{operation="{op}",quantile="{q}"}} '
+                        f'{round(value, 3)}'
+                    )
+                lines.append(f'graph_request_duration_window_ms_sum{{operation="{op}"}} {round(hist.total, 3)}')
+                lines.append(f'graph_request_duration_window_ms_count{{operation="{op}"}} {hist.count}')
+        
+        return "\n".join(lines) + "\n"
+    
     def is_healthy(self) -> bool:
         """
         Quick check if Graph API is healthy.
@@ -387,8 +696,10 @@ class GraphHealthMonitor:
     def reset(self):
         """Reset all metrics (useful for testing)."""
         with self._lock:
-            self._records.clear()
-            self._response_times.clear()
+            for slot in self._slots:
+                slot.reset(-1)
+            self._lifetime_latency.clear()
+            self._operation_names.clear()
             self._total_success = 0
             self._total_failure = 0
             self._total_throttle = 0
@@ -439,6 +750,16 @@ def get_health_report(force_refresh: bool = False) -> dict:
     return get_health_monitor().get_health_report(force_refresh)
 
 
+def get_percentiles(window_seconds: Optional[int] = None, operation: Optional[str] = None) -> dict:
+    """Get response time percentiles for a window and optional operation."""
+    return get_health_monitor().get_percentiles(window_seconds, operation)
+
+
+def export_prometheus() -> str:
+    """Render health metrics in Prometheus text format."""
+    return get_health_monitor().export_prometheus()
+
+
 def is_healthy() -> bool:
     """Quick health check."""
     return get_health_monitor().is_healthy()
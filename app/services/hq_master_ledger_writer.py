@@ -42,7 +42,7 @@ from __future__ import annotations
 import logging
 from datetime import datetime
 from decimal import Decimal
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
 from dataclasses import dataclass
 
 from app.config.onedrive_structure import (
@@ -108,6 +108,22 @@ class HQWriteResult:
         return {k: v for k, v in self.__dict__.items() if v is not None}
 
 
+@dataclass
+class HQBlockResult:
+    """Result of committing one pre-allocated block of rows (one office batch)."""
+    key: str
+    row_count: int
+    status: str = "pending"  # "pending", "allocated", "written", "error", "skipped_*"
+    sheet: Optional[str] = None
+    start_row: Optional[int] = None
+    end_row: Optional[int] = None
+    file_id: Optional[str] = None
+    error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {k: v for k, v in self.__dict__.items() if v is not None}
+
+
 # =============================================================================
 # EXCEPTIONS
 # =============================================================================
@@ -243,8 +259,8 @@ def ensure_hq_file_exists() -> str:
     """
     file_path = get_hq_master_ledger_path()
     
-    # Check if file already exists
-    if file_exists(file_path):
+    # Check if file already exists (ask Graph: a cached "missing" may be stale)
+    if file_exists(file_path, fresh=True):
         return get_file_id(file_path)
     
     # Ensure HQ folder exists
@@ -345,6 +361,63 @@ def _get_or_create_month_sheet(file_id: str, year: int, month: int, etag: str) -
     return (template_sheet, etag)
 
 
+def _find_footer_row(rows: List[List[Any]]) -> Optional[int]:
+    """Return the 1-indexed footer row (合計/残高/Total), or None."""
+    for row_idx, row in enumerate(rows):
+        for cell in row:
+            if cell and isinstance(cell, str):
+                cell_stripped = cell.strip()
+                if any(keyword in cell_stripped for keyword in FOOTER_KEYWORDS):
+                    logger.debug(f"Found footer at row {row_idx + 1}")
+                    return row_idx + 1
+    return None
+
+
+def _is_empty_key_row(row: List[Any]) -> bool:
+    """True when every key column of the row is blank."""
+    for col in HQ_KEY_COLUMNS:
+        if col < len(row):
+            val = row[col]
+            if val is not None and str(val).strip() != "":
+                return False
+    return True
+
+
+def _find_empty_block(rows: List[List[Any]], size: int) -> int:
+    """
+    Find the first run of ``size`` empty rows above the footer.
+    
+    Unlike _find_next_empty_row, a single gap is not enough: the whole
+    block must be free so it can be committed as one contiguous range.
+    
+    Returns:
+        int: 1-indexed first row of the block
+        
+    Raises:
+        HQWriteError: If no run of that size fits above the footer
+    """
+    footer_row = _find_footer_row(rows)
+    # Rows strictly above the footer are usable; without a footer, the sheet is open-ended
+    limit = footer_row - 1 if footer_row else None
+    
+    run_start = None
+    row_idx = HQ_DATA_START_ROW_0INDEXED
+    while limit is None or row_idx < limit:
+        if row_idx >= len(rows) or _is_empty_key_row(rows[row_idx]):
+            if run_start is None:
+                run_start = row_idx
+            if row_idx - run_start + 1 >= size:
+                return run_start + 1
+        else:
+            run_start = None
+        row_idx += 1
+    
+    raise HQWriteError(
+        operation="allocate_rows",
+        message=f"No block of {size} empty rows above the footer (row {footer_row})"
+    )
+
+
 def _find_next_empty_row(file_id: str, worksheet_name: str) -> int:
     """
     Find the first empty row in the HQ worksheet for data entry.
@@ -366,37 +439,14 @@ def _find_next_empty_row(file_id: str, worksheet_name: str) -> int:
             return HQ_DATA_START_ROW
         
         # Find footer row
-        footer_row = None
-        for row_idx, row in enumerate(rows):
-            for cell in row:
-                if cell and isinstance(cell, str):
-                    cell_stripped = cell.strip()
-                    if any(keyword in cell_stripped for keyword in FOOTER_KEYWORDS):
-                        footer_row = row_idx + 1
-                        logger.debug(f"Found footer at row {footer_row}")
-                        break
-            if footer_row:
-                break
+        footer_row = _find_footer_row(rows)
         
         if not footer_row:
             footer_row = len(rows) + 50
         
         # Scan for first empty row in key columns
         for row_idx in range(HQ_DATA_START_ROW_0INDEXED, footer_row - 1):
-            if row_idx >= len(rows):
-                return row_idx + 1
-            
-            row = rows[row_idx]
-            is_empty = True
-            
-            for col in HQ_KEY_COLUMNS:
-                if col < len(row):
-                    val = row[col]
-                    if val is not None and str(val).strip() != "":
-                        is_empty = False
-                        break
-            
-            if is_empty:
+            if row_idx >= len(rows) or _is_empty_key_row(rows[row_idx]):
                 logger.debug(f"Found empty row at {row_idx + 1}")
                 return row_idx + 1
         
@@ -800,3 +850,173 @@ def write_hq_batch(
         "failed": failed,
         "results": results
     }
+
+
+def write_hq_blocks(
+    blocks: Sequence[Tuple[str, List[List[Any]]]],
+    year: int,
+    month: int,
+    user_id: str,
+    on_progress: Optional[Callable[[HQBlockResult], None]] = None,
+) -> List[HQBlockResult]:
+    """
+    Commit prepared rows for several batches in contiguous range writes.
+    
+    Holds the HQ file lock once for the whole commit: one ETag fetch, one
+    worksheet read, then one range write per block. Each block (one office
+    batch) is allocated in turn to the first free run of rows it fits, so
+    it lands in its own contiguous row range; a block that fits nowhere
+    above the footer fails on its own and the others are still written.
+    
+    ``on_progress`` is called with a block's result when its rows are
+    allocated (status "allocated", before the write) and again once they
+    are written (status "written"). Callers persist both, so a commit that
+    stops part-way can be reconciled against column J (Batch ID); see
+    find_hq_batch_rows().
+    
+    Args:
+        blocks: (key, rows) pairs in commit order; rows come from
+            _prepare_hq_row_values()
+        year: Target year
+        month: Target month (1-12)
+        user_id: User ID performing the operation
+        on_progress: Optional callback for allocation/write progress
+        
+    Returns:
+        list: HQBlockResult per block, in input order. Blocks not written
+        carry status "error" (or "skipped_*") and the error message.
+    """
+    results = {key: HQBlockResult(key=key, row_count=len(rows)) for key, rows in blocks}
+    ordered = [results[key] for key, _ in blocks]
+    
+    def fail_pending(status: str, error: str) -> List[HQBlockResult]:
+        for result in ordered:
+            if result.status in ("pending", "allocated"):
+                result.status = status
+                result.error = error
+        return ordered
+    
+    if not is_graph_fully_configured():
+        logger.warning("HQ Master Ledger block writer called but Graph API not fully configured.")
+        return fail_pending(
+            "skipped_graph_not_configured",
+            "Graph API credentials not configured or contain placeholders",
+        )
+    
+    try:
+        year, month = validate_year_month(year, month)
+    except InvalidYearMonthError as e:
+        logger.warning(f"HQ block write invalid year/month: {e}")
+        return fail_pending("error", str(e))
+    
+    try:
+        file_id = ensure_hq_file_exists()
+        
+        def do_write(etag: str) -> None:
+            sheet_name, current_etag = _get_or_create_month_sheet(file_id, year, month, etag)
+            
+            # On an ETag retry, blocks already written stay written; only the
+            # rest are re-allocated against a fresh read
+            remaining = [(key, rows) for key, rows in blocks if rows and results[key].status != "written"]
+            if not remaining:
+                return
+            
+            try:
+                sheet_rows = read_worksheet(file_id, sheet_name, include_empty_rows=True)
+            except WorksheetNotFoundError:
+                raise HQWriteError(
+                    operation="allocate_rows",
+                    message=f"Worksheet '{sheet_name}' not found"
+                )
+            
+            for key, rows in remaining:
+                result = results[key]
+                try:
+                    start_row = _find_empty_block(sheet_rows, len(rows))
+                except HQWriteError as e:
+                    logger.warning(f"HQ block {key} ({len(rows)} rows) does not fit: {e}")
+                    result.status = "error"
+                    result.error = str(e)
+                    continue
+                result.status = "allocated"
+                result.error = None
+                result.sheet = sheet_name
+                result.file_id = file_id
+                result.start_row = start_row
+                result.end_row = start_row + len(rows) - 1
+                # Reserve the rows in the local view so later blocks skip them
+                while len(sheet_rows) < result.end_row:
+                    sheet_rows.append([])
+                sheet_rows[result.start_row - 1:result.end_row] = [list(row) for row in rows]
+                if on_progress is not None:
+                    on_progress(result)
+                
+                range_address = f"A{result.start_row}:{_column_letter(len(rows[0]) - 1)}{result.end_row}"
+                logger.info(f"Writing HQ Master Ledger block {key} at {sheet_name}!{range_address}")
+                current_etag = update_range(
+                    file_id=file_id,
+                    worksheet_name=sheet_name,
+                    range_address=range_address,
+                    values=rows,
+                    etag=current_etag
+                )
+                
+                result.status = "written"
+                if on_progress is not None:
+                    on_progress(result)
+        
+        safe_write(
+            file_id=file_id,
+            operation=do_write,
+            get_etag_fn=lambda: get_file_metadata(file_id)["eTag"],
+            max_retries=3,
+            worksheet_name=f"{year}年{month}月",
+            operation_name="write_hq_blocks"
+        )
+        
+    except WriteConflictError as e:
+        logger.error(f"HQ block write conflict: {e}")
+        fail_pending("error", f"Write conflict after retries: {e}")
+    except LockTimeoutError as e:
+        logger.error(f"HQ lock timeout: file={e.file_id[:20]}..., timeout={e.timeout_seconds}s")
+        fail_pending("error", f"Could not acquire write lock within {e.timeout_seconds}s")
+    except GraphAPIError as e:
+        logger.error(f"HQ Graph API error: {e}")
+        fail_pending("error", f"Graph API error: {e.message}")
+    except (SheetNotFoundStrictError, HQWriteError) as e:
+        logger.error(f"HQ block write error: {e}")
+        fail_pending("error", str(e))
+    except Exception as e:
+        logger.exception(f"HQ block write unexpected error: {e}")
+        fail_pending("error", str(e))
+    
+    written = sum(1 for result in ordered if result.status == "written")
+    logger.info(
+        f"HQ block commit: blocks={len(ordered)}, written={written}, "
+        f"rows={sum(result.row_count for result in ordered if result.status == 'written')}"
+    )
+    return ordered
+
+
+def find_hq_batch_rows(batch_ids: Sequence[str], year: int, month: int) -> Dict[str, List[int]]:
+    """
+    Locate rows already in the HQ month sheet for the given batches.
+    
+    Reads the sheet once and matches column J (Batch ID), so rows written
+    by an interrupted commit can be reconciled with the transfer records.
+    
+    Returns:
+        dict: batch_id -> sorted 1-indexed row numbers
+    """
+    year, month = validate_year_month(year, month)
+    file_id = get_hq_file_id()
+    sheet_name, _ = _get_or_create_month_sheet(file_id, year, month, etag="")
+    rows = read_worksheet(file_id, sheet_name, include_empty_rows=True)
+    
+    wanted = set(batch_ids)
+    found: Dict[str, List[int]] = {batch_id: [] for batch_id in batch_ids}
+    batch_col = HQ_COLUMN_MAPPING["batch_id"]
+    for row_idx, row in enumerate(rows):
+        if batch_col < len(row) and row[batch_col] in wanted:
+            found[row[batch_col]].append(row_idx + 1)
+    return found
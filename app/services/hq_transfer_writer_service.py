@@ -2,8 +2,9 @@
 HQ Transfer Writer Service (Phase 13)
 
 This module provides the full HQ transfer orchestration service that:
-1. Collects SENT receipts for an office-month
-2. Writes each receipt to HQ Master Ledger via Graph API
+1. Collects SENT receipts for an office-month (or every office at once)
+2. Writes each office's receipts to HQ Master Ledger via Graph API as one
+   contiguous block
 3. Tracks batch progress and handles failures
 4. Logs audit events for every operation
 5. Updates draft HQ status
@@ -27,22 +28,50 @@ Author: Phase 13 - Office Month-End Send to HQ
 from __future__ import annotations
 
 import logging
+import os
 import threading
-from datetime import datetime
-from typing import Any, Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
 from uuid import UUID, uuid4
 
 from app.models.draft import DraftReceipt, DraftStatus
 from app.models.audit import AuditEventType
 from app.repositories.draft_repository import DraftRepository
 from app.repositories.hq_transfer_repository import HQTransferRepository
-from app.services.hq_master_ledger_writer import write_hq_row, write_hq_batch, HQWriteResult
+from app.services.hq_master_ledger_writer import (
+    HQBlockResult,
+    _prepare_hq_row_values,
+    find_hq_batch_rows,
+    write_hq_blocks,
+)
 from app.services.audit_logger import AuditLogger
 
 
 _hq_transfer_lock = threading.Lock()
 logger = logging.getLogger(__name__)
 
+# Offices prepared (candidate selection, validation, row building) in parallel
+HQ_TRANSFER_PREPARE_WORKERS = int(os.environ.get("HQ_TRANSFER_PREPARE_WORKERS", "4"))
+
+# Batches younger than this are left alone by recover_interrupted_batches():
+# _hq_transfer_lock only covers this process, so a WRITING batch may belong
+# to a commit still running in another worker
+HQ_TRANSFER_RECOVERY_MIN_AGE_SECONDS = float(os.environ.get("HQ_TRANSFER_RECOVERY_MIN_AGE_SECONDS", "900"))
+
+
+@dataclass
+class _OfficePlan:
+    """One office's prepared transfer: candidates and the HQ rows to commit."""
+    office_id: str
+    batch_id: str
+    existing_success: Optional[Dict[str, Any]] = None
+    candidates: List[DraftReceipt] = field(default_factory=list)
+    rows: List[List[Any]] = field(default_factory=list)
+    row_draft_ids: List[str] = field(default_factory=list)
+    errors: List[Dict[str, str]] = field(default_factory=list)
+
 
 class HQTransferWriterService:
     """
@@ -137,13 +166,16 @@ class HQTransferWriterService:
         Execute month-end HQ transfer for an office.
         
         This is the main entry point for Phase 13 month-end operations.
+        It runs the transfer pipeline for a single office (see
+        execute_month_end_pipeline), so the office's rows are committed to
+        the HQ Master Ledger in one contiguous range write.
         
         Process:
         1. Check for existing SUCCESS batch (idempotent return)
         2. Collect SENT candidates for office-month
         3. Create batch record -> CREATED
         4. Transition to WRITING state
-        5. Write each receipt to HQ Master Ledger
+        5. Write the office's rows to HQ Master Ledger as one block
         6. Transition to SUCCESS or FAILED
         7. Update draft HQ references
         
@@ -163,205 +195,422 @@ class HQTransferWriterService:
                 - errors: List of error messages (if any)
                 - reporting_month: "YYYY-MM" format
         """
+        result = self.execute_month_end_pipeline(year, month, user_id, office_ids=[office_id])
+        return result["offices"][0]
+    
+    def execute_month_end_pipeline(
+        self,
+        year: int,
+        month: int,
+        user_id: str,
+        office_ids: Optional[List[str]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Transfer several offices' SENT receipts to HQ in one commit.
+        
+        Pipeline:
+        1. PREPARE (parallel per office, HQ_TRANSFER_PREPARE_WORKERS):
+           idempotency check, candidate selection, row validation and
+           row building. No Excel access.
+        2. Create a batch per office with candidates (CREATED -> WRITING).
+        3. COMMIT: write_hq_blocks() takes the HQ file lock once and writes
+           each office's rows as one contiguous block. Allocated rows are
+           recorded in HQTransferRepository before each block is written.
+        4. Finalize each office batch (SUCCESS / FAILED / partial), exactly
+           as execute_month_end_transfer() reports it.
+        
+        If the commit stops part-way, offices whose block was written are
+        finalized normally and the rest are marked FAILED; batches left in
+        WRITING by a crash are reconciled by recover_interrupted_batches().
+        
+        Args:
+            year: Transfer year
+            month: Transfer month (1-12)
+            user_id: User initiating the transfer
+            office_ids: Offices to transfer; defaults to every office with
+                SENT receipts
+            
+        Returns:
+            dict with reporting_month, overall status, totals and
+            ``offices``: one execute_month_end_transfer()-style result per
+            office, in request order
+        """
         reporting_month = f"{year:04d}-{month:02d}"
         
         with _hq_transfer_lock:
-            # IDEMPOTENCY CHECK: Return existing SUCCESS batch
-            existing_success = self.hq_repository.get_latest_success_batch(
-                office_id, reporting_month
-            )
-            if existing_success:
-                existing_batch_id = str(existing_success["batch_id"])
-                logger.info(
-                    "hq_transfer_idempotent batch_id=%s office_id=%s reporting_month=%s",
-                    existing_batch_id, office_id, reporting_month
-                )
-                return {
-                    "batch_id": existing_batch_id,
-                    "status": "idempotent",
-                    "receipt_count": existing_success.get("receipt_count", 0),
-                    "reporting_month": reporting_month,
-                    "message": "Transfer already completed for this office-month"
-                }
-            
-            # COLLECT CANDIDATES
-            candidates = self.get_transfer_candidates(office_id, reporting_month)
-            receipt_count = len(candidates)
-            
-            if receipt_count == 0:
-                logger.info(
-                    "hq_transfer_no_candidates office_id=%s reporting_month=%s",
-                    office_id, reporting_month
-                )
-                return {
-                    "batch_id": None,
-                    "status": "no_candidates",
-                    "receipt_count": 0,
-                    "reporting_month": reporting_month,
-                    "message": "No SENT receipts found for this office-month"
-                }
-            
-            # CREATE BATCH
-            batch_id = str(uuid4())
-            self.hq_repository.create_batch(
-                batch_id=batch_id,
-                office_id=office_id,
-                reporting_month=reporting_month,
-                created_by_user_id=user_id,
-            )
+            sent_by_office = self._sent_drafts_by_office()
+            if office_ids is None:
+                office_ids = sorted(sent_by_office)
             
-            # AUDIT: Transfer started
-            self._log_audit(
-                event_type=AuditEventType.HQ_TRANSFER_STARTED,
-                actor=user_id,
-                data={
-                    "batch_id": batch_id,
-                    "office_id": office_id,
-                    "reporting_month": reporting_month,
-                    "candidate_count": receipt_count,
-                }
-            )
+            # PREPARE: per-office candidate selection and row building in parallel
+            def prepare(office_id: str) -> _OfficePlan:
+                return self._prepare_office(office_id, sent_by_office.get(office_id, []), reporting_month)
             
-            # TRANSITION TO WRITING
-            self.hq_repository.mark_writing(batch_id)
+            workers = max(1, min(HQ_TRANSFER_PREPARE_WORKERS, len(office_ids)))
+            if self.hq_repository.db_path == ":memory:":
+                # An in-memory SQLite connection cannot be shared across threads
+                workers = 1
+            if workers == 1:
+                plans = [prepare(office_id) for office_id in office_ids]
+            else:
+                with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="hq-prepare") as pool:
+                    plans = list(pool.map(prepare, office_ids))
             
-            # EXECUTE WRITES
-            written_count = 0
-            failed_count = 0
-            errors = []
-            written_draft_ids = []
+            office_results: Dict[str, Dict[str, Any]] = {}
+            blocks: List[Tuple[str, List[List[Any]]]] = []
+            plans_by_batch: Dict[str, _OfficePlan] = {}
             
-            for draft in candidates:
-                receipt_data = self._draft_to_receipt_data(draft)
+            for plan in plans:
+                if plan.existing_success:
+                    existing_batch_id = str(plan.existing_success["batch_id"])
+                    logger.info(
+                        "hq_transfer_idempotent batch_id=%s office_id=%s reporting_month=%s",
+                        existing_batch_id, plan.office_id, reporting_month
+                    )
+                    office_results[plan.office_id] = {
+                        "batch_id": existing_batch_id,
+                        "status": "idempotent",
+                        "receipt_count": plan.existing_success.get("receipt_count", 0),
+                        "reporting_month": reporting_month,
+                        "message": "Transfer already completed for this office-month"
+                    }
+                    continue
                 
-                result = write_hq_row(
-                    receipt_data=receipt_data,
-                    batch_id=batch_id,
-                    year=year,
-                    month=month,
-                    user_id=user_id
+                if not plan.candidates:
+                    logger.info(
+                        "hq_transfer_no_candidates office_id=%s reporting_month=%s",
+                        plan.office_id, reporting_month
+                    )
+                    office_results[plan.office_id] = {
+                        "batch_id": None,
+                        "status": "no_candidates",
+                        "receipt_count": 0,
+                        "reporting_month": reporting_month,
+                        "message": "No SENT receipts found for this office-month"
+                    }
+                    continue
+                
+                # CREATE BATCH
+                self.hq_repository.create_batch(
+                    batch_id=plan.batch_id,
+                    office_id=plan.office_id,
+                    reporting_month=reporting_month,
+                    created_by_user_id=user_id,
                 )
                 
-                if result.status == "written":
-                    written_count += 1
-                    written_draft_ids.append(str(draft.draft_id))
-                    
-                    # AUDIT: Row written
-                    self._log_audit(
-                        event_type=AuditEventType.HQ_ROW_WRITTEN,
-                        actor=user_id,
-                        draft_id=str(draft.draft_id),
-                        data={
-                            "batch_id": batch_id,
-                            "office_id": office_id,
-                            "sheet": result.sheet,
-                            "row": result.row,
-                        }
+                # AUDIT: Transfer started
+                self._log_audit(
+                    event_type=AuditEventType.HQ_TRANSFER_STARTED,
+                    actor=user_id,
+                    data={
+                        "batch_id": plan.batch_id,
+                        "office_id": plan.office_id,
+                        "reporting_month": reporting_month,
+                        "candidate_count": len(plan.candidates),
+                    }
+                )
+                
+                # TRANSITION TO WRITING
+                self.hq_repository.mark_writing(plan.batch_id)
+                plans_by_batch[plan.batch_id] = plan
+                if plan.rows:
+                    blocks.append((plan.batch_id, plan.rows))
+            
+            # COMMIT: one lock, one read, one range write per office
+            def record_progress(block: HQBlockResult) -> None:
+                if block.status == "allocated":
+                    plan = plans_by_batch[block.key]
+                    self.hq_repository.record_allocated_rows(
+                        block.key,
+                        block.sheet,
+                        [(draft_id, block.start_row + k) for k, draft_id in enumerate(plan.row_draft_ids)],
                     )
-                else:
-                    failed_count += 1
-                    errors.append({
-                        "draft_id": str(draft.draft_id),
-                        "error": result.error or result.status
-                    })
-                    
+            
+            block_results = {
+                block.key: block
+                for block in (write_hq_blocks(blocks, year, month, user_id, on_progress=record_progress) if blocks else [])
+            }
+            
+            # FINALIZE each office batch
+            for batch_id, plan in plans_by_batch.items():
+                block = block_results.get(batch_id)
+                errors = list(plan.errors)
+                written_draft_ids: List[str] = []
+                if block is not None and block.status == "written":
+                    written_draft_ids = list(plan.row_draft_ids)
+                    for k, draft_id in enumerate(plan.row_draft_ids):
+                        # AUDIT: Row written
+                        self._log_audit(
+                            event_type=AuditEventType.HQ_ROW_WRITTEN,
+                            actor=user_id,
+                            draft_id=draft_id,
+                            data={
+                                "batch_id": batch_id,
+                                "office_id": plan.office_id,
+                                "sheet": block.sheet,
+                                "row": block.start_row + k,
+                            }
+                        )
+                elif block is not None:
+                    errors.extend(
+                        {"draft_id": draft_id, "error": block.error or block.status}
+                        for draft_id in plan.row_draft_ids
+                    )
+                
+                for error in errors:
                     # AUDIT: Row write failed
                     self._log_audit(
                         event_type=AuditEventType.HQ_ROW_WRITE_FAILED,
                         actor=user_id,
-                        draft_id=str(draft.draft_id),
+                        draft_id=error["draft_id"],
                         data={
                             "batch_id": batch_id,
-                            "office_id": office_id,
-                            "error": result.error or result.status,
+                            "office_id": plan.office_id,
+                            "error": error["error"],
                         }
                     )
-            
-            # DETERMINE FINAL STATUS
-            if failed_count == 0:
-                final_status = "success"
-                self.hq_repository.mark_success(batch_id, receipt_count=written_count)
                 
-                # Update draft HQ references
-                self.hq_repository.mark_drafts_transferred(
-                    draft_ids=written_draft_ids,
+                office_results[plan.office_id] = self._finalize_batch(
                     batch_id=batch_id,
+                    office_id=plan.office_id,
+                    reporting_month=reporting_month,
+                    user_id=user_id,
+                    receipt_count=len(plan.candidates),
+                    written_draft_ids=written_draft_ids,
+                    errors=errors,
                 )
-                
-                # AUDIT: Transfer completed
-                self._log_audit(
-                    event_type=AuditEventType.HQ_TRANSFER_COMPLETED,
-                    actor=user_id,
-                    data={
+        
+        ordered_results = [{"office_id": office_id, **office_results[office_id]} for office_id in office_ids]
+        statuses = {result["status"] for result in ordered_results}
+        if not ordered_results:
+            overall = "no_candidates"
+        elif len(statuses) == 1:
+            overall = statuses.pop()
+        elif statuses & {"failed", "partial_failure"}:
+            overall = "partial_failure"
+        else:
+            overall = "success"
+        
+        return {
+            "reporting_month": reporting_month,
+            "status": overall,
+            "office_count": len(ordered_results),
+            "written_count": sum(result.get("written_count") or 0 for result in ordered_results),
+            "failed_count": sum(result.get("failed_count") or 0 for result in ordered_results),
+            "offices": ordered_results,
+        }
+    
+    def recover_interrupted_batches(self, year: int, month: int, user_id: str) -> List[Dict[str, Any]]:
+        """
+        Reconcile batches left in WRITING by an interrupted commit.
+        
+        Allocated rows recorded before the commit are matched against the
+        HQ month sheet's Batch ID column: drafts whose rows are present are
+        marked transferred, and each batch is finalized as SUCCESS, partial
+        or FAILED. Batches that never reached allocation are marked FAILED
+        and can simply be re-run. Batches created less than
+        HQ_TRANSFER_RECOVERY_MIN_AGE_SECONDS ago are skipped, as their
+        commit may still be running in another process.
+        
+        Returns:
+            list: Finalized execute_month_end_transfer()-style results
+        """
+        reporting_month = f"{year:04d}-{month:02d}"
+        
+        cutoff = datetime.utcnow() - timedelta(seconds=HQ_TRANSFER_RECOVERY_MIN_AGE_SECONDS)
+        
+        with _hq_transfer_lock:
+            batches = self.hq_repository.list_batches(
+                reporting_month, statuses=["WRITING"], created_before=cutoff.isoformat()
+            )
+            if not batches:
+                return []
+            
+            allocated = {batch["batch_id"]: self.hq_repository.get_allocated_rows(batch["batch_id"]) for batch in batches}
+            with_rows = [batch_id for batch_id, rows in allocated.items() if rows]
+            present = find_hq_batch_rows(with_rows, year, month) if with_rows else {}
+            
+            results = []
+            for batch in batches:
+                batch_id = batch["batch_id"]
+                rows = allocated[batch_id]
+                if not rows:
+                    self.hq_repository.mark_failed(batch_id, error_message="Interrupted before HQ rows were allocated")
+                    results.append({
+                        "office_id": batch["office_id"],
                         "batch_id": batch_id,
-                        "office_id": office_id,
+                        "status": "failed",
+                        "receipt_count": 0,
+                        "written_count": 0,
+                        "failed_count": 0,
+                        "errors": None,
                         "reporting_month": reporting_month,
-                        "written_count": written_count,
-                    }
-                )
-                
-            elif written_count == 0:
-                final_status = "failed"
-                error_summary = "; ".join(e["error"][:100] for e in errors[:5])
-                self.hq_repository.mark_failed(batch_id, error_message=error_summary[:1000])
+                    })
+                    continue
                 
-                # AUDIT: Transfer failed
-                self._log_audit(
-                    event_type=AuditEventType.HQ_TRANSFER_FAILED,
-                    actor=user_id,
-                    data={
-                        "batch_id": batch_id,
-                        "office_id": office_id,
-                        "reporting_month": reporting_month,
-                        "failed_count": failed_count,
-                        "errors": errors[:10],
-                    }
+                present_rows = set(present.get(batch_id, []))
+                written_draft_ids = [row["draft_id"] for row in rows if row["row_index"] in present_rows]
+                errors = [
+                    {"draft_id": row["draft_id"], "error": "Row not found in HQ ledger after interrupted commit"}
+                    for row in rows if row["row_index"] not in present_rows
+                ]
+                logger.info(
+                    "hq_transfer_recovered batch_id=%s office_id=%s written=%d missing=%d",
+                    batch_id, batch["office_id"], len(written_draft_ids), len(errors)
                 )
-                
-            else:
-                final_status = "partial_failure"
-                # Mark as failed but include partial success info
-                error_summary = f"Partial: {written_count}/{receipt_count} written. "
-                error_summary += "; ".join(e["error"][:50] for e in errors[:3])
-                self.hq_repository.mark_failed(batch_id, error_message=error_summary[:1000])
-                
-                # Still update successful drafts
-                self.hq_repository.mark_drafts_transferred(
-                    draft_ids=written_draft_ids,
+                results.append({"office_id": batch["office_id"], **self._finalize_batch(
                     batch_id=batch_id,
-                )
-                
-                # AUDIT: Partial failure
-                self._log_audit(
-                    event_type=AuditEventType.HQ_TRANSFER_FAILED,
-                    actor=user_id,
-                    data={
-                        "batch_id": batch_id,
-                        "office_id": office_id,
-                        "reporting_month": reporting_month,
-                        "written_count": written_count,
-                        "failed_count": failed_count,
-                        "partial": True,
-                        "errors": errors[:10],
-                    }
-                )
+                    office_id=batch["office_id"],
+                    reporting_month=reporting_month,
+                    user_id=user_id,
+                    receipt_count=len(rows),
+                    written_draft_ids=written_draft_ids,
+                    errors=errors,
+                )})
+            return results
+    
+    def _sent_drafts_by_office(self) -> Dict[str, List[DraftReceipt]]:
+        """Load SENT drafts once and group them by business location."""
+        by_office: Dict[str, List[DraftReceipt]] = {}
+        for draft in self.draft_repository.list_all(status=DraftStatus.SENT, limit=None):
+            location = getattr(draft.receipt, "business_location_id", None)
+            if location:
+                by_office.setdefault(location, []).append(draft)
+        return by_office
+    
+    def _prepare_office(
+        self,
+        office_id: str,
+        sent_drafts: List[DraftReceipt],
+        reporting_month: str,
+    ) -> _OfficePlan:
+        """Select and validate one office's candidates and build its HQ rows (no Excel access)."""
+        plan = _OfficePlan(office_id=office_id, batch_id=str(uuid4()))
+        plan.existing_success = self.hq_repository.get_latest_success_batch(office_id, reporting_month)
+        if plan.existing_success:
+            return plan
+        
+        # Same rules as get_transfer_candidates()
+        for draft in sent_drafts:
+            existing_batch_id = getattr(draft, "hq_batch_id", None)
+            if existing_batch_id and self.hq_repository.is_success_batch_for_scope(
+                batch_id=str(existing_batch_id),
+                office_id=office_id,
+                reporting_month=reporting_month,
+            ):
+                continue
+            plan.candidates.append(draft)
+        
+        for draft in plan.candidates:
+            receipt_data = self._draft_to_receipt_data(draft)
+            draft_id = str(draft.draft_id)
+            if not receipt_data.get("receipt_date"):
+                plan.errors.append({"draft_id": draft_id, "error": "receipt_date required"})
+                continue
+            plan.rows.append(_prepare_hq_row_values(receipt_data, plan.batch_id))
+            plan.row_draft_ids.append(draft_id)
+        return plan
+    
+    def _finalize_batch(
+        self,
+        *,
+        batch_id: str,
+        office_id: str,
+        reporting_month: str,
+        user_id: str,
+        receipt_count: int,
+        written_draft_ids: List[str],
+        errors: List[Dict[str, str]],
+    ) -> Dict[str, Any]:
+        """Move a WRITING batch to SUCCESS or FAILED and update draft HQ references."""
+        written_count = len(written_draft_ids)
+        failed_count = len(errors)
+        
+        # DETERMINE FINAL STATUS
+        if failed_count == 0:
+            final_status = "success"
+            self.hq_repository.mark_success(batch_id, receipt_count=written_count)
             
-            logger.info(
-                "hq_transfer_%s batch_id=%s office_id=%s reporting_month=%s "
-                "written=%d failed=%d total=%d",
-                final_status, batch_id, office_id, reporting_month,
-                written_count, failed_count, receipt_count
+            # Update draft HQ references
+            self.hq_repository.mark_drafts_transferred(
+                draft_ids=written_draft_ids,
+                batch_id=batch_id,
             )
             
-            return {
-                "batch_id": batch_id,
-                "status": final_status,
-                "receipt_count": receipt_count,
-                "written_count": written_count,
-                "failed_count": failed_count,
-                "errors": errors if errors else None,
-                "reporting_month": reporting_month,
-            }
+            # AUDIT: Transfer completed
+            self._log_audit(
+                event_type=AuditEventType.HQ_TRANSFER_COMPLETED,
+                actor=user_id,
+                data={
+                    "batch_id": batch_id,
+                    "office_id": office_id,
+                    "reporting_month": reporting_month,
+                    "written_count": written_count,
+                }
+            )
+            
+        elif written_count == 0:
+            final_status = "failed"
+            error_summary = "; ".join(e["error"][:100] for e in errors[:5])
+            self.hq_repository.mark_failed(batch_id, error_message=error_summary[:1000])
+            
+            # AUDIT: Transfer failed
+            self._log_audit(
+                event_type=AuditEventType.HQ_TRANSFER_FAILED,
+                actor=user_id,
+                data={
+                    "batch_id": batch_id,
+                    "office_id": office_id,
+                    "reporting_month": reporting_month,
+                    "failed_count": failed_count,
+                    "errors": errors[:10],
+                }
+            )
+            
+        else:
+            final_status = "partial_failure"
+            # Mark as failed but include partial success info
+            error_summary = f"Partial: {written_count}/{receipt_count} written. "
+            error_summary += "; ".join(e["error"][:50] for e in errors[:3])
+            self.hq_repository.mark_failed(batch_id, error_message=error_summary[:1000])
+            
+            # Still update successful drafts
+            self.hq_repository.mark_drafts_transferred(
+                draft_ids=written_draft_ids,
+                batch_id=batch_id,
+            )
+            
+            # AUDIT: Partial failure
+            self._log_audit(
+                event_type=AuditEventType.HQ_TRANSFER_FAILED,
+                actor=user_id,
+                data={
+                    "batch_id": batch_id,
+                    "office_id": office_id,
+                    "reporting_month": reporting_month,
+                    "written_count": written_count,
+                    "failed_count": failed_count,
+                    "partial": True,
+                    "errors": errors[:10],
+                }
+            )
+        
+        logger.info(
+            "hq_transfer_%s batch_id=%s office_id=%s reporting_month=%s "
+            "written=%d failed=%d total=%d",
+            final_status, batch_id, office_id, reporting_month,
+            written_count, failed_count, receipt_count
+        )
+        
+        return {
+            "batch_id": batch_id,
+            "status": final_status,
+            "receipt_count": receipt_count,
+            "written_count": written_count,
+            "failed_count": failed_count,
+            "errors": errors if errors else None,
+            "reporting_month": reporting_month,
+        }
     
     def _log_audit(
         self,
@@ -14,6 +14,10 @@ Features:
 
 All paths are relative to ONEDRIVE_BASE_FOLDER environment variable.
 
+Path lookups go through the persistent path -> item id cache in
+app.services.drive_item_cache; prewarm_item_ids() fills it for known
+ledger paths at startup.
+
 Usage:
     from app.services.onedrive_file_manager import (
         ensure_folder, get_file_id, file_exists, get_file_metadata
@@ -32,16 +36,22 @@ Date: 2026-02-28
 
 import os
 import logging
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterable, Iterator, Sequence
 
+from app.services.drive_item_cache import DriveItemRef, get_drive_item_cache
 from app.services.graph_client import (
-    graph_get, graph_post, graph_put,
+    graph_get, graph_post, graph_put, graph_patch,
     get_user_id, get_base_folder, GraphAPIError
 )
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Items per /children page; Graph follows up with @odata.nextLink
+ONEDRIVE_FOLDER_PAGE_SIZE = int(os.getenv("ONEDRIVE_FOLDER_PAGE_SIZE", "200"))
+# Fields list_files_in_folder needs (folder/file facets tell the two apart)
+FOLDER_CHILD_FIELDS = ("id", "name", "eTag", "lastModifiedDateTime", "size", "folder", "file", "parentReference")
+
 
 class OneDriveFileNotFoundError(Exception):
     """Raised when a file or folder is not found on OneDrive."""
@@ -112,6 +122,63 @@ def _build_item_id_endpoint(item_id: str) -> str:
     return f"users/{user_id}/drive/items/{item_id}"
 
 
+def _resolve_path(full_path: str, fresh: bool = False) -> DriveItemRef:
+    """
+    Resolve a full drive path to its item, using the path -> id cache.
+    
+    A 404 is returned (and cached) as a missing ref; other Graph errors
+    propagate and are not cached. ``fresh`` skips the cached answer (the
+    result still updates the cache).
+    """
+    cache = get_drive_item_cache()
+    drive = get_user_id()
+    if cache is not None and not fresh:
+        cached = cache.get(drive, full_path)
+        if cached is not None:
+            return cached
+    
+    try:
+        item = graph_get(_build_item_path_endpoint(full_path))
+    except GraphAPIError as e:
+        if e.status_code != 404:
+            raise
+        if cache is not None:
+            return cache.remember_missing(drive, full_path)
+        return DriveItemRef(path=full_path, item_id=None)
+    
+    if cache is not None:
+        return cache.remember(drive, full_path, item)
+    return DriveItemRef(
+        path=full_path,
+        item_id=item.get("id"),
+        parent_id=(item.get("parentReference") or {}).get("id"),
+        is_folder="folder" in item,
+    )
+
+
+def _remember_item(full_path: str, item: Dict[str, Any]) -> None:
+    """Record an item this process just created or found at ``full_path``."""
+    cache = get_drive_item_cache()
+    if cache is not None and item.get("id"):
+        cache.remember(get_user_id(), full_path, item)
+
+
+def invalidate_item_id(item_id: str) -> None:
+    """Drop cached paths for an item that Graph reported as gone (404)."""
+    cache = get_drive_item_cache()
+    if cache is not None and item_id:
+        cache.invalidate_item(item_id)
+
+
+def _folder_item(ref: DriveItemRef) -> Dict[str, Any]:
+    return {
+        "id": ref.item_id,
+        "name": ref.path.rsplit("/", 1)[-1],
+        "parentReference": {"id": ref.parent_id},
+        "folder": {},
+    }
+
+
 def ensure_folder(folder_path: str) -> Dict[str, Any]:
     """
     Ensure a folder exists at the given path, creating it if necessary.
@@ -133,17 +200,17 @@ def ensure_folder(folder_path: str) -> Dict[str, Any]:
         print(folder["id"])  # OneDrive item ID
     """
     full_path = _build_drive_path(folder_path)
-    logger.info(f"Ensuring folder exists: {full_path}")
     
     # First, check if folder already exists
     try:
-        endpoint = _build_item_path_endpoint(full_path)
-        folder = graph_get(endpoint)
-        logger.debug(f"Folder already exists: {full_path}")
-        return folder
+        existing = _resolve_path(full_path)
     except GraphAPIError as e:
-        if e.status_code != 404:
-            raise FolderCreationError(folder_path, f"Error checking folder: {e.message}")
+        raise FolderCreationError(folder_path, f"Error checking folder: {e.message}")
+    if not existing.missing:
+        logger.debug(f"Folder already exists: {full_path}")
+        return _folder_item(existing)
+    
+    logger.info(f"Ensuring folder exists: {full_path}")
     
     # Folder doesn't exist - create it by building path incrementally
     path_parts = full_path.split("/")
@@ -161,40 +228,42 @@ def ensure_folder(folder_path: str) -> Dict[str, Any]:
         
         # Check if this part exists
         try:
-            endpoint = _build_item_path_endpoint(current_path)
-            current_item = graph_get(endpoint)
-            logger.debug(f"Path segment exists: {current_path}")
+            segment = _resolve_path(current_path)
         except GraphAPIError as e:
-            if e.status_code == 404:
-                # Need to create this folder
-                logger.info(f"Creating folder segment: {current_path}")
-                
-                # Get parent folder ID
-                if i == 0:
-                    # Creating at root
-                    parent_endpoint = f"users/{get_user_id()}/drive/root/children"
-                else:
-                    parent_path = "/".join(path_parts[:i])
-                    parent_endpoint = _build_item_path_endpoint(parent_path) + ":/children"
-                
-                try:
-                    current_item = graph_post(parent_endpoint, {
-                        "name": part,
-                        "folder": {},
-                        "@microsoft.graph.conflictBehavior": "fail"
-                    })
-                    logger.info(f"Created folder: {part}")
-                except GraphAPIError as create_error:
-                    # Handle race condition - folder may have been created
-                    if create_error.error_code == "nameAlreadyExists":
-                        current_item = graph_get(endpoint)
-                    else:
-                        raise FolderCreationError(
-                            folder_path, 
-                            f"Failed to create {part}: {create_error.message}"
-                        )
+            raise FolderCreationError(folder_path, f"Error accessing path: {e.message}")
+        
+        if not segment.missing:
+            current_item = _folder_item(segment)
+            logger.debug(f"Path segment exists: {current_path}")
+            continue
+        
+        # Need to create this folder
+        logger.info(f"Creating folder segment: {current_path}")
+        
+        # Create under the parent resolved in the previous step
+        if current_item is None:
+            # Creating at root
+            parent_endpoint = f"users/{get_user_id()}/drive/root/children"
+        else:
+            parent_endpoint = _build_item_id_endpoint(current_item["id"]) + "/children"
+        
+        try:
+            current_item = graph_post(parent_endpoint, {
+                "name": part,
+                "folder": {},
+                "@microsoft.graph.conflictBehavior": "fail"
+            })
+            logger.info(f"Created folder: {part}")
+        except GraphAPIError as create_error:
+            # Handle race condition - folder may have been created
+            if create_error.error_code == "nameAlreadyExists":
+                current_item = graph_get(_build_item_path_endpoint(current_path))
             else:
-                raise FolderCreationError(folder_path, f"Error accessing path: {e.message}")
+                raise FolderCreationError(
+                    folder_path, 
+                    f"Failed to create {part}: {create_error.message}"
+                )
+        _remember_item(current_path, current_item)
     
     logger.info(f"Folder ensured: {full_path}")
     return current_item
@@ -219,22 +288,21 @@ def get_file_id(file_path: str) -> str:
     """
     full_path = _build_drive_path(file_path)
     
-    try:
-        endpoint = _build_item_path_endpoint(full_path)
-        item = graph_get(endpoint)
-        return item["id"]
-    except GraphAPIError as e:
-        if e.status_code == 404:
-            raise OneDriveFileNotFoundError(file_path, f"File not found on OneDrive: {file_path}")
-        raise
+    ref = _resolve_path(full_path)
+    if ref.missing:
+        raise OneDriveFileNotFoundError(file_path, f"File not found on OneDrive: {file_path}")
+    return ref.item_id
 
 
-def file_exists(file_path: str) -> bool:
+def file_exists(file_path: str, fresh: bool = False) -> bool:
     """
     Check if a file exists at the given path.
     
     Args:
         file_path: Path relative to ONEDRIVE_BASE_FOLDER
+        fresh: Ask Graph instead of the path cache. Use it before deciding
+            to create a file: a cached "missing" may be stale if another
+            process created the file since.
         
     Returns:
         bool: True if file exists, False otherwise
@@ -249,12 +317,8 @@ def file_exists(file_path: str) -> bool:
     full_path = _build_drive_path(file_path)
     
     try:
-        endpoint = _build_item_path_endpoint(full_path)
-        graph_get(endpoint)
-        return True
+        return not _resolve_path(full_path, fresh=fresh).missing
     except GraphAPIError as e:
-        if e.status_code == 404:
-            return False
         # For other errors, log but return False to be safe
         logger.warning(f"Error checking file existence: {e.message}")
         return False
@@ -268,7 +332,9 @@ def create_excel_file(
     Create a new Excel file on OneDrive.
     
     If a template_local_path is provided, uploads that file.
-    If file already exists, returns the existing file ID without overwriting.
+    If file already exists, returns the existing file ID without overwriting:
+    existence is checked against Graph (not the path cache), and the upload
+    fails rather than replaces if the file appeared in the meantime.
     
     Args:
         file_path: Path relative to ONEDRIVE_BASE_FOLDER
@@ -289,7 +355,7 @@ def create_excel_file(
         )
     """
     # Check if file already exists
-    if file_exists(file_path):
+    if file_exists(file_path, fresh=True):
         logger.info(f"File already exists, returning existing ID: {file_path}")
         return get_file_id(file_path)
     
@@ -318,7 +384,8 @@ def create_excel_file(
         # Upload using PUT (for small files < 4MB)
         # For larger files, would need upload session
         user_id = get_user_id()
-        endpoint = f"users/{user_id}/drive/root:/{full_path}:/content"
+        # Never replace a file another process created since the check above
+        endpoint = f"users/{user_id}/drive/root:/{full_path}:/content?@microsoft.graph.conflictBehavior=fail"
         
         # Need to use raw request for binary upload
         import requests
@@ -335,7 +402,14 @@ def create_excel_file(
         if response.status_code in (200, 201):
             result = response.json()
             logger.info(f"File uploaded successfully: {file_path}")
+            _remember_item(full_path, result)
             return result["id"]
+        elif response.status_code == 409 and _error_code(response) == "nameAlreadyExists":
+            logger.info(f"File created concurrently, returning existing ID: {file_path}")
+            ref = _resolve_path(full_path, fresh=True)
+            if ref.missing:
+                raise OneDriveFileNotFoundError(file_path, f"File not found on OneDrive: {file_path}")
+            return ref.item_id
         else:
             raise GraphAPIError(
                 message=f"Upload failed: {response.text}",
@@ -362,6 +436,14 @@ def create_excel_file(
         )
 
 
+def _error_code(response) -> Optional[str]:
+    """Graph error code from a raw requests response, if it has one."""
+    try:
+        return (response.json().get("error") or {}).get("code")
+    except ValueError:
+        return None
+
+
 def get_file_metadata(file_id: str) -> Dict[str, Any]:
     """
     Get metadata for a file by its OneDrive item ID.
@@ -391,7 +473,13 @@ def get_file_metadata(file_id: str) -> Dict[str, Any]:
     # Request specific fields
     params = "?$select=id,name,size,lastModifiedDateTime,eTag,webUrl,file"
     
-    item = graph_get(endpoint + params)
+    try:
+        item = graph_get(endpoint + params)
+    except GraphAPIError as e:
+        if e.status_code == 404:
+            # Deleted or replaced: paths cached for this id are stale
+            invalidate_item_id(file_id)
+        raise
     
     return {
         "id": item.get("id"),
@@ -404,9 +492,65 @@ def get_file_metadata(file_id: str) -> Dict[str, Any]:
     }
 
 
+def iter_folder_children(
+    folder_path: str,
+    select: Sequence[str] = FOLDER_CHILD_FIELDS,
+    page_size: int = ONEDRIVE_FOLDER_PAGE_SIZE,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Yield every item in a folder, fetching pages lazily.
+    
+    Follows @odata.nextLink, so folders with more items than one page are
+    listed completely; only the ``select``ed fields are transferred. Item
+    ids are recorded in the path -> id cache as they arrive.
+    
+    Args:
+        folder_path: Path relative to ONEDRIVE_BASE_FOLDER
+                    Use empty string "" for base folder itself
+        select: driveItem fields to request
+        page_size: Items per page ($top)
+        
+    Yields:
+        dict: Raw driveItem objects with the selected fields
+        
+    Raises:
+        OneDriveFileNotFoundError: If the folder does not exist
+        
+    Example:
+        for item in iter_folder_children("staff", select=("id", "name", "eTag")):
+            print(item["name"])
+    """
+    full_path = _build_drive_path(folder_path) if folder_path else get_base_folder()
+    endpoint = (
+        _build_item_path_endpoint(full_path)
+        + f":/children?$select={','.join(select)}&$top={max(1, page_size)}"
+    )
+    first_page = True
+    
+    while endpoint:
+        try:
+            page = graph_get(endpoint)
+        except GraphAPIError as e:
+            if e.status_code == 404 and first_page:
+                cache = get_drive_item_cache()
+                if cache is not None:
+                    cache.invalidate_path(get_user_id(), full_path, recursive=True)
+                raise OneDriveFileNotFoundError(folder_path, f"Folder not found: {folder_path}")
+            raise
+        first_page = False
+        
+        for item in page.get("value", []):
+            if item.get("name") and item.get("id"):
+                # Children come back with their ids; keep them for later path lookups
+                _remember_item(f"{full_path}/{item['name']}", item)
+            yield item
+        
+        endpoint = page.get("@odata.nextLink")
+
+
 def list_files_in_folder(folder_path: str) -> List[Dict[str, Any]]:
     """
-    List all files in a folder.
+    List all files in a folder (all pages).
     
     Args:
         folder_path: Path relative to ONEDRIVE_BASE_FOLDER
@@ -418,36 +562,26 @@ def list_files_in_folder(folder_path: str) -> List[Dict[str, Any]]:
             - id: Item ID
             - size: Size in bytes
             - isFolder: Boolean
-            - lastModified: ISO timestamp
+            - lastModified / lastModifiedDateTime: ISO timestamp
+            - eTag: Entity tag
             
     Example:
         files = list_files_in_folder("Aichi/2026-02")
         for f in files:
             print(f"{f['name']} - {f['size']} bytes")
     """
-    full_path = _build_drive_path(folder_path) if folder_path else get_base_folder()
-    
-    try:
-        endpoint = _build_item_path_endpoint(full_path) + ":/children"
-        result = graph_get(endpoint)
-        
-        items = result.get("value", [])
-        
-        return [
-            {
-                "name": item.get("name"),
-                "id": item.get("id"),
-                "size": item.get("size", 0),
-                "isFolder": "folder" in item,
-                "lastModified": item.get("lastModifiedDateTime")
-            }
-            for item in items
-        ]
-        
-    except GraphAPIError as e:
-        if e.status_code == 404:
-            raise OneDriveFileNotFoundError(folder_path, f"Folder not found: {folder_path}")
-        raise
+    return [
+        {
+            "name": item.get("name"),
+            "id": item.get("id"),
+            "size": item.get("size", 0),
+            "isFolder": "folder" in item,
+            "lastModified": item.get("lastModifiedDateTime"),
+            "lastModifiedDateTime": item.get("lastModifiedDateTime"),
+            "eTag": item.get("eTag"),
+        }
+        for item in iter_folder_children(folder_path)
+    ]
 
 
 def get_folder_id(folder_path: str) -> str:
@@ -465,14 +599,10 @@ def get_folder_id(folder_path: str) -> str:
     """
     full_path = _build_drive_path(folder_path) if folder_path else get_base_folder()
     
-    try:
-        endpoint = _build_item_path_endpoint(full_path)
-        item = graph_get(endpoint)
-        return item["id"]
-    except GraphAPIError as e:
-        if e.status_code == 404:
-            raise OneDriveFileNotFoundError(folder_path, f"Folder not found: {folder_path}")
-        raise
+    ref = _resolve_path(full_path)
+    if ref.missing:
+        raise OneDriveFileNotFoundError(folder_path, f"Folder not found: {folder_path}")
+    return ref.item_id
 
 
 def get_base_folder_id() -> str:
@@ -486,14 +616,89 @@ def get_base_folder_id() -> str:
     """
     base_folder = get_base_folder()
     
+    ref = _resolve_path(base_folder)
+    if ref.missing:
+        # Create the base folder
+        logger.info(f"Creating base folder: {base_folder}")
+        folder = ensure_folder("")
+        return folder["id"]
+    return ref.item_id
+
+
+def rename_item(item_path: str, new_name: str) -> Dict[str, Any]:
+    """
+    Rename a file or folder in place.
+    
+    Cached ids for the old path (and, for a folder, everything under it)
+    are dropped and the new path is recorded.
+    
+    Args:
+        item_path: Path relative to ONEDRIVE_BASE_FOLDER
+        new_name: New file or folder name (no slashes)
+        
+    Returns:
+        dict: Updated item object from Graph API
+        
+    Raises:
+        OneDriveFileNotFoundError: If the item does not exist
+    """
+    full_path = _build_drive_path(item_path)
+    item_id = get_file_id(item_path)
+    
     try:
-        endpoint = _build_item_path_endpoint(base_folder)
-        item = graph_get(endpoint)
-        return item["id"]
+        item = graph_patch(_build_item_id_endpoint(item_id), {"name": new_name})
     except GraphAPIError as e:
         if e.status_code == 404:
-            # Create the base folder
-            logger.info(f"Creating base folder: {base_folder}")
-            folder = ensure_folder("")
-            return folder["id"]
+            invalidate_item_id(item_id)
+            raise OneDriveFileNotFoundError(item_path)
         raise
+    
+    cache = get_drive_item_cache()
+    if cache is not None:
+        cache.invalidate_path(get_user_id(), full_path, recursive=True)
+    parent_path = full_path.rsplit("/", 1)[0] if "/" in full_path else ""
+    _remember_item(f"{parent_path}/{new_name}" if parent_path else new_name, item)
+    logger.info(f"Renamed {item_path} -> {new_name}")
+    return item
+
+
+def prewarm_item_ids(file_paths: Iterable[str]) -> Dict[str, int]:
+    """
+    Resolve known file paths into the path -> id cache.
+    
+    Each parent folder is listed once (one request covers all of its
+    files); paths not seen in a listing are resolved individually, so
+    files that do not exist are cached as missing.
+    
+    Args:
+        file_paths: Paths relative to ONEDRIVE_BASE_FOLDER
+        
+    Returns:
+        dict: {"paths", "found", "missing", "errors"} counts
+    """
+    cache = get_drive_item_cache()
+    paths = list(dict.fromkeys(p.strip("/") for p in file_paths if p))
+    counts = {"paths": len(paths), "found": 0, "missing": 0, "errors": 0}
+    if cache is None or not paths:
+        return counts
+    
+    folders = sorted({p.rsplit("/", 1)[0] for p in paths if "/" in p})
+    for folder in folders:
+        try:
+            list_files_in_folder(folder)
+        except OneDriveFileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"Prewarm: failed to list {folder}: {e}")
+    
+    for path in paths:
+        try:
+            ref = _resolve_path(_build_drive_path(path))
+        except Exception as e:
+            counts["errors"] += 1
+            logger.warning(f"Prewarm: failed to resolve {path}: {e}")
+            continue
+        counts["missing" if ref.missing else "found"] += 1
+    
+    logger.info(f"Drive item cache prewarmed: {counts}")
+    return counts
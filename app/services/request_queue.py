@@ -2,9 +2,13 @@
 Request Queue with Rate Limiting (Phase 9A.4)
 
 This module provides a request queue for Graph API calls with:
-    - Priority-based queue (high, normal, low)
-    - Concurrent request limiting (max 4 simultaneous)
-    - Global pause on rate limiting (429) for Retry-After duration
+    - Priority-based queue (high, normal, low), strictly ordered
+    - Event-driven scheduler (no busy polling while idle or at capacity)
+    - Token-bucket rate limiting per Graph resource lane
+      (one write lane per workbook, one global read lane)
+    - Separate concurrency budgets for reads and writes
+    - Deadline-aware ordering so pending retries run ahead of fresh requests
+    - Pause on rate limiting (429) for Retry-After duration
     - Queue size limits with overflow protection
 
 Usage:
@@ -13,6 +17,10 @@ Usage:
     # Enqueue a request
     result = enqueue(lambda: graph_get("me/drive"), priority='normal')
     
+    # Enqueue a workbook write on its own lane
+    kind, lane = lane_for_request("PATCH", f"me/drive/items/{item_id}/workbook/...")
+    result = enqueue(write_fn, priority='high', kind=kind, lane=lane)
+    
     # Check queue health
     stats = get_queue_stats()
 
@@ -20,14 +28,18 @@ Author: Phase 9A.4 - Request Queue, Rate Limiting & Retry Engine
 Date: 2026-02-28
 """
 
+import bisect
+import itertools
 import logging
+import math
+import os
+import re
 import threading
 import time
 from concurrent.futures import ThreadPoolExecutor, Future
 from dataclasses import dataclass, field
 from enum import Enum
-from queue import PriorityQueue, Full, Empty
-from typing import Callable, Any, Optional, Dict, List, TypeVar
+from typing import Callable, Any, Optional, Dict, List, Tuple, TypeVar
 from collections import deque
 
 # Configure logging
@@ -36,6 +48,28 @@ logger = logging.getLogger(__name__)
 # Type variable for generic return types
 T = TypeVar('T')
 
+# Request kinds (each has its own concurrency budget)
+KIND_READ = 'read'
+KIND_WRITE = 'write'
+
+# Lane used by every read, and by writes whose target file is unknown
+READ_LANE = 'read:global'
+WRITE_LANE_GLOBAL = 'write:global'
+
+# Token bucket defaults (requests per second / burst size)
+READ_LANE_RATE = float(os.environ.get("GRAPH_READ_RATE_PER_SEC", "8"))
+READ_LANE_BURST = float(os.environ.get("GRAPH_READ_BURST", "16"))
+WRITE_LANE_RATE = float(os.environ.get("GRAPH_WRITE_RATE_PER_SEC", "2"))
+WRITE_LANE_BURST = float(os.environ.get("GRAPH_WRITE_BURST", "4"))
+
+# Idle write lanes are dropped once this many lanes exist
+MAX_IDLE_LANES = 256
+LANE_IDLE_SECONDS = 300
+
+# Matches "items/{id}" and "root:/{path}:" style drive item references
+_ITEM_ID_PATTERN = re.compile(r"items/([^/(:?]+)")
+_ITEM_PATH_PATTERN = re.compile(r"root:/([^:]+):")
+
 
 class Priority(Enum):
     """Request priority levels."""
@@ -53,23 +87,33 @@ class Priority(Enum):
         }.get(value.lower(), cls.NORMAL)
 
 
+_sequence = itertools.count()
+
+
 @dataclass(order=True)
 class QueuedRequest:
     """
     A request waiting in the queue.
     
-    Ordered by priority (lower number = higher priority),
-    then by timestamp (FIFO within priority).
+    Ordered by priority (lower number = higher priority), then by
+    deadline (retries carry their original enqueue time, fresh requests
+    have none), then by timestamp (FIFO within priority).
     """
     priority: int
+    deadline: float
     timestamp: float
-    request_fn: Callable = field(compare=False)
-    future: Future = field(compare=False)
+    sequence: int = field(default_factory=lambda: next(_sequence))
+    request_fn: Callable = field(default=None, compare=False)
+    future: Future = field(default=None, compare=False)
     request_id: str = field(default='', compare=False)
+    kind: str = field(default=KIND_READ, compare=False)
+    lane: str = field(default=READ_LANE, compare=False)
+    not_before: float = field(default=0.0, compare=False)
+    enqueued_at: float = field(default=0.0, compare=False)
     
     def __post_init__(self):
         if not self.request_id:
-            self.request_id = f"req_{int(self.timestamp * 1000)}"
+            self.request_id = f"req_{int(self.timestamp * 1000)}_{self.sequence}"
 
 
 class QueueOverflowError(Exception):
@@ -84,18 +128,120 @@ class QueueOverflowError(Exception):
         )
 
 
+class TokenBucket:
+    """
+    Token bucket for a single rate-limit lane.
+    
+    Tokens refill continuously at ``rate`` per second up to ``capacity``.
+    A throttle penalty pushes the next refill into the future so the lane
+    stays closed for the Retry-After duration.
+    """
+    
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self._updated = time.monotonic()
+        self.last_used = self._updated
+    
+    def _refill(self, now: float):
+        elapsed = now - self._updated
+        if elapsed > 0:
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+            self._updated = now
+    
+    def try_consume(self, now: float) -> bool:
+        """Take one token if available."""
+        self._refill(now)
+        if self.tokens >= 1:
+            self.tokens -= 1
+            self.last_used = now
+            return True
+        return False
+    
+    def seconds_until_token(self, now: float) -> float:
+        """Seconds until at least one token is available."""
+        self._refill(now)
+        if self._updated > now:
+            # Penalised: refill only starts after the penalty ends
+            return (self._updated - now) + max(0.0, 1 - self.tokens) / self.rate
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.rate
+    
+    def penalize(self, now: float, seconds: float):
+        """Empty the bucket and hold refills for ``seconds``."""
+        self.tokens = 0
+        self._updated = max(self._updated, now + seconds)
+    
+    def is_idle(self, now: float) -> bool:
+        """Full and unused for LANE_IDLE_SECONDS."""
+        self._refill(now)
+        return self.tokens >= self.capacity and now - self.last_used > LANE_IDLE_SECONDS
+    
+    def snapshot(self, now: float) -> dict:
+        self._refill(now)
+        return {
+            'tokens': round(max(0.0, self.tokens), 2),
+            'capacity': self.capacity,
+            'ratePerSec': self.rate,
+            'penaltyRemainingSeconds': round(max(0.0, self._updated - now), 2)
+        }
+
+
+def lane_for_request(method: str, endpoint: str) -> Tuple[str, str]:
+    """
+    Classify a Graph request into (kind, lane).
+    
+    Reads share the global read lane. Writes get one lane per drive item
+    (by item id, or by path for ``root:/path:`` addressing) so that writes
+    to one workbook are paced independently of other workbooks.
+    
+    Args:
+        method: HTTP method
+        endpoint: Graph API endpoint
+    
+    Returns:
+        Tuple of (kind, lane)
+    """
+    if method.upper() in ('GET', 'HEAD'):
+        return KIND_READ, READ_LANE
+    
+    match = _ITEM_ID_PATTERN.search(endpoint)
+    if match:
+        return KIND_WRITE, f"write:{match.group(1)}"
+    
+    match = _ITEM_PATH_PATTERN.search(endpoint)
+    if match:
+        return KIND_WRITE, f"write:{match.group(1).lower()}"
+    
+    return KIND_WRITE, WRITE_LANE_GLOBAL
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, math.ceil(pct / 100 * len(sorted_values)) - 1)
+    return sorted_values[rank]
+
+
 class RequestQueue:
     """
     Priority-based request queue with rate limiting support.
     
     Features:
-        - Max 4 concurrent requests
-        - Priority queue (high > normal > low)
-        - Global pause on 429 rate limiting
+        - Separate concurrency budgets for reads and writes
+        - Strict priority queue (high > normal > low)
+        - Token-bucket pacing per lane (per-file writes, global reads)
+        - Scheduler thread sleeps on a condition variable until the next
+          enqueue, completion, token refill or pause expiry
+        - Pause on 429 rate limiting
         - Queue size limit of 50 (configurable)
-        
+    
     Attributes:
-        max_concurrent: Maximum simultaneous requests
+        max_concurrent: Maximum simultaneous read requests
+        max_concurrent_writes: Maximum simultaneous write requests
         max_queue_size: Maximum queued requests
         is_paused: Whether processing is paused (rate limited)
         pause_until: Unix timestamp when pause ends
@@ -105,18 +251,31 @@ class RequestQueue:
         self,
         max_concurrent: int = 4,
         max_queue_size: int = 50,
-        low_priority_limit: int = None
+        low_priority_limit: int = None,
+        max_concurrent_writes: int = 2,
+        read_rate: float = READ_LANE_RATE,
+        read_burst: float = READ_LANE_BURST,
+        write_rate: float = WRITE_LANE_RATE,
+        write_burst: float = WRITE_LANE_BURST
     ):
         self.max_concurrent = max_concurrent
+        self.max_concurrent_writes = max_concurrent_writes
         self.max_queue_size = max_queue_size
         # Default: reserve 20% of queue for high/normal priority
         self.low_priority_limit = low_priority_limit if low_priority_limit is not None else max(1, int(max_queue_size * 0.2))
         
-        # Queue state
-        self._queue: PriorityQueue = PriorityQueue()
-        self._queue_lock = threading.Lock()
-        self._processing_count = 0
-        self._processing_lock = threading.Lock()
+        self._read_rate = read_rate
+        self._read_burst = read_burst
+        self._write_rate = write_rate
+        self._write_burst = write_burst
+        
+        # Queue state: pending list kept sorted by QueuedRequest ordering.
+        # Size is bounded by max_queue_size so a linear scan is cheap.
+        self._pending: List[QueuedRequest] = []
+        self._cond = threading.Condition(threading.Lock())
+        self._inflight = {KIND_READ: 0, KIND_WRITE: 0}
+        self._limits = {KIND_READ: max_concurrent, KIND_WRITE: max_concurrent_writes}
+        self._buckets: Dict[str, TokenBucket] = {}
         
         # Pause state for rate limiting
         self._is_paused = False
@@ -130,18 +289,19 @@ class RequestQueue:
             'total_failed': 0,
             'total_rejected': 0,
             'total_throttles': 0,
-            'recent_wait_times': deque(maxlen=100),  # Last 100 wait times
+            'total_retries': 0,
+            'recent_wait_times': deque(maxlen=500),  # Last 500 wait times
             'recent_process_times': deque(maxlen=100)
         }
         self._stats_lock = threading.Lock()
         
         # Thread pool for async execution
         self._executor = ThreadPoolExecutor(
-            max_workers=max_concurrent,
+            max_workers=max_concurrent + max_concurrent_writes,
             thread_name_prefix='graphqueue'
         )
         
-        # Background worker thread
+        # Background scheduler thread
         self._worker_running = True
         self._worker_thread = threading.Thread(
             target=self._process_queue,
@@ -152,9 +312,14 @@ class RequestQueue:
         
         logger.info(
             f"Request queue initialized: max_concurrent={max_concurrent}, "
+            f"max_concurrent_writes={max_concurrent_writes}, "
             f"max_queue_size={max_queue_size}"
         )
     
+    @property
+    def _processing_count(self) -> int:
+        return self._inflight[KIND_READ] + self._inflight[KIND_WRITE]
+    
     @property
     def is_paused(self) -> bool:
         """Check if queue is paused due to rate limiting."""
@@ -173,6 +338,13 @@ class RequestQueue:
             remaining = self._pause_until - time.time()
             return max(0, int(remaining))
     
+    def _pause_remaining(self) -> float:
+        """Exact remaining pause time (0 when not paused)."""
+        with self._pause_lock:
+            if not self._is_paused:
+                return 0.0
+            return max(0.0, self._pause_until - time.time())
+    
     def pause_for_throttle(self, retry_after_seconds: int):
         """
         Pause queue processing due to rate limiting.
@@ -192,20 +364,66 @@ class RequestQueue:
         
         with self._stats_lock:
             self._stats['total_throttles'] += 1
+        
+        with self._cond:
+            self._cond.notify()
+    
+    def throttle_lane(self, lane: str, retry_after_seconds: int):
+        """
+        Close a single write lane for the Retry-After duration.
+        
+        Throttles on the global read lane pause the whole queue instead,
+        since those are not tied to one workbook.
+        
+        Args:
+            lane: Lane that received the 429
+            retry_after_seconds: Seconds to hold the lane closed
+        """
+        if lane == READ_LANE:
+            self.pause_for_throttle(retry_after_seconds)
+            return
+        
+        with self._cond:
+            self._bucket_for(lane).penalize(time.monotonic(), retry_after_seconds)
+            self._cond.notify()
+        
+        with self._stats_lock:
+            self._stats['total_throttles'] += 1
+        
+        logger.warning(f"⚠️ Lane {lane} throttled for {retry_after_seconds}s")
     
     def _get_queue_size(self) -> int:
         """Get current queue size."""
-        return self._queue.qsize()
+        return len(self._pending)
     
     def _get_low_priority_count(self) -> int:
-        """Count low priority items in queue (approximate)."""
-        # This is approximate since we can't iterate PriorityQueue safely
-        return 0  # Simplified - full impl would track separately
+        """Count low priority items in queue."""
+        with self._cond:
+            return sum(1 for q in self._pending if q.priority == Priority.LOW.value)
+    
+    def _bucket_for(self, lane: str) -> TokenBucket:
+        """Get or create the token bucket for a lane (caller holds _cond)."""
+        bucket = self._buckets.get(lane)
+        if bucket is None:
+            if len(self._buckets) >= MAX_IDLE_LANES:
+                now = time.monotonic()
+                for name in [n for n, b in self._buckets.items() if b.is_idle(now)]:
+                    del self._buckets[name]
+            if lane == READ_LANE:
+                bucket = TokenBucket(self._read_rate, self._read_burst)
+            else:
+                bucket = TokenBucket(self._write_rate, self._write_burst)
+            self._buckets[lane] = bucket
+        return bucket
     
     def enqueue(
         self,
         request_fn: Callable[[], T],
-        priority: str = 'normal'
+        priority: str = 'normal',
+        kind: str = KIND_READ,
+        lane: Optional[str] = None,
+        deadline: Optional[float] = None,
+        not_before: float = 0.0
     ) -> Future:
         """
         Add a request to the queue.
@@ -213,10 +431,16 @@ class RequestQueue:
         Args:
             request_fn: Function to execute (takes no arguments)
             priority: 'high', 'normal', or 'low'
-            
+            kind: 'read' or 'write' (selects the concurrency budget)
+            lane: Rate-limit lane (defaults to the global lane for ``kind``)
+            deadline: Monotonic time used for ordering within a priority;
+                earlier deadlines run first (retries pass their original
+                enqueue time)
+            not_before: Seconds to wait before the request becomes eligible
+        
         Returns:
             Future that will contain the result
-            
+        
         Raises:
             QueueOverflowError: If queue is full and request is rejected
         """
@@ -238,64 +462,101 @@ class RequestQueue:
                     self._stats['total_rejected'] += 1
                 raise QueueOverflowError(current_size, self.max_queue_size)
         
+        if kind not in self._limits:
+            kind = KIND_READ
+        if lane is None:
+            lane = READ_LANE if kind == KIND_READ else WRITE_LANE_GLOBAL
+        
         # Create future for result
         future = Future()
+        now = time.monotonic()
         
         # Create queued request
         queued = QueuedRequest(
             priority=priority_enum.value,
+            deadline=deadline if deadline is not None else math.inf,
             timestamp=time.time(),
             request_fn=request_fn,
-            future=future
+            future=future,
+            kind=kind,
+            lane=lane,
+            not_before=now + max(0.0, not_before),
+            enqueued_at=now
         )
         
-        # Add to queue
-        with self._queue_lock:
-            self._queue.put(queued)
+        # Add to queue and wake the scheduler
+        with self._cond:
+            bisect.insort(self._pending, queued)
+            self._cond.notify()
         
         with self._stats_lock:
             self._stats['total_enqueued'] += 1
         
-        logger.debug(f"Enqueued request {queued.request_id} with priority {priority}")
+        logger.debug(
+            f"Enqueued request {queued.request_id} with priority {priority} on lane {lane}"
+        )
         
         return future
     
+    def _dispatch_ready(self, now: float) -> Optional[float]:
+        """
+        Start every request that can run now (caller holds _cond).
+        
+        Walks pending requests in priority order and starts each one whose
+        kind has a free slot and whose lane has a token. A request blocked
+        on its own lane does not block other lanes.
+        
+        Returns:
+            Seconds until the next time-based event (token refill, retry
+            becoming eligible, pause expiry), or None to wait for a notify.
+        """
+        pause_remaining = self._pause_remaining()
+        if pause_remaining > 0:
+            return pause_remaining
+        
+        next_wake: Optional[float] = None
+        remaining: List[QueuedRequest] = []
+        
+        for queued in self._pending:
+            if queued.not_before > now:
+                delay = queued.not_before - now
+                next_wake = delay if next_wake is None else min(next_wake, delay)
+                remaining.append(queued)
+                continue
+            
+            if self._inflight[queued.kind] >= self._limits[queued.kind]:
+                # Woken again by completion
+                remaining.append(queued)
+                continue
+            
+            bucket = self._bucket_for(queued.lane)
+            if not bucket.try_consume(now):
+                delay = bucket.seconds_until_token(now)
+                next_wake = delay if next_wake is None else min(next_wake, delay)
+                remaining.append(queued)
+                continue
+            
+            self._inflight[queued.kind] += 1
+            wait_time = (now - queued.enqueued_at) * 1000
+            with self._stats_lock:
+                self._stats['recent_wait_times'].append(wait_time)
+            self._executor.submit(self._execute_request, queued)
+        
+        self._pending = remaining
+        return next_wake
+    
     def _process_queue(self):
-        """Background worker that processes queued requests."""
-        while self._worker_running:
-            try:
-                # Check if paused
-                if self.is_paused:
-                    time.sleep(1)
-                    continue
-                
-                # Check if we can process more
-                with self._processing_lock:
-                    if self._processing_count >= self.max_concurrent:
-                        time.sleep(0.1)
-                        continue
-                
-                # Try to get next request
+        """Background scheduler that dispatches queued requests on events."""
+        with self._cond:
+            while self._worker_running:
                 try:
-                    queued: QueuedRequest = self._queue.get(timeout=0.5)
-                except Empty:
-                    continue
-                
-                # Calculate wait time
-                wait_time = (time.time() - queued.timestamp) * 1000
-                with self._stats_lock:
-                    self._stats['recent_wait_times'].append(wait_time)
-                
-                # Increment processing count
-                with self._processing_lock:
-                    self._processing_count += 1
-                
-                # Execute in thread pool
-                self._executor.submit(self._execute_request, queued)
-                
-            except Exception as e:
-                logger.error(f"Queue worker error: {e}")
-                time.sleep(1)
+                    timeout = self._dispatch_ready(time.monotonic())
+                except Exception as e:
+                    logger.error(f"Queue worker error: {e}")
+                    timeout = 1
+                if not self._worker_running:
+                    break
+                self._cond.wait(timeout=timeout)
     
     def _execute_request(self, queued: QueuedRequest):
         """Execute a single request and handle result."""
@@ -311,7 +572,7 @@ class RequestQueue:
                 self._stats['recent_process_times'].append(process_time)
             
             logger.debug(f"Request {queued.request_id} completed")
-            
+        
         except Exception as e:
             queued.future.set_exception(e)
             
@@ -327,40 +588,75 @@ class RequestQueue:
                     inner_error = e.response_body.get('error', {})
                     retry_after = inner_error.get('retryAfterSeconds', 30)
                 
-                self.pause_for_throttle(retry_after)
+                self.throttle_lane(queued.lane, retry_after)
             
             logger.warning(f"Request {queued.request_id} failed: {e}")
         
         finally:
-            with self._processing_lock:
-                self._processing_count -= 1
+            with self._cond:
+                self._inflight[queued.kind] -= 1
+                self._cond.notify()
+    
+    def record_retry(self):
+        """Count a retry scheduled through the queue."""
+        with self._stats_lock:
+            self._stats['total_retries'] += 1
     
     def get_stats(self) -> dict:
         """
         Get queue statistics.
         
         Returns:
-            dict with pending, processing, completed, failed, avgWaitMs, etc.
+            dict with pending, processing, completed, failed, avgWaitMs,
+            wait-time percentiles, depth by priority and lane, and token
+            bucket state per lane
         """
         with self._stats_lock:
-            wait_times = list(self._stats['recent_wait_times'])
+            wait_times = sorted(self._stats['recent_wait_times'])
             process_times = list(self._stats['recent_process_times'])
+            counters = {k: v for k, v in self._stats.items() if k.startswith('total_')}
+        
+        now = time.monotonic()
+        with self._cond:
+            pending = list(self._pending)
+            inflight = dict(self._inflight)
+            lanes = {name: bucket.snapshot(now) for name, bucket in self._buckets.items()}
+        
+        depth_by_priority = {p.name.lower(): 0 for p in Priority}
+        depth_by_lane: Dict[str, int] = {}
+        delayed = 0
+        for queued in pending:
+            depth_by_priority[Priority(queued.priority).name.lower()] += 1
+            depth_by_lane[queued.lane] = depth_by_lane.get(queued.lane, 0) + 1
+            if queued.not_before > now:
+                delayed += 1
         
         avg_wait = sum(wait_times) / len(wait_times) if wait_times else 0
         avg_process = sum(process_times) / len(process_times) if process_times else 0
         
         return {
-            'pending': self._get_queue_size(),
-            'processing': self._processing_count,
-            'completed': self._stats['total_completed'],
-            'failed': self._stats['total_failed'],
-            'rejected': self._stats['total_rejected'],
-            'throttles': self._stats['total_throttles'],
+            'pending': len(pending),
+            'pendingDelayed': delayed,
+            'processing': inflight[KIND_READ] + inflight[KIND_WRITE],
+            'processingReads': inflight[KIND_READ],
+            'processingWrites': inflight[KIND_WRITE],
+            'completed': counters['total_completed'],
+            'failed': counters['total_failed'],
+            'rejected': counters['total_rejected'],
+            'throttles': counters['total_throttles'],
+            'retries': counters['total_retries'],
             'avgWaitMs': round(avg_wait, 2),
+            'waitMsP50': round(_percentile(wait_times, 50), 2),
+            'waitMsP90': round(_percentile(wait_times, 90), 2),
+            'waitMsP99': round(_percentile(wait_times, 99), 2),
             'avgProcessMs': round(avg_process, 2),
+            'depthByPriority': depth_by_priority,
+            'depthByLane': depth_by_lane,
+            'lanes': lanes,
             'isPaused': self.is_paused,
             'pauseRemainingSeconds': self.pause_remaining_seconds,
             'maxConcurrent': self.max_concurrent,
+            'maxConcurrentWrites': self.max_concurrent_writes,
             'maxQueueSize': self.max_queue_size
         }
     
@@ -372,7 +668,9 @@ class RequestQueue:
             wait: Whether to wait for pending requests to complete
         """
         logger.info("Shutting down request queue...")
-        self._worker_running = False
+        with self._cond:
+            self._worker_running = False
+            self._cond.notify_all()
         
         if wait and self._worker_thread.is_alive():
             self._worker_thread.join(timeout=10)
@@ -400,7 +698,9 @@ def enqueue(
     request_fn: Callable[[], T],
     priority: str = 'normal',
     wait: bool = True,
-    timeout: float = None
+    timeout: float = None,
+    kind: str = KIND_READ,
+    lane: Optional[str] = None
 ) -> T:
     """
     Enqueue a request and optionally wait for result.
@@ -410,17 +710,19 @@ def enqueue(
         priority: 'high', 'normal', or 'low'
         wait: Whether to wait for result (default: True)
         timeout: Timeout in seconds if waiting
-        
+        kind: 'read' or 'write' (see lane_for_request)
+        lane: Rate-limit lane (see lane_for_request)
+    
     Returns:
         Result of request_fn if wait=True, else Future
-        
+    
     Raises:
         QueueOverflowError: If queue full and low priority
         TimeoutError: If wait times out
         Exception: Any exception from request_fn
     """
     queue = get_request_queue()
-    future = queue.enqueue(request_fn, priority)
+    future = queue.enqueue(request_fn, priority, kind=kind, lane=lane)
     
     if not wait:
         return future
@@ -428,6 +730,124 @@ def enqueue(
     return future.result(timeout=timeout)
 
 
+def enqueue_with_retry(
+    request_fn: Callable[[], T],
+    priority: str = 'normal',
+    kind: str = KIND_READ,
+    lane: Optional[str] = None,
+    max_retries: int = 4,
+    base_delay_ms: int = 1000,
+    max_delay_ms: int = 30000,
+    retry_on_status_codes: List[int] = None,
+    on_retry: Callable[[int, Exception, int], None] = None,
+    operation_name: str = None
+) -> T:
+    """
+    Run a request through the queue, re-enqueueing it on retryable failures.
+    
+    Unlike wrapping ``with_retry`` inside a queued callable, the backoff
+    delay is spent waiting in the queue (``not_before``) rather than
+    holding an execution slot. Retries keep the deadline of the first
+    attempt, so they are scheduled ahead of fresh requests of the same
+    priority.
+    
+    Args:
+        request_fn: Function to execute (one attempt)
+        priority: 'high', 'normal', or 'low'
+        kind: 'read' or 'write'
+        lane: Rate-limit lane
+        max_retries: Maximum number of retry attempts
+        base_delay_ms: Base delay for backoff in ms
+        max_delay_ms: Maximum delay cap in ms
+        retry_on_status_codes: HTTP status codes to retry on
+        on_retry: Optional callback(attempt, error, delay_ms) before each retry
+        operation_name: Description for logging/error reporting
+    
+    Returns:
+        Return value of request_fn on success
+    
+    Raises:
+        RetryExhaustedError: If all retries exhausted
+        QueueOverflowError: If queue full and low priority
+        Exception: Re-raises non-retryable errors immediately
+    """
+    from app.services.retry_engine import (
+        RetryExhaustedError, calculate_backoff, should_retry
+    )
+    
+    queue = get_request_queue()
+    operation = operation_name or 'queued_request'
+    start_time = time.time()
+    deadline = time.monotonic()
+    attempt_details = []
+    last_error = None
+    delay_s = 0.0
+    
+    for attempt in range(max_retries + 1):
+        attempt_start = time.time()
+        future = queue.enqueue(
+            request_fn,
+            priority,
+            kind=kind,
+            lane=lane,
+            deadline=deadline if attempt > 0 else None,
+            not_before=delay_s
+        )
+        
+        try:
+            result = future.result()
+            if attempt > 0:
+                total_time = (time.time() - start_time) * 1000
+                logger.info(
+                    f"Operation '{operation}' succeeded on attempt {attempt + 1} "
+                    f"(total time: {total_time:.0f}ms)"
+                )
+            return result
+        
+        except Exception as e:
+            last_error = e
+            attempt_details.append({
+                'attempt': attempt + 1,
+                'error': str(e),
+                'error_type': type(e).__name__,
+                'duration_ms': (time.time() - attempt_start) * 1000
+            })
+            
+            retryable, retry_after = should_retry(e, retry_on_status_codes)
+            if not retryable:
+                raise
+            
+            if attempt >= max_retries:
+                break
+            
+            if retry_after:
+                delay_ms = retry_after * 1000
+            else:
+                delay_ms = calculate_backoff(attempt, base_delay_ms, max_delay_ms)
+            
+            logger.warning(
+                f"Retry {attempt + 1}/{max_retries} for '{operation}': "
+                f"{type(e).__name__} - re-queued with {delay_ms}ms delay"
+            )
+            
+            if on_retry:
+                try:
+                    on_retry(attempt + 1, e, delay_ms)
+                except Exception:
+                    pass  # Don't fail on callback error
+            
+            queue.record_retry()
+            delay_s = delay_ms / 1000
+    
+    raise RetryExhaustedError(
+        operation=operation,
+        attempts=max_retries + 1,
+        last_error=last_error,
+        total_time_ms=(time.time() - start_time) * 1000,
+        attempt_details=attempt_details
+    )
+
+
 def get_queue_stats() -> dict:
     """Get queue statistics."""
     return get_request_queue().get_stats()
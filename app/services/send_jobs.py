@@ -0,0 +1,676 @@
+"""Durable bulk-send jobs for POST /api/drafts/send-jobs.
+
+A send job owns one row per draft, each moving through a small state
+machine::
+
+    pending -> writing -> sent | failed
+
+Drafts are sent in chunks through ``DraftService.send_drafts`` (so the
+summary service still batches workbook writes). A chunk is marked
+``writing`` before the Excel writes start; if the worker dies mid-chunk, the
+next worker to claim the job checks each ``writing`` draft for a confirmed
+write (status SENT, ``graph_api_write_confirmed`` or a stored
+``format1_row_index``). Drafts without one are marked failed for manual
+review rather than re-sent: the ledger writers do not dedupe by draft, so
+a row written just before the crash would be written twice.
+
+Claiming and retries follow app.mobile.analysis_jobs; both stores are driven
+by app.utils.job_workers.JobWorkerPool.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from uuid import UUID, uuid4
+
+from app.config.data_paths import get_data_dir
+from app.utils.job_workers import JobClaimLost
+from app.models.draft import DraftStatus
+
+logger = logging.getLogger(__name__)
+
+# Worker threads per process running send jobs (0 = enqueue only; run
+# ``python -m app.services.send_jobs`` as a separate worker process)
+SEND_JOB_WORKERS = int(os.environ.get("SEND_JOB_WORKERS", "1"))
+# Drafts per DraftService.send_drafts call; also the re-check window after a crash
+SEND_JOB_CHUNK_SIZE = max(1, int(os.environ.get("SEND_JOB_CHUNK_SIZE", "10")))
+SEND_JOB_MAX_ATTEMPTS = int(os.environ.get("SEND_JOB_MAX_ATTEMPTS", "3"))
+SEND_JOB_RETRY_BASE_SECONDS = float(os.environ.get("SEND_JOB_RETRY_BASE_SECONDS", "5"))
+SEND_JOB_CLAIM_TIMEOUT_SECONDS = float(os.environ.get("SEND_JOB_CLAIM_TIMEOUT_SECONDS", "300"))
+SEND_JOB_RETENTION_SECONDS = float(os.environ.get("SEND_JOB_RETENTION_SECONDS", str(7 * 24 * 3600)))
+SEND_JOB_DB_PATH = os.environ.get("SEND_JOB_DB_PATH", "")
+
+STATE_QUEUED = "queued"
+STATE_RUNNING = "running"
+STATE_COMPLETED = "completed"
+STATE_FAILED = "failed"
+
+ITEM_PENDING = "pending"
+ITEM_WRITING = "writing"
+ITEM_SENT = "sent"
+ITEM_FAILED = "failed"
+ITEM_STATES = (ITEM_PENDING, ITEM_WRITING, ITEM_SENT, ITEM_FAILED)
+
+INTERRUPTED_WRITE_ERROR = "Send interrupted mid-write; check the ledgers before sending this draft again"
+
+# Stages reported while a job runs, in order
+STAGES = ("resuming", "sending", "finalizing")
+
+
+@dataclass
+class SendJob:
+    job_id: str
+    state: str
+    stage: Optional[str]
+    payload: Dict[str, Any]
+    created_by: Optional[str]
+    attempts: int
+    max_attempts: int
+    created_at: float
+    updated_at: float
+    error: Optional[str] = None
+    result: Optional[Dict[str, Any]] = None
+    timings: Dict[str, Any] = field(default_factory=dict)
+    claim_token: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.job_id,
+            "state": self.state,
+            "stage": self.stage,
+            "created_by": self.created_by,
+            "attempts": self.attempts,
+            "max_attempts": self.max_attempts,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
+            "error": self.error,
+        }
+
+
+@dataclass
+class SendJobItem:
+    position: int
+    draft_id: str
+    state: str
+    attempts: int
+    updated_at: float
+    error: Optional[str] = None
+    result: Optional[Dict[str, Any]] = None
+    warnings: Dict[str, Any] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "draft_id": self.draft_id,
+            "state": self.state,
+            "attempts": self.attempts,
+            "error": self.error,
+        }
+
+
+class DraftsAlreadyQueued(ValueError):
+    """Raised when drafts are still pending in another queued or running send job."""
+
+    def __init__(self, draft_ids: List[str]) -> None:
+        super().__init__(f"Drafts already queued for sending: {', '.join(draft_ids)}")
+        self.draft_ids = draft_ids
+
+
+class SendJobStore:
+    """Send jobs and their per-draft items in SQLite.
+
+    Claim semantics match AnalysisJobStore: ``claim`` hands the oldest due
+    job to one worker, and a job whose claim is not renewed (every item
+    update renews it, and a heartbeat renews it while a chunk is written)
+    becomes claimable again once the claim expires.
+    """
+
+    def __init__(
+        self,
+        db_path: str | Path | None = None,
+        *,
+        claim_timeout: float = SEND_JOB_CLAIM_TIMEOUT_SECONDS,
+    ) -> None:
+        if db_path is None:
+            db_path = SEND_JOB_DB_PATH or get_data_dir() / "send_jobs.db"
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.claim_timeout = claim_timeout
+        self._init_schema()
+
+    def enqueue(
+        self,
+        draft_ids: Iterable[UUID | str],
+        payload: Dict[str, Any],
+        *,
+        created_by: Optional[str] = None,
+        job_id: Optional[str] = None,
+        max_attempts: int = SEND_JOB_MAX_ATTEMPTS,
+    ) -> SendJob:
+        """Create a job with one pending item per draft (duplicates dropped, order kept).
+
+        Raises DraftsAlreadyQueued if any draft is still unsent in another
+        queued or running job, so one draft is never written by two jobs.
+        """
+        ids = list(dict.fromkeys(str(draft_id) for draft_id in draft_ids))
+        if not ids:
+            raise ValueError("A send job needs at least one draft")
+        job_id = job_id or uuid4().hex
+        now = time.time()
+        with self._connect(immediate=True) as conn:
+            busy = conn.execute(
+                f"""
+                SELECT DISTINCT i.draft_id FROM send_job_items i
+                JOIN send_jobs j ON j.job_id = i.job_id
+                WHERE j.state IN ('queued', 'running') AND i.state IN ('pending', 'writing')
+                  AND i.draft_id IN ({", ".join("?" for _ in ids)})
+                """,
+                ids,
+            ).fetchall()
+            if busy:
+                raise DraftsAlreadyQueued(sorted(row[0] for row in busy))
+            conn.execute(
+                """
+                INSERT INTO send_jobs
+                    (job_id, state, stage, payload, created_by, attempts, max_attempts,
+                     next_attempt_at, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, 0, ?, ?, ?, ?)
+                """,
+                (job_id, STATE_QUEUED, None, _dumps(payload), created_by, max(1, max_attempts), now, now, now),
+            )
+            conn.executemany(
+                """
+                INSERT INTO send_job_items (job_id, position, draft_id, state, attempts, updated_at)
+                VALUES (?, ?, ?, 'pending', 0, ?)
+                """,
+                [(job_id, position, draft_id, now) for position, draft_id in enumerate(ids)],
+            )
+        return self.get(job_id)
+
+    def get(self, job_id: str) -> Optional[SendJob]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM send_jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return self._build_job(row) if row else None
+
+    def items(self, job_id: str) -> List[SendJobItem]:
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT * FROM send_job_items WHERE job_id = ? ORDER BY position", (job_id,)
+            ).fetchall()
+        return [self._build_item(row) for row in rows]
+
+    def snapshot(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Job state, per-state item counts and per-draft states, read in one transaction."""
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM send_jobs WHERE job_id = ?", (job_id,)).fetchone()
+            if row is None:
+                return None
+            item_rows = conn.execute(
+                "SELECT * FROM send_job_items WHERE job_id = ? ORDER BY position", (job_id,)
+            ).fetchall()
+        job = self._build_job(row)
+        items = [self._build_item(item) for item in item_rows]
+        progress = {state: 0 for state in ITEM_STATES}
+        for item in items:
+            progress[item.state] = progress.get(item.state, 0) + 1
+        progress["total"] = len(items)
+        progress["done"] = progress[ITEM_SENT] + progress[ITEM_FAILED]
+        return {
+            **job.to_dict(),
+            "progress": progress,
+            "items": [item.to_dict() for item in items],
+            "result": job.result,
+        }
+
+    def claim(self, *, worker_id: Optional[str] = None) -> Optional[SendJob]:
+        """Claim the oldest queued job that is due, or a running job whose claim expired."""
+        now = time.time()
+        token = f"{worker_id or 'worker'}:{uuid4().hex}"
+        with self._connect(immediate=True) as conn:
+            row = conn.execute(
+                """
+                UPDATE send_jobs
+                SET state = 'running', claim_token = ?, claim_expires_at = ?,
+                    attempts = attempts + 1, updated_at = ?
+                WHERE job_id = (
+                    SELECT job_id FROM send_jobs
+                    WHERE (state = 'queued' AND next_attempt_at <= ?)
+                       OR (state = 'running' AND claim_expires_at <= ?)
+                    ORDER BY next_attempt_at
+                    LIMIT 1
+                )
+                RETURNING *
+                """,
+                (token, now + self.claim_timeout, now, now, now),
+            ).fetchone()
+        return self._build_job(row) if row else None
+
+    def set_stage(self, job: SendJob, stage: str) -> None:
+        """Record progress and renew the claim; raises JobClaimLost if it expired."""
+        with self._connect(immediate=True) as conn:
+            self._renew(conn, job, stage=stage)
+        job.stage = stage
+
+    def renew(self, job: SendJob) -> None:
+        """Extend the claim without other changes; raises JobClaimLost if it expired."""
+        with self._connect(immediate=True) as conn:
+            self._renew(conn, job)
+
+    def begin_items(self, job: SendJob, draft_ids: List[str]) -> None:
+        """Mark drafts as being written (pending -> writing) before calling the writers."""
+        now = time.time()
+        with self._connect(immediate=True) as conn:
+            self._renew(conn, job)
+            conn.executemany(
+                """
+                UPDATE send_job_items SET state = 'writing', attempts = attempts + 1, updated_at = ?
+                WHERE job_id = ? AND draft_id = ? AND state = 'pending'
+                """,
+                [(now, job.job_id, draft_id) for draft_id in draft_ids],
+            )
+
+    def finish_items(
+        self,
+        job: SendJob,
+        outcomes: Dict[str, Tuple[str, Optional[Dict[str, Any]], Optional[Dict[str, Any]], Optional[str]]],
+    ) -> None:
+        """Record ``{draft_id: (state, result, warnings, error)}`` for items being written."""
+        now = time.time()
+        with self._connect(immediate=True) as conn:
+            self._renew(conn, job)
+            conn.executemany(
+                """
+                UPDATE send_job_items SET state = ?, result = ?, warnings = ?, error = ?, updated_at = ?
+                WHERE job_id = ? AND draft_id = ? AND state = 'writing'
+                """,
+                [
+                    (
+                        state,
+                        _dumps(result) if result is not None else None,
+                        _dumps(warnings) if warnings else None,
+                        error,
+                        now,
+                        job.job_id,
+                        draft_id,
+                    )
+                    for draft_id, (state, result, warnings, error) in outcomes.items()
+                ],
+            )
+
+    def complete(self, job: SendJob, result: Dict[str, Any], timings: Optional[Dict[str, Any]] = None) -> bool:
+        with self._connect(immediate=True) as conn:
+            cur = conn.execute(
+                """
+                UPDATE send_jobs
+                SET state = 'completed', stage = NULL, result = ?, timings = ?, error = NULL,
+                    claim_token = NULL, claim_expires_at = NULL, updated_at = ?
+                WHERE job_id = ? AND claim_token = ?
+                """,
+                (_dumps(result), _dumps(timings or {}), time.time(), job.job_id, job.claim_token),
+            )
+            return cur.rowcount == 1
+
+    def fail(self, job: SendJob, error: str) -> bool:
+        """Schedule a retry with exponential backoff; returns True if the job is now terminally failed."""
+        now = time.time()
+        terminal = job.attempts >= job.max_attempts
+        delay = SEND_JOB_RETRY_BASE_SECONDS * (2 ** max(0, job.attempts - 1))
+        with self._connect(immediate=True) as conn:
+            cur = conn.execute(
+                """
+                UPDATE send_jobs
+                SET state = ?, error = ?, next_attempt_at = ?,
+                    claim_token = NULL, claim_expires_at = NULL, updated_at = ?
+                WHERE job_id = ? AND claim_token = ?
+                """,
+                (STATE_FAILED if terminal else STATE_QUEUED, error, now + delay, now, job.job_id, job.claim_token),
+            )
+            if cur.rowcount != 1:
+                return False
+        return terminal
+
+    def counts(self) -> Dict[str, int]:
+        with self._connect() as conn:
+            rows = conn.execute("SELECT state, COUNT(*) FROM send_jobs GROUP BY state").fetchall()
+        return {row[0]: row[1] for row in rows}
+
+    def purge_finished(self, older_than_seconds: float = SEND_JOB_RETENTION_SECONDS) -> int:
+        cutoff = time.time() - older_than_seconds
+        with self._connect(immediate=True) as conn:
+            rows = conn.execute(
+                """
+                DELETE FROM send_jobs
+                WHERE state IN ('completed', 'failed') AND updated_at < ?
+                RETURNING job_id
+                """,
+                (cutoff,),
+            ).fetchall()
+            conn.executemany("DELETE FROM send_job_items WHERE job_id = ?", [(row[0],) for row in rows])
+        return len(rows)
+
+    # -----------------
+    # Internals
+    # -----------------
+    def _renew(self, conn: sqlite3.Connection, job: SendJob, *, stage: Optional[str] = None) -> None:
+        now = time.time()
+        cur = conn.execute(
+            """
+            UPDATE send_jobs SET stage = COALESCE(?, stage), claim_expires_at = ?, updated_at = ?
+            WHERE job_id = ? AND claim_token = ? AND state = 'running'
+            """,
+            (stage, now + self.claim_timeout, now, job.job_id, job.claim_token),
+        )
+        if cur.rowcount != 1:
+            raise JobClaimLost(job.job_id)
+
+    @contextmanager
+    def _connect(self, *, immediate: bool = False) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(str(self.db_path), timeout=15.0, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            conn.execute("PRAGMA busy_timeout = 15000")
+            conn.execute("BEGIN IMMEDIATE" if immediate else "BEGIN")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+        finally:
+            conn.close()
+
+    def _init_schema(self) -> None:
+        conn = sqlite3.connect(str(self.db_path), timeout=15.0)
+        try:
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS send_jobs (
+                    job_id TEXT PRIMARY KEY,
+                    state TEXT NOT NULL,
+                    stage TEXT,
+                    payload TEXT NOT NULL,
+                    created_by TEXT,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    max_attempts INTEGER NOT NULL,
+                    next_attempt_at REAL NOT NULL,
+                    claim_token TEXT,
+                    claim_expires_at REAL,
+                    error TEXT,
+                    result TEXT,
+                    timings TEXT,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+            """)
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_send_jobs_state_due
+                ON send_jobs (state, next_attempt_at)
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS send_job_items (
+                    job_id TEXT NOT NULL,
+                    position INTEGER NOT NULL,
+                    draft_id TEXT NOT NULL,
+                    state TEXT NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    result TEXT,
+                    warnings TEXT,
+                    error TEXT,
+                    updated_at REAL NOT NULL,
+                    PRIMARY KEY (job_id, position)
+                )
+            """)
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_send_job_items_draft
+                ON send_job_items (draft_id, state)
+            """)
+            conn.commit()
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _build_job(row: sqlite3.Row) -> SendJob:
+        return SendJob(
+            job_id=row["job_id"],
+            state=row["state"],
+            stage=row["stage"],
+            payload=json.loads(row["payload"]),
+            created_by=row["created_by"],
+            attempts=row["attempts"],
+            max_attempts=row["max_attempts"],
+            created_at=row["created_at"],
+            updated_at=row["updated_at"],
+            error=row["error"],
+            result=json.loads(row["result"]) if row["result"] else None,
+            timings=json.loads(row["timings"]) if row["timings"] else {},
+            claim_token=row["claim_token"],
+        )
+
+    @staticmethod
+    def _build_item(row: sqlite3.Row) -> SendJobItem:
+        return SendJobItem(
+            position=row["position"],
+            draft_id=row["draft_id"],
+            state=row["state"],
+            attempts=row["attempts"],
+            updated_at=row["updated_at"],
+            error=row["error"],
+            result=json.loads(row["result"]) if row["result"] else None,
+            warnings=json.loads(row["warnings"]) if row["warnings"] else {},
+        )
+
+
+def process_send_job(
+    store: SendJobStore,
+    service: Any,
+    job: SendJob,
+    report_stage: Callable[[str], None],
+    *,
+    chunk_size: int = SEND_JOB_CHUNK_SIZE,
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Run (or resume) a send job with ``service`` (a DraftService).
+
+    Returns the same payload shape as the synchronous /api/drafts/send
+    response, plus timings.
+    """
+    started = time.perf_counter()
+    report_stage(STAGES[0])
+    resumed = _resolve_interrupted_items(store, service, job)
+
+    report_stage(STAGES[1])
+    pending = [item.draft_id for item in store.items(job.job_id) if item.state == ITEM_PENDING]
+    chunks = 0
+    for offset in range(0, len(pending), max(1, chunk_size)):
+        chunk = pending[offset:offset + max(1, chunk_size)]
+        store.begin_items(job, chunk)
+        chunks += 1
+        with _claim_heartbeat(store, job):
+            result = service.send_drafts(
+                [UUID(draft_id) for draft_id in chunk],
+                sent_by_user_id=job.payload.get("sent_by_user_id"),
+                sent_by_role=job.payload.get("sent_by_role"),
+            )
+        store.finish_items(job, _chunk_outcomes(chunk, result))
+
+    report_stage(STAGES[2])
+    items = store.items(job.job_id)
+    timings = {
+        "attempts": job.attempts,
+        "chunks": chunks,
+        "resumed": resumed,
+        "total_seconds": round(time.perf_counter() - started, 3),
+    }
+    return _build_result(items), timings
+
+
+@contextmanager
+def _claim_heartbeat(store: SendJobStore, job: SendJob) -> Iterator[None]:
+    """Renew the job's claim in the background while a chunk is being written.
+
+    A slow send_drafts call would otherwise outlive the claim, and another
+    worker would reclaim the job and write the same drafts again.
+    """
+    interval = max(0.05, store.claim_timeout / 3)
+    stop = threading.Event()
+
+    def beat() -> None:
+        while not stop.wait(interval):
+            try:
+                store.renew(job)
+            except JobClaimLost:
+                logger.warning("Send job %s claim lost during a chunk", job.job_id)
+                return
+            except Exception:
+                logger.exception("Send job %s heartbeat failed", job.job_id)
+
+    thread = threading.Thread(target=beat, name=f"send-job-heartbeat-{job.job_id[:8]}", daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        stop.set()
+        thread.join()
+
+
+def _resolve_interrupted_items(store: SendJobStore, service: Any, job: SendJob) -> int:
+    """Settle items left ``writing`` by a worker that died mid-chunk.
+
+    Drafts with a confirmed write are recorded as sent. The rest may or may
+    not have reached the ledgers, and re-sending could duplicate their rows,
+    so they are marked failed for review; the draft itself stays unsent and
+    can be sent again once the ledgers have been checked.
+    """
+    writing = [item.draft_id for item in store.items(job.job_id) if item.state == ITEM_WRITING]
+    if not writing:
+        return 0
+    drafts = {str(draft.draft_id): draft for draft in service.repository.get_by_ids([UUID(d) for d in writing])}
+    outcomes = {}
+    for draft_id in writing:
+        draft = drafts.get(draft_id)
+        if draft is not None and _write_confirmed(draft):
+            outcomes[draft_id] = (ITEM_SENT, _resumed_result(draft), None, None)
+        else:
+            result = {"draft_id": draft_id, "status": "error", "error": INTERRUPTED_WRITE_ERROR, "needs_review": True}
+            outcomes[draft_id] = (ITEM_FAILED, result, None, INTERRUPTED_WRITE_ERROR)
+    store.finish_items(job, outcomes)
+    resumed = sum(1 for state, *_ in outcomes.values() if state == ITEM_SENT)
+    logger.warning(
+        "Send job %s resumed: %s confirmed, %s unconfirmed marked for review",
+        job.job_id, resumed, len(writing) - resumed,
+    )
+    return resumed
+
+
+def _write_confirmed(draft: Any) -> bool:
+    return (
+        draft.status == DraftStatus.SENT
+        or bool(draft.graph_api_write_confirmed)
+        or draft.format1_row_index is not None
+    )
+
+
+def _resumed_result(draft: Any) -> Dict[str, Any]:
+    return {
+        "draft_id": str(draft.draft_id),
+        "status": "sent",
+        "resumed": True,
+        "attempt_count": draft.send_attempt_count,
+        "last_send_attempt_at": draft.last_send_attempt_at.isoformat() if draft.last_send_attempt_at else None,
+        "last_send_error": draft.last_send_error,
+        "graph_api": {
+            "format1_file_id": draft.format1_file_id,
+            "format1_row_index": draft.format1_row_index,
+            "format2_file_id": draft.format2_file_id,
+            "format2_row_index": draft.format2_row_index,
+            "write_confirmed": draft.graph_api_write_confirmed,
+        },
+    }
+
+
+def _chunk_outcomes(chunk: List[str], result: Dict[str, Any]) -> Dict[str, tuple]:
+    """Split one send_drafts() result into per-draft item outcomes."""
+    per_draft = {entry.get("draft_id"): entry for entry in result.get("results", [])}
+    warnings = result.get("warnings") or {}
+    duplicates: Dict[str, List[Dict[str, Any]]] = {}
+    for entry in warnings.get("duplicates") or []:
+        duplicates.setdefault(entry.get("draft_id"), []).append(entry)
+    tax = {entry.get("draft_id"): entry for entry in (warnings.get("tax_mismatch") or {}).get("items", [])}
+
+    outcomes = {}
+    for draft_id in chunk:
+        entry = per_draft.get(draft_id) or {"draft_id": draft_id, "status": "error", "error": "No result returned"}
+        item_warnings = {}
+        if duplicates.get(draft_id):
+            item_warnings["duplicates"] = duplicates[draft_id]
+        if draft_id in tax:
+            item_warnings["tax_mismatch"] = tax[draft_id]
+        if entry.get("status") == "sent":
+            outcomes[draft_id] = (ITEM_SENT, entry, item_warnings, None)
+        else:
+            error = entry.get("error") or entry.get("last_send_error") or entry.get("status")
+            outcomes[draft_id] = (ITEM_FAILED, entry, item_warnings, error)
+    return outcomes
+
+
+def _build_result(items: List[SendJobItem]) -> Dict[str, Any]:
+    """Aggregate item outcomes into the SendDraftsResponse shape."""
+    results = []
+    duplicates: List[Dict[str, Any]] = []
+    tax_items: List[Dict[str, Any]] = []
+    sent = 0
+    for item in items:
+        if item.state == ITEM_SENT:
+            sent += 1
+        results.append(item.result or {"draft_id": item.draft_id, "status": "error", "error": item.error})
+        duplicates.extend(item.warnings.get("duplicates", []))
+        if item.warnings.get("tax_mismatch"):
+            tax_items.append(item.warnings["tax_mismatch"])
+    warnings: Dict[str, Any] = {"duplicates": duplicates}
+    if tax_items:
+        warnings["tax_mismatch"] = {"count": len(tax_items), "items": tax_items}
+    return {
+        "total": len(items),
+        "sent": sent,
+        "failed": len(items) - sent,
+        "results": results,
+        "warnings": warnings,
+    }
+
+
+_store: Optional[SendJobStore] = None
+_store_lock = threading.Lock()
+
+
+def get_send_job_store() -> SendJobStore:
+    """Get or create the global send job store."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = SendJobStore()
+        return _store
+
+
+def _dumps(payload: Dict[str, Any]) -> str:
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":"), default=str)
+
+
+if __name__ == "__main__":
+    # Standalone worker process: scales Excel sends independently of HTTP workers
+    logging.basicConfig(level=logging.INFO)
+    from app.api.drafts import get_send_worker_pool
+
+    pool = get_send_worker_pool(workers=max(1, SEND_JOB_WORKERS))
+    pool.start()
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pool.stop()
@@ -7,13 +7,16 @@ Updated in Phase 9.R.2 to add Graph API writer for Format② (location ledger).
 from __future__ import annotations
 
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, Iterable, List, Protocol
+from typing import Dict, Iterable, List, Protocol, Tuple
 import logging
 import threading
+from pathlib import Path
 
 from app.excel.branch_ledger_writer import BranchLedgerWriter
 from app.excel.staff_ledger_writer import StaffLedgerWriter
+from app.excel.workbook_session import get_workbook_session
 
 logger = logging.getLogger(__name__)
 _excel_send_lock = threading.Lock()
@@ -39,6 +42,17 @@ _excel_send_lock = threading.Lock()
 # =============================================================================
 USE_GRAPH_API_WRITERS = os.environ.get("USE_GRAPH_API_WRITERS", "false").lower() in ("1", "true", "yes")
 
+# Number of independent workbook lanes written in parallel during a Graph
+# API send. Writes within one lane (one workbook) always stay serialized.
+SEND_LANE_WORKERS = int(os.environ.get("SEND_LANE_WORKERS", "4"))
+
+# Prepare (read-only lookups) the next receipt of each lane while the current
+# receipt is being written. Only applies to writers with prepare_receipt().
+SEND_PIPELINE_PREPARE = os.environ.get("SEND_PIPELINE_PREPARE", "false").lower() in ("1", "true", "yes")
+
+# Writer targets, in the order they are applied to each receipt
+_TARGETS = ("branch", "staff")
+
 
 class ReceiptWriter(Protocol):
     """Protocol for receipt writer implementations."""
@@ -48,6 +62,18 @@ class ReceiptWriter(Protocol):
         ...
 
 
+# Writers may define ``workbook_key(receipt) -> str | None`` naming the file a
+# receipt is written to; receipts with the same key share a lane.
+#
+# Writers may also define ``prepare_receipt(receipt) -> dict`` (read-only
+# lookups such as resolving the workbook's item ID; never creating files, so a
+# receipt that fails validation does not leave an empty ledger behind) and
+# accept its result as
+# ``write_receipt(receipt, prepared=...)``. With SEND_PIPELINE_PREPARE on,
+# SummaryService prepares the next receipt of a lane while the current one
+# is being written.
+
+
 class StaffLedgerWriterGraph:
     """Graph API wrapper for Format① staff ledger writer.
     
@@ -70,11 +96,35 @@ class StaffLedgerWriterGraph:
             self._write_format1_row = write_format1_row
         return self._write_format1_row
     
-    def write_receipt(self, receipt) -> Dict[str, object]:
+    def workbook_key(self, receipt) -> str | None:
+        """OneDrive path of the staff ledger this receipt is written to."""
+        if not receipt.staff_id:
+            return None
+        from app.config.onedrive_structure import get_staff_file_path
+
+        staff_display = self._resolve_staff_name(receipt) or receipt.staff_id
+        return get_staff_file_path(staff_display, receipt.business_location_id or "unknown")
+
+    def prepare_receipt(self, receipt) -> Dict[str, object]:
+        """Resolve the staff display name and ledger file ID ahead of the write."""
+        if not receipt.staff_id:
+            return {}
+        from app.services.format1_writer_graph import Format1FileNotFoundError, get_format1_file_id
+
+        staff_display = self._resolve_staff_name(receipt) or receipt.staff_id
+        try:
+            file_id = get_format1_file_id(staff_display, receipt.business_location_id or "unknown")
+        except Format1FileNotFoundError:
+            # Created from the template by the write step, not ahead of it
+            return {"staff_display": staff_display}
+        return {"staff_display": staff_display, "file_id": file_id}
+
+    def write_receipt(self, receipt, prepared: Dict[str, object] | None = None) -> Dict[str, object]:
         """Write receipt to OneDrive via Graph API.
         
         Adapts the Receipt model to the write_format1_row() interface.
         """
+        prepared = prepared or {}
         if not receipt.staff_id:
             return {
                 "status": "skipped_missing_staff_id",
@@ -97,7 +147,7 @@ class StaffLedgerWriterGraph:
             month = dt.month
             
             # Resolve staff display name
-            staff_display = self._resolve_staff_name(receipt)
+            staff_display = prepared.get("staff_display") or self._resolve_staff_name(receipt)
             
             # Build receipt data dict
             receipt_data = {
@@ -121,7 +171,8 @@ class StaffLedgerWriterGraph:
                 staff=staff_display or receipt.staff_id,
                 year=year,
                 month=month,
-                user_id="system"  # Could be enhanced to pass actual user
+                user_id="system",  # Could be enhanced to pass actual user
+                file_id=prepared.get("file_id"),
             )
             
             return result
@@ -178,11 +229,34 @@ class BranchLedgerWriterGraph:
             self._write_format2_row = write_format2_row
         return self._write_format2_row
     
-    def write_receipt(self, receipt) -> Dict[str, object]:
+    def workbook_key(self, receipt) -> str | None:
+        """OneDrive path of the location ledger this receipt is written to."""
+        if not receipt.business_location_id:
+            return None
+        from app.config.onedrive_structure import get_location_file_path
+
+        return get_location_file_path(receipt.business_location_id)
+
+    def prepare_receipt(self, receipt) -> Dict[str, object]:
+        """Resolve the staff display name and location ledger file ID ahead of the write."""
+        if not receipt.business_location_id:
+            return {}
+        from app.services.format2_writer_graph import Format2FileNotFoundError, get_format2_file_id
+
+        prepared: Dict[str, object] = {"staff_display": self._resolve_staff_name(receipt)}
+        try:
+            prepared["file_id"] = get_format2_file_id(receipt.business_location_id)
+        except Format2FileNotFoundError:
+            # Created from the template by the write step, not ahead of it
+            pass
+        return prepared
+
+    def write_receipt(self, receipt, prepared: Dict[str, object] | None = None) -> Dict[str, object]:
         """Write receipt to OneDrive via Graph API.
         
         Adapts the Receipt model to the write_format2_row() interface.
         """
+        prepared = prepared or {}
         if not receipt.business_location_id:
             return {
                 "status": "skipped_missing_location_id",
@@ -209,7 +283,7 @@ class BranchLedgerWriterGraph:
             month = dt.month
             
             # Resolve staff display name
-            staff_display = self._resolve_staff_name(receipt)
+            staff_display = prepared.get("staff_display") or self._resolve_staff_name(receipt)
             
             # Build receipt data dict
             receipt_data = {
@@ -234,7 +308,8 @@ class BranchLedgerWriterGraph:
                 year=year,
                 month=month,
                 user_id="system",  # Could be enhanced to pass actual user
-                staff_display=staff_display
+                staff_display=staff_display,
+                file_id=prepared.get("file_id"),
             )
             
             return result
@@ -283,6 +358,8 @@ class SummaryService:
         branch_writer: ReceiptWriter | None = None,
         staff_writer: ReceiptWriter | None = None,
         use_graph_api: bool | None = None,
+        lane_workers: int | None = None,
+        pipeline_prepare: bool | None = None,
     ) -> None:
         # Determine whether to use Graph API writers
         if use_graph_api is None:
@@ -311,6 +388,12 @@ class SummaryService:
             
             # Local writers need the global lock for serialization
             self._use_graph_api = False
+        
+        # Local writers stay fully sequential under _excel_send_lock
+        if lane_workers is None:
+            lane_workers = SEND_LANE_WORKERS if self._use_graph_api else 1
+        self.lane_workers = max(1, lane_workers)
+        self.pipeline_prepare = SEND_PIPELINE_PREPARE if pipeline_prepare is None else pipeline_prepare
 
     def send_receipts(self, receipts):
         """Write receipts to location (Format 02) and staff (Format 01) ledgers.
@@ -321,7 +404,9 @@ class SummaryService:
         
         Locking behavior (Phase 9.R.2):
         - Graph API mode: Locking handled by conflict_resolver.safe_write()
-        - Local mode: Uses _excel_send_lock for serialization
+        - Local mode: Uses _excel_send_lock for serialization, and holds a
+          workbook session batch so each touched .xlsx is parsed and saved
+          once per send instead of once per receipt
         """
 
         normalized: List = list(self._coerce_iterable(receipts))
@@ -334,26 +419,65 @@ class SummaryService:
         else:
             with _excel_send_lock:
                 logger.info("SUMMARY_SERVICE: acquired excel send lock (local mode)")
-                return self._process_receipts(normalized)
+                with get_workbook_session().batch() as batch:
+                    result = self._process_receipts(normalized)
+                if batch.errors:
+                    self._apply_flush_errors(result, batch.errors)
+                return result
     
     def _process_receipts(self, normalized: List) -> Dict[str, object]:
-        """Process receipts and write to ledgers."""
+        """Process receipts and write to ledgers.
+
+        The batch is split into per-workbook lanes: one per Format② location
+        file and one per Format① staff file. Each lane writes its receipts
+        in date order, one at a time (ETag rules need a serialized writer
+        per workbook). Independent lanes run in parallel on a bounded pool,
+        so a batch takes about as long as its busiest lane; a receipt's
+        Format② and Format① writes always sit in different lanes and run
+        concurrently. With ``pipeline_prepare``, each lane also prepares its
+        next receipt while the current one is written. Results are reported
+        in receipt order regardless of lane completion order.
+        """
         ordered = sorted(
             normalized,
             key=lambda r: (r.receipt_date is None, r.receipt_date or ""),
         )
 
-        logger.info(f"SUMMARY_SERVICE: Processing {len(ordered)} receipts")
-        
+        lanes = self._build_lanes(ordered)
+        logger.info(
+            f"SUMMARY_SERVICE: Processing {len(ordered)} receipts across {len(lanes)} workbook lanes"
+        )
+
+        outcomes: List[Dict[str, Dict[str, object]]] = [{} for _ in ordered]
+        workers = min(self.lane_workers, len(lanes))
+        prepare_pool = (
+            ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="send-prepare")
+            if self.pipeline_prepare and self._has_prepare() else None
+        )
+
+        try:
+            if workers <= 1:
+                # Sequential: both writes for each receipt, in receipt order
+                entries = [(i, target) for i in range(len(ordered)) for target in _TARGETS]
+                self._run_lane(entries, ordered, outcomes, prepare_pool, log_receipts=True)
+            else:
+                with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="send-lane") as pool:
+                    futures = [
+                        pool.submit(self._run_lane, entries, ordered, outcomes, prepare_pool)
+                        for entries in lanes.values()
+                    ]
+                    for future in futures:
+                        future.result()
+        finally:
+            if prepare_pool is not None:
+                prepare_pool.shutdown(wait=True)
+
         results = []
         counts: Dict[str, int] = {"success": 0, "skipped": 0, "error": 0}
 
         for i, receipt in enumerate(ordered):
-            logger.info(f"SUMMARY_SERVICE: Processing receipt {i+1}/{len(ordered)} - ID: {getattr(receipt, 'receipt_id', 'N/A')}")
-            logger.info(f"SUMMARY_SERVICE: Receipt details - vendor={receipt.vendor_name}, location={receipt.business_location_id}, staff={receipt.staff_id}, invoice={receipt.invoice_number}")
-            
-            branch_res = self._safe_write(self.branch_writer.write_receipt, receipt)
-            staff_res = self._safe_write(self.staff_writer.write_receipt, receipt)
+            branch_res = outcomes[i]["branch"]
+            staff_res = outcomes[i]["staff"]
 
             logger.info(f"SUMMARY_SERVICE: Receipt {i+1} - branch_res={branch_res}, staff_res={staff_res}")
             
@@ -369,7 +493,108 @@ class SummaryService:
             )
 
         logger.info(f"SUMMARY_SERVICE: Completed - counts={counts}")
-        return {"processed": len(ordered), "counts": counts, "results": results}
+        return {"processed": len(ordered), "counts": counts, "results": results, "lanes": len(lanes)}
+
+    @staticmethod
+    def _apply_flush_errors(result: Dict[str, object], errors: Dict[str, str]) -> None:
+        """Downgrade 'written' results whose workbook failed to save at batch end."""
+        counts = result["counts"]
+        for entry in result["results"]:
+            for target in _TARGETS:
+                res = entry.get(target) or {}
+                workbook = res.get("workbook")
+                if res.get("status") != "written" or not workbook:
+                    continue
+                error = errors.get(str(Path(workbook).resolve()))
+                if error is None:
+                    continue
+                entry[target] = {**res, "status": "error", "error": f"Workbook save failed: {error}"}
+                counts["success"] -= 1
+                counts["error"] += 1
+
+    def _lane_key(self, target: str, receipt) -> Tuple[str, ...]:
+        """Identify the workbook a writer target touches for a receipt.
+
+        Writers with ``workbook_key(receipt)`` name the file itself, so two
+        staff_ids that resolve to the same staff ledger share one lane.
+        Otherwise the key falls back to location / staff_id.
+        """
+        key_fn = getattr(self._writer_for(target), "workbook_key", None)
+        if key_fn is not None:
+            try:
+                workbook = key_fn(receipt)
+            except Exception as exc:
+                logger.debug(f"SUMMARY_SERVICE: workbook_key failed for {target}: {exc}")
+                workbook = None
+            if workbook:
+                return (target, str(workbook).casefold())
+        location = (receipt.business_location_id or "").strip().lower()
+        if target == "branch":
+            return ("format2", location)
+        return ("format1", location, (receipt.staff_id or "").strip().lower())
+
+    def _build_lanes(self, ordered: List) -> Dict[Tuple[str, ...], List[Tuple[int, str]]]:
+        """Group (receipt index, target) pairs by workbook, preserving order."""
+        lanes: Dict[Tuple[str, ...], List[Tuple[int, str]]] = {}
+        for i, receipt in enumerate(ordered):
+            for target in _TARGETS:
+                lanes.setdefault(self._lane_key(target, receipt), []).append((i, target))
+        return lanes
+
+    def _writer_for(self, target: str) -> ReceiptWriter:
+        return self.branch_writer if target == "branch" else self.staff_writer
+
+    def _has_prepare(self) -> bool:
+        return any(hasattr(self._writer_for(target), "prepare_receipt") for target in _TARGETS)
+
+    def _write_target(self, target: str, receipt, prepared: Dict[str, object] | None = None) -> Dict[str, object]:
+        writer = self._writer_for(target)
+        if prepared is None:
+            return self._safe_write(writer.write_receipt, receipt)
+        return self._safe_write(lambda r: writer.write_receipt(r, prepared=prepared), receipt)
+
+    def _prepare_target(self, target: str, receipt) -> Dict[str, object] | None:
+        """Run the writer's read-only preparation; failures fall back to an unprepared write."""
+        prepare = getattr(self._writer_for(target), "prepare_receipt", None)
+        if prepare is None:
+            return None
+        try:
+            return prepare(receipt)
+        except Exception as exc:
+            logger.debug(f"SUMMARY_SERVICE: prepare failed for {target}, writer will resolve inline: {exc}")
+            return None
+
+    def _run_lane(
+        self,
+        entries: List[Tuple[int, str]],
+        ordered: List,
+        outcomes: List[Dict[str, Dict[str, object]]],
+        prepare_pool: ThreadPoolExecutor | None,
+        log_receipts: bool = False,
+    ) -> None:
+        """Write a lane's entries in order.
+
+        With a prepare pool, entry k+1 is prepared while entry k is written,
+        so its lookups overlap the previous write instead of following it.
+        """
+        pending = None
+        if prepare_pool is not None and entries:
+            i, target = entries[0]
+            pending = prepare_pool.submit(self._prepare_target, target, ordered[i])
+        for k, (i, target) in enumerate(entries):
+            prepared = pending.result() if pending is not None else None
+            pending = None
+            if prepare_pool is not None and k + 1 < len(entries):
+                next_i, next_target = entries[k + 1]
+                pending = prepare_pool.submit(self._prepare_target, next_target, ordered[next_i])
+            if log_receipts and target == _TARGETS[0]:
+                self._log_receipt(i, len(ordered), ordered[i])
+            outcomes[i][target] = self._write_target(target, ordered[i], prepared)
+
+    @staticmethod
+    def _log_receipt(i: int, total: int, receipt) -> None:
+        logger.info(f"SUMMARY_SERVICE: Processing receipt {i+1}/{total} - ID: {getattr(receipt, 'receipt_id', 'N/A')}")
+        logger.info(f"SUMMARY_SERVICE: Receipt details - vendor={receipt.vendor_name}, location={receipt.business_location_id}, staff={receipt.staff_id}, invoice={receipt.invoice_number}")
 
     def _coerce_iterable(self, receipts) -> Iterable:
         if receipts is None:
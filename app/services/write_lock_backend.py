@@ -0,0 +1,455 @@
+"""
+Write Lock Backends (cross-process write coordination)
+
+Pluggable backends for the per-file write lock used by
+conflict_resolver.acquire_write_lock / safe_write.
+
+Backends:
+    - memory: threading.Lock per file (single process only)
+    - sqlite: lease table in a local SQLite database, shared by every
+      worker process on the same host
+
+Both backends hand out a WriteLease carrying a fencing token. Tokens
+increase monotonically per file, so a holder whose lease expired (and was
+taken over by another worker) can detect it via validate()/renew() before
+issuing a write, instead of discovering it later as a 412.
+
+Backend selection:
+    WRITE_LOCK_BACKEND=memory|sqlite
+    Default is "sqlite" when WEB_CONCURRENCY > 1, otherwise "memory".
+    WRITE_LOCK_DB_PATH overrides the lease database location.
+
+Usage:
+    from app.services.write_lock_backend import get_lock_backend
+
+    backend = get_lock_backend()
+    lease = backend.acquire(file_id, timeout=30.0)
+    if lease is None:
+        ...  # timed out
+    try:
+        backend.renew(lease)
+        ...
+    finally:
+        backend.release(lease)
+"""
+
+import logging
+import os
+import random
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from app.config.data_paths import get_data_dir
+
+logger = logging.getLogger(__name__)
+
+# Default lease duration; safe_write renews before every attempt
+DEFAULT_LEASE_SECONDS = 60.0
+
+# Poll backoff while another process holds the lease
+_POLL_MIN_SECONDS = 0.02
+_POLL_MAX_SECONDS = 0.25
+
+
+@dataclass
+class WriteLease:
+    """A granted write lock on one file."""
+    file_id: str
+    owner: str
+    fencing_token: int
+    acquired_at: float
+    expires_at: float
+    wait_ms: float = 0.0
+
+
+class LockBackend(ABC):
+    """Interface implemented by every write lock backend."""
+
+    name = "base"
+
+    @abstractmethod
+    def acquire(
+        self,
+        file_id: str,
+        timeout: float,
+        lease_seconds: float = DEFAULT_LEASE_SECONDS
+    ) -> Optional[WriteLease]:
+        """Block until the lock is granted or timeout elapses (returns None)."""
+
+    @abstractmethod
+    def release(self, lease: WriteLease) -> bool:
+        """Release a lease. Returns False if it was no longer held."""
+
+    @abstractmethod
+    def renew(self, lease: WriteLease, lease_seconds: float = DEFAULT_LEASE_SECONDS) -> bool:
+        """Extend a lease. Returns False if it was lost (expired and taken)."""
+
+    @abstractmethod
+    def validate(self, lease: WriteLease) -> bool:
+        """True if the lease is still the current holder for its file."""
+
+    @abstractmethod
+    def holders(self) -> Dict[str, dict]:
+        """Current lock holders keyed by file_id."""
+
+    @abstractmethod
+    def clear(self) -> int:
+        """Drop all locks (testing/cleanup). Returns number cleared."""
+
+
+def _new_owner() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{threading.get_ident()}:{uuid.uuid4().hex[:8]}"
+
+
+class InMemoryLockBackend(LockBackend):
+    """
+    threading.Lock per file.
+
+    Only serializes writers inside this process; other workers are
+    protected by ETag checks alone.
+    """
+
+    name = "memory"
+
+    def __init__(self):
+        self._locks: Dict[str, threading.Lock] = {}
+        self._tokens: Dict[str, int] = {}
+        self._holders: Dict[str, WriteLease] = {}
+        self._registry_lock = threading.Lock()
+
+    def _get_lock(self, file_id: str) -> threading.Lock:
+        with self._registry_lock:
+            if file_id not in self._locks:
+                self._locks[file_id] = threading.Lock()
+            return self._locks[file_id]
+
+    def acquire(self, file_id, timeout, lease_seconds=DEFAULT_LEASE_SECONDS):
+        start = time.time()
+        if not self._get_lock(file_id).acquire(timeout=timeout):
+            return None
+        now = time.time()
+        with self._registry_lock:
+            token = self._tokens.get(file_id, 0) + 1
+            self._tokens[file_id] = token
+            lease = WriteLease(
+                file_id=file_id,
+                owner=_new_owner(),
+                fencing_token=token,
+                acquired_at=now,
+                expires_at=now + lease_seconds,
+                wait_ms=(now - start) * 1000
+            )
+            self._holders[file_id] = lease
+        return lease
+
+    def release(self, lease):
+        with self._registry_lock:
+            holder = self._holders.get(lease.file_id)
+            if holder is None or holder.fencing_token != lease.fencing_token:
+                return False
+            del self._holders[lease.file_id]
+            lock = self._locks.get(lease.file_id)
+        try:
+            lock.release()
+            return True
+        except RuntimeError:
+            return False
+
+    def renew(self, lease, lease_seconds=DEFAULT_LEASE_SECONDS):
+        # In-process locks never expire underneath their holder
+        if not self.validate(lease):
+            return False
+        lease.expires_at = time.time() + lease_seconds
+        return True
+
+    def validate(self, lease):
+        with self._registry_lock:
+            holder = self._holders.get(lease.file_id)
+            return holder is not None and holder.fencing_token == lease.fencing_token
+
+    def holders(self):
+        with self._registry_lock:
+            return {
+                file_id: {
+                    "owner": lease.owner,
+                    "fencingToken": lease.fencing_token,
+                    "heldForSeconds": round(time.time() - lease.acquired_at, 3)
+                }
+                for file_id, lease in self._holders.items()
+            }
+
+    def clear(self):
+        with self._registry_lock:
+            count = len(self._locks)
+            self._locks = {}
+            self._holders = {}
+            return count
+
+
+class SQLiteLeaseLockBackend(LockBackend):
+    """
+    Lease table in a local SQLite database, shared across processes.
+
+    Each file has at most one row in write_leases. Acquisition takes the
+    row inside a BEGIN IMMEDIATE transaction when it is free or expired,
+    bumping the per-file fencing token. Threads in this process first
+    queue on an in-process lock so only one of them polls the database
+    per file.
+
+    Table: write_leases
+    """
+
+    name = "sqlite"
+
+    def __init__(self, db_path: Optional[str] = None):
+        if db_path is None:
+            db_path = os.environ.get("WRITE_LOCK_DB_PATH")
+        if db_path is None:
+            db_path = str(get_data_dir() / "write_locks.db")
+
+        self.db_path = db_path
+        self._local = InMemoryLockBackend()
+        self._init_schema()
+
+    def _get_connection(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=15.0, isolation_level=None)
+        conn.execute("PRAGMA busy_timeout = 15000")
+        conn.execute("PRAGMA journal_mode = WAL")
+        return conn
+
+    def _init_schema(self) -> None:
+        conn = self._get_connection()
+        try:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS write_leases (
+                    file_id TEXT PRIMARY KEY,
+                    owner TEXT,
+                    fencing_token INTEGER NOT NULL DEFAULT 0,
+                    acquired_at REAL,
+                    expires_at REAL NOT NULL DEFAULT 0
+                )
+                """
+            )
+        finally:
+            conn.close()
+
+    def _try_take(self, conn: sqlite3.Connection, file_id: str, owner: str, lease_seconds: float):
+        """One acquisition attempt. Returns (token, expires_at) or None."""
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            now = time.time()
+            row = conn.execute(
+                "SELECT owner, fencing_token, expires_at FROM write_leases WHERE file_id = ?",
+                (file_id,)
+            ).fetchone()
+
+            if row is not None and row[0] is not None and row[2] > now:
+                conn.execute("COMMIT")
+                return None
+
+            if row is not None and row[0] is not None:
+                logger.warning(
+                    f"Write lease on {file_id[:20]}... held by {row[0]} expired; taking over"
+                )
+
+            token = (row[1] if row else 0) + 1
+            expires_at = now + lease_seconds
+            conn.execute(
+                """
+                INSERT INTO write_leases (file_id, owner, fencing_token, acquired_at, expires_at)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(file_id) DO UPDATE SET
+                    owner = excluded.owner,
+                    fencing_token = excluded.fencing_token,
+                    acquired_at = excluded.acquired_at,
+                    expires_at = excluded.expires_at
+                """,
+                (file_id, owner, token, now, expires_at)
+            )
+            conn.execute("COMMIT")
+            return token, expires_at
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def acquire(self, file_id, timeout, lease_seconds=DEFAULT_LEASE_SECONDS):
+        start = time.time()
+        deadline = start + timeout
+
+        local = self._local.acquire(file_id, timeout)
+        if local is None:
+            return None
+
+        owner = local.owner
+        delay = _POLL_MIN_SECONDS
+        conn = self._get_connection()
+        try:
+            while True:
+                taken = self._try_take(conn, file_id, owner, lease_seconds)
+                if taken is not None:
+                    token, expires_at = taken
+                    now = time.time()
+                    return WriteLease(
+                        file_id=file_id,
+                        owner=owner,
+                        fencing_token=token,
+                        acquired_at=now,
+                        expires_at=expires_at,
+                        wait_ms=(now - start) * 1000
+                    )
+
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    self._local.release(local)
+                    return None
+                time.sleep(min(remaining, delay * (1 + random.random() * 0.5)))
+                delay = min(delay * 2, _POLL_MAX_SECONDS)
+        except Exception:
+            self._local.release(local)
+            raise
+        finally:
+            conn.close()
+
+    def _local_lease(self, lease: WriteLease) -> Optional[WriteLease]:
+        with self._local._registry_lock:
+            local = self._local._holders.get(lease.file_id)
+        if local is not None and local.owner == lease.owner:
+            return local
+        return None
+
+    def release(self, lease):
+        conn = self._get_connection()
+        try:
+            cursor = conn.execute(
+                """
+                UPDATE write_leases SET owner = NULL, expires_at = 0
+                WHERE file_id = ? AND owner = ? AND fencing_token = ?
+                """,
+                (lease.file_id, lease.owner, lease.fencing_token)
+            )
+            released = cursor.rowcount == 1
+        finally:
+            conn.close()
+            local = self._local_lease(lease)
+            if local is not None:
+                self._local.release(local)
+        return released
+
+    def renew(self, lease, lease_seconds=DEFAULT_LEASE_SECONDS):
+        expires_at = time.time() + lease_seconds
+        conn = self._get_connection()
+        try:
+            cursor = conn.execute(
+                """
+                UPDATE write_leases SET expires_at = ?
+                WHERE file_id = ? AND owner = ? AND fencing_token = ?
+                """,
+                (expires_at, lease.file_id, lease.owner, lease.fencing_token)
+            )
+            if cursor.rowcount != 1:
+                return False
+        finally:
+            conn.close()
+        lease.expires_at = expires_at
+        return True
+
+    def validate(self, lease):
+        conn = self._get_connection()
+        try:
+            row = conn.execute(
+                "SELECT owner, fencing_token, expires_at FROM write_leases WHERE file_id = ?",
+                (lease.file_id,)
+            ).fetchone()
+        finally:
+            conn.close()
+        return (
+            row is not None
+            and row[0] == lease.owner
+            and row[1] == lease.fencing_token
+            and row[2] > time.time()
+        )
+
+    def holders(self):
+        conn = self._get_connection()
+        try:
+            rows = conn.execute(
+                """
+                SELECT file_id, owner, fencing_token, acquired_at, expires_at
+                FROM write_leases WHERE owner IS NOT NULL
+                """
+            ).fetchall()
+        finally:
+            conn.close()
+        now = time.time()
+        return {
+            file_id: {
+                "owner": owner,
+                "fencingToken": token,
+                "heldForSeconds": round(now - (acquired_at or now), 3),
+                "expiresInSeconds": round(expires_at - now, 3),
+                "expired": expires_at <= now
+            }
+            for file_id, owner, token, acquired_at, expires_at in rows
+        }
+
+    def clear(self):
+        conn = self._get_connection()
+        try:
+            # Keep fencing tokens; only drop ownership
+            cursor = conn.execute(
+                "UPDATE write_leases SET owner = NULL, expires_at = 0 WHERE owner IS NOT NULL"
+            )
+            count = cursor.rowcount
+        finally:
+            conn.close()
+        return max(count, self._local.clear())
+
+
+def _default_backend_name() -> str:
+    configured = os.environ.get("WRITE_LOCK_BACKEND")
+    if configured:
+        return configured.strip().lower()
+    try:
+        workers = int(os.environ.get("WEB_CONCURRENCY", "1"))
+    except ValueError:
+        workers = 1
+    return "sqlite" if workers > 1 else "memory"
+
+
+def create_lock_backend(name: Optional[str] = None) -> LockBackend:
+    """Build a backend by name ('memory' or 'sqlite')."""
+    name = (name or _default_backend_name()).lower()
+    if name == "sqlite":
+        return SQLiteLeaseLockBackend()
+    if name != "memory":
+        logger.warning(f"Unknown WRITE_LOCK_BACKEND '{name}', using in-memory locks")
+    return InMemoryLockBackend()
+
+
+# Global singleton instance
+_backend: Optional[LockBackend] = None
+_backend_lock = threading.Lock()
+
+
+def get_lock_backend() -> LockBackend:
+    """Get or create the process-wide lock backend."""
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            _backend = create_lock_backend()
+            logger.info(f"Write lock backend: {_backend.name}")
+        return _backend
+
+
+def set_lock_backend(backend: LockBackend) -> None:
+    """Replace the process-wide lock backend (startup configuration/tests)."""
+    global _backend
+    with _backend_lock:
+        _backend = backend
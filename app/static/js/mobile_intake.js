@@ -379,7 +379,8 @@ function loadUser() {
             return;
         }
         const fieldValues = { ...(payload.fields || {}) };
-        const sourceImage = fieldValues.source_image;
+        const sourceImage = fieldValues.source_image_url || fieldValues.source_image;
+        delete fieldValues.source_image_url;
         delete fieldValues.source_image;
 
         populateVerificationForm(fieldValues);
@@ -416,7 +417,7 @@ function loadUser() {
         }
     }
 
-    function drawAnalysisImage(base64Image, fieldBoxes) {
+    function drawAnalysisImage(imageSource, fieldBoxes) {
         if (!analysisCanvas) {
             return;
         }
@@ -424,7 +425,7 @@ function loadUser() {
         if (!ctx) {
             return;
         }
-        if (!base64Image) {
+        if (!imageSource) {
             ctx.clearRect(0, 0, analysisCanvas.width, analysisCanvas.height);
             analysisPlaceholder?.classList.remove("hidden");
             return;
@@ -438,7 +439,8 @@ function loadUser() {
             ctx.drawImage(image, 0, 0, image.width, image.height);
             drawBoxes(ctx, fieldBoxes, image.width, image.height);
         };
-        image.src = base64Image.startsWith("data:") ? base64Image : `data:image/png;base64,${base64Image}`;
+        const isUrl = /^(data:|https?:|\/artifacts\/)/.test(imageSource);
+        image.src = isUrl ? imageSource : `data:image/png;base64,${imageSource}`;
     }
 
     function drawBoxes(ctx, boxes, width, height) {
@@ -1,19 +1,61 @@
 import io
 import hashlib
-from typing import Dict, Tuple
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
 from PIL import Image
 
 MAX_DIMENSION = 1600
 JPEG_QUALITY = 85
+THUMBNAIL_SIZE = (200, 200)
+THUMBNAIL_QUALITY = 70
 
 
-def optimize_image_for_ocr(image_bytes: bytes) -> Tuple[bytes, Dict[str, str]]:
-    """Normalize receipt images so OCR engines receive consistent payloads."""
+@dataclass
+class PreparedImage:
+    """Everything the upload path needs from one decode of an image."""
+    format: str
+    size: Tuple[int, int]
+    extension: str
+    optimized_bytes: bytes
+    stats: Dict[str, str]
+    thumbnail_bytes: Optional[bytes] = None
+
+
+def _fit_within(size: Tuple[int, int], max_dimension: int) -> Tuple[int, int]:
+    width, height = size
+    scale = min(1.0, max_dimension / max(width, height, 1))
+    return max(1, int(width * scale)), max(1, int(height * scale))
+
+
+def image_extension(image_format: Optional[str]) -> str:
+    """File extension used for stored copies of an upload."""
+    if image_format in ('JPEG', 'JPG'):
+        return 'jpg'
+    return image_format.lower() if image_format else 'png'
+
+
+def read_image_header(image_bytes: bytes) -> Tuple[str, Tuple[int, int]]:
+    """Validate an image by parsing its header only (no pixel decode)."""
+    with Image.open(io.BytesIO(image_bytes)) as image:
+        return image.format, image.size
+
+
+def prepare_image_for_ocr(image_bytes: bytes, *, thumbnail_size: Optional[Tuple[int, int]] = THUMBNAIL_SIZE) -> PreparedImage:
+    """Decode once and derive the OCR payload and (optionally) a JPEG thumbnail.
+
+    JPEGs are decoded at a reduced DCT scale (``Image.draft``) that still
+    covers the OCR target size, so large photos never decode at full
+    resolution. The thumbnail is scaled down from the already-reduced image.
+    """
     with Image.open(io.BytesIO(image_bytes)) as image:
         original_format = image.format or "UNKNOWN"
         original_mode = image.mode
         original_size = image.size
 
+        target_size = _fit_within(original_size, MAX_DIMENSION)
+        if target_size != original_size:
+            image.draft(None, target_size)
+
         if image.mode not in ("RGB", "L"):
             image = image.convert("RGB")
         elif image.mode == "L":
@@ -30,6 +72,14 @@ def optimize_image_for_ocr(image_bytes: bytes) -> Tuple[bytes, Dict[str, str]]:
 
         optimized_bytes = optimized_buffer.getvalue()
 
+        thumbnail_bytes = None
+        if thumbnail_size is not None:
+            thumb = image.copy()
+            thumb.thumbnail(thumbnail_size, Image.Resampling.LANCZOS)
+            thumb_buffer = io.BytesIO()
+            thumb.save(thumb_buffer, format='JPEG', quality=THUMBNAIL_QUALITY)
+            thumbnail_bytes = thumb_buffer.getvalue()
+
     stats = {
         "original_format": original_format,
         "original_mode": original_mode,
@@ -38,4 +88,17 @@ def optimize_image_for_ocr(image_bytes: bytes) -> Tuple[bytes, Dict[str, str]]:
         "optimized_hash": hashlib.sha1(optimized_bytes).hexdigest(),
     }
 
-    return optimized_bytes, stats
+    return PreparedImage(
+        format=original_format,
+        size=original_size,
+        extension=image_extension(original_format if original_format != "UNKNOWN" else None),
+        optimized_bytes=optimized_bytes,
+        stats=stats,
+        thumbnail_bytes=thumbnail_bytes,
+    )
+
+
+def optimize_image_for_ocr(image_bytes: bytes) -> Tuple[bytes, Dict[str, str]]:
+    """Normalize receipt images so OCR engines receive consistent payloads."""
+    prepared = prepare_image_for_ocr(image_bytes, thumbnail_size=None)
+    return prepared.optimized_bytes, prepared.stats
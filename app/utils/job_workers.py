@@ -0,0 +1,122 @@
+"""Claim-based worker threads shared by the durable job stores.
+
+A store hands out jobs through ``claim(worker_id=)`` and tracks them with
+``set_stage`` / ``complete`` / ``fail`` / ``purge_finished``; a job whose
+claim is not renewed in time becomes claimable again, and any later update
+by the worker that lost it raises ``JobClaimLost``. Both
+app.mobile.analysis_jobs and app.services.send_jobs follow this contract.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+from typing import Any, Callable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+POLL_INTERVAL_SECONDS = 0.5
+
+# Handler signature: (job, report_stage) -> (result, timings)
+JobHandler = Callable[[Any, Callable[[str], None]], Any]
+
+
+class JobClaimLost(RuntimeError):
+    """Raised when a worker no longer holds the claim on its job."""
+
+
+class JobWorkerPool:
+    """Daemon threads that claim jobs from ``store`` and run ``handler``.
+
+    ``on_failure(job, error)`` is called once a job has exhausted its
+    attempts; retries in between are scheduled by the store. ``name``
+    labels the threads and log lines.
+    """
+
+    def __init__(
+        self,
+        store: Any,
+        handler: JobHandler,
+        *,
+        workers: int,
+        on_failure: Optional[Callable[[Any, str], None]] = None,
+        name: str = "job",
+    ) -> None:
+        self.store = store
+        self.name = name
+        self.handler = handler
+        self.workers = max(0, workers)
+        self.on_failure = on_failure
+        self._threads: List[threading.Thread] = []
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        with self._lock:
+            if self._threads or self.workers == 0:
+                return
+            self._stop.clear()
+            for index in range(self.workers):
+                thread = threading.Thread(
+                    target=self._run, args=(f"{os.getpid()}-{index}",),
+                    name=f"{self.name}-{index}", daemon=True,
+                )
+                thread.start()
+                self._threads.append(thread)
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop.set()
+        self._wake.set()
+        with self._lock:
+            threads, self._threads = self._threads, []
+        for thread in threads:
+            thread.join(timeout)
+
+    def notify(self) -> None:
+        """Wake idle workers (call after enqueueing)."""
+        self._wake.set()
+
+    def run_once(self, worker_id: str = "inline") -> bool:
+        """Claim and process a single job; returns False if none was due."""
+        job = self.store.claim(worker_id=worker_id)
+        if job is None:
+            return False
+        if job.attempts > job.max_attempts:
+            # Reclaimed after its worker died on the final attempt
+            error = job.error or "Worker stopped while processing the job"
+            if self.store.fail(job, error) and self.on_failure is not None:
+                self.on_failure(job, error)
+            return True
+        try:
+            result, timings = self.handler(job, lambda stage: self.store.set_stage(job, stage))
+        except JobClaimLost:
+            logger.warning("%s %s claim expired; another worker will retry it", self.name, job.job_id)
+            return True
+        except Exception as exc:
+            logger.exception("%s %s failed (attempt %s/%s)", self.name, job.job_id, job.attempts, job.max_attempts)
+            if self.store.fail(job, str(exc)) and self.on_failure is not None:
+                self.on_failure(job, str(exc))
+            return True
+        self.store.complete(job, result, timings)
+        return True
+
+    def _run(self, worker_id: str) -> None:
+        idle_loops = 0
+        while not self._stop.is_set():
+            try:
+                processed = self.run_once(worker_id)
+            except Exception:
+                logger.exception("%s worker %s crashed; continuing", self.name, worker_id)
+                processed = False
+            if processed:
+                continue
+            idle_loops += 1
+            if idle_loops % 1200 == 0:
+                try:
+                    self.store.purge_finished()
+                except Exception:
+                    logger.exception("Failed to purge finished %s rows", self.name)
+            self._wake.wait(POLL_INTERVAL_SECONDS)
+            self._wake.clear()
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import shutil
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+from fastapi import UploadFile
+
+UPLOAD_CHUNK_SIZE = 256 * 1024
+
+
+class UploadTooLargeError(ValueError):
+    """Raised when an upload exceeds the allowed size."""
+
+    def __init__(self, size: int, max_bytes: int) -> None:
+        super().__init__(f"Upload of {size} bytes exceeds limit of {max_bytes} bytes")
+        self.size = size
+        self.max_bytes = max_bytes
+
+
+@dataclass
+class ReceivedUpload:
+    """An upload read into a single shared buffer."""
+    filename: Optional[str]
+    content_type: Optional[str]
+    data: bytes
+    sha256: str
+
+    @property
+    def size(self) -> int:
+        return len(self.data)
+
+
+def _spooled_size(upload: UploadFile) -> Optional[int]:
+    """Size of the already-spooled body without reading it."""
+    try:
+        fileobj = upload.file
+        position = fileobj.tell()
+        fileobj.seek(0, os.SEEK_END)
+        size = fileobj.tell()
+        fileobj.seek(position)
+        return size
+    except (AttributeError, OSError, ValueError):
+        return None
+
+
+async def receive_upload(upload: UploadFile, max_bytes: int, *, chunk_size: int = UPLOAD_CHUNK_SIZE) -> ReceivedUpload:
+    """Read an upload into one buffer and hash it.
+
+    Starlette has already streamed the multipart body into a spooled
+    temporary file (in memory for small files, on disk beyond that), so
+    oversized uploads are rejected from the spooled size before any bytes
+    are copied, and the body is then read with a single allocation.
+    Callers share the returned buffer instead of re-reading or copying it.
+    """
+    size = _spooled_size(upload)
+    if size is not None and size > max_bytes:
+        raise UploadTooLargeError(size, max_bytes)
+
+    await upload.seek(0)
+    digest = hashlib.sha256()
+    if size is not None:
+        data = await upload.read()
+        if len(data) > max_bytes:
+            raise UploadTooLargeError(len(data), max_bytes)
+        digest.update(data)
+    else:
+        chunks = []
+        received = 0
+        while True:
+            chunk = await upload.read(chunk_size)
+            if not chunk:
+                break
+            received += len(chunk)
+            if received > max_bytes:
+                raise UploadTooLargeError(received, max_bytes)
+            digest.update(chunk)
+            chunks.append(chunk)
+        data = b"".join(chunks)
+    return ReceivedUpload(
+        filename=upload.filename,
+        content_type=upload.content_type,
+        data=data,
+        sha256=digest.hexdigest(),
+    )
+
+
+def save_spooled_upload(upload: UploadFile, dest: Path, *, chunk_size: int = UPLOAD_CHUNK_SIZE) -> None:
+    """Copy an upload's spooled body to ``dest`` (temp file + rename).
+
+    Streams from Starlette's spooled file in chunks instead of writing a
+    received buffer. Blocking; call it via run_in_threadpool.
+    """
+    dest = Path(dest)
+    tmp = dest.with_name(f".{dest.name}.tmp")
+    upload.file.seek(0)
+    try:
+        with open(tmp, "wb") as out:
+            shutil.copyfileobj(upload.file, out, chunk_size)
+        os.replace(tmp, dest)
+    finally:
+        tmp.unlink(missing_ok=True)
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Benchmark month-sheet creation for the Format① and Format② templates.
+
+Compares the per-cell style copy (ExcelTemplateLoader._copy_sheet) against
+stamping the compiled template image (ExcelTemplateLoader._stamp_sheet),
+and checks each result against the template's values, styles and merges.
+Both ledger writers create month sheets by stamping (Format② via
+ensure_format02_month_sheet, Format① via ensure_format01_month_sheet).
+
+Usage:
+    python scripts/benchmarks/month_sheet_clone.py [--months 12]
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from openpyxl import Workbook  # noqa: E402
+
+from app.excel.excel_template_loader import ExcelTemplateLoader  # noqa: E402
+
+
+def _per_cell(loader, sheet_loader, months):
+    timings = []
+    wb = Workbook()
+    for m in range(months):
+        start = time.perf_counter()
+        template_wb, template_sheet = sheet_loader()
+        ws = wb.create_sheet(title=f"old{m}")
+        loader._copy_sheet(template_sheet, ws)
+        template_wb.close()
+        timings.append(time.perf_counter() - start)
+    return wb, timings
+
+
+def _stamped(loader, template_path, sheet_loader, months):
+    timings = []
+    wb = Workbook()
+    for m in range(months):
+        start = time.perf_counter()
+        image = loader._sheet_image(template_path, sheet_loader)
+        ws = wb.create_sheet(title=f"new{m}")
+        loader._stamp_sheet(image, ws)
+        timings.append(time.perf_counter() - start)
+    return wb, timings
+
+
+def _signature(ws):
+    cells = {
+        c.coordinate: tuple(
+            repr(x) for x in (c.value, c.font, c.border, c.fill, c.number_format, c.alignment, c.protection)
+        )
+        for row in ws.iter_rows() for c in row if c.value is not None or c.has_style
+    }
+    return cells, sorted(str(m) for m in ws.merged_cells.ranges)
+
+
+def _report(name, old, new):
+    print(f"{name}")
+    print(f"  per-cell copy : first {old[0] * 1000:8.1f} ms  median {statistics.median(old) * 1000:8.1f} ms")
+    print(f"  stamped image : first {new[0] * 1000:8.1f} ms  median {statistics.median(new) * 1000:8.1f} ms")
+    print(f"  speedup (median): {statistics.median(old) / statistics.median(new):.1f}x")
+
+
+def _matches_template(sheet_loader, ws):
+    template_wb, template_sheet = sheet_loader()
+    try:
+        return _signature(template_sheet) == _signature(ws)
+    finally:
+        template_wb.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--months", type=int, default=12, help="Month sheets to create per run")
+    args = parser.parse_args()
+
+    loader = ExcelTemplateLoader()
+    cases = [
+        ("Format② (location)", loader.format02_template, loader._load_format02_template_sheet),
+        ("Format① (staff)", loader.format01_template, loader._load_format01_template_sheet),
+    ]
+    for name, path, sheet_loader in cases:
+        if not path.exists():
+            print(f"{name}: template missing at {path}, skipped")
+            continue
+        old_wb, old = _per_cell(loader, sheet_loader, args.months)
+        new_wb, new = _stamped(loader, path, sheet_loader, args.months)
+        _report(name, old, new)
+        print(f"  per-cell copy matches template: {_matches_template(sheet_loader, old_wb['old0'])}")
+        print(f"  stamped image matches template: {_matches_template(sheet_loader, new_wb['new0'])}")
+
+
+if __name__ == "__main__":
+    main()
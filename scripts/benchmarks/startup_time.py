@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Benchmark application cold start.
+
+Two measurements, each in a fresh interpreter:
+  * import: ``python -X importtime -c "import app.main"``; reports the total
+    and the slowest modules (cumulative and self time)
+  * first request: spawns uvicorn and polls /health until it answers; reports
+    the time from process spawn to the first 200
+
+Usage:
+    python scripts/benchmarks/startup_time.py [--runs 3] [--top 15]
+        [--warmup background|eager|off] [--skip-server] [--json out.json]
+"""
+
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+
+
+def _env(warmup):
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(ROOT), env.get("PYTHONPATH")]))
+    env["STARTUP_WARMUP"] = warmup
+    return env
+
+
+def _parse_importtime(stderr):
+    """Return {module: (self_us, cumulative_us)} from -X importtime output."""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+            modules[name.strip()] = (int(self_us), int(cumulative_us))
+        except ValueError:
+            continue
+    return modules
+
+
+def measure_import(warmup):
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=ROOT, env=_env(warmup), capture_output=True, text=True,
+    )
+    wall = time.perf_counter() - start
+    if proc.returncode != 0:
+        raise RuntimeError(f"import app.main failed:\n{proc.stderr[-2000:]}")
+    modules = _parse_importtime(proc.stderr)
+    return wall, modules
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def measure_first_request(warmup, timeout=120.0):
+    port = _free_port()
+    url = f"http://127.0.0.1:{port}/health"
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port)],
+        cwd=ROOT, env=_env(warmup), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        while time.perf_counter() - start < timeout:
+            if proc.poll() is not None:
+                raise RuntimeError(f"uvicorn exited with code {proc.returncode}")
+            try:
+                with urllib.request.urlopen(url, timeout=1) as response:
+                    if response.status == 200:
+                        return time.perf_counter() - start
+            except (urllib.error.URLError, ConnectionError, OSError):
+                time.sleep(0.05)
+        raise RuntimeError(f"no response from {url} within {timeout}s")
+    finally:
+        proc.terminate()
+        try:
+            proc.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--warmup", default="background", choices=["background", "eager", "off"])
+    parser.add_argument("--skip-server", action="store_true", help="only measure imports")
+    parser.add_argument("--json", type=Path, help="write results to this file")
+    args = parser.parse_args()
+
+    import_walls, import_totals, modules = [], [], {}
+    for _ in range(args.runs):
+        wall, modules = measure_import(args.warmup)
+        import_walls.append(wall)
+        import_totals.append(modules.get("app.main", (0, 0))[1] / 1e6)
+
+    print(f"import app.main (median of {args.runs}): {statistics.median(import_totals):.2f}s importtime, "
+          f"{statistics.median(import_walls):.2f}s interpreter wall")
+    by_cumulative = sorted(modules.items(), key=lambda item: item[1][1], reverse=True)[:args.top]
+    by_self = sorted(modules.items(), key=lambda item: item[1][0], reverse=True)[:args.top]
+    print(f"\nTop {args.top} by cumulative time (last run):")
+    for name, (_, cumulative) in by_cumulative:
+        print(f"  {cumulative / 1000:9.1f} ms  {name}")
+    print(f"\nTop {args.top} by self time (last run):")
+    for name, (self_us, _) in by_self:
+        print(f"  {self_us / 1000:9.1f} ms  {name}")
+
+    results = {
+        "warmup": args.warmup,
+        "import_seconds": statistics.median(import_totals),
+        "import_wall_seconds": statistics.median(import_walls),
+        "top_cumulative": [{"module": n, "ms": c / 1000} for n, (_, c) in by_cumulative],
+        "top_self": [{"module": n, "ms": s / 1000} for n, (s, _) in by_self],
+    }
+
+    if not args.skip_server:
+        first_requests = [measure_first_request(args.warmup) for _ in range(args.runs)]
+        results["first_request_seconds"] = statistics.median(first_requests)
+        print(f"\nspawn -> first /health 200 (median of {args.runs}, STARTUP_WARMUP={args.warmup}): "
+              f"{results['first_request_seconds']:.2f}s")
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,12 +6,22 @@ Phase 4E: Test Foundation
 - Shared fixtures for common test scenarios
 """
 
+import atexit
 import os
+import shutil
 import tempfile
 from pathlib import Path
 from typing import Generator
 from unittest.mock import Mock, patch
 
+# Default databases (drafts, users, audit, locks, ...) go to a throwaway
+# directory; set before app modules are imported by any test. Subprocesses
+# started by tests inherit it.
+if "APP_DATA_DIR" not in os.environ:
+    _test_data_dir = tempfile.mkdtemp(prefix="receipt-ocr-test-data-")
+    os.environ["APP_DATA_DIR"] = _test_data_dir
+    atexit.register(shutil.rmtree, _test_data_dir, ignore_errors=True)
+
 import pytest
 from fastapi.testclient import TestClient
 
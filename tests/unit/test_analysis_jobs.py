@@ -0,0 +1,70 @@
+"""
+Tests for the durable /mobile/analyze job store and worker pool.
+"""
+
+import time
+
+from app.mobile import analysis_jobs
+from app.mobile.analysis_jobs import AnalysisJobStore, AnalysisJobWorkerPool
+
+
+def test_job_runs_with_stage_progress_and_cleans_blobs(tmp_path):
+    store = AnalysisJobStore(tmp_path)
+    store.enqueue("job1", {"metadata": "m"}, blobs={"optimized": b"abc"})
+    assert store.get("job1").stage is None
+    seen = []
+
+    def handler(job, report_stage):
+        assert open(job.payload["blobs"]["optimized"], "rb").read() == b"abc"
+        for stage in ("ocr", "extraction", "validation"):
+            report_stage(stage)
+            seen.append(store.get(job.job_id).stage)
+        return {"vendor": "Shop"}, {"ocr": 0.1}
+
+    pool = AnalysisJobWorkerPool(store, handler, workers=0)
+    assert pool.run_once() is True
+    assert pool.run_once() is False
+
+    job = store.get("job1")
+    assert seen == ["ocr", "extraction", "validation"]
+    assert job.state == "completed"
+    assert job.result == {"vendor": "Shop"}
+    assert not (store.blobs_dir / "job1").exists()
+
+
+def test_failures_retry_with_backoff_then_fail(tmp_path, monkeypatch):
+    monkeypatch.setattr(analysis_jobs, "ANALYSIS_JOB_RETRY_BASE_SECONDS", 0)
+    store = AnalysisJobStore(tmp_path)
+    store.enqueue("job1", {}, max_attempts=2)
+    failures = []
+
+    def handler(job, report_stage):
+        raise RuntimeError(f"boom {job.attempts}")
+
+    pool = AnalysisJobWorkerPool(store, handler, workers=0, on_failure=lambda job, err: failures.append(err))
+    pool.run_once()
+    assert store.get("job1").state == "queued"
+    assert failures == []
+
+    pool.run_once()
+    job = store.get("job1")
+    assert job.state == "failed"
+    assert job.attempts == 2
+    assert failures == ["boom 2"]
+
+
+def test_expired_claim_is_reclaimed_by_another_worker(tmp_path):
+    store = AnalysisJobStore(tmp_path, claim_timeout=0.05)
+    store.enqueue("job1", {})
+
+    crashed = store.claim(worker_id="a")
+    assert crashed is not None
+    assert store.claim(worker_id="b") is None
+
+    time.sleep(0.1)
+    reclaimed = store.claim(worker_id="b")
+    assert reclaimed.job_id == "job1"
+    assert reclaimed.attempts == 2
+    # The original worker's late completion is rejected
+    assert store.complete(crashed, {"stale": True}) is False
+    assert store.complete(reclaimed, {"ok": True}) is True
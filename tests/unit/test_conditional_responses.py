@@ -0,0 +1,85 @@
+import json
+import os
+
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from app.models.draft import DraftReceipt
+from app.models.schema import Receipt
+from app.repositories.draft_repository import DraftRepository
+from app.services.config_service import ConfigService
+from app.utils import http_cache
+from app.utils.http_cache import ResponseCache, conditional_json_response, make_etag
+
+
+def test_change_version_moves_on_every_write_path():
+    repo = DraftRepository(db_path=":memory:")
+    start = repo.get_change_version()
+
+    draft = repo.save(DraftReceipt(receipt=Receipt(vendor_name="Shop")))
+    after_save = repo.get_change_version()
+    assert after_save > start
+
+    repo.list_all()
+    assert repo.get_change_version() == after_save
+
+    # Writers outside the repository (e.g. HQ transfer marking) are covered too
+    conn = repo._get_connection()
+    conn.execute("UPDATE draft_receipts SET hq_status = 'TRANSFERRED'")
+    conn.commit()
+    after_update = repo.get_change_version()
+    assert after_update > after_save
+
+    repo.delete(draft.draft_id)
+    assert repo.get_change_version() > after_update
+
+
+def test_conditional_response_skips_build_on_match_and_caches_body(monkeypatch):
+    monkeypatch.setattr(http_cache, "_response_cache", ResponseCache(max_entries=4))
+    builds = []
+    version = {"value": 1}
+    app = FastAPI()
+
+    @app.get("/items")
+    def items(request: Request):
+        etag = make_etag("/items", "user-1", version["value"])
+
+        def build():
+            builds.append(version["value"])
+            return json.dumps({"version": version["value"]}).encode()
+
+        return conditional_json_response(request, etag, build)
+
+    client = TestClient(app)
+    first = client.get("/items")
+    etag = first.headers["etag"]
+    assert first.json() == {"version": 1}
+
+    assert client.get("/items", headers={"If-None-Match": etag}).status_code == 304
+    assert client.get("/items").json() == {"version": 1}
+    assert builds == [1]
+
+    version["value"] = 2
+    refreshed = client.get("/items", headers={"If-None-Match": etag})
+    assert refreshed.status_code == 200
+    assert refreshed.headers["etag"] != etag
+    assert builds == [1, 2]
+
+
+def test_config_version_changes_and_reloads_on_edit(tmp_path):
+    service = ConfigService()
+    service.locations_path = tmp_path / "locations.json"
+    service.staff_config_path = tmp_path / "staff_config.json"
+    service.vendor_overrides_path = tmp_path / "vendor_overrides.json"
+    service.locations_path.write_text(json.dumps({"locations": ["aeon"]}))
+
+    version = service.get_version()
+    assert service.get_locations() == ["aeon"]
+    assert service.get_version() == version
+
+    service.locations_path.write_text(json.dumps({"locations": ["aeon", "kyoto"]}))
+    stat = service.locations_path.stat()
+    os.utime(service.locations_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    assert service.get_version() != version
+    assert service.get_locations() == ["aeon", "kyoto"]
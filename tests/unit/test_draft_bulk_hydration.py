@@ -0,0 +1,71 @@
+import sqlite3
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import pytest
+
+from app.models.draft import DraftReceipt, DraftStatus
+from app.models.schema import Receipt
+from app.repositories.draft_repository import DraftRepository
+
+
+def _seed(repo, count=5):
+    for i in range(count):
+        receipt = Receipt(
+            receipt_date="2026-03-01",
+            vendor_name=f"Vendor {i}",
+            total_amount=Decimal("1234.5"),
+            business_location_id="aeon",
+            staff_id="s1",
+            created_at=datetime.now(timezone.utc),
+        )
+        repo.save(DraftReceipt(
+            receipt=receipt,
+            status=DraftStatus.SENT,
+            sent_at=datetime.utcnow(),
+            excel_last_known_values='{"total": 1234.5}',
+            graph_api_write_confirmed=bool(i % 2),
+        ))
+
+
+def _all_rows(repo):
+    conn = repo._get_connection()
+    conn.row_factory = sqlite3.Row
+    return conn.execute("SELECT * FROM draft_receipts ORDER BY created_at DESC").fetchall()
+
+
+def test_bulk_hydration_matches_per_row_conversion():
+    repo = DraftRepository(db_path=":memory:")
+    _seed(repo)
+
+    bulk = repo.list_all(limit=None)
+    single = [repo._row_to_draft(row) for row in _all_rows(repo)]
+
+    assert [d.model_dump() for d in bulk] == [d.model_dump() for d in single]
+    assert isinstance(bulk[0].receipt.total_amount, Decimal)
+    assert bulk[0].excel_last_known_values == '{"total": 1234.5}'
+
+
+def test_bulk_hydration_falls_back_to_per_row_on_invalid_batch():
+    repo = DraftRepository(db_path=":memory:")
+    _seed(repo, count=2)
+    conn = repo._get_connection()
+    conn.execute("UPDATE draft_receipts SET status = 'BOGUS'")
+    conn.commit()
+
+    with pytest.raises(ValueError):
+        repo.list_all()
+
+
+def test_list_projected_returns_plain_dicts():
+    repo = DraftRepository(db_path=":memory:")
+    _seed(repo, count=3)
+
+    rows = repo.list_projected(["vendor_name", "total_amount"], status=DraftStatus.SENT, limit=2)
+
+    assert len(rows) == 2
+    assert rows[0]["vendor_name"] == "Vendor 2"
+    assert rows[0]["total_amount"] == "1234.5"
+    assert rows[0]["status"] == "SENT"
+    with pytest.raises(ValueError):
+        repo.list_projected(["vendor_name; DROP TABLE draft_receipts"])
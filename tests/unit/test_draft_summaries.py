@@ -0,0 +1,49 @@
+import json
+import uuid
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from app.models.draft import DraftReceipt, DraftStatus
+from app.models.schema import Receipt
+from app.repositories.draft_repository import DraftRepository
+
+
+def test_summaries_read_promoted_columns_and_legacy_rows():
+    repo = DraftRepository(db_path=":memory:")
+    repo.save(DraftReceipt(
+        receipt=Receipt(receipt_date="2026-03-01", vendor_name="Shop", total_amount=Decimal("1200"),
+                        business_location_id="aeon", staff_id="s1"),
+        excel_last_known_values="{}" * 1000,
+    ))
+    # Row written without the promoted columns (e.g. by an older build)
+    now = datetime.utcnow() + timedelta(seconds=1)
+    conn = repo._get_connection()
+    conn.execute(
+        "INSERT INTO draft_receipts (draft_id, receipt_json, status, created_at, updated_at) VALUES (?, ?, ?, ?, ?)",
+        (str(uuid.uuid4()), json.dumps({"vendor_name": "Legacy", "total_amount": "99"}), "DRAFT",
+         now.isoformat(), now.isoformat()),
+    )
+    conn.commit()
+
+    rows = repo.list_summaries(statuses=[DraftStatus.DRAFT])
+
+    assert [row["vendor_name"] for row in rows] == ["Legacy", "Shop"]
+    assert rows[1]["total_amount"] == "1200"
+    assert rows[1]["staff_id"] == "s1"
+    assert "receipt_json" not in rows[1]
+    assert "excel_last_known_values" not in rows[1]
+
+
+def test_sent_summaries_span_statuses_and_sort_by_sent_at():
+    repo = DraftRepository(db_path=":memory:")
+    base = datetime(2026, 3, 1, 12, 0)
+    for offset, status in ((1, DraftStatus.SENT), (3, DraftStatus.REVIEWED), (2, DraftStatus.SENT), (0, DraftStatus.DRAFT)):
+        repo.save(DraftReceipt(
+            receipt=Receipt(vendor_name=f"v{offset}"),
+            status=status,
+            sent_at=base + timedelta(hours=offset) if status != DraftStatus.DRAFT else None,
+        ))
+
+    rows = repo.list_summaries(statuses=[DraftStatus.SENT, DraftStatus.REVIEWED], limit=2, order_by_sent=True)
+
+    assert [row["vendor_name"] for row in rows] == ["v3", "v2"]
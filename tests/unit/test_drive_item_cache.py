@@ -0,0 +1,123 @@
+import pytest
+
+from app.services import onedrive_file_manager as ofm
+from app.services.drive_item_cache import DriveItemCache
+from app.services.graph_client import GraphAPIError
+
+
+class FakeGraph:
+    def __init__(self):
+        self.items = {
+            "Base/staff": {"id": "folder-staff", "folder": {}},
+            "Base/staff/Ethan_Aichi.xlsx": {"id": "file-ethan", "parentReference": {"id": "folder-staff"}},
+        }
+        self.calls = []
+
+    def get(self, endpoint):
+        self.calls.append(endpoint)
+        if endpoint.startswith("users/u1/drive/items/"):
+            item_id = endpoint.split("/")[4].split("?")[0]
+            if item_id not in {item["id"] for item in self.items.values()}:
+                raise GraphAPIError("gone", status_code=404)
+            return {"id": item_id, "eTag": '"e"'}
+        path = endpoint.split("root:/", 1)[1].split("?")[0]
+        if path.endswith(":/children"):
+            folder = path[: -len(":/children")]
+            return {"value": [
+                dict(item, name=p.rsplit("/", 1)[1])
+                for p, item in self.items.items() if p.rsplit("/", 1)[0] == folder
+            ]}
+        if path not in self.items:
+            raise GraphAPIError("not found", status_code=404)
+        return self.items[path]
+
+
+@pytest.fixture
+def graph(monkeypatch, tmp_path):
+    fake = FakeGraph()
+    cache = DriveItemCache(tmp_path / "drive_items.db")
+    monkeypatch.setattr(ofm, "graph_get", fake.get)
+    monkeypatch.setattr(ofm, "get_user_id", lambda: "u1")
+    monkeypatch.setattr(ofm, "get_base_folder", lambda: "Base")
+    monkeypatch.setattr(ofm, "get_drive_item_cache", lambda: cache)
+    fake.cache = cache
+    return fake
+
+
+def test_ids_and_misses_are_cached_and_persisted(graph, tmp_path):
+    assert ofm.get_file_id("staff/Ethan_Aichi.xlsx") == "file-ethan"
+    assert not ofm.file_exists("staff/Maya_Aichi.xlsx")
+    graph.calls.clear()
+
+    assert ofm.get_file_id("staff/ethan_aichi.xlsx") == "file-ethan"
+    assert not ofm.file_exists("staff/Maya_Aichi.xlsx")
+    with pytest.raises(ofm.OneDriveFileNotFoundError):
+        ofm.get_file_id("staff/Maya_Aichi.xlsx")
+    assert graph.calls == []
+
+    # A fresh process starts from the persisted rows
+    reloaded = DriveItemCache(tmp_path / "drive_items.db")
+    assert reloaded.get("u1", "Base/staff/Ethan_Aichi.xlsx").parent_id == "folder-staff"
+
+
+def test_404_on_item_id_drops_cached_path(graph):
+    ofm.get_file_id("staff/Ethan_Aichi.xlsx")
+
+    # Deleted and recreated under a new id
+    graph.items["Base/staff/Ethan_Aichi.xlsx"] = {"id": "file-ethan-2"}
+    with pytest.raises(GraphAPIError):
+        ofm.get_file_metadata("file-ethan")
+
+    assert ofm.get_file_id("staff/Ethan_Aichi.xlsx") == "file-ethan-2"
+
+
+def test_prewarm_lists_each_folder_once(graph):
+    counts = ofm.prewarm_item_ids(["staff/Ethan_Aichi.xlsx", "staff/Maya_Aichi.xlsx"])
+
+    assert counts == {"paths": 2, "found": 1, "missing": 1, "errors": 0}
+    assert [call.split("?")[0] for call in graph.calls] == [
+        "users/u1/drive/root:/Base/staff:/children",
+        "users/u1/drive/root:/Base/staff/Maya_Aichi.xlsx",
+    ]
+    assert ofm.ensure_folder("staff")["id"] == "folder-staff"
+    assert len(graph.calls) == 3  # the folder item itself is resolved on first use
+
+
+class FakeUpload:
+    def __init__(self, status_code, body):
+        self.status_code = status_code
+        self._body = body
+        self.text = str(body)
+
+    def json(self):
+        return self._body
+
+
+def test_create_never_trusts_a_cached_miss_or_replaces_a_file(graph, monkeypatch, tmp_path):
+    import requests
+    from app.services import graph_auth
+
+    template = tmp_path / "template.xlsx"
+    template.write_bytes(b"xlsx")
+    monkeypatch.setattr(graph_auth, "get_access_token", lambda: "token")
+    uploads = []
+
+    def put(url, **kwargs):
+        uploads.append(url)
+        # Another worker created the workbook between our lookup and the upload
+        graph.items["Base/staff/Noah_Kyoto.xlsx"] = {"id": "file-noah"}
+        return FakeUpload(409, {"error": {"code": "nameAlreadyExists"}})
+
+    monkeypatch.setattr(requests, "put", put)
+
+    # Cached as missing, but created elsewhere since: no upload at all
+    assert not ofm.file_exists("staff/Maya_Aichi.xlsx")
+    graph.items["Base/staff/Maya_Aichi.xlsx"] = {"id": "file-maya"}
+    assert ofm.create_excel_file("staff/Maya_Aichi.xlsx", str(template)) == "file-maya"
+    assert uploads == []
+
+    # Created between the lookup and the upload: the upload refuses to replace it
+    assert ofm.create_excel_file("staff/Noah_Kyoto.xlsx", str(template)) == "file-noah"
+    assert len(uploads) == 1
+    assert uploads[0].endswith(":/content?@microsoft.graph.conflictBehavior=fail")
+    assert ofm.get_file_id("staff/Noah_Kyoto.xlsx") == "file-noah"
@@ -0,0 +1,86 @@
+from app.services import excel_data_provider as provider_module
+from app.services.excel_data_provider import ExcelDataProvider, WorksheetRowCache
+from app.services.excel_reader import WorksheetNotFoundError
+
+
+class FakeDrive:
+    def __init__(self):
+        self.etag = '"v1"'
+        self.calls = []
+        self.sheets = {
+            "2026年3月": [["h"]] * 5 + [["2026-03-01", None, "Shop", "Taro", None, 100], ["合計"]],
+            "2026年4月": [["h"]] * 5 + [["2026-04-01", None, "Shop", "Taro", None, 200],
+                                      ["2026-04-02", None, "Shop", "Jiro", None, 300]],
+        }
+
+    def get_file_id(self, path):
+        self.calls.append("id")
+        return "file-" + path.split("/")[-1].split("_")[0]
+
+    def get_file_metadata(self, file_id):
+        self.calls.append("metadata")
+        return {"eTag": self.etag}
+
+    def get_worksheet_names(self, file_id):
+        self.calls.append("worksheets")
+        return list(self.sheets)
+
+    def read_worksheet(self, file_id, worksheet_name):
+        self.calls.append(f"read:{worksheet_name}")
+        if worksheet_name not in self.sheets:
+            raise WorksheetNotFoundError(worksheet_name, file_id)
+        return self.sheets[worksheet_name]
+
+    def iter_folder_children(self, folder, select=None):
+        return iter([{"name": f"{name}_Accumulated.xlsx", "id": name} for name in ("Aichi", "Kyoto")])
+
+
+def _provider(monkeypatch):
+    drive = FakeDrive()
+    for name in ("get_file_id", "get_file_metadata", "get_worksheet_names", "read_worksheet", "iter_folder_children"):
+        monkeypatch.setattr(provider_module, name, getattr(drive, name))
+    return ExcelDataProvider(cache=WorksheetRowCache()), drive
+
+
+def test_repeat_reads_only_revalidate_etag(monkeypatch):
+    provider, drive = _provider(monkeypatch)
+
+    first = provider.get_location_receipts("Aichi")
+    drive.calls.clear()
+    second = provider.get_location_receipts("Aichi")
+
+    assert [r.expense for r in second] == [r.expense for r in first] == [100, 200, 300]
+    assert drive.calls == ["id", "metadata"]
+    assert provider.count_receipts_in_location("Aichi") == 3
+    assert provider.count_receipts_in_location("Aichi", 2026, 5) == 0
+    assert "read:2026年4月" not in drive.calls
+
+    # A missing month is remembered for this ETag too
+    drive.calls.clear()
+    assert provider.count_receipts_in_location("Aichi", 2026, 5) == 0
+    assert drive.calls == ["id", "metadata"]
+
+
+def test_changed_etag_reloads_and_drops_old_entries(monkeypatch):
+    provider, drive = _provider(monkeypatch)
+    provider.get_location_receipts("Aichi", 2026, 3)
+
+    drive.etag = '"v2"'
+    drive.sheets["2026年3月"].insert(6, ["2026-03-02", None, "Shop", "Taro", None, 50])
+    drive.calls.clear()
+
+    receipts = provider.get_location_receipts("Aichi", 2026, 3)
+
+    assert [r.expense for r in receipts] == [100, 50]
+    assert drive.calls == ["id", "metadata", "read:2026年3月"]
+    assert provider.cache.stats()["entries"] == 1
+
+
+def test_all_locations_are_read_concurrently_in_file_order(monkeypatch):
+    monkeypatch.setattr(provider_module, "EXCEL_READ_WORKERS", 4)
+    provider, drive = _provider(monkeypatch)
+
+    result = provider.get_all_location_receipts(2026, 4)
+
+    assert list(result) == ["Aichi", "Kyoto"]
+    assert [len(rows) for rows in result.values()] == [2, 2]
@@ -0,0 +1,111 @@
+from pathlib import Path
+
+from openpyxl import load_workbook
+
+from app.services import excel_data_provider as provider_module
+from app.services import onedrive_file_manager as ofm
+from app.services.excel_data_provider import ExcelDataProvider, WorksheetRowCache
+
+
+def test_folder_enumeration_follows_next_links(monkeypatch):
+    pages = {
+        "first": {"value": [{"id": "1", "name": "a.xlsx"}, {"id": "2", "name": "b.xlsx"}],
+                  "@odata.nextLink": "https://graph.microsoft.com/v1.0/page-2"},
+        "https://graph.microsoft.com/v1.0/page-2": {"value": [{"id": "3", "name": "c.xlsx", "eTag": '"e3"'}]},
+    }
+    calls = []
+
+    def graph_get(endpoint):
+        calls.append(endpoint)
+        return pages[endpoint if endpoint in pages else "first"]
+
+    monkeypatch.setattr(ofm, "graph_get", graph_get)
+    monkeypatch.setattr(ofm, "get_user_id", lambda: "u1")
+    monkeypatch.setattr(ofm, "get_base_folder", lambda: "Base")
+    monkeypatch.setattr(ofm, "get_drive_item_cache", lambda: None)
+
+    items = ofm.iter_folder_children("staff", select=("id", "name", "eTag"), page_size=2)
+    assert next(items)["id"] == "1"
+    assert len(calls) == 1  # later pages are fetched only when consumed
+    assert [item["id"] for item in items] == ["2", "3"]
+    assert calls[0] == "users/u1/drive/root:/Base/staff:/children?$select=id,name,eTag&$top=2"
+
+    assert [f["eTag"] for f in ofm.list_files_in_folder("staff")] == [None, None, '"e3"']
+
+
+def test_row_counts_are_probed_once_per_etag(monkeypatch):
+    listing = [
+        {"id": "s1", "name": "Ethan_Aichi.xlsx", "eTag": '"s1-v1"'},
+        {"id": "s2", "name": "Maya_Aichi.xlsx", "eTag": '"s2-v1"'},
+        {"id": "notes", "name": "notes.txt"},
+    ]
+    probes = []
+    monkeypatch.setattr(provider_module, "iter_folder_children", lambda folder, select=None: iter(listing))
+    monkeypatch.setattr(provider_module, "get_worksheet_names", lambda file_id: ["原本", "202603", "202604"])
+
+    header = [["担当", "支払日", "勘定科目", "摘要"], [None] * 4]
+    sheets = {
+        "202603": header + [["Ethan", "2026-03-01", "旅費交通費", f"receipt {i}"] for i in range(10)],
+        "202604": header[:1],
+    }
+
+    def get_used_row_count(file_id, worksheet_name):
+        probes.append((file_id, worksheet_name))
+        return len(sheets[worksheet_name])
+
+    monkeypatch.setattr(provider_module, "get_used_row_count", get_used_row_count)
+    monkeypatch.setattr(provider_module, "read_range", lambda file_id, ws_name, address: sheets[ws_name])
+    provider = ExcelDataProvider(cache=WorksheetRowCache())
+
+    files = provider.fill_row_counts(provider.list_staff_files())
+
+    # Two header rows per Format① sheet; the template sheet is not counted
+    assert [(f.file_name, f.row_count) for f in files] == [("Ethan_Aichi.xlsx", 10), ("Maya_Aichi.xlsx", 10)]
+    assert sorted(probes) == [("s1", "202603"), ("s1", "202604"), ("s2", "202603"), ("s2", "202604")]
+
+    probes.clear()
+    listing[1]["eTag"] = '"s2-v2"'
+    files = provider.fill_row_counts(provider.list_staff_files())
+    assert [f.row_count for f in files] == [10, 10]
+    assert sorted(probes) == [("s2", "202603"), ("s2", "202604")]
+
+
+def _template_sheet(file_name, sheet_name, receipts):
+    """Template worksheet values (A:L) as Graph returns them, with ``receipts`` filled in."""
+    path = Path(__file__).resolve().parents[2] / "Template" / "Formats" / file_name
+    ws = load_workbook(path, data_only=True)[sheet_name]
+    for (row, col), value in receipts.items():
+        ws.cell(row=row, column=col, value=value)
+    return ws.max_row, [[cell.value for cell in row] for row in ws.iter_rows(max_col=12)]
+
+
+def test_row_count_probe_ignores_template_formula_and_footer_rows(monkeypatch):
+    # Format①: values (formulas) down to the 合計 footer on row 72
+    staff_used, staff_rows = _template_sheet("各個人集計用　_2024.xlsx", "原本", {
+        (row, col): value
+        for row in (3, 4, 5)
+        for col, value in ((1, "Ethan"), (2, "2026-03-01"), (4, "交通費"), (7, 500))
+    })
+    # Format②: 繰越 row, then 合計/残高 footer on rows 39-40
+    location_used, location_rows = _template_sheet("事業所集計テーブル.xlsx", "Monthly_Template", {
+        (row, col): value
+        for row in (6, 7)
+        for col, value in ((1, "2026-03-01"), (3, "Store"), (4, "Ethan"), (6, 500))
+    })
+    assert staff_used >= 72 and location_used >= 40
+    sheets = {
+        "s1": ("202603", staff_used, staff_rows),
+        "l1": ("2026年3月", location_used, location_rows),
+    }
+    listings = {
+        "staff": [{"id": "s1", "name": "Ethan_Aichi.xlsx", "eTag": '"s1"'}],
+        "locations": [{"id": "l1", "name": "Aichi.xlsx", "eTag": '"l1"'}],
+    }
+    monkeypatch.setattr(provider_module, "iter_folder_children", lambda folder, select=None: iter(listings[folder]))
+    monkeypatch.setattr(provider_module, "get_worksheet_names", lambda file_id: [sheets[file_id][0]])
+    monkeypatch.setattr(provider_module, "get_used_row_count", lambda file_id, ws_name: sheets[file_id][1])
+    monkeypatch.setattr(provider_module, "read_range", lambda file_id, ws_name, address: sheets[file_id][2])
+    provider = ExcelDataProvider(cache=WorksheetRowCache())
+
+    assert [f.row_count for f in provider.fill_row_counts(provider.list_staff_files())] == [3]
+    assert [f.row_count for f in provider.fill_row_counts(provider.list_location_files())] == [2]
@@ -0,0 +1,89 @@
+"""
+Tests for streaming latency percentiles in GraphHealthMonitor.
+"""
+
+from app.services.graph_health_monitor import GraphHealthMonitor, LatencyHistogram
+
+
+class FakeClock:
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_histogram_quantiles_within_relative_error():
+    hist = LatencyHistogram()
+    for v in range(1, 10001):
+        hist.record(float(v))
+
+    p50, p90, p99 = hist.quantiles((0.5, 0.9, 0.99))
+    for estimate, exact in ((p50, 5000), (p90, 9000), (p99, 9900)):
+        assert abs(estimate - exact) / exact <= LatencyHistogram.RELATIVE_ERROR * 1.5
+    assert hist.count == 10000
+    assert len(hist.counts) == LatencyHistogram.BUCKET_COUNT
+
+
+def test_windows_and_operations_are_independent():
+    clock = FakeClock()
+    monitor = GraphHealthMonitor(clock=clock)
+
+    for _ in range(100):
+        monitor.record_success(1000, "slow")
+    clock.now += 600  # Outside the 5 minute window, inside retention
+    for _ in range(100):
+        monitor.record_success(100, "fast")
+
+    assert monitor.get_percentiles(300)["p50"] < 110
+    assert monitor.get_percentiles(300, "slow")["count"] == 0
+    assert monitor.get_percentiles(900, "slow")["count"] == 100
+    assert monitor.get_percentiles(900)["p99"] > 900
+
+    report = monitor.get_health_report(force_refresh=True)
+    assert report["totalRequests"] == 100
+    assert set(report["operations"]) == {"fast"}
+
+
+def test_slots_recycle_after_retention():
+    clock = FakeClock()
+    monitor = GraphHealthMonitor(clock=clock)
+    monitor.record_failure(50, "op")
+    clock.now += GraphHealthMonitor.RETENTION_SECONDS
+    monitor.record_success(50, "op")
+
+    stats = monitor._get_window_stats(GraphHealthMonitor.RETENTION_SECONDS)
+    assert stats["failure_count"] == 0
+    assert stats["success_count"] == 1
+
+
+def test_prometheus_export():
+    monitor = GraphHealthMonitor()
+    monitor.record_success(40, 'GET "me"')
+    monitor.record_success(400, 'GET "me"')
+    monitor.record_throttle()
+
+    text = monitor.export_prometheus()
+    assert 'graph_requests_total{outcome="throttle"} 1' in text
+    assert 'graph_request_duration_ms_bucket{operation="GET \\"me\\"",le="50"} 1' in text
+    assert 'graph_request_duration_ms_count{operation="GET \\"me\\"",le="+Inf"}' not in text
+    assert 'graph_request_duration_ms_count{operation="GET \\"me\\""} 2' in text
+    assert 'quantile="0.99"' in text
+
+
+def test_request_urls_are_keyed_by_route_template():
+    monitor = GraphHealthMonitor()
+    for i in range(GraphHealthMonitor.MAX_OPERATIONS + 10):
+        monitor.record_success(
+            100,
+            f"PATCH users/u{i}/drive/items/01ITEM{i:04d}/workbook/worksheets('2026年3月')/range(address='A{i}:J{i}')",
+        )
+        monitor.record_success(100, f"GET users/u{i}/drive/root:/Base/staff/Staff {i}_Aichi.xlsx")
+
+    route = "PATCH users/{user}/drive/items/{id}/workbook/worksheets/{ws}/range"
+    report = monitor.get_health_report(force_refresh=True)
+    assert set(report["operations"]) == {route, "GET users/{user}/drive/root:/{path}"}
+    assert monitor.get_percentiles(300, route)["count"] == GraphHealthMonitor.MAX_OPERATIONS + 10
+
+    text = monitor.export_prometheus()
+    assert "01ITEM" not in text and "Staff 1" not in text and 'operation="other"' not in text
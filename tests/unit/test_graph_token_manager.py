@@ -0,0 +1,101 @@
+import threading
+import time
+
+from app.services.graph_auth import TOKEN_EXPIRY_BUFFER, TokenManager
+
+
+class SlowAcquirer:
+    def __init__(self, expires_in=3600, delay=0.1):
+        self.calls = 0
+        self.expires_in = expires_in
+        self.delay = delay
+        self._lock = threading.Lock()
+
+    def __call__(self, scopes, tenant_id):
+        with self._lock:
+            self.calls += 1
+            n = self.calls
+        time.sleep(self.delay)
+        return f"token-{tenant_id}-{n}", self.expires_in
+
+
+def test_concurrent_callers_share_one_acquisition():
+    acquirer = SlowAcquirer()
+    manager = TokenManager(acquire_fn=acquirer)
+    results = []
+
+    threads = [
+        threading.Thread(target=lambda: results.append(manager.get_token(tenant_id="t1")))
+        for _ in range(10)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert acquirer.calls == 1
+    assert set(results) == {"token-t1-1"}
+    metrics = manager.get_metrics()
+    assert metrics["acquisitions"] == 1
+    assert metrics["coalescedWaits"] == 9
+    assert metrics["avgLatencyMs"] >= 100
+    manager.clear()
+
+
+def test_tokens_are_cached_per_tenant():
+    acquirer = SlowAcquirer(delay=0)
+    manager = TokenManager(acquire_fn=acquirer)
+
+    assert manager.get_token(tenant_id="a") == "token-a-1"
+    assert manager.get_token(tenant_id="b") == "token-b-2"
+    assert manager.get_token(tenant_id="a") == "token-a-1"
+    assert acquirer.calls == 2
+    manager.clear()
+
+
+def test_token_in_refresh_window_is_served_while_refreshing_in_background():
+    # Token lands inside the refresh window immediately
+    acquirer = SlowAcquirer(expires_in=TOKEN_EXPIRY_BUFFER - 60, delay=0.05)
+    manager = TokenManager(acquire_fn=acquirer)
+
+    first = manager.get_token(tenant_id="t")
+    assert first == "token-t-1"
+
+    # Served from cache without waiting; a refresh starts behind it
+    start = time.monotonic()
+    assert manager.get_token(tenant_id="t") == "token-t-1"
+    assert time.monotonic() - start < 0.04
+
+    deadline = time.monotonic() + 2
+    while manager.get_metrics()["acquisitions"] < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert manager.get_metrics()["backgroundRefreshes"] >= 1
+    assert manager.get_token(tenant_id="t") != "token-t-1"
+    manager.clear()
+
+
+def test_refresh_that_returns_the_cached_token_backs_off():
+    acquirer = SlowAcquirer(expires_in=TOKEN_EXPIRY_BUFFER - 60, delay=0)
+    refreshes = []
+
+    def stale_refresh(scopes, tenant_id):
+        refreshes.append(tenant_id)
+        return "token-t-1", TOKEN_EXPIRY_BUFFER - 61
+
+    manager = TokenManager(acquire_fn=acquirer, refresh_fn=stale_refresh)
+    assert manager.get_token(tenant_id="t") == "token-t-1"
+    expires_at = manager.get_entry(tenant_id="t")["expires_at"]
+
+    assert manager.get_token(tenant_id="t") == "token-t-1"
+    deadline = time.monotonic() + 2
+    while manager.get_metrics()["acquisitions"] < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    # Further calls inside the window do not start another refresh straight away
+    for _ in range(20):
+        assert manager.get_token(tenant_id="t") == "token-t-1"
+    time.sleep(0.05)
+    assert refreshes == ["t"]
+    assert acquirer.calls == 1
+    assert manager.get_entry(tenant_id="t")["expires_at"] == expires_at
+    manager.clear()
@@ -0,0 +1,127 @@
+from datetime import datetime
+
+import pytest
+
+from app.models.draft import DraftReceipt, DraftStatus
+from app.models.schema import Receipt
+from app.repositories.draft_repository import DraftRepository
+from app.repositories.hq_transfer_repository import HQTransferRepository
+from app.services import hq_master_ledger_writer as writer
+from app.services import hq_transfer_writer_service
+from app.services.excel_writer import ExcelWriteError
+from app.services.hq_transfer_writer_service import HQTransferWriterService
+
+
+class FakeAudit:
+    def __init__(self):
+        self.events = []
+
+    def log(self, event_type, actor=None, draft_id=None, data=None):
+        self.events.append(event_type)
+
+
+class FakeSheet:
+    """In-memory HQ month sheet: header rows, one used row, a one-row gap, one used row."""
+
+    def __init__(self):
+        self.rows = [["事業所"], ["header"], ["x", "2026-03-01", "old", None, 1], [], ["y", "2026-03-02", "old", None, 2]]
+        self.writes = []
+        self.fail_on_write = None
+
+    def update_range(self, file_id, worksheet_name, range_address, values, etag):
+        if self.fail_on_write == len(self.writes):
+            raise ExcelWriteError("update_range", "boom")
+        self.writes.append(range_address)
+        start = int(range_address.split(":")[0][1:])
+        while len(self.rows) < start - 1 + len(values):
+            self.rows.append([])
+        for offset, row in enumerate(values):
+            self.rows[start - 1 + offset] = list(row)
+        return f"etag-{len(self.writes)}"
+
+
+@pytest.fixture
+def sheet(monkeypatch):
+    fake = FakeSheet()
+    monkeypatch.setattr(writer, "is_graph_fully_configured", lambda: True)
+    monkeypatch.setattr(writer, "ensure_hq_file_exists", lambda: "hq-file")
+    monkeypatch.setattr(writer, "get_hq_file_id", lambda: "hq-file")
+    monkeypatch.setattr(writer, "get_worksheet_names", lambda file_id: ["2026年3月"])
+    monkeypatch.setattr(writer, "read_worksheet", lambda *a, **k: [list(r) for r in fake.rows])
+    monkeypatch.setattr(writer, "update_range", fake.update_range)
+    monkeypatch.setattr(writer, "safe_write", lambda file_id, operation, get_etag_fn, **kw: operation("etag-0"))
+    return fake
+
+
+@pytest.fixture
+def service(tmp_path):
+    db_path = str(tmp_path / "drafts.db")
+    drafts = DraftRepository(db_path=db_path)
+    for office, count in (("Aichi", 3), ("Kyoto", 2)):
+        for day in range(1, count + 1):
+            drafts.save(DraftReceipt(
+                receipt=Receipt(receipt_date=f"2026-03-0{day}", vendor_name=f"{office}-{day}",
+                                total_amount=100.0, business_location_id=office),
+                status=DraftStatus.SENT,
+                sent_at=datetime(2026, 3, day),
+            ))
+    return HQTransferWriterService(
+        hq_repository=HQTransferRepository(db_path=db_path),
+        draft_repository=drafts,
+        audit_logger=FakeAudit(),
+    )
+
+
+def test_offices_commit_as_contiguous_blocks_after_existing_rows(sheet, service):
+    result = service.execute_month_end_pipeline(2026, 3, "admin")
+
+    # The single-row gap at row 4 is skipped; both blocks land back to back
+    assert sheet.writes == ["A6:J8", "A9:J10"]
+    assert result["status"] == "success"
+    assert [(o["office_id"], o["written_count"]) for o in result["offices"]] == [("Aichi", 3), ("Kyoto", 2)]
+
+    aichi = result["offices"][0]
+    assert service.hq_repository.get_batch_by_id(aichi["batch_id"])["status"] == "SUCCESS"
+    assert [r["row_index"] for r in service.hq_repository.get_allocated_rows(aichi["batch_id"])] == [6, 7, 8]
+    assert all(row[9] == aichi["batch_id"] for row in sheet.rows[5:8])
+
+    # Re-running is idempotent per office
+    again = service.execute_month_end_transfer("Kyoto", 2026, 3, "admin")
+    assert again["status"] == "idempotent"
+
+
+def test_block_that_does_not_fit_fails_alone(sheet, service):
+    # Footer at row 8 leaves rows 6-7 free: room for Kyoto's 2 rows, not Aichi's 3
+    sheet.rows += [[], [], ["合計"]]
+    result = service.execute_month_end_pipeline(2026, 3, "admin")
+
+    aichi, kyoto = result["offices"]
+    assert (aichi["status"], kyoto["status"]) == ("failed", "success")
+    assert sheet.writes == ["A6:J7"]
+
+
+def test_failed_commit_keeps_written_offices_and_recovers_interrupted_rows(sheet, service, monkeypatch):
+    sheet.fail_on_write = 1
+    result = service.execute_month_end_pipeline(2026, 3, "admin")
+
+    aichi, kyoto = result["offices"]
+    assert (aichi["status"], kyoto["status"]) == ("success", "failed")
+    assert result["status"] == "partial_failure"
+
+    # A crash after Kyoto's rows were allocated and only partly written
+    sheet.fail_on_write = None
+    retry = service.execute_month_end_pipeline(2026, 3, "admin", office_ids=["Kyoto"])
+    kyoto_batch = retry["offices"][0]["batch_id"]
+    service.hq_repository.mark_writing(kyoto_batch)
+    allocated = service.hq_repository.get_allocated_rows(kyoto_batch)
+    sheet.rows[allocated[1]["row_index"] - 1] = []
+
+    # A batch this young may still be committing in another process
+    assert service.recover_interrupted_batches(2026, 3, "admin") == []
+    assert service.hq_repository.get_batch_by_id(kyoto_batch)["status"] == "WRITING"
+
+    monkeypatch.setattr(hq_transfer_writer_service, "HQ_TRANSFER_RECOVERY_MIN_AGE_SECONDS", 0)
+    recovered = service.recover_interrupted_batches(2026, 3, "admin")
+
+    assert [(r["office_id"], r["status"], r["written_count"]) for r in recovered] == [("Kyoto", "partial_failure", 1)]
+    assert service.hq_repository.get_batch_by_id(kyoto_batch)["status"] == "FAILED"
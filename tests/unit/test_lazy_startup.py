@@ -0,0 +1,55 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+
+
+def test_importing_app_does_not_load_heavy_subsystems():
+    probe = (
+        "import sys, app.main\n"
+        "heavy = [m for m in ('openpyxl', 'pandas', 'cv2', 'google.cloud.vision', 'app.ocr.multi_engine_ocr') if m in sys.modules]\n"
+        "print('HEAVY=' + ','.join(heavy))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", probe],
+        cwd=ROOT, capture_output=True, text=True, env=dict(os.environ, PYTHONPATH=str(ROOT), STARTUP_WARMUP="off"),
+    )
+    assert result.returncode == 0, result.stderr[-2000:]
+    assert "HEAVY=\n" in result.stdout
+
+
+def test_component_build_does_not_block_the_event_loop(monkeypatch):
+    import asyncio
+    import time
+
+    from app.api import routes
+
+    class SlowHistory:
+        def __init__(self):
+            time.sleep(0.5)
+
+        def get_stats(self):
+            return {"entries": 0}
+
+    monkeypatch.setattr(routes, "_components", {})
+    monkeypatch.setattr(routes, "_build_submission_history", SlowHistory)
+
+    async def main():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        task = asyncio.create_task(ticker())
+        stats = await routes.get_analysis_history_stats()
+        task.cancel()
+        return stats, ticks
+
+    stats, ticks = asyncio.run(main())
+    assert stats == {"entries": 0}
+    assert ticks >= 10
@@ -0,0 +1,80 @@
+"""
+Tests for the content-addressed ledger backup store.
+"""
+
+import os
+import threading
+
+from app.excel.ledger_backup import LedgerBackupStore, OBJECTS_DIR
+
+
+def _write(path, data: bytes, mtime_ns: int):
+    path.write_bytes(data)
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_identical_content_is_not_stored_twice(tmp_path):
+    store = LedgerBackupStore(tmp_path / "backups", max_snapshots=3)
+    ledger = tmp_path / "Aichi_Accumulated.xlsx"
+
+    _write(ledger, b"v1" * 1000, 1_000)
+    first = store.snapshot(ledger, "Aichi")
+    assert store.snapshot(ledger, "Aichi") == first  # unchanged stamp: no read
+
+    _write(ledger, b"v1" * 1000, 2_000)  # touched, same bytes
+    assert store.snapshot(ledger, "Aichi") == first
+
+    assert len(store.list_snapshots("Aichi")) == 1
+    assert first.stat().st_size < 2000
+
+
+def test_prune_keeps_newest_and_restores(tmp_path):
+    store = LedgerBackupStore(tmp_path / "backups", max_snapshots=2)
+    ledger = tmp_path / "Tokyo_Accumulated.xlsx"
+
+    for i in range(4):
+        _write(ledger, f"version {i}".encode(), 1_000 + i)
+        store.snapshot_async(ledger, "Tokyo").result()
+
+    snapshots = store.list_snapshots("Tokyo")
+    assert len(snapshots) == 2
+    objects = list((tmp_path / "backups" / "Tokyo" / OBJECTS_DIR).iterdir())
+    assert len(objects) == 2
+
+    restored = store.restore("Tokyo", snapshots[1]["sha256"], tmp_path / "restored.xlsx")
+    assert restored.read_bytes() == b"version 2"
+
+
+def test_missing_file_is_skipped(tmp_path):
+    store = LedgerBackupStore(tmp_path / "backups")
+    assert store.snapshot(tmp_path / "absent.xlsx", "Osaka") is None
+
+
+def test_save_does_not_wait_for_compression(tmp_path):
+    store = LedgerBackupStore(tmp_path / "backups")
+    ledger = tmp_path / "Nagoya_Accumulated.xlsx"
+    _write(ledger, b"before save", 1_000)
+
+    release = threading.Event()
+    compress = store._hash_and_compress
+
+    def slow_compress(*args):
+        assert release.wait(5)
+        return compress(*args)
+
+    store._hash_and_compress = slow_compress
+    backup = store.snapshot_async(ledger, "Nagoya")
+
+    # The save replaces the workbook by rename while compression is still blocked
+    replacement = tmp_path / "saved.tmp"
+    replacement.write_bytes(b"after save")
+    os.replace(replacement, ledger)
+    assert not backup.done()
+
+    release.set()
+    object_path = backup.result(timeout=5)
+    snapshot = store.list_snapshots("Nagoya")[0]
+    assert object_path.name.startswith(snapshot["sha256"])
+    restored = store.restore("Nagoya", snapshot["sha256"], tmp_path / "restored.xlsx")
+    assert restored.read_bytes() == b"before save"
+    assert not list((tmp_path / "backups" / "Nagoya" / OBJECTS_DIR).glob(".*"))
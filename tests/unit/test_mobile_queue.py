@@ -0,0 +1,75 @@
+"""
+Tests for the SQLite-backed mobile upload queue.
+"""
+
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.mobile.queue import MobileUploadQueueManager
+
+
+def test_claims_are_exclusive_and_ordered(tmp_path):
+    queue = MobileUploadQueueManager(tmp_path)
+    ids = [queue.enqueue(f"r{i}.jpg", b"img", {"n": i}, queued_at=1000 + i).queue_id for i in range(20)]
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        claimed = list(pool.map(lambda w: queue.pop_next(worker_id=f"w{w}"), range(20)))
+
+    assert sorted(item.queue_id for item in claimed) == sorted(ids)
+    assert queue.pop_next() is None
+    assert queue.pending_count() == 20
+
+    first = min(claimed, key=lambda item: item.queued_at)
+    assert first.metadata == {"n": 0}
+    queue.mark_processed(first, result_summary={"ok": True})
+    assert queue.pending_count() == 19
+    assert queue.get_item(first.queue_id) is None
+    assert queue.get_item(first.queue_id, include_processed=True).status == "processed"
+
+
+def test_visibility_timeout_and_release(tmp_path):
+    queue = MobileUploadQueueManager(tmp_path, visibility_timeout=0.05)
+    queued = queue.enqueue("a.png", b"img", {}, queued_at=time.time())
+
+    item = queue.pop_next()
+    assert item.queue_id == queued.queue_id
+    assert queue.pop_next() is None
+
+    time.sleep(0.06)
+    retry = queue.pop_next(visibility_timeout=60)
+    assert retry.queue_id == queued.queue_id and retry.attempts == 2
+    assert not queue.extend_claim(item)  # stale claim lost to the retry
+    assert queue.release(retry)
+    assert queue.pop_next().queue_id == queued.queue_id
+
+
+def test_metadata_updates_and_legacy_import(tmp_path):
+    legacy = tmp_path / "pending" / "legacy1"
+    legacy.mkdir(parents=True)
+    (legacy / "upload.jpg").write_bytes(b"img")
+    (legacy / "metadata.json").write_text(
+        json.dumps({"metadata": {"staff": "x"}, "original_filename": "old.jpg", "queued_at": 5}),
+        encoding="utf-8",
+    )
+
+    queue = MobileUploadQueueManager(tmp_path)
+    queue.store_analysis("legacy1", {"total": 100})
+
+    snapshot = queue.snapshot()
+    assert [entry["id"] for entry in snapshot] == ["legacy1"]
+    assert snapshot[0]["status"] == "awaiting_confirmation"
+    assert snapshot[0]["analysis"] == {"total": 100}
+    assert queue.get_metadata("legacy1")["original_filename"] == "old.jpg"
+
+
+def test_item_with_missing_upload_is_dead_lettered(tmp_path):
+    queue = MobileUploadQueueManager(tmp_path)
+    lost = queue.enqueue("lost.jpg", b"img", {}, queued_at=1000)
+    kept = queue.enqueue("kept.jpg", b"img", {}, queued_at=1001)
+    lost.stored_path.unlink()
+
+    assert queue.pop_next().queue_id == kept.queue_id
+    assert queue.pop_next() is None
+    assert queue.pending_count() == 1
+    assert [entry["id"] for entry in queue.snapshot(include_processed=True)] == [kept.queue_id]
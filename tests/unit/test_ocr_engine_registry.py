@@ -0,0 +1,52 @@
+import threading
+import time
+
+from app.ocr.multi_engine_ocr import OCREngineRegistry
+
+
+class _FakeEngine:
+    def __init__(self):
+        self.refreshes = 0
+        self.closed = False
+
+    def refresh_availability(self):
+        self.refreshes += 1
+
+    def shutdown(self, wait=True):
+        self.closed = True
+
+
+def test_registry_builds_one_engine_across_threads():
+    created = []
+
+    def factory():
+        time.sleep(0.05)
+        engine = _FakeEngine()
+        created.append(engine)
+        return engine
+
+    registry = OCREngineRegistry(factory=factory, refresh_interval=0)
+    seen = []
+    threads = [threading.Thread(target=lambda: seen.append(registry.get())) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(created) == 1
+    assert all(engine is created[0] for engine in seen)
+
+
+def test_registry_refreshes_on_timer_and_shuts_down():
+    registry = OCREngineRegistry(factory=_FakeEngine, refresh_interval=0.02)
+    engine = registry.get()
+    time.sleep(0.15)
+    registry.shutdown()
+
+    assert engine.refreshes >= 2
+    assert engine.closed
+    refreshes = engine.refreshes
+    time.sleep(0.05)
+    assert engine.refreshes == refreshes
+    assert registry.get() is not engine
+    registry.shutdown()
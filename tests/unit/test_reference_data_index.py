@@ -0,0 +1,53 @@
+import json
+import os
+
+from app.services.config_service import ConfigService
+from validators import normalize_location
+
+
+def _service(tmp_path, locations, vendors=None):
+    service = ConfigService()
+    service.locations_path = tmp_path / "locations.json"
+    service.staff_config_path = tmp_path / "staff_config.json"
+    service.vendor_overrides_path = tmp_path / "vendor_overrides.json"
+    service.locations_path.write_text(json.dumps(locations), encoding="utf-8")
+    service.staff_config_path.write_text(json.dumps({
+        "Tokyo": [{"id": "tok_001", "name": "Taro"}],
+        "Osaka": [{"id": "shared", "name": "Osaka Shared"}],
+        "Kyoto": [{"id": "shared", "name": "Kyoto Shared"}],
+    }), encoding="utf-8")
+    service.vendor_overrides_path.write_text(json.dumps(vendors or []), encoding="utf-8")
+    return service
+
+
+def test_index_lookups_match_original_rules(tmp_path):
+    locations = {"locations": ["Tokyo", "Osaka", "Kyoto"], "synonyms": {"東京": "Tokyo", "osaka": "Kyoto"}}
+    service = _service(tmp_path, locations, vendors=[
+        {"aliases": ["セブンイレブン", " 7-Eleven "], "canonical_name": "セブン-イレブン"},
+    ])
+
+    for raw in ["tokyo", " Ｔｏｋｙｏ ", "東京", "OSAKA", "yot", "nowhere", "", None]:
+        assert service.normalize_location(raw) == normalize_location(raw, locations)
+
+    assert service.get_staff_name("shared") == "Osaka Shared"
+    assert service.get_staff_name("shared", "Kyoto") == "Kyoto Shared"
+    assert service.get_staff_name("missing") is None
+    assert service.get_vendor_canonical("7-eleven") == "セブン-イレブン"
+    assert service.get_vendor_canonical("Lawson") == "Lawson"
+
+
+def test_index_is_shared_and_reloads_on_file_change(tmp_path):
+    service = _service(tmp_path, {"locations": ["Tokyo"]})
+    other = _service(tmp_path, {"locations": ["Tokyo"]})
+    index = service.get_index()
+    assert other.get_index() is index
+
+    service.locations_path.write_text(json.dumps({"locations": ["Tokyo", "Nagoya"]}), encoding="utf-8")
+    stat = service.locations_path.stat()
+    os.utime(service.locations_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    version = service.get_version()
+    assert version != index.version
+    reloaded = other.get_index()
+    assert reloaded.generation == index.generation + 1
+    assert other.get_locations() == ["Tokyo", "Nagoya"]
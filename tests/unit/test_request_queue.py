@@ -0,0 +1,94 @@
+import threading
+import time
+
+import pytest
+
+from app.services.request_queue import (
+    KIND_READ,
+    KIND_WRITE,
+    READ_LANE,
+    RequestQueue,
+    TokenBucket,
+    lane_for_request,
+)
+
+
+@pytest.fixture
+def queue():
+    q = RequestQueue(max_concurrent=1, max_concurrent_writes=1, max_queue_size=50)
+    yield q
+    q.shutdown(wait=True)
+
+
+def test_lane_for_request_splits_reads_and_per_file_writes():
+    assert lane_for_request("GET", "users/u/drive/items/ABC/workbook") == (KIND_READ, READ_LANE)
+    assert lane_for_request("PATCH", "users/u/drive/items/ABC/workbook/worksheets('x')/range") == (
+        KIND_WRITE,
+        "write:ABC",
+    )
+    assert lane_for_request("PUT", "users/u/drive/root:/Base/Staff.xlsx:/content") == (
+        KIND_WRITE,
+        "write:base/staff.xlsx",
+    )
+
+
+def test_token_bucket_refills_at_rate():
+    bucket = TokenBucket(rate=10, capacity=2)
+    now = time.monotonic()
+    assert bucket.try_consume(now)
+    assert bucket.try_consume(now)
+    assert not bucket.try_consume(now)
+    assert bucket.seconds_until_token(now) == pytest.approx(0.1, abs=0.01)
+    assert bucket.try_consume(now + 0.11)
+
+
+def test_token_bucket_penalty_holds_lane_closed():
+    bucket = TokenBucket(rate=100, capacity=5)
+    now = time.monotonic()
+    bucket.penalize(now, 2)
+    assert not bucket.try_consume(now + 1)
+    assert bucket.try_consume(now + 2.1)
+
+
+def test_strict_priority_and_retry_deadline_ordering(queue):
+    gate = threading.Event()
+    order = []
+
+    # Occupy the single read slot so everything else queues up
+    blocker = queue.enqueue(gate.wait, 'normal')
+    time.sleep(0.05)
+
+    futures = [
+        queue.enqueue(lambda: order.append('low'), 'low'),
+        queue.enqueue(lambda: order.append('normal-fresh'), 'normal'),
+        queue.enqueue(lambda: order.append('normal-retry'), 'normal', deadline=0.0),
+        queue.enqueue(lambda: order.append('high'), 'high'),
+    ]
+    gate.set()
+    for f in [blocker] + futures:
+        f.result(timeout=5)
+
+    assert order == ['high', 'normal-retry', 'normal-fresh', 'low']
+
+
+def test_write_lane_is_rate_limited_without_blocking_reads():
+    q = RequestQueue(max_concurrent=2, max_concurrent_writes=2, write_rate=5, write_burst=1)
+    try:
+        start = time.monotonic()
+        writes = [q.enqueue(time.monotonic, 'high', kind=KIND_WRITE, lane='write:A') for _ in range(3)]
+        read = q.enqueue(time.monotonic, 'low')
+
+        read_at = read.result(timeout=5)
+        write_times = [f.result(timeout=5) for f in writes]
+
+        # One token up front, then one every 0.2s
+        assert write_times[2] - start >= 0.35
+        assert read_at - start < 0.2
+
+        stats = q.get_stats()
+        assert stats['pending'] == 0
+        assert 'write:A' in stats['lanes']
+        assert stats['lanes']['write:A']['capacity'] == 1
+        assert {'waitMsP50', 'waitMsP90', 'waitMsP99', 'depthByPriority'} <= stats.keys()
+    finally:
+        q.shutdown(wait=True)
@@ -0,0 +1,122 @@
+import time
+from datetime import datetime
+
+import pytest
+
+from app.utils.job_workers import JobWorkerPool
+from app.models.draft import DraftReceipt
+from app.models.schema import Receipt
+from app.repositories.draft_repository import DraftRepository
+from app.services.send_jobs import DraftsAlreadyQueued, SendJobStore, process_send_job
+
+
+class FakeDraftService:
+    def __init__(self):
+        self.repository = DraftRepository(db_path=":memory:")
+        self.calls = []
+
+    def send_drafts(self, draft_ids, sent_by_user_id=None, sent_by_role=None):
+        self.calls.append([str(draft_id) for draft_id in draft_ids])
+        results = []
+        for draft in self.repository.get_by_ids(draft_ids):
+            if draft.receipt.vendor_name == "bad":
+                results.append({"draft_id": str(draft.draft_id), "status": "error", "error": "Excel write failed"})
+                continue
+            draft.mark_as_sent(sent_at=datetime.utcnow())
+            self.repository.save(draft)
+            results.append({"draft_id": str(draft.draft_id), "status": "sent"})
+        duplicates = [{"draft_id": str(draft_ids[0]), "reason": "same_amount"}]
+        return {"total": len(draft_ids), "results": results, "warnings": {"duplicates": duplicates}}
+
+
+def _drafts(service, *vendors):
+    return [service.repository.save(DraftReceipt(receipt=Receipt(vendor_name=v))).draft_id for v in vendors]
+
+
+def _pool(store, service, chunk_size):
+    return JobWorkerPool(
+        store,
+        lambda job, report_stage: process_send_job(store, service, job, report_stage, chunk_size=chunk_size),
+        workers=0,
+        name="send-job",
+    )
+
+
+def test_send_job_runs_in_chunks_and_reports_per_draft_results(tmp_path):
+    store = SendJobStore(tmp_path / "send_jobs.db")
+    service = FakeDraftService()
+    ids = _drafts(service, "a", "bad", "c")
+    job = store.enqueue(ids, {"sent_by_user_id": "u1"}, created_by="u1")
+
+    assert _pool(store, service, chunk_size=2).run_once()
+
+    snapshot = store.snapshot(job.job_id)
+    assert snapshot["state"] == "completed"
+    assert service.calls == [[str(ids[0]), str(ids[1])], [str(ids[2])]]
+    assert [item["state"] for item in snapshot["items"]] == ["sent", "failed", "sent"]
+    assert snapshot["progress"]["done"] == 3
+    result = snapshot["result"]
+    assert (result["total"], result["sent"], result["failed"]) == (3, 2, 1)
+    assert [w["draft_id"] for w in result["warnings"]["duplicates"]] == [str(ids[0]), str(ids[2])]
+
+
+def test_reclaimed_job_does_not_resend_interrupted_drafts(tmp_path):
+    store = SendJobStore(tmp_path / "send_jobs.db", claim_timeout=0)
+    service = FakeDraftService()
+    ids = _drafts(service, "a", "b", "c")
+    job = store.enqueue(ids, {})
+
+    # First worker marks a chunk as writing, persists one draft as SENT, then dies
+    claimed = store.claim(worker_id="dead")
+    store.begin_items(claimed, [str(ids[0]), str(ids[1])])
+    draft = service.repository.get_by_id(ids[0])
+    draft.mark_as_sent()
+    draft.format1_row_index = 12
+    service.repository.save(draft)
+    store.claim_timeout = 60
+
+    assert _pool(store, service, chunk_size=10).run_once()
+
+    # ids[1] may already be in the ledgers: flagged for review, not re-sent
+    assert service.calls == [[str(ids[2])]]
+    snapshot = store.snapshot(job.job_id)
+    assert snapshot["state"] == "completed"
+    assert [item["state"] for item in snapshot["items"]] == ["sent", "failed", "sent"]
+    assert snapshot["result"]["sent"] == 2
+    assert snapshot["result"]["results"][0]["resumed"] is True
+    assert snapshot["result"]["results"][1]["needs_review"] is True
+
+
+def test_drafts_cannot_be_queued_twice_while_unsent(tmp_path):
+    store = SendJobStore(tmp_path / "send_jobs.db")
+    service = FakeDraftService()
+    ids = _drafts(service, "a", "b")
+    store.enqueue(ids[:1], {})
+
+    with pytest.raises(DraftsAlreadyQueued) as excinfo:
+        store.enqueue(ids, {})
+    assert excinfo.value.draft_ids == [str(ids[0])]
+
+    _pool(store, service, chunk_size=10).run_once()
+    assert store.enqueue(ids, {}).state == "queued"
+
+
+def test_claim_is_renewed_while_a_slow_chunk_is_written(tmp_path):
+    store = SendJobStore(tmp_path / "send_jobs.db", claim_timeout=0.3)
+    service = FakeDraftService()
+    ids = _drafts(service, "a")
+    store.enqueue(ids, {})
+    stolen = []
+
+    send_drafts = service.send_drafts
+
+    def slow_send(draft_ids, **kwargs):
+        time.sleep(1.0)
+        stolen.append(store.claim(worker_id="other"))
+        return send_drafts(draft_ids, **kwargs)
+
+    service.send_drafts = slow_send
+    assert _pool(store, service, chunk_size=10).run_once()
+
+    assert stolen == [None]
+    assert service.calls == [[str(ids[0])]]
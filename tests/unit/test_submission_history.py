@@ -0,0 +1,67 @@
+"""
+Tests for the bounded, optionally persistent submission history.
+"""
+
+import pytest
+
+from app.history import submission_history as history_module
+from app.history.submission_history import SubmissionHistory
+
+
+def test_reads_are_read_only_and_status_is_shared_through_db(tmp_path):
+    db_path = str(tmp_path / "history.db")
+    worker_a = SubmissionHistory(persist=True, db_path=db_path)
+    worker_b = SubmissionHistory(persist=True, db_path=db_path)
+
+    worker_a.create_pending_analysis("q1", None, "hash1")
+    worker_a.mark_analysis_processing("q1")
+    assert worker_b.get_analysis_status("q1")["status"] == "processing"
+
+    worker_a.store_analysis("q1", {"vendor": "Shop", "total": "100"}, None, "hash1")
+    status = worker_b.get_analysis_status("q1")
+    assert status["status"] == "completed"
+    with pytest.raises(TypeError):
+        status["status"] = "tampered"
+
+    cached = worker_b.get_cached_analysis("hash1")
+    assert cached["vendor"] == "Shop"
+    with pytest.raises(TypeError):
+        cached["vendor"] = "Other"
+
+    worker_a.store_submission("q1", {**cached}, {"name": "A"}, "/tmp/out.xlsx")
+    assert worker_b.get_analysis_status("q1") is None
+    assert worker_a.get_submission_count() == 1
+
+
+def test_size_and_ttl_eviction_are_counted(monkeypatch):
+    monkeypatch.setattr(history_module, "HISTORY_MAX_ANALYSES", 3)
+    history = SubmissionHistory(persist=False)
+    for i in range(5):
+        history.create_pending_analysis(f"q{i}", None, None)
+
+    assert history.get_analysis_status("q0") is None
+    assert history.get_analysis_status("q4")["status"] == "queued"
+    stats = history.get_stats()
+    assert stats["analyses"]["entries"] == 3
+    assert stats["analyses"]["evictedSize"] == 2
+    assert stats["approxBytes"] > 0
+
+    history.clear_old_analyses(hours=0)
+    stats = history.get_stats()
+    assert stats["analyses"]["entries"] == 0
+    assert stats["analyses"]["evictedTtl"] == 3
+
+
+def test_batch_updates_do_not_mutate_returned_views():
+    history = SubmissionHistory(persist=False)
+    history.create_batch("b1", ["a.jpg", "b.jpg"], "auto")
+    before = history.get_batch("b1")
+
+    history.update_file_status("b1", "a.jpg", "completed")
+    history.update_batch_status("b1", "completed")
+
+    assert before["status"] == "pending"
+    assert before["files"][0]["status"] == "pending"
+    after = history.get_batch("b1")
+    assert after["status"] == "completed"
+    assert after["files"][0]["status"] == "completed"
@@ -0,0 +1,163 @@
+import threading
+import time
+
+from app.models.schema import Receipt
+from app.services.summary_service import SummaryService
+
+
+class RecordingWriter:
+    """Fake ledger writer that records overlap per workbook."""
+
+    def __init__(self, key_fn, delay=0.05):
+        self.key_fn = key_fn
+        self.delay = delay
+        self.active = {}
+        self.overlaps = 0
+        self.order = {}
+        self._lock = threading.Lock()
+
+    def write_receipt(self, receipt):
+        key = self.key_fn(receipt)
+        with self._lock:
+            if self.active.get(key):
+                self.overlaps += 1
+            self.active[key] = True
+            self.order.setdefault(key, []).append(receipt.receipt_date)
+        time.sleep(self.delay)
+        with self._lock:
+            self.active[key] = False
+        if receipt.vendor_name == "FAIL":
+            raise RuntimeError("boom")
+        return {"status": "written"}
+
+
+def _receipts():
+    receipts = []
+    for staff in range(5):
+        for day in (3, 1, 2):
+            receipts.append(
+                Receipt(
+                    receipt_date=f"2026-01-0{day}",
+                    vendor_name="FAIL" if (staff, day) == (4, 2) else "Vendor",
+                    total_amount=100.0,
+                    business_location_id="Kashima",
+                    staff_id=f"kas_00{staff}",
+                )
+            )
+    return receipts
+
+
+def test_lanes_run_in_parallel_but_serialize_per_workbook():
+    branch = RecordingWriter(lambda r: r.business_location_id, delay=0.0)
+    staff = RecordingWriter(lambda r: r.staff_id)
+    service = SummaryService(branch_writer=branch, staff_writer=staff, use_graph_api=True, lane_workers=5)
+
+    receipts = _receipts()
+    start = time.monotonic()
+    result = service.send_receipts(receipts)
+    elapsed = time.monotonic() - start
+
+    # 5 staff lanes of 3 writes each ~= one lane, not 15 sequential writes
+    assert elapsed < 15 * staff.delay * 0.6
+    assert staff.overlaps == 0 and branch.overlaps == 0
+    assert all(dates == sorted(dates) for dates in staff.order.values())
+
+    assert result["processed"] == 15
+    assert result["lanes"] == 6
+    assert result["counts"] == {"success": 28, "skipped": 0, "error": 2}
+    # Results stay in date order with per-receipt isolation of failures
+    expected_ids = [str(r.receipt_id) for r in sorted(receipts, key=lambda r: r.receipt_date)]
+    assert [res["receipt_id"] for res in result["results"]] == expected_ids
+
+
+def test_local_mode_stays_sequential():
+    branch = RecordingWriter(lambda r: r.business_location_id, delay=0.0)
+    staff = RecordingWriter(lambda r: r.staff_id, delay=0.0)
+    service = SummaryService(branch_writer=branch, staff_writer=staff, use_graph_api=False)
+
+    assert service.lane_workers == 1
+    result = service.send_receipts(_receipts())
+    assert result["counts"] == {"success": 28, "skipped": 0, "error": 2}
+
+
+class PreparingWriter(RecordingWriter):
+    """Fake writer with a slow read-only prepare step."""
+
+    def __init__(self, key_fn, delay=0.05):
+        super().__init__(key_fn, delay)
+        self.prepared = []
+
+    def prepare_receipt(self, receipt):
+        time.sleep(self.delay)
+        return {"file_id": f"file-{self.key_fn(receipt)}"}
+
+    def write_receipt(self, receipt, prepared=None):
+        self.prepared.append(prepared)
+        return super().write_receipt(receipt)
+
+
+def test_pipelined_prepare_overlaps_next_receipt_with_current_write():
+    branch = PreparingWriter(lambda r: r.business_location_id)
+    staff = PreparingWriter(lambda r: r.staff_id)
+    receipts = [
+        Receipt(receipt_date=f"2026-01-0{day}", vendor_name="Vendor", total_amount=100.0,
+                business_location_id="Kashima", staff_id="kas_000")
+        for day in range(1, 7)
+    ]
+
+    service = SummaryService(branch_writer=branch, staff_writer=staff, use_graph_api=True,
+                             lane_workers=2, pipeline_prepare=True)
+    start = time.monotonic()
+    result = service.send_receipts(receipts)
+    elapsed = time.monotonic() - start
+
+    # 6 prepares + 6 writes per lane, overlapped: ~7 delays instead of 12
+    assert elapsed < 12 * branch.delay * 0.8
+    assert result["counts"] == {"success": 12, "skipped": 0, "error": 0}
+    assert branch.prepared == [{"file_id": "file-Kashima"}] * 6
+    assert staff.prepared == [{"file_id": "file-kas_000"}] * 6
+    assert branch.overlaps == 0 and staff.overlaps == 0
+
+
+class KeyedWriter(RecordingWriter):
+    """Fake writer whose staff ids map onto shared workbooks."""
+
+    def workbook_key(self, receipt):
+        return self.key_fn(receipt)
+
+
+def test_lanes_follow_resolved_workbook_not_staff_id():
+    # Two staff ids resolve to the same staff ledger (same display name)
+    branch = RecordingWriter(lambda r: r.business_location_id, delay=0.0)
+    staff = KeyedWriter(lambda r: "staff/Shared_Kashima.xlsx" if r.staff_id in ("kas_000", "kas_001") else f"staff/{r.staff_id}.xlsx")
+    service = SummaryService(branch_writer=branch, staff_writer=staff, use_graph_api=True, lane_workers=5)
+
+    result = service.send_receipts(_receipts())
+
+    assert staff.overlaps == 0
+    assert result["lanes"] == 5
+    assert staff.order["staff/Shared_Kashima.xlsx"] == sorted(staff.order["staff/Shared_Kashima.xlsx"])
+
+
+def test_graph_prepare_does_not_create_missing_ledgers(monkeypatch):
+    from app.services import format1_writer_graph as f1
+    from app.services import format2_writer_graph as f2
+    from app.services.summary_service import BranchLedgerWriterGraph, StaffLedgerWriterGraph
+
+    def missing_staff(staff_name, location_id):
+        raise f1.Format1FileNotFoundError(staff_name, "staff/missing.xlsx")
+
+    def missing_location(location_id):
+        raise f2.Format2FileNotFoundError(location_id, "locations/missing.xlsx")
+
+    def forbidden(*args):
+        raise AssertionError("prepare must not create ledgers")
+
+    monkeypatch.setattr(f1, "get_format1_file_id", missing_staff)
+    monkeypatch.setattr(f2, "get_format2_file_id", missing_location)
+    monkeypatch.setattr(f1, "ensure_staff_file_exists", forbidden)
+    monkeypatch.setattr(f2, "ensure_location_file_exists", forbidden)
+
+    receipt = _receipts()[0]
+    assert StaffLedgerWriterGraph().prepare_receipt(receipt) == {"staff_display": receipt.staff_id}
+    assert "file_id" not in BranchLedgerWriterGraph().prepare_receipt(receipt)
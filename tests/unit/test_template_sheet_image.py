@@ -0,0 +1,95 @@
+"""
+Tests for compiled template-sheet stamping in ExcelTemplateLoader.
+"""
+
+from openpyxl import Workbook, load_workbook
+from openpyxl.styles import Border, Font, PatternFill, Side
+
+from app.excel.excel_template_loader import ExcelTemplateLoader
+
+
+def _template_sheet():
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Monthly_Template"
+    ws["A1"] = "支払日"
+    ws["A1"].font = Font(bold=True, name="Meiryo")
+    ws["B1"] = "=SUM(B2:B5)"
+    ws["B1"].number_format = "#,##0"
+    ws["C3"].fill = PatternFill("solid", fgColor="FFFF00")
+    ws.merge_cells("D1:E2")
+    ws["E2"].border = Border(bottom=Side(style="double"))
+    ws.column_dimensions["A"].width = 18
+    ws.row_dimensions[1].height = 30
+    ws.print_title_rows = "1:2"
+    ws.print_area = "A1:E20"
+    return ws
+
+
+def test_stamp_reproduces_template_and_survives_save(tmp_path):
+    template = _template_sheet()
+    image = ExcelTemplateLoader._compile_sheet(template)
+
+    target_wb = Workbook()
+    target_wb["Sheet"]["A1"].font = Font(italic=True)  # pre-existing style table entries
+    for title in ("2026年1月", "2026年2月"):
+        ExcelTemplateLoader._stamp_sheet(image, target_wb.create_sheet(title))
+
+    path = tmp_path / "ledger.xlsx"
+    target_wb.save(path)
+    ws = load_workbook(path)["2026年2月"]
+
+    assert ws["A1"].value == "支払日"
+    assert ws["A1"].font.b and ws["A1"].font.name == "Meiryo"
+    assert ws["B1"].value == "=SUM(B2:B5)"
+    assert ws["B1"].number_format == "#,##0"
+    assert ws["C3"].fill.fgColor.rgb == "00FFFF00"
+    assert [str(r) for r in ws.merged_cells.ranges] == ["D1:E2"]
+    assert ws["E2"].border.bottom.style == "double"
+    assert ws.column_dimensions["A"].width == 18
+    assert ws.row_dimensions[1].height == 30
+    assert ws.print_title_rows == "$1:$2"
+    assert ws.print_area == "'2026年2月'!$A$1:$E$20"
+    assert len(image.styles) == 4  # A1, B1, C3 and the merged-cell border
+
+
+def test_staff_month_sheet_is_stamped_from_format01_template(monkeypatch):
+    from openpyxl.workbook.workbook import Workbook as WorkbookClass
+
+    from app.excel.staff_ledger_writer import StaffLedgerWriter
+
+    def no_copy(self, source):
+        raise AssertionError("month sheets must not be copied cell by cell")
+
+    monkeypatch.setattr(WorkbookClass, "copy_worksheet", no_copy)
+    loader = ExcelTemplateLoader()
+    writer = StaffLedgerWriter(template_loader=loader, repository=object(), config_service=object())
+    wb = load_workbook(loader.format01_template)
+
+    assert writer._ensure_month_sheet(wb, "202603") == "202603"
+    assert writer._ensure_month_sheet(wb, "202603") == "202603"  # existing sheet reused
+
+    template, stamped = wb["原本"], wb["202603"]
+    values = lambda ws: {c.coordinate: c.value for row in ws.iter_rows() for c in row if c.value is not None}
+    assert values(stamped) == values(template)
+    assert sorted(map(str, stamped.merged_cells.ranges)) == sorted(map(str, template.merged_cells.ranges))
+
+
+def test_stamped_format01_sheet_keeps_template_page_layout(tmp_path):
+    loader = ExcelTemplateLoader()
+    wb = load_workbook(loader.format01_template)
+    loader.ensure_format01_month_sheet(wb, "202603")
+    path = tmp_path / "staff.xlsx"
+    wb.save(path)
+
+    saved = load_workbook(path)
+    template, stamped = saved["原本"], saved["202603"]
+    assert stamped.page_setup.orientation == template.page_setup.orientation == "portrait"
+    assert stamped.page_setup.paperSize == template.page_setup.paperSize == 9
+    assert stamped.sheet_format.defaultRowHeight == template.sheet_format.defaultRowHeight == 18.75
+    assert stamped.sheet_format == template.sheet_format
+    assert stamped.sheet_properties.tabColor == template.sheet_properties.tabColor
+    assert stamped.page_margins == template.page_margins
+    assert stamped.print_options == template.print_options
+    assert stamped.print_title_rows == template.print_title_rows
+    assert stamped.print_title_cols == template.print_title_cols
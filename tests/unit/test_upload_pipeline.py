@@ -0,0 +1,67 @@
+"""
+Tests for the single-read, single-decode upload pipeline.
+"""
+
+import asyncio
+import hashlib
+import io
+from tempfile import SpooledTemporaryFile
+
+import pytest
+from fastapi import UploadFile
+from PIL import Image
+
+from app.utils.image_processing import optimize_image_for_ocr, prepare_image_for_ocr, read_image_header
+from app.utils.uploads import UploadTooLargeError, receive_upload, save_spooled_upload
+
+
+def _jpeg(size):
+    buffer = io.BytesIO()
+    Image.new("RGB", size, (200, 180, 160)).save(buffer, format="JPEG", quality=90)
+    return buffer.getvalue()
+
+
+def _upload(data):
+    spool = SpooledTemporaryFile(max_size=1024)
+    spool.write(data)
+    spool.seek(0)
+    return UploadFile(file=spool, filename="receipt.jpg")
+
+
+def test_receive_upload_hashes_and_rejects_oversized_before_reading():
+    data = _jpeg((400, 300))
+    received = asyncio.run(receive_upload(_upload(data), max_bytes=len(data)))
+    assert received.data == data
+    assert received.sha256 == hashlib.sha256(data).hexdigest()
+
+    with pytest.raises(UploadTooLargeError) as excinfo:
+        asyncio.run(receive_upload(_upload(data), max_bytes=len(data) - 1))
+    assert excinfo.value.size == len(data)
+
+
+def test_received_upload_is_saved_from_the_spooled_file(tmp_path):
+    data = _jpeg((400, 300))
+    upload = _upload(data)
+    asyncio.run(receive_upload(upload, max_bytes=len(data)))
+
+    dest = tmp_path / "receipt.jpg"
+    save_spooled_upload(upload, dest, chunk_size=256)
+    assert dest.read_bytes() == data
+    assert [p.name for p in tmp_path.iterdir()] == ["receipt.jpg"]
+
+
+def test_prepare_image_decodes_once_into_payload_and_thumbnail():
+    data = _jpeg((4000, 3000))
+    assert read_image_header(data) == ("JPEG", (4000, 3000))
+
+    prepared = prepare_image_for_ocr(data)
+    assert prepared.extension == "jpg"
+    assert prepared.stats["original_size"] == "4000x3000"
+    with Image.open(io.BytesIO(prepared.optimized_bytes)) as optimized:
+        assert max(optimized.size) == 1600
+    with Image.open(io.BytesIO(prepared.thumbnail_bytes)) as thumb:
+        assert max(thumb.size) == 200
+
+    optimized_bytes, stats = optimize_image_for_ocr(data)
+    assert optimized_bytes == prepared.optimized_bytes
+    assert stats == prepared.stats
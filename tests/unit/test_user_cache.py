@@ -0,0 +1,27 @@
+import sqlite3
+
+from app.repositories.user_repository import UserRepository
+
+
+def test_cached_lookup_skips_database_until_invalidated(tmp_path):
+    db_path = str(tmp_path / "users.db")
+    repo = UserRepository(db_path=db_path)
+    user = repo.upsert_user("PY-00001", "a@example.com", "pw", "WORKER", "Alice")
+
+    assert repo.get_cached_user_by_id(user.user_id).name == "Alice"
+
+    # A write that bypasses the repository is not seen while the entry is live
+    conn = sqlite3.connect(db_path)
+    conn.execute("UPDATE users SET name = 'Changed' WHERE user_id = ?", (str(user.user_id),))
+    conn.commit()
+    conn.close()
+    assert repo.get_cached_user_by_id(user.user_id).name == "Alice"
+
+    # Writes through any repository on the same database invalidate the entry
+    UserRepository(db_path=db_path).upsert_user("PY-00001", "a@example.com", "pw", "ADMIN", "Alice B")
+    cached = repo.get_cached_user_by_id(user.user_id)
+    assert cached.name == "Alice B"
+    assert cached.role == "ADMIN"
+
+    assert repo.set_user_active(user.user_id, False) is True
+    assert repo.get_cached_user_by_id(user.user_id).is_active is False
@@ -0,0 +1,160 @@
+"""
+Tests for the workbook session cache used by local ledger writers.
+"""
+
+import os
+
+import pytest
+from openpyxl import Workbook, load_workbook
+
+from app.excel.workbook_session import WorkbookSession
+
+
+@pytest.fixture
+def xlsx(tmp_path):
+    path = tmp_path / "ledger.xlsx"
+    wb = Workbook()
+    wb.active["A1"] = "header"
+    wb.save(path)
+    return path
+
+
+def _append(session, path, value):
+    with session.lock(path):
+        wb = session.open(path, loader=load_workbook)
+        ws = wb.active
+        ws.cell(row=ws.max_row + 1, column=1, value=value)
+        session.mark_dirty(path)
+
+
+def test_batch_loads_and_saves_once(xlsx):
+    session = WorkbookSession()
+    saved = []
+
+    with session.batch() as batch:
+        for i in range(30):
+            _append(session, xlsx, f"row{i}")
+        with session.lock(xlsx):
+            session.mark_dirty(xlsx, after_save=saved.append)
+        assert load_workbook(xlsx).active.max_row == 1  # nothing written yet
+
+    stats = session.get_stats()
+    assert stats["loads"] == 1
+    assert stats["flushes"] == 1
+    assert saved == [xlsx]
+    assert batch.errors == {}
+    assert load_workbook(xlsx).active.max_row == 31
+    assert [p.name for p in xlsx.parent.iterdir()] == ["ledger.xlsx"]
+
+
+def test_external_change_invalidates_clean_entry(xlsx):
+    session = WorkbookSession()
+    _append(session, xlsx, "ours")
+
+    external = load_workbook(xlsx)
+    external.active["B1"] = "edited in Excel"
+    external.save(xlsx)
+    os.utime(xlsx, ns=(0, 1))  # force a distinct mtime
+
+    _append(session, xlsx, "ours again")
+    ws = load_workbook(xlsx).active
+    assert ws["B1"].value == "edited in Excel"
+    assert ws.max_row == 3
+    assert session.get_stats()["loads"] == 2
+
+
+def test_failed_batch_flush_drops_unsaved_rows(xlsx, monkeypatch):
+    session = WorkbookSession()
+
+    def refuse(*args, **kwargs):
+        raise PermissionError("locked by Excel")
+
+    with session.batch() as batch:
+        _append(session, xlsx, "lost")
+        monkeypatch.setattr("app.excel.workbook_session.atomic_save_workbook", refuse)
+
+    assert list(batch.errors.values()) == ["locked by Excel"]
+    assert session.get_stats()["open"] == 0
+    assert load_workbook(xlsx).active.max_row == 1
+
+
+def test_lru_eviction_flushes_dirty_workbooks(tmp_path):
+    session = WorkbookSession(max_open=2)
+    paths = []
+    for i in range(3):
+        path = tmp_path / f"wb{i}.xlsx"
+        Workbook().save(path)
+        paths.append(path)
+
+    with session.batch():
+        for path in paths:
+            _append(session, path, "x")
+        assert session.get_stats()["open"] == 2
+        assert load_workbook(paths[0]).active["A2"].value == "x"
+
+
+def test_failed_write_mid_batch_keeps_earlier_rows_only(xlsx, monkeypatch):
+    from app.excel.excel_repository import ExcelRepository
+
+    session = WorkbookSession()
+    repo = ExcelRepository(session=session)
+    monkeypatch.setattr(repo, "_copy_artifact", lambda *args, **kwargs: None)
+
+    def write(receipt):
+        def apply(wb):
+            ws = wb.active
+            row = ws.max_row + 1
+            ws.cell(row=row, column=1, value=receipt)
+            if receipt == "r2":
+                raise RuntimeError("failed mid-write")
+            ws.cell(row=row, column=2, value="done")
+
+        with repo.checkout(xlsx) as wb:
+            apply(wb)
+            repo.commit(xlsx, replay=apply)
+
+    with session.batch() as batch:
+        write("r1")
+        with pytest.raises(RuntimeError):
+            write("r2")
+        write("r3")
+
+    assert batch.errors == {}
+    ws = load_workbook(xlsx).active
+    assert [(row[0].value, row[1].value) for row in ws.iter_rows(min_row=2)] == [("r1", "done"), ("r3", "done")]
+
+
+def test_failed_accumulator_append_is_rolled_back(xlsx, monkeypatch):
+    import accumulator
+
+    session = WorkbookSession()
+    monkeypatch.setattr(accumulator, "get_workbook_session", lambda: session)
+    monkeypatch.setattr(accumulator, "ensure_location_workbook", lambda location: xlsx)
+    monkeypatch.setattr(accumulator, "validate_staff_member", lambda location, staff: True)
+    monkeypatch.setattr(accumulator, "_create_backup_snapshot", lambda *args: None)
+    monkeypatch.setattr(accumulator, "log_operation", lambda *args, **kwargs: None)
+
+    append_row = accumulator.append_row
+
+    def failing_append_row(ws, row_idx, mapped_values):
+        if mapped_values["インボイス番号"] == "T2":
+            ws.cell(row=row_idx, column=1, value="partial")
+            raise RuntimeError("failed mid-write")
+        append_row(ws, row_idx, mapped_values)
+
+    monkeypatch.setattr(accumulator, "append_row", failing_append_row)
+
+    def append(invoice):
+        data = {"receipt_date": "2026-03-05", "vendor_name": invoice, "total_amount": 100, "invoice_number": invoice}
+        return accumulator.append_to_month_sheet(data, "Aichi", "Ethan", {})
+
+    with session.batch() as batch:
+        assert append("T1")["row"] == 41
+        with pytest.raises(RuntimeError):
+            append("T2")
+        assert append("T3")["row"] == 42
+
+    assert batch.errors == {}
+    ws = load_workbook(xlsx)["2026年03月"]
+    assert [ws.cell(row=r, column=8).value for r in (41, 42, 43)] == ["T1", "T3", None]
+    assert ws.cell(row=43, column=1).value is None
@@ -0,0 +1,67 @@
+import time
+
+import pytest
+
+from app.services import conflict_resolver
+from app.services.conflict_resolver import LeaseLostError, acquire_write_lock, ensure_lease
+from app.services.write_lock_backend import InMemoryLockBackend, LockBackend, SQLiteLeaseLockBackend, set_lock_backend
+
+
+@pytest.fixture
+def sqlite_backend(tmp_path):
+    backend = SQLiteLeaseLockBackend(db_path=str(tmp_path / "locks.db"))
+    set_lock_backend(backend)
+    yield backend
+    conflict_resolver.clear_all_locks()
+    set_lock_backend(None)
+
+
+def test_expired_lease_is_taken_over_with_higher_fencing_token(sqlite_backend, tmp_path):
+    # Second backend on the same database stands in for another worker process
+    other_worker = SQLiteLeaseLockBackend(db_path=str(tmp_path / "locks.db"))
+
+    stale = sqlite_backend.acquire("FILE", timeout=1, lease_seconds=0.05)
+    assert stale is not None
+    assert other_worker.acquire("FILE", timeout=0.01) is None
+
+    time.sleep(0.1)
+    fresh = other_worker.acquire("FILE", timeout=1)
+
+    assert fresh.fencing_token == stale.fencing_token + 1
+    assert not sqlite_backend.validate(stale)
+    assert not sqlite_backend.renew(stale)
+    assert other_worker.validate(fresh)
+    assert not sqlite_backend.release(stale)
+    assert other_worker.release(fresh)
+
+
+def test_lost_lease_blocks_write_and_metrics_are_reported(sqlite_backend, tmp_path):
+    other_worker = SQLiteLeaseLockBackend(db_path=str(tmp_path / "locks.db"))
+
+    with acquire_write_lock("FILE") as lease:
+        ensure_lease(lease)
+        # Simulate the lease expiring and another worker taking it over
+        conn = other_worker._get_connection()
+        conn.execute(
+            "UPDATE write_leases SET owner = 'other', fencing_token = fencing_token + 1 "
+            "WHERE file_id = 'FILE'"
+        )
+        conn.close()
+        with pytest.raises(LeaseLostError):
+            ensure_lease(lease)
+
+    status = conflict_resolver.get_lock_status()["FILE"]
+    assert status["backend"] == "sqlite"
+    assert status["acquisitions"] == 1
+    assert status["lastFencingToken"] == lease.fencing_token
+    assert status["holder"]["owner"] == "other"
+
+
+def test_incomplete_backend_fails_at_construction():
+    class AcquireOnly(LockBackend):
+        def acquire(self, file_id, timeout, lease_seconds=60.0):
+            return None
+
+    with pytest.raises(TypeError):
+        AcquireOnly()
+    assert InMemoryLockBackend().holders() == {}